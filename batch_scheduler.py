@@ -0,0 +1,326 @@
+"""
+批量排课（命令行，无界面）
+读取一批学生画像（CSV 或 JSON），在进程池中为每位学生依次完成：
+专业课提取 -> 排课（跳过已修课程、选择不冲突的教学班）-> 通识课推荐 -> 教师推荐，
+为每位学生写出一份课表 JSON（--html 时另写一份 HTML 课表），并汇总生成按专业/年级统计的报告。
+--archive 把每位学生的课表（HTML、iCalendar、XLSX、PDF，--formats 选择）边排课边写入一个 zip。
+
+本模块不导入 PyQt5，可以在没有显示器的服务器上运行（导出 PDF 时才导入 schedule_pdf，使用 offscreen 平台）。
+
+学生画像字段（CSV 中多个值用分号分隔）:
+    id, grade（大一/一上...）, major, interests, preferred_workload（low/medium/high）,
+    preferred_assessment, preferred_teaching_style, completed（已修课程）,
+    general_count（通识课门数）, include_optional（是否选择选择性必修）
+
+用法: python batch_scheduler.py students.csv --output batch_output [--workers 4] [--html]
+                                  [--archive schedules.zip --formats html,ics,xlsx,pdf]
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import argparse
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+from config import COURSE_CONFIG, EXPORT_CONFIG
+from core.course_scheduler import Course, CourseScheduler, create_course_from_dict, create_courses_from_dicts
+from core.extract_courses import (file_path, get_compulsory_courses, get_optional_compulsory_courses,
+                             get_general_courses)
+from core.course_rating import course_rating_manager
+from core.course_names import course_key
+from core.ai_recommender import AIRecommender, StudentProfile
+from core.preference_model import PreferenceModel
+from core.html_report import export_schedules, file_stem, unique_stem
+from core.schedule_export import ScheduleArchive
+from core.logging_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# 画像中缺省的字段
+DEFAULT_PROFILE = {
+    'interests': [],
+    'preferred_workload': 'medium',
+    'preferred_assessment': 'mixed',
+    'preferred_teaching_style': 'balanced',
+    'completed': [],
+    'general_count': 2,
+    'include_optional': False,
+}
+
+LIST_FIELDS = ('interests', 'completed')
+
+
+def _split_list(value) -> List[str]:
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    if value is None:
+        return []
+    return [item.strip() for item in str(value).replace('；', ';').split(';') if item.strip()]
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'y', '是')
+
+
+def normalize_profile(raw: Dict, position: int) -> Dict:
+    """补全缺省字段并统一格式；年级"大一"等换成"一上"等学期写法"""
+    profile = dict(DEFAULT_PROFILE)
+    profile.update({key: value for key, value in raw.items() if value not in (None, '')})
+    profile['id'] = str(raw.get('id') or raw.get('student_id') or position + 1)
+    grade = str(profile.get('grade', '')).strip()
+    profile['grade'] = COURSE_CONFIG['grade_mapping'].get(grade, grade)
+    profile['major'] = str(profile.get('major', '')).strip()
+    for field in LIST_FIELDS:
+        profile[field] = _split_list(profile[field])
+    profile['general_count'] = int(profile['general_count'])
+    profile['include_optional'] = _parse_bool(profile['include_optional'])
+    return profile
+
+
+def load_profiles(path: str) -> List[Dict]:
+    """读取学生画像文件（.csv 或 .json，JSON 为对象列表）"""
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    else:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+    return [normalize_profile(row, i) for i, row in enumerate(rows)]
+
+
+# ---- 工作进程 ----
+
+_general_pool: List[Course] = []
+_preference_model: Optional[PreferenceModel] = None
+
+
+def _init_worker():
+    """每个工作进程启动时加载一次课表、评分特征表、通识课池和偏好模型"""
+    global _general_pool, _preference_model
+    logging.getLogger().setLevel(logging.WARNING)
+    _general_pool = create_courses_from_dicts(get_general_courses(file_path))
+    course_rating_manager.get_course_feature_table()
+    _preference_model = PreferenceModel.load()
+
+
+def _add_sections(scheduler: CourseScheduler, records: List[Dict], skip_keys: set,
+                  credit_limit: float) -> Dict[str, List[str]]:
+    """按课程名称分组，每门课选第一个不冲突的教学班（跳过 skip_keys 中的课程）"""
+    sections: Dict[str, List[Course]] = {}
+    for record in records:
+        course = create_course_from_dict(record)
+        if course_key(course.name) in skip_keys:
+            continue
+        sections.setdefault(course.name, []).append(course)
+
+    result = {'added': [], 'conflicts': [], 'over_limit': []}
+    credits = sum(course.credit for course in scheduler.selected_courses)
+    for name, options in sections.items():
+        section = next((course for course in options if not scheduler.check_conflicts(course)), None)
+        if section is None:
+            result['conflicts'].append(name)
+        elif credits + section.credit > credit_limit:
+            result['over_limit'].append(name)
+        else:
+            scheduler.add_selected_course(section)
+            credits += section.credit
+            result['added'].append(name)
+    return result
+
+
+def _course_record(course: Course) -> Dict:
+    return {'name': course.name, 'credit': course.credit, 'time': course.time,
+            'location': course.location, 'teacher': course.teacher, 'type': course.course_type}
+
+
+def schedule_student(profile: Dict) -> Dict:
+    """为一位学生排课，返回可直接写成 JSON 的结果；出错时返回带 error 的结果"""
+    start = time.perf_counter()
+    try:
+        credit_limit = COURSE_CONFIG['max_total_credits']
+        completed = {course_key(name) for name in profile['completed']}
+        scheduler = CourseScheduler()
+
+        compulsory = _add_sections(
+            scheduler, get_compulsory_courses(file_path, profile['grade'], profile['major']),
+            completed, credit_limit)
+        optional = {'added': [], 'conflicts': [], 'over_limit': []}
+        if profile['include_optional']:
+            selected = {course_key(course.name) for course in scheduler.selected_courses}
+            optional = _add_sections(
+                scheduler, get_optional_compulsory_courses(file_path, profile['grade'], profile['major']),
+                completed | selected, credit_limit)
+
+        # 通识课：按推荐顺序逐条取，跳过已修、已选和与新加入课程冲突的
+        recommender = AIRecommender(scheduler, _preference_model)
+        recommender.set_student_profile(StudentProfile(
+            age=profile['grade'], major=profile['major'], interests=profile['interests'],
+            preferred_workload=profile['preferred_workload'],
+            preferred_assessment=profile['preferred_assessment'],
+            preferred_teaching_style=profile['preferred_teaching_style']))
+        taken = completed | {course_key(course.name) for course in scheduler.selected_courses}
+        credits = sum(course.credit for course in scheduler.selected_courses)
+        general = []
+        if profile['general_count'] > 0:
+            for item in recommender.iter_recommendations(_general_pool):
+                course = item['course']
+                key = course_key(course.name)
+                if key in taken or scheduler.check_conflicts(course) or credits + course.credit > credit_limit:
+                    continue
+                scheduler.add_selected_course(course)
+                taken.add(key)
+                credits += course.credit
+                general.append({'name': course.name, 'score': round(item['score'], 2),
+                                'reasons': item['reasons']})
+                if len(general) >= profile['general_count']:
+                    break
+
+        selected = scheduler.selected_courses
+        teachers = course_rating_manager.get_teacher_recommendations([course.name for course in selected])
+        return {
+            'id': profile['id'],
+            'grade': profile['grade'],
+            'major': profile['major'],
+            'courses': [_course_record(course) for course in selected],
+            'total_credits': sum(course.credit for course in selected),
+            'compulsory': compulsory,
+            'optional_compulsory': optional,
+            'general': general,
+            'teachers': {name: info.get('recommended_teacher') for name, info in teachers.items()},
+            'schedule': CourseScheduler.format_schedule(scheduler.get_schedule_matrix()),
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+        }
+    except Exception as e:
+        return {'id': profile['id'], 'grade': profile.get('grade'), 'major': profile.get('major'),
+                'error': f"{type(e).__name__}: {e}",
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)}
+
+
+# ---- 汇总 ----
+
+def build_report(results: List[Dict], elapsed: float) -> Dict:
+    """按专业/年级汇总：人数、平均学分与门数、冲突和超学分未排入的课程、热门通识课"""
+    groups = defaultdict(list)
+    for result in results:
+        groups[(result.get('major'), result.get('grade'))].append(result)
+
+    report_groups = []
+    for (major, grade), members in sorted(groups.items(), key=lambda item: tuple(map(str, item[0]))):
+        ok = [member for member in members if 'error' not in member]
+        unplaced = Counter()
+        for member in ok:
+            for part in ('compulsory', 'optional_compulsory'):
+                unplaced.update(member[part]['conflicts'] + member[part]['over_limit'])
+        report_groups.append({
+            'major': major,
+            'grade': grade,
+            'students': len(members),
+            'failed': len(members) - len(ok),
+            'avg_credits': round(sum(m['total_credits'] for m in ok) / len(ok), 2) if ok else 0,
+            'avg_courses': round(sum(len(m['courses']) for m in ok) / len(ok), 2) if ok else 0,
+            'unplaced_courses': dict(unplaced.most_common()),
+        })
+
+    general = Counter(item['name'] for result in results for item in result.get('general', []))
+    return {
+        'students': len(results),
+        'failed': sum('error' in result for result in results),
+        'elapsed_seconds': round(elapsed, 2),
+        'students_per_second': round(len(results) / elapsed, 2) if elapsed else 0,
+        'groups': report_groups,
+        'popular_general_courses': dict(general.most_common(20)),
+        'files': [{'id': result['id'], 'file': result['file']} for result in results],
+        'errors': [{'id': result['id'], 'file': result['file'], 'error': result['error']}
+                   for result in results if 'error' in result],
+    }
+
+
+def result_selection(result: Dict) -> Dict:
+    """排课结果 -> 界面 user_data 格式的选课结果（core.html_report 用）"""
+    records = {course['name']: course for course in result['courses']}
+    return {
+        'id': result['id'],
+        'age': result['grade'],
+        'major': result['major'],
+        'compulsory_courses': [records[name] for name in result['compulsory']['added']],
+        'optional_compulsory_courses': [records[name] for name in result['optional_compulsory']['added']],
+        'general_courses': [records[item['name']] for item in result['general']],
+    }
+
+
+def _write_json(path: str, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def run_batch(profiles: List[Dict], output_dir: str, workers: int = None, chunksize: int = 8,
+              html: bool = False, archive: str = None, formats: List[str] = None) -> Dict:
+    """在进程池中为全部学生排课，写出每位学生的结果和汇总报告，返回报告
+
+    学生结果写到 output_dir/students，文件名取学生编号（file_stem 处理，重名加 -2、-3 后缀），
+    最终文件名记在结果的 file 字段和报告的 files 中。
+    html 为 True 时把排课成功的学生的课表写到 output_dir/html（共用一个 style.css）。
+    给出 archive 时，每位学生排完即把课表按 formats 写入该 zip（core.schedule_export.ScheduleArchive）。
+    """
+    student_dir = os.path.join(output_dir, 'students')
+    os.makedirs(student_dir, exist_ok=True)
+    formats = list(formats or EXPORT_CONFIG['default_formats'])
+    if archive and 'pdf' in formats:
+        import schedule_pdf  # noqa: F401  注册 PDF 格式（需要 PyQt5）
+
+    start = time.perf_counter()
+    results, used = [], set()
+    schedule_archive = ScheduleArchive(archive, formats) if archive else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for result in executor.map(schedule_student, profiles, chunksize=chunksize):
+                result['file'] = unique_stem(file_stem(result['id']), used) + '.json'
+                _write_json(os.path.join(student_dir, result['file']), result)
+                results.append(result)
+                if 'error' in result:
+                    logger.warning(f"学生 {result['id']} 排课失败: {result['error']}")
+                elif schedule_archive is not None:
+                    schedule_archive.add(result_selection(result))
+    finally:
+        if schedule_archive is not None:
+            schedule_archive.close()
+    if html:
+        export_schedules((result_selection(result) for result in results if 'error' not in result),
+                         os.path.join(output_dir, 'html'))
+    report = build_report(results, time.perf_counter() - start)
+    _write_json(os.path.join(output_dir, 'report.json'), report)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('profiles', help='学生画像文件（.csv 或 .json）')
+    parser.add_argument('--output', default='batch_output', help='输出目录')
+    parser.add_argument('--workers', type=int, default=None, help='工作进程数，默认为CPU核数')
+    parser.add_argument('--chunksize', type=int, default=8, help='每次分给工作进程的学生数')
+    parser.add_argument('--html', action='store_true', help='同时导出每位学生的 HTML 课表')
+    parser.add_argument('--archive', help='把每位学生的课表写入该 zip 文件')
+    parser.add_argument('--formats', default=','.join(EXPORT_CONFIG['default_formats']),
+                        help='--archive 中的格式，逗号分隔（html, ics, xlsx, pdf）')
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    profiles = load_profiles(args.profiles)
+    logger.info(f"读取学生画像 {len(profiles)} 条")
+    report = run_batch(profiles, args.output, args.workers, args.chunksize, args.html,
+                       args.archive, args.formats.split(','))
+    print(f"完成 {report['students']} 名学生（失败 {report['failed']}），"
+          f"用时 {report['elapsed_seconds']}s，{report['students_per_second']} 人/秒")
+    print(f"结果已写入: {os.path.abspath(args.output)}")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+课程浏览检索基准测试（无界面运行，QT_QPA_PLATFORM=offscreen）
+
+逐字输入一组查询（名称、拼音、教师，叠加星期/节次、学分区间和"与我的课表不冲突"），测量每次按键的检索耗时：
+    scan     不建索引：每次按键遍历全部教学班，比较名称/教师子串、解析上课时间判断冲突
+    index    core.catalog_index：倒排索引求交 + 预先算好的时间位掩码数组
+--sizes 中的 0 表示真实课表（res/北京大学2025春季课表.xlsx），其余为合成课表（benchmarks/synthetic）。
+最后在真实课表上打开 catalog_browser.CatalogBrowser，测量从按键到结果表格重绘完成的延迟（目标 16ms 以内）。
+
+用法: python benchmarks/bench_catalog_search.py [--sizes 0,20000,100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from core.catalog_index import CatalogIndex, get_catalog_index, slots_mask
+from core.conflict_index import occupancy_mask
+from core.course_scheduler import TimeSlot, slot_mask
+from synthetic import make_timetable_records
+
+MY_SCHEDULE = occupancy_mask(['星期一(第1节-第2节) 星期三(第1节-第2节)', '星期二(第3节-第4节)', '星期四(第7节-第8节)'])
+
+# (逐字输入的字段, 文字, 其他固定条件)
+QUERIES = [
+    ('text', '概率统计', {}),
+    ('text', 'gailv', {}),
+    ('text', 'sjjg', {}),
+    ('teacher', '王', {}),
+    ('text', '数学', {'days': (3,), 'periods': (3, 4)}),
+    ('text', '导论', {'min_credit': 2, 'max_credit': 3, 'avoid_mask': MY_SCHEDULE}),
+    ('text', '', {'avoid_mask': MY_SCHEDULE}),
+]
+
+
+def scan_search(courses, text='', teacher='', days=(), periods=(), min_credit=None, max_credit=None, avoid_mask=0):
+    """不建索引：逐门课程比较（每次都解析上课时间）"""
+    text, teacher = text.lower(), teacher.lower()
+    wanted = slots_mask(days, periods) if days or periods else 0
+    rows = []
+    for row, course in enumerate(courses):
+        if text and text not in course['课程名称'].lower():
+            continue
+        if teacher and teacher not in str(course['教师']).lower():
+            continue
+        credit = float(course['学分'] or 0)
+        if (min_credit is not None and credit < min_credit) or (max_credit is not None and credit > max_credit):
+            continue
+        if wanted or avoid_mask:
+            mask = slot_mask(TimeSlot.parse_time_str(str(course['上课时间'] or '')))
+            if (wanted and not mask & wanted) or mask & avoid_mask:
+                continue
+        rows.append(row)
+    return rows
+
+
+def keystrokes():
+    """每次按键后的完整检索条件"""
+    for field, value, extra in QUERIES:
+        for length in range(1, len(value) + 1) if value else (0,):
+            yield dict(extra, **{field: value[:length]})
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.95)], samples[-1]
+
+
+def measure(search):
+    samples = []
+    for query in keystrokes():
+        start = time.perf_counter()
+        search(**query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def browser_latency():
+    """真实课表上的 CatalogBrowser：按键到结果表格重绘完成"""
+    from PyQt5 import QtCore, QtWidgets
+    from catalog_browser import CatalogBrowser
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    QtCore.qInstallMessageHandler(lambda *_: None)
+    browser = CatalogBrowser(MY_SCHEDULE)
+    browser.show()
+    app.processEvents()
+    samples = []
+    for field, value, extra in QUERIES:
+        browser.name_edit.clear()
+        browser.teacher_edit.clear()
+        browser.free_only.setChecked(bool(extra.get('avoid_mask')))
+        app.processEvents()
+        edit = browser.name_edit if field == 'text' else browser.teacher_edit
+        for char in value:
+            start = time.perf_counter()
+            edit.insert(char)
+            app.processEvents()  # 处理表格的重绘请求
+            samples.append((time.perf_counter() - start) * 1000)
+    browser.close()
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='0,20000,100000', help='教学班数，逗号分隔（0 表示真实课表）')
+    args = parser.parse_args()
+
+    print(f"{'教学班':>7} {'建索引(s)':>9} {'scan p50/p95(ms)':>17} {'index p50/p95(ms)':>18}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        if size:
+            courses = make_timetable_records(size)
+            start = time.perf_counter()
+            index = CatalogIndex(courses)
+        else:
+            start = time.perf_counter()
+            index = get_catalog_index()
+            courses = index.courses
+        build_s = time.perf_counter() - start
+        scan = measure(lambda **query: scan_search(courses, **query))
+        indexed = measure(index.search)
+        print(f"{len(courses):>7} {build_s:>9.2f} {scan[0]:>8.2f}/{scan[1]:<8.2f} {indexed[0]:>9.2f}/{indexed[1]:<8.2f}")
+
+    p50, p95, worst = browser_latency()
+    print(f"\n课程浏览界面（真实课表）按键到重绘: p50 {p50:.1f}ms，p95 {p95:.1f}ms，最大 {worst:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
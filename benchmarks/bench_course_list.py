@@ -0,0 +1,191 @@
+"""
+课程列表基准测试（无界面运行，QT_QPA_PLATFORM=offscreen）
+
+打开列表：比较两种课程列表的"填充 + 首次绘制"耗时
+    widgets  原来的做法：每门课程一组 QTableWidgetItem，另建一个 QCheckBox 放在滚动区域中
+    model    course_list_view：CourseTableModel + CourseTableView，固定行高，只绘制可见行
+
+勾选到重绘：在 --toggle-size 门课程的列表中反复勾选/取消，测量从勾选到冲突高亮重绘完成的延迟
+    rescan   每次勾选后把每一行与全部已选课程两两比较，重设整张表的背景色
+    model    core.conflict_index：占用位掩码 + 预先算好的冲突邻接表，只重绘状态改变的行
+
+用法: python benchmarks/bench_course_list.py [--sizes 1000,10000] [--repeat 3]
+                                            [--toggle-size 2000] [--toggles 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from config import UI_CONFIG
+from course_list_view import CourseTableModel, CourseTableView
+from synthetic import make_courses
+
+COLUMNS = [("课程名称", 'name'), ("学分", 'credit'), ("时间", 'time')]
+
+# 勾选测试中反复勾选/取消的行数（已选课程数保持在这个量级以内）
+TOGGLE_POOL = 30
+
+
+def synthetic_courses(size):
+    return make_courses(size)[:size]
+
+
+def course_dicts(size):
+    return [{'name': course.name, 'credit': course.credit, 'time': course.time,
+             'is_current_grade': index % 3 == 0}
+            for index, course in enumerate(synthetic_courses(size))]
+
+
+def open_widgets(parent, courses):
+    """原来的做法（与改动前的 CompulsoryChooseUi.update_course_display 相同）"""
+    table = QtWidgets.QTableWidget(parent)
+    table.setGeometry(0, 0, 350, 450)
+    table.setColumnCount(len(COLUMNS))
+    table.setStyleSheet(UI_CONFIG['component_styles']['table'])
+    scroll = QtWidgets.QScrollArea(parent)
+    scroll.setGeometry(350, 0, 280, 450)
+    scroll.setWidgetResizable(True)
+    content = QtWidgets.QWidget()
+    scroll.setWidget(content)
+    layout = QtWidgets.QVBoxLayout(content)
+    table.setRowCount(len(courses))
+    for row, course in enumerate(courses):
+        items = [QtWidgets.QTableWidgetItem(str(course[key])) for _, key in COLUMNS]
+        for column, item in enumerate(items):
+            if course['is_current_grade']:
+                item.setBackground(QtGui.QColor(173, 216, 230))
+            table.setItem(row, column, item)
+        checkbox = QtWidgets.QCheckBox(content)
+        checkbox.setText(f"{course['name']} ({course['credit']}分)")
+        checkbox.setStyleSheet(UI_CONFIG['component_styles']['checkbox'])
+        checkbox.setChecked(course['is_current_grade'])
+        layout.addWidget(checkbox)
+    table.resizeColumnsToContents()
+
+
+def open_model(parent, courses):
+    view = CourseTableView(parent)
+    view.setGeometry(0, 0, 650, 450)
+    view.setStyleSheet(UI_CONFIG['component_styles']['table'])
+    model = CourseTableModel(COLUMNS, credit_key='credit', parent=parent)
+    view.setModel(model)
+    model.set_courses(courses,
+                      checked=[course['is_current_grade'] for course in courses],
+                      highlight=['current' if course['is_current_grade'] else None for course in courses])
+    view.resizeColumnsToContents()
+
+
+def measure(app, opener, courses, repeat):
+    """填充列表并显示、处理完绘制事件的耗时（毫秒），取最好的一次"""
+    best = float('inf')
+    for _ in range(repeat):
+        window = QtWidgets.QWidget()
+        window.resize(700, 500)
+        start = time.perf_counter()
+        opener(window, courses)
+        window.show()
+        app.processEvents()
+        best = min(best, time.perf_counter() - start)
+        window.deleteLater()
+        app.processEvents()
+    return best * 1000
+
+
+class RescanList:
+    """对照：每次勾选后逐行与全部已选课程比较，重设整张表的背景色"""
+
+    def __init__(self, parent, courses):
+        self.courses = courses
+        self.selected = set()
+        self.table = QtWidgets.QTableWidget(len(courses), len(COLUMNS), parent)
+        self.table.setGeometry(0, 0, 650, 450)
+        for row, course in enumerate(courses):
+            for column, (_, key) in enumerate(COLUMNS):
+                self.table.setItem(row, column, QtWidgets.QTableWidgetItem(str(getattr(course, key))))
+        self.conflict_brush = QtGui.QBrush(QtGui.QColor(UI_CONFIG['course_list']['highlight_colors']['conflict']))
+        self.plain_brush = QtGui.QBrush()
+
+    def toggle(self, row):
+        self.selected ^= {row}
+        chosen = [self.courses[index] for index in self.selected]
+        for index, course in enumerate(self.courses):
+            conflict = any(other is not course and course.conflicts_with(other) for other in chosen)
+            brush = self.conflict_brush if conflict else self.plain_brush
+            for column in range(len(COLUMNS)):
+                self.table.item(index, column).setBackground(brush)
+
+
+class ModelList:
+    def __init__(self, parent, courses):
+        self.view = CourseTableView(parent)
+        self.view.setGeometry(0, 0, 650, 450)
+        self.model = CourseTableModel(COLUMNS, credit_key='credit', time_key='time', parent=parent)
+        self.view.setModel(self.model)
+        self.model.set_courses([{'name': course.name, 'credit': course.credit, 'time': course.time}
+                                for course in courses])
+
+    def toggle(self, row):
+        self.model.toggle(row)
+
+
+def toggle_latency(app, factory, courses, toggles, seed=0):
+    """勾选/取消 toggles 次，每次到重绘完成的耗时（毫秒）"""
+    window = QtWidgets.QWidget()
+    window.resize(700, 500)
+    target = factory(window, courses)
+    window.show()
+    app.processEvents()
+    rng = random.Random(seed)
+    # 在可见的前几行中勾选，保证每次都有需要重绘的内容
+    pool = list(range(min(TOGGLE_POOL, len(courses))))
+    samples = []
+    for _ in range(toggles):
+        row = rng.choice(pool)
+        start = time.perf_counter()
+        target.toggle(row)
+        app.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+    window.deleteLater()
+    app.processEvents()
+    samples.sort()
+    return {'p50': samples[len(samples) // 2], 'p95': samples[int(len(samples) * 0.95)], 'max': samples[-1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000', help='课程数，逗号分隔')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--toggle-size', type=int, default=2000, help='勾选测试的课程数（0 表示跳过）')
+    parser.add_argument('--toggles', type=int, default=200, help='勾选测试的勾选次数')
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    # 原来的复选框样式每个控件都会打印一条 "Unknown property" 警告
+    QtCore.qInstallMessageHandler(lambda *_: None)
+    print(f"{'课程数':>7} {'widgets(ms)':>12} {'model(ms)':>10} {'加速':>7}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        courses = course_dicts(size)
+        widgets_ms = measure(app, open_widgets, courses, args.repeat)
+        model_ms = measure(app, open_model, courses, args.repeat)
+        print(f"{size:>7} {widgets_ms:>12.1f} {model_ms:>10.1f} {widgets_ms / model_ms:>6.1f}x")
+
+    if args.toggle_size:
+        courses = synthetic_courses(args.toggle_size)
+        print(f"\n勾选到重绘（{len(courses)} 门课程，{args.toggles} 次）")
+        print(f"{'做法':<8} {'p50(ms)':>9} {'p95(ms)':>9} {'最大(ms)':>9}")
+        for name, factory in (('rescan', RescanList), ('model', ModelList)):
+            stats = toggle_latency(app, factory, courses, args.toggles)
+            print(f"{name:<8} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['max']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+extract_courses_by_grade_and_major 回归基准测试
+
+对比原先的逐门课程筛选（每门课 course_df[course_df['课程名称'] == name] 再 iterrows）
+与按课程名称连接键整体合并（join_course_details）。课表按倍数复制放大，
+并检查两种方式在精确同名的课程上给出相同的记录。
+
+用法: python benchmarks/bench_extract_courses.py [--repeat 5] [--scales 1,10,40]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import extract_courses
+from core.extract_courses import load_catalog_frames, join_course_details
+from core.course_catalog import placeholder_fields
+
+
+def legacy_join(target_courses, course_df, compulsory_df):
+    """原实现的课程数据构建循环（示例数据改用同样的稳定摘要，便于比较结果）"""
+    courses = []
+    for course_name in target_courses:
+        course_info = course_df[course_df['课程名称'] == course_name]
+        if not course_info.empty:
+            for _, course in course_info.iterrows():
+                course_time = str(course.get('上课时间', '')) if pd.notna(course.get('上课时间')) else ''
+                if not course_time or course_time == 'nan':
+                    course_time = placeholder_fields(course_name)['time']
+                courses.append({
+                    '课程名称': str(course.get('课程名称', course_name)),
+                    '学分': float(course.get('学分', 0)) if pd.notna(course.get('学分')) else 2,
+                    '上课时间': course_time,
+                    '上课地点': str(course.get('上课地点', '')) if pd.notna(course.get('上课地点')) else placeholder_fields(course_name)['numbered_location'],
+                    '教师': str(course.get('教师', '')) if pd.notna(course.get('教师')) else placeholder_fields(course_name)['numbered_teacher'],
+                    '课程容量': int(course.get('课程容量', 0)) if pd.notna(course.get('课程容量')) else 50,
+                    '已选人数': int(course.get('已选人数', 0)) if pd.notna(course.get('已选人数')) else 0
+                })
+        else:
+            course = compulsory_df[compulsory_df['课程名称'] == course_name].iloc[0]
+            placeholder = placeholder_fields(course_name)
+            courses.append({
+                '课程名称': str(course_name),
+                '学分': float(course.get('学分', 0)) if pd.notna(course.get('学分')) else 2,
+                '上课时间': placeholder['time'],
+                '上课地点': placeholder['location'],
+                '教师': placeholder['teacher'],
+                '课程容量': 50,
+                '已选人数': 0
+            })
+    return courses
+
+
+def timed(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scales', default='1,10,40', help='课表复制倍数，逗号分隔')
+    args = parser.parse_args()
+
+    compulsory_file = os.path.join(extract_courses.res_dir, "通班&智能专业课 表格.xlsx")
+    start = time.perf_counter()
+    frames = load_catalog_frames(extract_courses.file_path, compulsory_file)
+    print(f"读取并索引两张表: {(time.perf_counter() - start) * 1000:.1f}ms")
+    start = time.perf_counter()
+    load_catalog_frames(extract_courses.file_path, compulsory_file)
+    print(f"再次获取（内存缓存）: {(time.perf_counter() - start) * 1000:.3f}ms")
+
+    # 以全部通班课程为目标，课名与课表精确一致时两种方式的结果应相同
+    target_df = frames.compulsory_df
+    exact = target_df['课程名称'].isin(set(frames.course_df['课程名称']))
+    target_df = target_df[exact | ~target_df['_key'].isin(set(frames.course_df['_key']))]
+    target_names = target_df['课程名称'].tolist()
+
+    print(f"{'课表行数':>10} {'目标课程':>8} {'逐门筛选(ms)':>14} {'整体合并(ms)':>14} {'加速比':>8} {'结果一致':>8}")
+    for scale in (int(s) for s in args.scales.split(',')):
+        course_df = pd.concat([frames.course_df] * scale, ignore_index=True)
+        legacy, legacy_result = timed(
+            lambda: legacy_join(target_names, course_df, frames.compulsory_df), max(1, args.repeat // 2))
+        joined, joined_result = timed(lambda: join_course_details(target_df, course_df), args.repeat)
+        print(f"{len(course_df):>10} {len(target_names):>8} {legacy * 1000:>14.1f} {joined * 1000:>14.1f} "
+              f"{legacy / joined:>7.1f}x {str(legacy_result == joined_result):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+HTML 课表导出基准测试
+
+为 --students 名学生（benchmarks/synthetic.make_selection，每人 10 门课）生成最终课表，比较：
+    concat    改动前 main_enhanced.FinalDialog.generate_final_schedule 的做法：f-string 逐段拼接，
+              每个页面内嵌整份样式
+    template  core.html_report：预先切分好的模板，值转义后 join 一次；批量导出共用一个 style.css
+分别测量只生成 HTML 和生成后写入文件（每人一个文件）的耗时，取 --repeat 次中的最短。
+
+用法: python benchmarks/bench_html_export.py [--students 500] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.html_report import export_schedules, render_final_schedule
+from synthetic import make_selection
+
+
+def legacy_final_schedule(user_data):
+    """改动前的 main_enhanced.FinalDialog.generate_final_schedule（逐段拼接字符串）"""
+    # 计算正确的总学分
+    compulsory_credits = sum(course['credit'] for course in user_data.get("compulsory_courses", []))
+    optional_credits = sum(course['credit'] for course in user_data.get("optional_compulsory_courses", []))
+    general_credits = sum(course['credit'] for course in user_data.get("general_courses", []))
+    total_credits = compulsory_credits + optional_credits + general_credits
+
+    # 更新全局学分数据
+    user_data["total_credits"] = total_credits
+
+    html_content = f"""
+    <html>
+    <head>
+        <style>
+            body {{ font-family: '微软雅黑'; margin: 10px; }}
+            .header {{ background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%); color: white; padding: 10px; border-radius: 8px; margin-bottom: 15px; text-align: center; }}
+            .schedule-table {{ width: 100%; border-collapse: collapse; margin-bottom: 15px; }}
+            .schedule-table th, .schedule-table td {{ border: 1px solid #ddd; padding: 8px; text-align: center; font-size: 12px; }}
+            .schedule-table th {{ background-color: #f2f2f2; font-weight: bold; }}
+            .compulsory {{ background-color: #FFE4E1; }}
+            .optional {{ background-color: #E0FFFF; }}
+            .general {{ background-color: #F0FFF0; }}
+            .summary {{ background-color: #f8f9fa; padding: 10px; border-radius: 5px; font-size: 14px; }}
+            .course-info {{ font-size: 10px; line-height: 1.2; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h3>🎓 {user_data.get('age', '')} {user_data.get('major', '')} 课程表</h3>
+            <p>总学分: {total_credits} 分 | 课程数: {len(user_data.get('compulsory_courses', [])) + len(user_data.get('optional_compulsory_courses', [])) + len(user_data.get('general_courses', []))} 门</p>
+        </div>
+
+        <table class="schedule-table">
+            <tr>
+                <th style="width: 80px;">时间</th>
+                <th>周一</th>
+                <th>周二</th>
+                <th>周三</th>
+                <th>周四</th>
+                <th>周五</th>
+            </tr>
+    """
+
+    # 时间段
+    time_slots = [
+        "8:00-8:45", "8:55-9:40", "10:00-10:45", "10:55-11:40",
+        "13:30-14:15", "14:25-15:10", "15:30-16:15", "16:25-17:10",
+        "18:30-19:15", "19:25-20:10", "20:20-21:05", "21:15-22:00"
+    ]
+
+    # 创建课程表矩阵
+    schedule_matrix = [["" for _ in range(5)] for _ in range(12)]
+
+    # 解析时间并填入课程
+    def parse_time_and_fill(courses, course_type, css_class):
+        for course in courses:
+            time_str = course.get('time', '')
+            if not time_str:
+                continue
+
+            try:
+                # 解析时间格式，如 "周一3-4节"
+                if '周' in time_str and '节' in time_str:
+                    # 提取星期
+                    weekday = -1
+                    if '周一' in time_str: weekday = 0
+                    elif '周二' in time_str: weekday = 1
+                    elif '周三' in time_str: weekday = 2
+                    elif '周四' in time_str: weekday = 3
+                    elif '周五' in time_str: weekday = 4
+
+                    if weekday >= 0:
+                        # 提取节次
+                        import re
+                        periods = re.findall(r'(\d+)', time_str)
+                        for period in periods:
+                            period_num = int(period) - 1  # 转换为0-based索引
+                            if 0 <= period_num < 12:
+                                course_info = f'<div class="{css_class}"><div class="course-info"><strong>{course["name"]}</strong><br>{course.get("teacher", "")}<br>{course.get("location", "")}<br>{course["credit"]}学分</div></div>'
+                                schedule_matrix[period_num][weekday] = course_info
+            except Exception as e:
+                pass
+
+    # 填入各类课程
+    parse_time_and_fill(user_data.get("compulsory_courses", []), "必修课", "compulsory")
+    parse_time_and_fill(user_data.get("optional_compulsory_courses", []), "选择性必修课", "optional")
+    parse_time_and_fill(user_data.get("general_courses", []), "通识课", "general")
+
+    # 生成表格行
+    for i, time_slot in enumerate(time_slots):
+        html_content += f"<tr><td><strong>第{i+1}节<br>{time_slot}</strong></td>"
+        for j in range(5):
+            cell_content = schedule_matrix[i][j] if schedule_matrix[i][j] else ""
+            html_content += f"<td>{cell_content}</td>"
+        html_content += "</tr>"
+
+    html_content += """
+        </table>
+
+        <div class="summary">
+            <h4>📊 课程统计</h4>
+            <div style="display: flex; justify-content: space-between;">
+                <div>
+                    <span style="background-color: #FFE4E1; padding: 2px 8px; border-radius: 3px;">必修课</span>
+                    {compulsory_count}门 ({compulsory_credits}学分)
+                </div>
+                <div>
+                    <span style="background-color: #E0FFFF; padding: 2px 8px; border-radius: 3px;">选择性必修</span>
+                    {optional_count}门 ({optional_credits}学分)
+                </div>
+                <div>
+                    <span style="background-color: #F0FFF0; padding: 2px 8px; border-radius: 3px;">通识课</span>
+                    {general_count}门 ({general_credits}学分)
+                </div>
+            </div>
+            <p style="text-align: center; margin-top: 10px;"><strong>总计: {total_credits} 学分</strong></p>
+        </div>
+    </body>
+    </html>
+    """.format(
+        compulsory_count=len(user_data.get("compulsory_courses", [])),
+        compulsory_credits=compulsory_credits,
+        optional_count=len(user_data.get("optional_compulsory_courses", [])),
+        optional_credits=optional_credits,
+        general_count=len(user_data.get("general_courses", [])),
+        general_credits=general_credits,
+        total_credits=total_credits
+    )
+
+    return html_content
+
+
+def export_legacy(selections, output_dir):
+    paths = []
+    for position, selection in enumerate(selections, start=1):
+        path = os.path.join(output_dir, f"student-{position:04d}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(legacy_final_schedule(dict(selection)))
+        paths.append(path)
+    return paths
+
+
+def best_of(repeat, func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--students', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    selections = [make_selection(seed) for seed in range(args.students)]
+    with tempfile.TemporaryDirectory(prefix='html_export_') as workdir:
+        legacy_dir = os.path.join(workdir, 'concat')
+        template_dir = os.path.join(workdir, 'template')
+        os.makedirs(legacy_dir)
+        results = {
+            'concat': (best_of(args.repeat, lambda: [legacy_final_schedule(dict(s)) for s in selections]),
+                       best_of(args.repeat, lambda: export_legacy(selections, legacy_dir))),
+            'template': (best_of(args.repeat, lambda: [render_final_schedule(s) for s in selections]),
+                         best_of(args.repeat, lambda: export_schedules(selections, template_dir))),
+        }
+        sizes = {name: sum(os.path.getsize(os.path.join(directory, entry)) for entry in os.listdir(directory))
+                 for name, directory in (('concat', legacy_dir), ('template', template_dir))}
+
+    print(f"{args.students} 名学生")
+    print(f"{'做法':<10} {'生成(ms)':>10} {'生成+写文件(ms)':>16} {'每人(ms)':>9} {'文件总大小(KB)':>15}")
+    for name, (render_ms, export_ms) in results.items():
+        print(f"{name:<10} {render_ms:>10.1f} {export_ms:>16.1f} {export_ms / args.students:>9.3f} "
+              f"{sizes[name] / 1024:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
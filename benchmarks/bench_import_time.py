@@ -0,0 +1,74 @@
+"""
+导入耗时基准测试
+
+每个模块在新的 Python 进程中导入，记录导入耗时以及是否加载了 PyQt5。
+界面模块（对话框）与其背后的 core 模块成对比较：批量排课和服务端只需导入 core。
+
+用法: python benchmarks/bench_import_time.py [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (说明, 界面模块, core 模块)
+PAIRS = [
+    ('教师推荐', 'teacher_recommendation', 'core.teacher_recommender'),
+    ('必修课列表', 'compulsory_choose', 'core.course_selection'),
+    ('通识课列表', 'optimal', 'core.course_selection'),
+    ('排课', 'final', 'core.course_scheduler'),
+    ('课程推荐', 'compulsory_choose', 'core.ai_recommender'),
+    ('AI评估', 'evaluation', 'core.llm_integration'),
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'qt': 'PyQt5' in sys.modules}}))
+"""
+
+
+def import_time(module, repeat):
+    """在新进程中导入模块 repeat 次，返回最短耗时（秒）和是否加载了 PyQt5"""
+    best, qt = float('inf'), False
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(module=module)], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best = min(best, result['seconds'])
+        qt = result['qt']
+    return best, qt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cache = {}
+
+    def measure(module):
+        if module not in cache:
+            cache[module] = import_time(module, args.repeat)
+        return cache[module]
+
+    print(f"{'':10} {'界面模块':>26} {'耗时(ms)':>9} {'Qt':>3}   {'core 模块':>26} {'耗时(ms)':>9} {'Qt':>3} {'比例':>6}")
+    for title, view, core in PAIRS:
+        view_time, view_qt = measure(view)
+        core_time, core_qt = measure(core)
+        print(f"{title:10} {view:>26} {view_time * 1000:>9.1f} {'是' if view_qt else '否':>3}   "
+              f"{core:>26} {core_time * 1000:>9.1f} {'是' if core_qt else '否':>3} {core_time / view_time:>6.0%}")
+
+    for module in ('core', 'core.extract_courses', 'core.course_rating', 'core.degree_planner'):
+        core_time, core_qt = measure(module)
+        print(f"{module:>26}: {core_time * 1000:.1f}ms，PyQt5: {'是' if core_qt else '否'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+日志开销基准测试
+
+在合成数据（默认 5000 门专业课）上测量课程列表加载的耗时，分别在以下日志设置下运行：
+    off        debug_mode 关闭（INFO），逐行日志不格式化也不输出
+    debug      debug_mode 打开（DEBUG），同一位置每秒最多 rate_burst 条
+    unlimited  debug_mode 打开且不限流，每门课程一行
+
+每种设置在单独的子进程中运行（COURSE_RES_DIR 指向合成数据目录），日志写入临时文件。
+"首次加载"包括读取 Excel，"重复加载"是表格已缓存后再次生成课程列表。
+
+用法: python benchmarks/bench_logging.py [--rows 5000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ('off', 'debug', 'unlimited')
+
+
+def run_child(mode, repeat, log_path):
+    """子进程：按 mode 配置日志后加载课程列表，输出 JSON 结果"""
+    from config import LOGGING_CONFIG
+    from core.logging_setup import configure_logging
+    if mode == 'unlimited':
+        LOGGING_CONFIG['rate_burst'] = 0
+    with open(log_path, 'w', encoding='utf-8') as log_file:
+        configure_logging(debug=mode != 'off', stream=log_file)
+        from core.course_selection import load_compulsory_course_list
+
+        start = time.perf_counter()
+        courses = load_compulsory_course_list('二下')
+        first = time.perf_counter() - start
+
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            load_compulsory_course_list('二下')
+            best = min(best, time.perf_counter() - start)
+    with open(log_path, 'r', encoding='utf-8') as f:
+        lines = sum(1 for _ in f)
+    print(json.dumps({'courses': len(courses), 'first_ms': first * 1000, 'warm_ms': best * 1000,
+                      'log_lines': lines}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000, help='专业课表行数')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--log', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.repeat, args.log)
+        return
+
+    from synthetic import write_timetable, write_compulsory, TIMETABLE_FILE, COMPULSORY_FILE
+    with tempfile.TemporaryDirectory(prefix='course_logging_') as workdir:
+        timetable_rows = args.rows * 2
+        write_timetable(os.path.join(workdir, TIMETABLE_FILE), timetable_rows)
+        write_compulsory(os.path.join(workdir, COMPULSORY_FILE), args.rows, timetable_rows)
+        env = dict(os.environ, COURSE_RES_DIR=workdir)
+
+        def run(mode):
+            log_path = os.path.join(workdir, f"{mode}.log")
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode,
+                                     '--repeat', str(args.repeat), '--log', log_path],
+                                    cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+            return json.loads(output.strip().splitlines()[-1])
+
+        # 先运行一次，建立课程目录缓存（cache/catalog.json），避免第一种设置多算这部分时间
+        run('off')
+        print(f"{'日志设置':<10} {'课程数':>7} {'首次加载(ms)':>13} {'重复加载(ms)':>13} {'日志行数':>9}")
+        for mode in MODES:
+            result = run(mode)
+            print(f"{mode:<10} {result['courses']:>7} {result['first_ms']:>13.1f} "
+                  f"{result['warm_ms']:>13.1f} {result['log_lines']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+界面切换基准测试（无界面运行，QT_QPA_PLATFORM=offscreen）
+
+按脚本走一遍选课流程（前进到评估，再逐步返回到必修课，然后重新前进），
+界面不真正显示（exec_ 直接返回脚本中的结果），测量每次切换的耗时
+（上一个界面关闭到下一个界面创建或刷新完成，navigator.Navigator.last_transition_ms）：
+    rebuild  改动前的做法：每次进入都新建界面（重新读表、建控件、做冲突分析）
+    reuse    navigator：界面创建一次后保留，再次进入只刷新变化的部分
+
+用法: python benchmarks/bench_navigation.py [--repeat 3]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtCore, QtWidgets
+
+from navigator import Navigator
+
+# (状态, 界面返回值)：前进到评估，返回三步，再前进到评估
+ACCEPTED, REJECTED = QtWidgets.QDialog.Accepted, QtWidgets.QDialog.Rejected
+SCRIPT = [
+    ('welcome', ACCEPTED), ('age', ACCEPTED), ('major', ACCEPTED),
+    ('compulsory', ACCEPTED + 1), ('optional_compulsory', ACCEPTED), ('general', ACCEPTED),
+    ('evaluation', REJECTED), ('general', REJECTED), ('optional_compulsory', REJECTED),
+    ('compulsory', ACCEPTED + 1), ('optional_compulsory', ACCEPTED), ('general', ACCEPTED),
+    ('evaluation', ACCEPTED), ('final', ACCEPTED),
+]
+
+
+class ScriptedNavigator(Navigator):
+    """界面的 exec_ 换成按脚本返回，记录每次切换的耗时；reuse=False 时每次进入都新建界面"""
+
+    def __init__(self, screens, reuse=True):
+        super().__init__(screens)
+        self.reuse = reuse
+        self.steps = iter(SCRIPT)
+        self.timings = []
+
+    def dialog(self, state):
+        if not self.reuse:
+            self.discard(state)
+        dialog = super().dialog(state)
+        dialog.exec_ = self.scripted_exec
+        return dialog
+
+    def scripted_exec(self):
+        expected, result = next(self.steps)
+        assert expected == self.state, (expected, self.state)
+        self.timings.append((self.state, self.last_transition_ms))
+        return result
+
+
+def walk(main_enhanced, reuse):
+    main_enhanced.user_data.update(age='大二', major='通班', compulsory_courses=[],
+                                   optional_compulsory_courses=[], general_courses=[], total_credits=0)
+    navigator = ScriptedNavigator(main_enhanced.SCREENS, reuse)
+    navigator.run('welcome')
+    QtWidgets.QApplication.processEvents()
+    return navigator.timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    QtCore.qInstallMessageHandler(lambda *_: None)
+    logging.disable(logging.WARNING)
+    import main_enhanced
+    # 评估界面的大语言模型调用由计时器触发，这里没有事件循环，不会调用
+
+    results = {}
+    for name, reuse in (('rebuild', False), ('reuse', True)):
+        runs = [walk(main_enhanced, reuse) for _ in range(args.repeat)]
+        results[name] = [min(run[i][1] for run in runs) for i in range(len(SCRIPT))]
+
+    print(f"{'#':>2} {'进入的界面':<20} {'rebuild(ms)':>12} {'reuse(ms)':>10}")
+    for i, (state, _) in enumerate(SCRIPT):
+        print(f"{i:>2} {state:<20} {results['rebuild'][i]:>12.1f} {results['reuse'][i]:>10.1f}")
+    revisits = [i for i, (state, _) in enumerate(SCRIPT) if state in dict(SCRIPT[:i])]
+    for name in ('rebuild', 'reuse'):
+        values = [results[name][i] for i in revisits]
+        print(f"{name}: 再次进入 {len(values)} 次，中位数 {statistics.median(values):.1f}ms，"
+              f"最大 {max(values):.1f}ms；全程 {sum(results[name]):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+选课服务压力测试
+
+在子进程中启动 start_system.py --serve（或通过 --url 连接已运行的服务），
+用多个客户端线程（长连接）按混合比例请求各接口，持续指定时间后报告吞吐量、
+客户端测得的延迟分位数和服务端 /metrics 中的延迟直方图。
+
+用法: python benchmarks/load_test_server.py [--clients 16] [--duration 10] [--workers 8] [--url http://127.0.0.1:8765]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit, quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SELECTED = [
+    {'name': '人工智能引论', 'credit': 3, 'time': '星期一(第5节-第6节) 星期四(第7节-第8节)'},
+    {'name': '线性代数A I', 'credit': 4, 'time': '周二3-4节,周四1-2节'},
+]
+CANDIDATES = [
+    {'name': '平台经济', 'credit': 2, 'time': '星期三(第5节-第6节)'},
+    {'name': '国际传播学', 'credit': 3, 'time': '星期一(第10节-第12节)'},
+    {'name': '音乐与数学', 'credit': 2, 'time': '星期四(第7节-第8节)'},
+]
+PROFILES = [
+    {'grade': '二上', 'major': '通班', 'interests': ['艺术', '历史'], 'preferred_workload': 'low'},
+    {'grade': '一下', 'major': '通班', 'interests': ['经济'], 'preferred_workload': 'medium'},
+    {'grade': '三上', 'major': '智能', 'interests': ['计算机', '音乐'], 'preferred_workload': 'high'},
+]
+QUERIES = ['经济', '艺术', '计算', '数学', '历史', '人工智能']
+
+# (权重, 方法, 路径或路径生成函数, 请求体生成函数)
+REQUEST_MIX = [
+    (30, 'GET', lambda rng: f"/catalog?q={quote(rng.choice(QUERIES))}&limit=20", None),
+    (10, 'GET', lambda rng: f"/catalog/compulsory?grade={quote(rng.choice(['一上', '二上', '三下']))}&major="
+                            f"{quote('通班')}", None),
+    (25, 'POST', lambda rng: '/conflicts', lambda rng: {'selected': SELECTED, 'candidates': CANDIDATES}),
+    (20, 'POST', lambda rng: '/recommend', lambda rng: {'profile': rng.choice(PROFILES), 'selected': SELECTED,
+                                                        'top_k': 5}),
+    (10, 'POST', lambda rng: '/teachers', lambda rng: {'courses': ['人工智能引论', '计算概论A', '线性代数A I']}),
+    (5, 'POST', lambda rng: '/evaluate', lambda rng: {'年级': '二上', '专业': '通班', '必修课程': ['人工智能引论'],
+                                                      '总学分': 20, 'use_llm': False}),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(host, port, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def run_client(host, port, seed, stop_at, results, lock):
+    rng = random.Random(seed)
+    weights = [item[0] for item in REQUEST_MIX]
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    local = []
+    while time.time() < stop_at:
+        _, method, make_path, make_body = rng.choices(REQUEST_MIX, weights)[0]
+        path = make_path(rng)
+        body = json.dumps(make_body(rng), ensure_ascii=False).encode('utf-8') if make_body else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+            if response.getheader('Connection', '').lower() == 'close':
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            status = 0
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+        local.append((f"{method} {urlsplit(path).path}", status, (time.perf_counter() - start) * 1000))
+    conn.close()
+    with lock:
+        results.extend(local)
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16, help='并发客户端数')
+    parser.add_argument('--duration', type=float, default=10, help='持续时间（秒）')
+    parser.add_argument('--workers', type=int, default=8, help='服务端工作线程数（自动启动服务时）')
+    parser.add_argument('--url', default=None, help='已运行的服务地址，不指定则自动启动')
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        server = subprocess.Popen([sys.executable, 'start_system.py', '--serve', '--host', host,
+                                   '--port', str(port), '--workers', str(args.workers)],
+                                  cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_ready(host, port):
+            print("服务未能启动")
+            return 1
+
+        results, lock = [], threading.Lock()
+        stop_at = time.time() + args.duration
+        start = time.perf_counter()
+        threads = [threading.Thread(target=run_client, args=(host, port, seed, stop_at, results, lock))
+                   for seed in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        ok = [r for r in results if r[1] == 200]
+        print(f"客户端 {args.clients}，持续 {elapsed:.1f}s，请求 {len(results)}，成功 {len(ok)}，"
+              f"吞吐量 {len(ok) / elapsed:.1f} 请求/秒")
+        print(f"{'接口':<24} {'请求数':>7} {'失败':>5} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+        for endpoint in sorted({r[0] for r in results}):
+            rows = [r for r in results if r[0] == endpoint]
+            latencies = [r[2] for r in rows if r[1] == 200]
+            print(f"{endpoint:<24} {len(rows):>7} {sum(r[1] != 200 for r in rows):>5} "
+                  f"{percentile(latencies, 0.5):>9.1f} {percentile(latencies, 0.95):>9.1f} "
+                  f"{percentile(latencies, 0.99):>9.1f}")
+
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        conn.request('GET', '/metrics')
+        metrics = json.loads(conn.getresponse().read())
+        print(f"\n服务端直方图（拒绝连接 {metrics['rejected']}）:")
+        for endpoint, item in sorted(metrics['endpoints'].items()):
+            print(f"{endpoint:<24} {item['count']:>7} mean {item['mean_ms']:>8.2f}ms  p50<={item['p50_ms']:g}ms  "
+                  f"p95<={item['p95_ms']:g}ms  p99<={item['p99_ms']:g}ms  max {item['max_ms']:.1f}ms")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
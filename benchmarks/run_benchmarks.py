@@ -0,0 +1,236 @@
+"""
+排课核心基准测试套件
+
+在 100 / 1k / 10k 门课程的合成课程目录上测量排课核心的各项操作：
+读取课表 Excel、解析上课时间、Course.conflicts_with、CourseScheduler.recommend_courses、
+AIRecommender.recommend_courses、CourseRatingManager.get_teacher_recommendations 和生成 HTML 课表。
+每项取 --repeat 次中的最短耗时。
+
+结果可以保存为基线（benchmarks/baseline.json），之后用 --check 与基线比较：
+耗时超过基线 (1 + threshold) 倍且差值超过 --min-delta-ms 的项视为性能回退，退出码为 1。
+
+用法:
+    python benchmarks/run_benchmarks.py                        # 运行并打印结果
+    python benchmarks/run_benchmarks.py --save-baseline        # 运行并写入基线
+    python benchmarks/run_benchmarks.py --check [--threshold 0.25]
+    python benchmarks/run_benchmarks.py --only teacher --sizes 100,1000
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import get_resource_path
+from synthetic import (make_courses, make_time_strings, make_selection, make_timetable_records,
+                       write_timetable)
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+
+
+# ---- 测试项 ----
+# 每个 setup(size, workdir) 完成准备工作并返回被计时的无参函数
+
+def setup_excel_load(size, workdir):
+    from core import extract_courses
+    path = os.path.join(workdir, f"timetable_{size}.xlsx")
+    write_timetable(path, size)
+    compulsory_file = get_resource_path("通班&智能专业课 表格.xlsx")
+
+    def run():
+        extract_courses._catalog_cache.clear()
+        extract_courses.load_catalog_frames(path, compulsory_file)
+    return run
+
+
+def setup_parse_time(size, workdir):
+    from core.course_scheduler import TimeSlot
+    strings = make_time_strings(size)
+    return lambda: [TimeSlot.parse_time_str(text) for text in strings]
+
+
+def setup_conflicts_with(size, workdir):
+    courses = make_courses(size)
+    selected = make_courses(10, seed=1)
+    return lambda: [course.conflicts_with(other) for course in courses for other in selected]
+
+
+def _scheduler(size):
+    from core.course_scheduler import CourseScheduler
+    scheduler = CourseScheduler()
+    for course in make_courses(5, seed=1):
+        if not scheduler.check_conflicts(course):
+            scheduler.add_selected_course(course)
+    for course in make_courses(size):
+        scheduler.add_available_course(course)
+    return scheduler
+
+
+def setup_scheduler_recommend(size, workdir):
+    scheduler = _scheduler(size)
+    return lambda: scheduler.recommend_courses(max_courses=10)
+
+
+def setup_ai_recommend(size, workdir):
+    from core.ai_recommender import AIRecommender, StudentProfile
+    recommender = AIRecommender(_scheduler(0))
+    recommender.set_student_profile(StudentProfile(
+        age='二下', major='通班', interests=['人工智能', '程序'],
+        preferred_workload='medium', preferred_assessment='mixed',
+        preferred_teaching_style='balanced'))
+    courses = make_courses(size)
+    return lambda: recommender.recommend_courses(courses, top_k=10)
+
+
+def setup_teacher_recommendations(size, workdir):
+    from core.course_rating import CourseRatingManager
+    manager = CourseRatingManager()
+    manager.load_ratings()
+    names = [record['课程名称'] for record in make_timetable_records(size)]
+    return lambda: manager.get_teacher_recommendations(names)
+
+
+def setup_html_schedule(size, workdir):
+    """每 10 门课程对应一名学生的课表（每人 10 门课）
+
+    最终课表界面（main_enhanced.FinalDialog.generate_final_schedule）直接调用 render_final_schedule。
+    """
+    from core.html_report import render_final_schedule
+    selections = [make_selection(seed) for seed in range(max(1, size // 10))]
+
+    def run():
+        for selection in selections:
+            render_final_schedule(selection)
+    return run
+
+
+CASES = [
+    ('excel_load', setup_excel_load),
+    ('parse_time', setup_parse_time),
+    ('conflicts_with', setup_conflicts_with),
+    ('scheduler_recommend', setup_scheduler_recommend),
+    ('ai_recommend', setup_ai_recommend),
+    ('teacher_recommendations', setup_teacher_recommendations),
+    ('html_schedule', setup_html_schedule),
+]
+
+
+# ---- 运行与比较 ----
+
+def measure(func, repeat):
+    """运行 repeat 次（先预热一次），返回最短和中位耗时（毫秒）"""
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'best_ms': round(min(samples), 3), 'median_ms': round(statistics.median(samples), 3)}
+
+
+def run_suite(sizes, repeat, only=None):
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='course_bench_')
+    try:
+        for name, setup in CASES:
+            if only and not any(item in name for item in only):
+                continue
+            for size in sizes:
+                key = f"{name}@{size}"
+                # 10k 规模的慢项少跑几次
+                runs = repeat if size < 10000 else max(1, repeat // 3)
+                results[key] = measure(setup(size, workdir), runs)
+                print(f"{key:<32} best {results[key]['best_ms']:>10.2f}ms  "
+                      f"median {results[key]['median_ms']:>10.2f}ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """与基线比较，返回回退项列表 [(key, 基线, 当前, 比例)]"""
+    regressions = []
+    print(f"\n{'测试项':<32} {'基线(ms)':>10} {'当前(ms)':>10} {'变化':>8}")
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<32} {'-':>10} {current['best_ms']:>10.2f} {'新增':>8}")
+            continue
+        ratio = current['best_ms'] / base['best_ms'] if base['best_ms'] else float('inf')
+        regressed = ratio > 1 + threshold and current['best_ms'] - base['best_ms'] > min_delta_ms
+        print(f"{key:<32} {base['best_ms']:>10.2f} {current['best_ms']:>10.2f} {ratio - 1:>+8.0%}"
+              f"{'  回退' if regressed else ''}")
+        if regressed:
+            regressions.append((key, base['best_ms'], current['best_ms'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='课程目录规模，逗号分隔')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', default=None, help='只运行名称包含这些字符串的测试项，逗号分隔')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线文件')
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果写入基线文件')
+    parser.add_argument('--check', action='store_true', help='与基线比较，有回退时退出码为 1')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help=f'允许的相对变慢比例，默认取基线文件中的值或 {DEFAULT_THRESHOLD}')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='小于该差值的变化视为噪声')
+    parser.add_argument('--output', default=None, help='把本次结果写入 JSON 文件')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    only = args.only.split(',') if args.only else None
+    results = run_suite(sizes, args.repeat, only)
+
+    document = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'threshold': args.threshold if args.threshold is not None else DEFAULT_THRESHOLD,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+
+    status = 0
+    if args.check:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        threshold = args.threshold if args.threshold is not None else baseline.get('threshold', DEFAULT_THRESHOLD)
+        regressions = compare(results, baseline['results'], threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} 项超过基线 {threshold:.0%}:")
+            for key, base, current, ratio in regressions:
+                print(f"  {key}: {base:.2f}ms -> {current:.2f}ms ({ratio:.2f}x)")
+            status = 1
+        else:
+            print(f"\n全部测试项在基线 {threshold:.0%} 以内")
+
+    if args.save_baseline:
+        if only or sizes != list(DEFAULT_SIZES):
+            # 部分运行只更新对应的项
+            previous = {}
+            if os.path.exists(args.baseline):
+                with open(args.baseline, 'r', encoding='utf-8') as f:
+                    previous = json.load(f).get('results', {})
+            document['results'] = {**previous, **results}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+        print(f"基线已写入: {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
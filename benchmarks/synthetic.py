@@ -0,0 +1,255 @@
+"""
+合成课程数据
+
+按随机种子生成与 res/ 中三张表同列的数据：课表（北京大学2025春季课表.xlsx）、
+通班专业课表（通班&智能专业课 表格.xlsx）和课程评分表（课程评分.xlsx）。
+结果只由规模和 seed 决定，不同次运行、不同机器上得到相同的数据。
+
+生成的数据保留真实表格中影响加载和计算耗时的特征：一门课多个教学班、
+一个教学班多个上课时间段（含单双周标记）、多位教师合上、专业课表列名中的零宽字符、
+评分表中的空行分组和 "missing" 值。约十分之一的课程使用真实评分表中已有的课程名称。
+"""
+
+import random
+from typing import List, Dict
+
+from core.course_scheduler import Course, create_course_from_dict
+
+TIMETABLE_FILE = '北京大学2025春季课表.xlsx'
+COMPULSORY_FILE = '通班&智能专业课 表格.xlsx'
+RATING_FILE = '课程评分.xlsx'
+
+TIMETABLE_COLUMNS = ['课程号', '课程名称', '开课单位', '课程类型', '班号', '学分', '起止周', '上课时间', '教师', '备注']
+# 真实文件的列名前后带有零宽字符，读取时由 load_catalog_frames 清理
+ZERO_WIDTH = '\u200b\u200b'
+COMPULSORY_COLUMNS = ['课程名称' + ZERO_WIDTH] + [ZERO_WIDTH + name + ZERO_WIDTH for name in ('选课时间', '学分', '学时')]
+RATING_COLUMNS = ['课程', '老师', '课程内容 满分10分', '课程工作量', '课程考核', '平均分', '有效评价条数', '数据来源于']
+
+WEEKDAYS = '一二三四五'
+PERIOD_PAIRS = [(1, 2), (3, 4), (5, 6), (7, 8), (9, 10), (10, 11), (10, 12)]
+# 每个教学班的上课时间段数及权重（与真实课表的分布接近）
+SLOT_COUNTS = ([1, 2, 3, 4, 5], [78, 16, 2, 2, 2])
+WEEK_RANGES = (['1-16', '2-16', '1-8', '9-16', '3-16'], [95, 1, 1, 1, 1])
+RATED_NAMES = ['计算概论A', '高等数学A 下', '人工智能引论', '程序设计实习', '多智能体系统', '线性代数A I']
+COURSE_TYPES = (['专业必修', '专业任选', '专业限选', '体育', '大学英语', '全校公选课', '通选课', '思想政治'],
+                [41, 22, 8, 8, 6, 5, 4, 2])
+DEPARTMENTS = ['信息科学技术学院', '数学科学学院', '物理学院', '元培学院', '人工智能研究院', '经济学院',
+               '中国语言文学系', '历史学系', '哲学系', '心理与认知科学学院']
+REMARKS = (['', '研本合上', '理教', '双语授课', '一学年的课'], [80, 10, 4, 3, 3])
+SEMESTERS = (['一上', '一下', '二上', '二下', '三上', '三下', '四上', '三上/四上', '三上/下', '三下/四下', '二上/三上'],
+             [7, 5, 5, 4, 4, 6, 1, 6, 4, 2, 1])
+
+TOPICS = ['数学分析', '高等代数', '概率论', '数理统计', '数据结构', '操作系统', '编译原理', '计算机网络',
+          '机器学习', '深度学习', '计算机视觉', '自然语言处理', '强化学习', '博弈论', '认知科学', '量子力学',
+          '电动力学', '热力学', '微观经济学', '宏观经济学', '中国古代史', '西方哲学史', '艺术史', '心理学']
+SUFFIXES = ['', '导论', '原理', '基础', '专题', '前沿', '实习', '研讨', '(A)', '(B)', ' I', ' II']
+SURNAMES = '王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹'
+GIVEN_NAMES = ['伟', '芳', '娜', '敏', '静', '磊', '洋', '勇', '艳', '杰', '涛', '明', '超', '秀英', '华',
+               '建国', '晓东', '志强', '海燕', '文博', '一鸣', '子涵', '嘉欣', '宇航', '思远', '雨桐', '立新']
+
+
+def course_name(index: int) -> str:
+    """第 index 门合成课程的名称；每十门中有一门使用评分表中的真实课程名称"""
+    if index % 10 == 0:
+        return RATED_NAMES[(index // 10) % len(RATED_NAMES)]
+    topic = TOPICS[index % len(TOPICS)]
+    suffix = SUFFIXES[(index // len(TOPICS)) % len(SUFFIXES)]
+    round_ = index // (len(TOPICS) * len(SUFFIXES))
+    return f"{topic}{suffix}" + (f"（{round_ + 1}）" if round_ else '')
+
+
+def teacher_name(index: int) -> str:
+    name = SURNAMES[index % len(SURNAMES)] + GIVEN_NAMES[(index // len(SURNAMES)) % len(GIVEN_NAMES)]
+    round_ = index // (len(SURNAMES) * len(GIVEN_NAMES))
+    return name + (str(round_ + 1) if round_ else '')
+
+
+def _choice(rng: random.Random, weighted):
+    values, weights = weighted
+    return rng.choices(values, weights)[0]
+
+
+def timetable_time(rng: random.Random) -> str:
+    """课表格式的上课时间，例如 "星期一(第1节-第2节)(单) 星期三(第3节-第4节)" """
+    days = rng.sample(WEEKDAYS, _choice(rng, SLOT_COUNTS))
+    parts = []
+    for day in sorted(days, key=WEEKDAYS.index):
+        start, end = rng.choice(PERIOD_PAIRS)
+        marker = rng.choice(['(单)', '(双)']) if rng.random() < 0.03 else ''
+        parts.append(f"星期{day}(第{start}节-第{end}节){marker}")
+    return ' '.join(parts)
+
+
+def short_time(rng: random.Random) -> str:
+    """界面中使用的简写格式，例如 "周一1-2节,周三3-4节" """
+    parts = []
+    for day in rng.sample(WEEKDAYS, rng.randint(1, 2)):
+        start, end = rng.choice(PERIOD_PAIRS)
+        parts.append(f"周{day}{start}-{end}节")
+    return ','.join(parts)
+
+
+def course_teachers(course_index: int, teacher_count: int) -> List[str]:
+    """一门课程的任课教师（1-4 位），由课程下标决定"""
+    rng = random.Random(course_index)
+    return [teacher_name(rng.randrange(teacher_count)) for _ in range(rng.choice([1, 1, 2, 2, 3, 4]))]
+
+
+def _teacher_count(rows: int) -> int:
+    return max(10, rows // 3)
+
+
+def make_timetable_records(n: int, seed: int = 0) -> List[Dict]:
+    """生成 n 条课表记录（列与课表文件相同），一门课程有 1-3 个教学班"""
+    rng = random.Random(seed)
+    teacher_count = _teacher_count(n)
+    records = []
+    course_index = 0
+    while len(records) < n:
+        name = course_name(course_index)
+        teachers = course_teachers(course_index, teacher_count)
+        credit = float(rng.choice([1, 2, 2, 2, 3, 3, 4, 5]))
+        course_type = _choice(rng, COURSE_TYPES)
+        department = rng.choice(DEPARTMENTS)
+        for section in range(min(rng.choice([1, 1, 1, 2, 2, 3]), n - len(records))):
+            # 约五分之一的教学班由两到三位教师合上，教师名之间用空格分隔
+            if len(teachers) > 1 and rng.random() < 0.2:
+                teacher = ' '.join(rng.sample(teachers, min(len(teachers), rng.choice([2, 3]))))
+            else:
+                teacher = teachers[section % len(teachers)]
+            records.append({
+                '课程号': 400000 + course_index,
+                '课程名称': name,
+                '开课单位': department,
+                '课程类型': course_type,
+                '班号': section + 1,
+                '学分': credit,
+                '起止周': _choice(rng, WEEK_RANGES),
+                '上课时间': timetable_time(rng),
+                '教师': teacher,
+                '备注': _choice(rng, REMARKS),
+            })
+        course_index += 1
+    return records
+
+
+def make_compulsory_records(n: int, timetable_rows: int, seed: int = 0) -> List[Dict]:
+    """生成 n 条专业课记录（列名为清理后的名称）
+
+    九成课程取自课表中的课程（课程名称不重复），其余是课表中没有的课程，
+    走示例数据的分支。
+    """
+    rng = random.Random(seed + 1)
+    # 每门课程平均不到两个教学班，前 timetable_rows // 2 门课程都在课表中
+    names = list(dict.fromkeys(course_name(i) for i in range(max(1, timetable_rows // 2))))
+    rng.shuffle(names)
+    records = []
+    for i in range(n):
+        if i < len(names) and rng.random() < 0.9:
+            name = names[i]
+        else:
+            name = f"{course_name(i)}实验{i}"
+        credit = rng.choice([0, 1, 2, 2, 3, 3, 4, 5])
+        records.append({
+            '课程名称': name,
+            '选课时间': _choice(rng, SEMESTERS),
+            '学分': credit,
+            '学时': credit * 17 + rng.choice([0, 0, 17, 34]),
+        })
+    return records
+
+
+def _review_total(rng: random.Random, reviews: int, levels=(10, 7, 4, 1), weights=(70, 20, 7, 3)) -> int:
+    """评分表中的分数是所有有效评价的分数之和"""
+    return sum(rng.choices(levels, weights, k=reviews))
+
+
+def make_rating_records(n: int, timetable_rows: int, seed: int = 0) -> List[Dict]:
+    """生成约 n 行课程评分记录
+
+    每门课程一组，组内每位任课教师一行，组与组之间有一个空行；
+    少数课程没有评价数据，各列为 "missing"。
+    """
+    rng = random.Random(seed + 2)
+    teacher_count = _teacher_count(timetable_rows)
+    course_count = max(1, timetable_rows // 2)
+    records = []
+    empty = {column: None for column in RATING_COLUMNS}
+    position = 0
+    while len(records) < n:
+        course_index = position % course_count
+        position += 1
+        name = course_name(course_index)
+        if rng.random() < 0.05:
+            records.append({**empty, '课程': name, **{column: 'missing' for column in RATING_COLUMNS[1:7]}})
+        else:
+            for teacher in dict.fromkeys(course_teachers(course_index, teacher_count)):
+                reviews = rng.randint(1, 20)
+                records.append({
+                    '课程': name,
+                    '老师': teacher,
+                    '课程内容 满分10分': _review_total(rng, reviews),
+                    '课程工作量': _review_total(rng, reviews),
+                    '课程考核': _review_total(rng, reviews),
+                    '平均分': sum(rng.randint(150, 196) / 2 for _ in range(reviews)),
+                    '有效评价条数': reviews,
+                    '数据来源于': None,
+                })
+        records.append(dict(empty))
+    records = records[:n]
+    if records:
+        records[0]['数据来源于'] = '统计规则：绿色10分 黑7分 橙4分 哭1分'
+    return records
+
+
+def make_time_strings(n: int, seed: int = 0) -> List[str]:
+    """n 个上课时间字符串，课表格式和简写格式各占一半"""
+    rng = random.Random(seed)
+    return [timetable_time(rng) if i % 2 else short_time(rng) for i in range(n)]
+
+
+def make_courses(n: int, seed: int = 0) -> List[Course]:
+    """n 门合成课程对象（每个教学班一门）"""
+    return [create_course_from_dict(record) for record in make_timetable_records(n, seed)]
+
+
+def make_selection(seed: int = 1) -> Dict[str, List[Dict]]:
+    """一份已选课程（界面 user_data 中的格式），必修、选择性必修和通识课各几门"""
+    rng = random.Random(seed)
+    selection = {'compulsory_courses': [], 'optional_compulsory_courses': [], 'general_courses': []}
+    for category, count in (('compulsory_courses', 5), ('optional_compulsory_courses', 2), ('general_courses', 3)):
+        for i in range(count):
+            selection[category].append({
+                'name': f"{category}-{i}",
+                'credit': rng.choice([2, 3, 4]),
+                'time': short_time(rng),
+                'teacher': f"教师{rng.randrange(100)}",
+                'location': f"理教{rng.randrange(100, 500)}",
+            })
+    return selection
+
+
+def write_workbook(path: str, columns: List[str], records: List[Dict], keys: List[str] = None):
+    """用 openpyxl 的只写模式逐行写出 xlsx，十万行也不必在内存中建立完整的工作表"""
+    from openpyxl import Workbook
+    keys = keys or columns
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(columns)
+    for record in records:
+        sheet.append([record.get(key) for key in keys])
+    workbook.save(path)
+
+
+def write_timetable(path: str, n: int, seed: int = 0):
+    """把 n 条合成课表记录写成 xlsx"""
+    write_workbook(path, TIMETABLE_COLUMNS, make_timetable_records(n, seed))
+
+
+def write_compulsory(path: str, n: int, timetable_rows: int, seed: int = 0):
+    keys = ['课程名称', '选课时间', '学分', '学时']
+    write_workbook(path, COMPULSORY_COLUMNS, make_compulsory_records(n, timetable_rows, seed), keys)
+
+
+def write_ratings(path: str, n: int, timetable_rows: int, seed: int = 0):
+    write_workbook(path, RATING_COLUMNS, make_rating_records(n, timetable_rows, seed))
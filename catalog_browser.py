@@ -0,0 +1,211 @@
+"""
+课程浏览
+在全部课表（北京大学2025春季课表.xlsx 的所有教学班）中按名称或拼音、教师、星期、节次、学分区间检索，
+可只看与我的课表不冲突的教学班。检索用 core.catalog_index 预先建好的索引，每次修改条件立即刷新结果。
+任意界面中按 Ctrl+Shift+F 打开（见 install_catalog_shortcut）。
+"""
+
+import time
+from typing import List
+
+import numpy as np
+from PyQt5 import QtCore
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit, QComboBox,
+                             QDoubleSpinBox, QCheckBox, QTableView, QHeaderView, QAbstractItemView, QApplication)
+
+from config import UI_CONFIG
+from core import instrumentation
+from core.catalog_index import get_catalog_index
+from core.conflict_index import occupancy_mask
+
+# 列：(表头, 课程记录的键)
+COLUMNS = [("课程名称", '课程名称'), ("教师", '教师'), ("学分", '学分'), ("上课时间", '上课时间'),
+           ("开课单位", '开课单位'), ("课程类型", '课程类型'), ("备注", '备注')]
+
+DAY_CHOICES = [("不限星期", ())] + [(f"周{day}", (number,)) for number, day in enumerate('一二三四五六日', start=1)]
+PERIOD_CHOICES = [("不限节次", ())] + [(f"第{first}-{first + 1}节", (first, first + 1)) for first in range(1, 12, 2)]
+
+# 我的课表：user_data 中各类已选课程
+SELECTION_KEYS = ('compulsory_courses', 'optional_compulsory_courses', 'general_courses')
+
+
+class CatalogTableModel(QtCore.QAbstractTableModel):
+    """检索结果：只保存结果的行号，显示文字在绘制可见行时才取"""
+
+    def __init__(self, courses: List[dict], parent=None):
+        super().__init__(parent)
+        self._courses = courses
+        self._rows = np.zeros(0, dtype=np.int32)
+
+    def set_rows(self, rows: np.ndarray):
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def course(self, row: int) -> dict:
+        return self._courses[self._rows[row]]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole or (role == Qt.ToolTipRole and index.column() in (0, 1, 6)):
+            value = self.course(index.row()).get(COLUMNS[index.column()][1], '')
+            return f"{value:g}" if isinstance(value, float) else str(value)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section][0]
+        return None
+
+
+class CatalogBrowser(QDialog):
+    """全部课程的检索界面
+
+    schedule_mask 是我的课表占用的时间槽（core.conflict_index.occupancy_mask），
+    勾选"与我的课表不冲突"时用于排除冲突的教学班。
+    """
+
+    def __init__(self, schedule_mask: int = 0, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("课程浏览")
+        self.resize(980, 640)
+        self.schedule_mask = schedule_mask
+        self.index = get_catalog_index()
+        self.model = CatalogTableModel(self.index.courses, self)
+        self.last_search_ms = 0.0
+        self.init_ui()
+        self.apply_filters()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        filters = QGridLayout()
+
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText("课程名称或拼音（如 概率、gailv、glt）" if self.index.has_pinyin
+                                          else "课程名称")
+        self.teacher_edit = QLineEdit()
+        self.teacher_edit.setPlaceholderText("教师")
+        self.day_box = QComboBox()
+        for text, days in DAY_CHOICES:
+            self.day_box.addItem(text, days)
+        self.period_box = QComboBox()
+        for text, periods in PERIOD_CHOICES:
+            self.period_box.addItem(text, periods)
+        self.min_credit = QDoubleSpinBox()
+        self.max_credit = QDoubleSpinBox()
+        for box, value in ((self.min_credit, 0), (self.max_credit, 10)):
+            box.setRange(0, 10)
+            box.setSingleStep(0.5)
+            box.setDecimals(1)
+            box.setValue(value)
+        self.free_only = QCheckBox("与我的课表不冲突")
+        self.free_only.setEnabled(bool(self.schedule_mask))
+
+        filters.addWidget(self.name_edit, 0, 0, 1, 3)
+        filters.addWidget(self.teacher_edit, 0, 3, 1, 2)
+        filters.addWidget(self.day_box, 1, 0)
+        filters.addWidget(self.period_box, 1, 1)
+        credits = QHBoxLayout()
+        credits.addWidget(QLabel("学分"))
+        credits.addWidget(self.min_credit)
+        credits.addWidget(QLabel("至"))
+        credits.addWidget(self.max_credit)
+        filters.addLayout(credits, 1, 2, 1, 2)
+        filters.addWidget(self.free_only, 1, 4)
+        layout.addLayout(filters)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setWordWrap(False)
+        self.table.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        # 所有行等高，只绘制可见行
+        vertical = self.table.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(UI_CONFIG['course_list']['row_height'])
+        horizontal = self.table.horizontalHeader()
+        horizontal.setStretchLastSection(True)
+        for column, width in enumerate((220, 120, 50, 260, 140, 90)):
+            self.table.setColumnWidth(column, width)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        for edit in (self.name_edit, self.teacher_edit):
+            edit.textChanged.connect(self.apply_filters)
+        for box in (self.day_box, self.period_box):
+            box.currentIndexChanged.connect(self.apply_filters)
+        for box in (self.min_credit, self.max_credit):
+            box.valueChanged.connect(self.apply_filters)
+        self.free_only.toggled.connect(self.apply_filters)
+
+    def set_schedule_mask(self, schedule_mask: int):
+        """我的课表变化后更新（再次打开界面时）"""
+        self.schedule_mask = schedule_mask
+        self.free_only.setEnabled(bool(schedule_mask))
+        self.apply_filters()
+
+    def apply_filters(self):
+        """按当前条件检索并替换结果（每次按键调用，耗时显示在状态栏）"""
+        started = time.perf_counter()
+        rows = self.index.search(
+            text=self.name_edit.text(), teacher=self.teacher_edit.text(),
+            days=self.day_box.currentData(), periods=self.period_box.currentData(),
+            min_credit=self.min_credit.value(), max_credit=self.max_credit.value(),
+            avoid_mask=self.schedule_mask if self.free_only.isChecked() else 0)
+        self.model.set_rows(rows)
+        self.last_search_ms = (time.perf_counter() - started) * 1000
+        instrumentation.observe('ui.catalog.filter', self.last_search_ms)
+        self.status_label.setText(f"共 {len(rows)} / {len(self.index)} 个教学班（检索 {self.last_search_ms:.1f}ms）")
+
+
+def schedule_mask() -> int:
+    """当前已选课程（main_enhanced.user_data）占用的时间槽"""
+    from main_enhanced import user_data
+    return occupancy_mask(course.get('time') for key in SELECTION_KEYS for course in user_data.get(key) or [])
+
+
+class _BrowserShortcut(QtCore.QObject):
+    """应用级按键过滤：任意窗口中按 Ctrl+Shift+F 打开课程浏览
+
+    选课对话框都是模态运行的，浏览界面也设为应用模态才能接收输入。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.browser = None
+
+    def eventFilter(self, obj, event):
+        if (event.type() == QtCore.QEvent.KeyPress and event.key() == QtCore.Qt.Key_F
+                and event.modifiers() == (QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier)):
+            if self.browser is None:
+                QApplication.setOverrideCursor(Qt.WaitCursor)
+                try:
+                    self.browser = CatalogBrowser(schedule_mask())
+                finally:
+                    QApplication.restoreOverrideCursor()
+                self.browser.setWindowModality(QtCore.Qt.ApplicationModal)
+            else:
+                self.browser.set_schedule_mask(schedule_mask())
+            self.browser.show()
+            self.browser.raise_()
+            return True
+        return False
+
+
+def install_catalog_shortcut(app: QApplication):
+    """在应用上安装 Ctrl+Shift+F 快捷键"""
+    shortcut = _BrowserShortcut(app)
+    app.installEventFilter(shortcut)
+    return shortcut
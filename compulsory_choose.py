@@ -9,12 +9,17 @@
 
 
 from PyQt5 import QtCore, QtGui, QtWidgets
-import pandas as pd
 import os
+import logging
 from config import UI_CONFIG
-from extract_courses import get_compulsory_courses
-from course_rating import course_rating_manager
-from teacher_recommendation import TeacherRecommender
+from core.course_selection import (compulsory_grade, load_compulsory_course_list, selection_record,
+                                   fallback_compulsory_courses, spring_semester_courses)
+from core.teacher_recommender import TeacherRecommender
+from core.preference_model import log_course_selection
+from core import instrumentation
+from course_list_view import CourseTableModel, CourseTableView
+
+logger = logging.getLogger(__name__)
 
 
 class Ui_Dialog(object):
@@ -38,24 +43,29 @@ class Ui_Dialog(object):
         self.confirm.setObjectName("confirm")
         self.confirm.setStyleSheet(UI_CONFIG['component_styles']['button'])
         
-        # 课程列表表格 - 调整位置和大小
-        self.list = QtWidgets.QTableWidget(self.frame)
-        self.list.setGeometry(QtCore.QRect(30, 150, 350, 450))
+        # 课程列表（第0列勾选）
+        self.list = CourseTableView(self.frame)
+        self.list.setGeometry(QtCore.QRect(30, 150, 650, 450))
         self.list.setObjectName("list")
-        self.list.setColumnCount(3)  # 增加一列显示年级信息
         self.list.setStyleSheet(UI_CONFIG['component_styles']['table'])
-        
-        # 设置表头
-        header_items = ["课程名称", "学分", "学期"]
-        for i, header in enumerate(header_items):
-            item = QtWidgets.QTableWidgetItem()
-            item.setText(header)
-            self.list.setHorizontalHeaderItem(i, item)
+        self.course_model = CourseTableModel([
+            ("课程名称", 'name'),
+            ("学分", 'credit'),
+            ("学期", 'grade')  # 显示年级信息
+        ], credit_key='credit', type_key='grade', parent=Dialog)
+        self.list.setModel(self.course_model)
         
         # 设置列宽
-        self.list.setColumnWidth(0, 180)  # 课程名称列
-        self.list.setColumnWidth(1, 60)   # 学分列
-        self.list.setColumnWidth(2, 80)   # 学期列
+        self.list.setColumnWidth(0, 50)   # 勾选列
+        self.list.setColumnWidth(1, 360)  # 课程名称列
+        self.list.setColumnWidth(2, 80)   # 学分列
+        self.list.setColumnWidth(3, 120)  # 学期列
+        
+        # 全选当前年级的课程
+        self.select_current = QtWidgets.QPushButton(self.frame)
+        self.select_current.setGeometry(QtCore.QRect(560, 105, 120, 35))
+        self.select_current.setObjectName("select_current")
+        self.select_current.setStyleSheet(UI_CONFIG['component_styles']['button'])
         
         # 学分显示
         self.all_points = QtWidgets.QLCDNumber(self.frame)
@@ -109,34 +119,6 @@ class Ui_Dialog(object):
             }
         """)
         
-        # 创建复选框布局 - 调整位置避免重叠
-        self.layoutWidget = QtWidgets.QWidget(self.frame)
-        self.layoutWidget.setGeometry(QtCore.QRect(400, 150, 280, 450))
-        self.layoutWidget.setObjectName("layoutWidget")
-        
-        # 创建滚动区域以支持更多复选框
-        self.scrollArea = QtWidgets.QScrollArea(self.layoutWidget)
-        self.scrollArea.setGeometry(QtCore.QRect(0, 0, 280, 450))
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setStyleSheet("""
-            QScrollArea {
-                border: 2px solid #000000;
-                border-radius: 10px;
-                background-color: #ffffff;
-            }
-        """)
-        
-        self.scrollWidget = QtWidgets.QWidget()
-        self.scrollArea.setWidget(self.scrollWidget)
-        
-        self.verticalLayout = QtWidgets.QVBoxLayout(self.scrollWidget)
-        self.verticalLayout.setContentsMargins(10, 10, 10, 10)
-        self.verticalLayout.setSpacing(8)
-        self.verticalLayout.setObjectName("verticalLayout")
-        
-        # 复选框将在加载课程数据时动态创建
-        self.checkboxes = []
-        
         # 添加教师推荐区域
         self.recommendation_group = QtWidgets.QGroupBox(self.frame)
         self.recommendation_group.setGeometry(QtCore.QRect(30, 150, 720, 500))
@@ -184,7 +166,6 @@ class Ui_Dialog(object):
         
         # 设置z-order
         self.background.raise_()
-        self.layoutWidget.raise_()
         self.pushButton_4.raise_()
         self.confirm.raise_()
         self.list.raise_()
@@ -192,6 +173,7 @@ class Ui_Dialog(object):
         self.return_2.raise_()
         self.label.raise_()
         self.pushButton_5.raise_()
+        self.select_current.raise_()
         self.recommendation_group.raise_()  # 确保推荐界面在最上层
         
         self.gridLayout.addWidget(self.frame, 0, 0, 1, 1)
@@ -206,22 +188,18 @@ class Ui_Dialog(object):
         self.return_2.setText(_translate("Dialog", "返回"))
         self.label.setText(_translate("Dialog", "已选学分"))
         self.pushButton_5.setText(_translate("Dialog", "必修课选择"))
+        self.select_current.setText(_translate("Dialog", "全选本年级"))
 
 class CompulsoryChooseUi(QtWidgets.QDialog, Ui_Dialog):
     def __init__(self, grade=None, major=None, parent=None):
         super().__init__(parent)
         self.setupUi(self)
         # 兼容"大一""大二"或"二下"格式
-        if grade in ["大一", "大二", "大三", "大四"]:
-            grade_prefix = grade[1]  # "一""二""三""四"
-            self.grade = f"{grade_prefix}下"
-        else:
-            self.grade = grade or "二下"
+        self.grade = compulsory_grade(grade)
         self.major = major or "通班"
         self.selected_courses = []
         self.all_courses = []  # 存储所有课程
-        self.current_grade_courses = []  # 存储当前年级的课程
-        self.checkboxes = []
+        self.current_grade_rows = []  # 当前年级的课程在列表中的行号
         self.teacher_recommender = TeacherRecommender()
         
         # 设置背景图片
@@ -231,11 +209,14 @@ class CompulsoryChooseUi(QtWidgets.QDialog, Ui_Dialog):
             if os.path.exists(background_path):
                 self.background.setPixmap(QtGui.QPixmap(background_path))
         except Exception as e:
-            print(f"加载背景图片失败: {e}")
+            logger.warning("加载背景图片失败: %s", e)
         
         # 连接信号
         self.confirm.clicked.connect(self.confirm_selection)
         self.return_2.clicked.connect(self.reject)
+        self.select_current.clicked.connect(self.select_current_grade)
+        self.course_model.checkedChanged.connect(self.update_credits)
+        self.course_model.checkedChanged.connect(self.save_draft)
         
         # 加载课程数据
         self.load_all_courses()
@@ -243,146 +224,24 @@ class CompulsoryChooseUi(QtWidgets.QDialog, Ui_Dialog):
     def load_all_courses(self):
         """加载所有课程数据，显示全部但自动勾选当前年级的课程"""
         try:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            res_dir = os.path.join(base_dir, "res")
-            
-            # 直接从通班专业课表格读取所有课程
-            compulsory_file = os.path.join(res_dir, "通班&智能专业课 表格.xlsx")
-            if os.path.exists(compulsory_file):
-                df = pd.read_excel(compulsory_file)
-                df.columns = df.columns.str.replace('\u200b', '').str.strip()
-                
-                print(f"通班文件列名: {df.columns.tolist()}")
-                print(f"数据行数: {len(df)}")
-                
-                # 年级映射 - 包含上下半学期和跨学期的课程
-                grade_mapping = {
-                    "一上": ["一上", "一上/下"],
-                    "一下": ["一下", "一上/下", "一/下"],
-                    "二上": ["二上", "二上/下"],
-                    "二下": ["二下", "二上/下", "二/下"],
-                    "三上": ["三上", "三上/下"],
-                    "三下": ["三下", "三上/下", "三/下"],
-                    "四上": ["四上", "四上/下"],
-                    "四下": ["四下", "四上/下", "四/下"]
-                }
-                
-                # 获取当前年级对应的学期
-                current_semesters = grade_mapping.get(self.grade, [self.grade])
-                print(f"当前年级: {self.grade}, 对应学期: {current_semesters}")
-                
-                # 获取所有课程
-                self.all_courses = []
-                for _, row in df.iterrows():
-                    course_name = str(row.get('课程名称', '')).strip()
-                    if course_name in ['微电子与电路基础', '人工智能与社会科学']:
-                        continue
-                    if course_name and course_name != 'nan':
-                        course_semester = str(row.get('选课时间', '')).strip()
-                        course_credit = row.get('学分', 2)
-                        
-                        # 判断是否为当前年级的课程
-                        is_current_grade = False
-                        if current_semesters:
-                            current_grade_prefix = self.grade[0]  # 获取年级前缀（如"二"）
-                            current_semester = "下" if self.grade.endswith("下") else "上"
-                            
-                            # 检查课程学期是否与当前年级匹配
-                            if course_semester:  # 确保课程学期不为空
-                                # 检查各种可能的格式
-                                patterns = [
-                                    self.grade,  # 完全匹配（如"二下"）
-                                    f"{current_grade_prefix}上/下",  # 跨学期匹配（如"二上/下"）
-                                    f"{current_grade_prefix}/下",  # 简写下学期（如"二/下"）
-                                    f"{current_grade_prefix}{current_semester}/下"  # 扩展格式
-                                ]
-                                
-                                # 检查是否匹配任何模式
-                                is_current_grade = (
-                                    any(pattern in course_semester for pattern in patterns) or
-                                    course_semester in current_semesters
-                                )
-                                
-                                print(f"课程: {course_name}, 学期: {course_semester}, 当前年级: {self.grade}, 是否当前年级: {is_current_grade}")
-                        
-                        # 为课程分配示例时间和地点信息
-                        import random
-                        days = ['周一', '周二', '周三', '周四', '周五']
-                        periods = ['1-2节', '3-4节', '5-6节', '7-8节']
-                        locations = ['教学楼A101', '教学楼A102', '教学楼B201', '教学楼B202', '实验楼C301']
-                        teachers = ['张教授', '李教授', '王教授', '赵教授', '陈教授', '刘教授']
-                        
-                        # 生成随机但固定的时间（基于课程名称哈希）
-                        course_hash = hash(course_name) % 1000
-                        day = days[course_hash % len(days)]
-                        period = periods[course_hash % len(periods)]
-                        location = locations[course_hash % len(locations)]
-                        teacher = teachers[course_hash % len(teachers)]
-                        
-                        self.all_courses.append({
-                            'name': course_name,
-                            'credit': course_credit,
-                            'grade': course_semester,
-                            'time': f'{day}{period}',
-                            'location': location,
-                            'teacher': teacher,
-                            'is_current_grade': is_current_grade
-                        })
-                
-                print(f"加载了 {len(self.all_courses)} 门课程")
-                print(f"当前年级课程数: {sum(1 for c in self.all_courses if c['is_current_grade'])}")
-                
-            else:
-                print(f"通班文件不存在: {compulsory_file}")
-                # 提供示例数据
-                self.all_courses = [
-                    {'name': '计算概论A', 'credit': 3, 'grade': '一上', 'is_current_grade': self.grade in ['一上', '一下']},
-                    {'name': '线性代数A I', 'credit': 4, 'grade': '一上', 'is_current_grade': self.grade in ['一上', '一下']},
-                    {'name': '高等数学A I', 'credit': 5, 'grade': '一上', 'is_current_grade': self.grade in ['一上', '一下']},
-                    {'name': '数据结构与算法(A)', 'credit': 3, 'grade': '二上', 'is_current_grade': self.grade in ['二上', '二下']},
-                    {'name': '计算机系统导论', 'credit': 5, 'grade': '二上', 'is_current_grade': self.grade in ['二上', '二下']},
-                ]
-            
-            # 更新界面
-            self.update_course_display()
-            
+            self.all_courses = load_compulsory_course_list(self.grade)
         except Exception as e:
-            print(f"加载课程数据失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("加载课程数据失败: %s", e)
             # 提供示例数据
-            self.all_courses = [
-                {'name': '计算概论A', 'credit': 3, 'grade': '一上', 'is_current_grade': self.grade in ['一上', '一下']},
-                {'name': '线性代数A I', 'credit': 4, 'grade': '一上', 'is_current_grade': self.grade in ['一上', '一下']},
-                {'name': '高等数学A I', 'credit': 5, 'grade': '一上', 'is_current_grade': self.grade in ['一上', '一下']},
-                {'name': '数据结构与算法(A)', 'credit': 3, 'grade': '二上', 'is_current_grade': self.grade in ['二上', '二下']},
-                {'name': '计算机系统导论', 'credit': 5, 'grade': '二上', 'is_current_grade': self.grade in ['二上', '二下']},
-            ]
-            self.update_course_display()
+            self.all_courses = fallback_compulsory_courses(self.grade)
+        
+        # 更新界面
+        self.update_course_display()
     
+    @instrumentation.timed('ui.compulsory.course_table')
     def update_course_display(self):
         """更新课程显示"""
         if not self.all_courses:
             return
         
-        # 清空现有的复选框
-        for checkbox in self.checkboxes:
-            checkbox.deleteLater()
-        self.checkboxes.clear()
-        
         # 过滤出所有下学期的课程（包括跨学期的课程）
-        all_second_semester_courses = []
-        for course in self.all_courses:
-            course_semester = course['grade']
-            if (any(semester in course_semester for semester in ["一下", "二下", "三下", "四下"]) or
-                any(f"{semester}/下" in course_semester for semester in ["一", "二", "三", "四"])):
-                all_second_semester_courses.append(course)
-                print(f"显示课程: {course['name']}, 学期: {course_semester}, 是否当前年级: {course['is_current_grade']}")
-        
-        # 更新表格
-        self.list.setRowCount(len(all_second_semester_courses))
-        
-        # 添加课程到表格和复选框
+        all_second_semester_courses = spring_semester_courses(self.all_courses)
+        
         from main_enhanced import user_data
         selected_names = set()
         for c in user_data.get("compulsory_courses", []):
@@ -391,101 +250,50 @@ class CompulsoryChooseUi(QtWidgets.QDialog, Ui_Dialog):
                 selected_names.add(c["name"])
             elif "课程名称" in c:
                 selected_names.add(c["课程名称"])
-        for i, course in enumerate(all_second_semester_courses):
-            try:
-                # 表格项
-                name_item = QtWidgets.QTableWidgetItem(course['name'])
-                credit_item = QtWidgets.QTableWidgetItem(str(course['credit']))
-                grade_item = QtWidgets.QTableWidgetItem(course['grade'])
-                # 如果是当前年级的课程，高亮显示
-                if course['is_current_grade']:
-                    name_item.setBackground(QtGui.QColor(173, 216, 230))  # 淡蓝色
-                    credit_item.setBackground(QtGui.QColor(173, 216, 230))
-                    grade_item.setBackground(QtGui.QColor(173, 216, 230))
-                self.list.setItem(i, 0, name_item)
-                self.list.setItem(i, 1, credit_item)
-                self.list.setItem(i, 2, grade_item)
-                # 创建对应的复选框
-                checkbox = QtWidgets.QCheckBox(self.scrollWidget)
-                checkbox.setText(f"{course['name']} ({course['credit']}分)")
-                checkbox.setStyleSheet(UI_CONFIG['component_styles']['checkbox'])
-                # 优先根据user_data恢复勾选
-                if course['name'] in selected_names:
-                    checkbox.setChecked(True)
-                    checkbox.setStyleSheet(UI_CONFIG['component_styles']['checkbox'] + """
-                        QCheckBox {
-                            font-weight: bold;
-                            color: #2196F3;
-                            background-color: #E3F2FD;
-                            padding: 2px;
-                            border-radius: 4px;
-                        }
-                    """)
-                elif course['is_current_grade']:
-                    print(f"自动勾选课程: {course['name']}")
-                    checkbox.setChecked(True)
-                    checkbox.setStyleSheet(UI_CONFIG['component_styles']['checkbox'] + """
-                        QCheckBox {
-                            font-weight: bold;
-                            color: #2196F3;
-                            background-color: #E3F2FD;
-                            padding: 2px;
-                            border-radius: 4px;
-                        }
-                    """)
-                else:
-                    checkbox.setChecked(False)
-                    checkbox.setStyleSheet(UI_CONFIG['component_styles']['checkbox'])
-                checkbox.stateChanged.connect(self.update_credits)
-                self.checkboxes.append(checkbox)
-                self.verticalLayout.addWidget(checkbox)
-            except Exception as e:
-                print(f"添加课程到界面失败: {course['name']} - {e}")
-                continue
-        
-        # 调整表格列宽
-        self.list.resizeColumnsToContents()
+        self.current_grade_rows = [row for row, course in enumerate(all_second_semester_courses)
+                                   if course['is_current_grade']]
+        # 优先根据user_data恢复勾选，当前年级的课程自动勾选并高亮
+        self.course_model.set_courses(
+            all_second_semester_courses,
+            checked=[course['name'] in selected_names or course['is_current_grade']
+                     for course in all_second_semester_courses],
+            highlight=['current' if course['is_current_grade'] else None
+                       for course in all_second_semester_courses])
         
         # 更新学分显示
         self.update_credits()
     
-    def update_credits(self):
-        """更新学分显示"""
-        total_credits = 0
-        selected_count = 0
-        
-        # 获取所有下学期课程
-        all_second_semester_courses = []
-        for course in self.all_courses:
-            course_semester = course['grade']
-            if (any(semester in course_semester for semester in ["一下", "二下", "三下", "四下"]) or
-                any(f"{semester}/下" in course_semester for semester in ["一", "二", "三", "四"])):
-                all_second_semester_courses.append(course)
-        
-        # 确保复选框和课程列表长度匹配
-        if len(self.checkboxes) != len(all_second_semester_courses):
-            print(f"警告：复选框数量 ({len(self.checkboxes)}) 与课程数量 ({len(all_second_semester_courses)}) 不匹配")
+    def refresh(self, grade=None, major=None):
+        """界面再次显示前调用：年级或专业变了才重新加载课程，否则保留列表和勾选"""
+        self.show_course_selection()
+        grade, major = compulsory_grade(grade), major or "通班"
+        if (grade, major) == (self.grade, self.major):
             return
-        
-        # 计算已选课程的总学分
-        for i, checkbox in enumerate(self.checkboxes):
-            if checkbox.isChecked():
-                try:
-                    total_credits += all_second_semester_courses[i]['credit']
-                    selected_count += 1
-                except (IndexError, KeyError) as e:
-                    print(f"错误：获取课程学分失败 - {e}")
-                    continue
-        
-        # 更新显示
-        self.all_points.display(total_credits)
-        self.label.setText(f"已选学分 ({selected_count}门)")
+        self.grade, self.major = grade, major
+        self.load_all_courses()
+
+    def select_current_grade(self):
+        """勾选全部当前年级的课程（一次批量更新）"""
+        self.course_model.set_rows_checked(self.current_grade_rows)
+    
+    def update_credits(self):
+        """更新学分显示（合计随勾选增减，不重新遍历课程）"""
+        totals = self.course_model.totals
+        self.all_points.display(totals.credits)
+        self.label.setText(f"已选学分 ({totals.count}门)")
+        # 按学期的合计
+        self.all_points.setToolTip(totals.describe())
     
+    def save_draft(self):
+        """勾选变化时自动保存当前的选择（防抖，稍后在后台写文件）"""
+        from main_enhanced import save_session
+        save_session('compulsory', compulsory_courses=[
+            selection_record(course) for course in self.course_model.checked_courses()])
+
     def show_teacher_recommendations(self):
         """显示教师推荐"""
         # 隐藏选课界面
         self.list.hide()
-        self.layoutWidget.hide()
         self.pushButton_5.hide()  # 隐藏标题
         
         # 确保推荐界面在最上层并显示
@@ -583,7 +391,6 @@ class CompulsoryChooseUi(QtWidgets.QDialog, Ui_Dialog):
         """返回课程选择界面"""
         self.recommendation_group.hide()
         self.list.show()
-        self.layoutWidget.show()
         self.pushButton_5.show()  # 显示标题
 
     def confirm_selection(self):
@@ -597,31 +404,22 @@ class CompulsoryChooseUi(QtWidgets.QDialog, Ui_Dialog):
             )
             return
         
-        # 显示教师推荐
+        # 显示教师推荐（"选择性必修课"按钮在 setupUi 中已连接到 go_to_elective_courses）
         self.show_teacher_recommendations()
-        
-        # 添加一个确认按钮点击事件，用于跳转到选择性必修课
-        self.next_to_elective.clicked.connect(self.go_to_elective_courses)
     
     def get_selected_courses(self):
         """获取选中的课程"""
-        selected_courses = []
-        all_second_semester_courses = [course for course in self.all_courses 
-                                    if any(semester in course['grade'] for semester in ["一下", "二下", "三下", "四下"]) or
-                                    any(f"{semester}/下" in course['grade'] for semester in ["一", "二", "三", "四"])]
-        
-        for i, checkbox in enumerate(self.checkboxes):
-            if checkbox.isChecked():
-                course = all_second_semester_courses[i]
-                selected_courses.append({
-                    '课程名称': course['name'],
-                    '学分': course['credit'],
-                    '上课时间': course.get('time', ''),
-                    '上课地点': course.get('location', ''),
-                    '教师': course.get('teacher', ''),
-                    '推荐年级': course['grade']
-                })
-        return selected_courses
+        return [
+            {
+                '课程名称': course['name'],
+                '学分': course['credit'],
+                '上课时间': course.get('time', ''),
+                '上课地点': course.get('location', ''),
+                '教师': course.get('teacher', ''),
+                '推荐年级': course['grade']
+            }
+            for course in self.course_model.checked_courses()
+        ]
     
     def go_to_elective_courses(self):
         """跳转到选择性必修课界面"""
@@ -638,15 +436,7 @@ class CompulsoryChooseUi(QtWidgets.QDialog, Ui_Dialog):
                 from main_enhanced import user_data
                 
                 # 格式化必修课数据
-                formatted_compulsory = []
-                for course in selected_compulsory:
-                    formatted_compulsory.append({
-                        'name': course.get('课程名称', ''),
-                        'credit': float(course.get('学分', 0)),
-                        'time': course.get('上课时间', ''),
-                        'location': course.get('上课地点', ''),
-                        'teacher': course.get('教师', '')
-                    })
+                formatted_compulsory = [selection_record(course) for course in selected_compulsory]
                 
                 # 保存到全局数据
                 user_data["compulsory_courses"] = formatted_compulsory
@@ -655,17 +445,21 @@ class CompulsoryChooseUi(QtWidgets.QDialog, Ui_Dialog):
                 compulsory_credits = sum(course['credit'] for course in formatted_compulsory)
                 user_data["total_credits"] = compulsory_credits
                 
-                print(f"必修课保存成功: {len(formatted_compulsory)}门课程")
-                print(f"必修课学分初始化: {compulsory_credits}")
+                logger.info("必修课保存成功: %d门课程，学分 %s", len(formatted_compulsory), compulsory_credits)
+                
+                # 记录本次选课，作为偏好模型的训练数据
+                offered = spring_semester_courses(self.all_courses)
+                log_course_selection(offered, [c['name'] for c in formatted_compulsory], '必修课',
+                                     grade=self.grade, major=self.major)
                 
             except Exception as e:
-                print(f"保存必修课数据失败: {e}")
+                logger.error("保存必修课数据失败: %s", e)
             
             # 设置结果代码，表示需要跳转到选择性必修课
             self.done(QtWidgets.QDialog.Accepted + 1)  # 使用特殊的结果代码
             
         except Exception as e:
-            print(f"跳转到选择性必修课失败: {e}")
+            logger.error("跳转到选择性必修课失败: %s", e)
             QtWidgets.QMessageBox.warning(
                 self,
                 "错误",
@@ -133,18 +133,18 @@ UI_CONFIG = {
             }
         """,
         'table': """
-            QTableWidget {
+            QTableView {
                 background-color: #ffffff;
                 border: 2px solid #000000;
                 border-radius: 10px;
                 font-family: '楷体';
                 font-size: 14px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 border-bottom: 1px solid #eeeeee;
                 padding: 8px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #2196F3;
                 color: white;
             }
@@ -259,6 +259,24 @@ UI_CONFIG = {
                 background-color: #ffffff;
             }
         """,
+    },
+
+    # 课程列表（course_list_view.py）
+    'course_list': {
+        # 固定行高（像素），所有行等高，滚动时只绘制可见行
+        'row_height': 32,
+        # 按内容调整列宽时最多取样的行数
+        'resize_sample_rows': 200,
+        # 行高亮类别 -> 背景色
+        'highlight_colors': {
+            'current': '#ADD8E6',      # 当前年级的课程
+            'recommended': '#90EE90',  # 推荐（与已选课程不冲突）
+            'conflict': '#FFB6C1'      # 与已选课程时间冲突
+        },
+        # 已勾选行的文字颜色（加粗显示）
+        'checked_color': '#2196F3',
+        # 列表旁的推荐信息中逐门列出的课程数上限（其余只计数，完整列表在课程列表中）
+        'summary_limit': 20
     }
 }
 
@@ -270,6 +288,8 @@ APP_CONFIG = {
     'high_dpi_enabled': True,
     'debug_mode': False,
     'auto_save': True,
+    # 自动保存的防抖间隔（秒）：停止修改这么久之后才写会话文件
+    'auto_save_delay': 0.5,
     'language': 'zh_CN'
 }
 
@@ -286,6 +306,103 @@ COURSE_CONFIG = {
     }
 }
 
+# 课表导出配置（core/schedule_export.py）
+EXPORT_CONFIG = {
+    # 第1周周一（2025春季学期）
+    'semester_start': '2025-02-17',
+    # 课程没有起止周信息时按 1..weeks 周展开
+    'weeks': 16,
+    # 每天12节课的起止时间
+    'period_times': [
+        ('08:00', '08:50'), ('09:00', '09:50'), ('10:10', '11:00'), ('11:10', '12:00'),
+        ('13:00', '13:50'), ('14:00', '14:50'), ('15:10', '16:00'), ('16:10', '17:00'),
+        ('17:10', '18:00'), ('18:40', '19:30'), ('19:40', '20:30'), ('20:40', '21:30')
+    ],
+    # 批量导出默认的格式
+    'default_formats': ('html', 'ics', 'xlsx')
+}
+
+# 服务模式配置（start_system.py --serve）
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    # 同时处理请求的工作线程数
+    'workers': 8,
+    # 工作线程全忙时最多排队的连接数，超出后直接返回503
+    'queue_size': 64,
+    # 单个请求的超时（秒）：读取请求和计算结果各自不超过该时间
+    'request_timeout': 10,
+    # 请求体大小上限（字节）
+    'max_body_bytes': 1 << 20
+}
+
+# 日志配置（core/logging_setup.py），级别由 APP_CONFIG['debug_mode'] 决定
+LOGGING_CONFIG = {
+    'format': '%(asctime)s %(levelname)s %(name)s: %(message)s',
+    # 单独设置的模块日志级别
+    'module_levels': {
+        'urllib3': 'WARNING',
+        'PyQt5': 'WARNING'
+    },
+    # 同一位置的日志在 rate_window 秒内最多输出 rate_burst 条（0 表示不限流）
+    'rate_burst': 20,
+    'rate_window': 1.0
+}
+
+# 性能埋点配置（core/instrumentation.py），环境变量 COURSE_PERF=1 也可打开
+PERF_CONFIG = {
+    'enabled': False,
+    # 快照文件（在缓存目录下）
+    'snapshot_file': 'perf_snapshot.json',
+    # 打开埋点时，程序退出前写出一次快照
+    'write_on_exit': True
+}
+
+# 缓存与模型文件配置
+CACHE_CONFIG = {
+    # 缓存目录（课程目录缓存、索引、模型等都放在这里）
+    'cache_dir': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache'),
+    # 选课偏好模型权重
+    'preference_model_file': 'preference_model.npz',
+    # 选课记录（用于训练偏好模型）
+    'selection_log_file': 'selection_log.jsonl',
+    # 兴趣匹配的字符n-gram TF-IDF索引
+    'interest_index_file': 'interest_index.npz',
+    # 课程目录缓存（课程示例数据等）
+    'catalog_cache_file': 'catalog.json',
+    # 选课进度（APP_CONFIG['auto_save'] 开启时自动保存，下次启动可直接恢复）
+    'session_file': 'session.json'
+}
+
+# 数据文件目录（课表、评分表、图片等），可用环境变量 COURSE_RES_DIR 指向其他目录（如合成数据）
+RES_DIR = os.environ.get('COURSE_RES_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'res')
+
+def get_resource_path(filename: str) -> str:
+    """
+    获取数据文件目录下文件的完整路径
+
+    Args:
+        filename: 文件名
+
+    Returns:
+        完整路径
+    """
+    return os.path.join(RES_DIR, filename)
+
+def get_cache_path(filename: str) -> str:
+    """
+    获取缓存目录下文件的完整路径（目录不存在时自动创建）
+
+    Args:
+        filename: 文件名
+
+    Returns:
+        完整路径
+    """
+    cache_dir = CACHE_CONFIG['cache_dir']
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, filename)
+
 def get_api_key(service_name: str) -> str:
     """
     获取指定服务的API密钥
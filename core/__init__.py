@@ -0,0 +1,27 @@
+"""
+选课系统核心逻辑（不依赖 PyQt5）
+
+    course_names        课程名称规范化与匹配
+    course_catalog      课程目录缓存（示例时间、地点、教师）
+    extract_courses     读取课表与专业课表，按年级/专业提取课程
+    course_selection    各选课界面的课程列表加载与筛选、已选学分合计
+    course_scheduler    时间解析、冲突检查与排课
+    conflict_index      选课界面的实时冲突（时间位掩码与冲突邻接表）
+    catalog_index       全部课程的检索索引（倒排索引、时间位掩码数组）
+    degree_planner      多学期培养方案规划
+    course_rating       课程评分与教师推荐
+    teacher_recommender 按课程列出任课教师的评分
+    interest_matcher    兴趣与课程名称匹配
+    ai_recommender      课程推荐打分
+    preference_model    选课偏好模型
+    llm_integration     大语言模型评估
+    html_report         HTML 课表与评估报告（共用样式、预编译模板、批量导出）
+    schedule_export     课表导出为 iCalendar、XLSX，多名学生逐个写入一个 zip
+    session_store       选课进度的自动保存与恢复（防抖、原子写入）
+    instrumentation     性能埋点（计时、计数、直方图）
+    logging_setup       日志级别与限流
+
+界面模块（*.py 对话框）只负责显示，从这里取数据；批量排课等无界面入口直接使用本包。
+本包的 __init__ 不导入任何子模块；排课与推荐模块不导入 pandas，评分表和 API 调用
+用到的 pandas、requests 在第一次读表或调用时才导入，以保持启动开销最小。
+"""
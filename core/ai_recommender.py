@@ -0,0 +1,340 @@
+import numpy as np
+from typing import List, Dict, Tuple, Iterator
+import heapq
+from dataclasses import dataclass
+from .course_scheduler import Course, CourseScheduler
+from .course_rating import course_rating_manager
+from .interest_matcher import get_interest_index, INTEREST_MATCH_THRESHOLD
+from . import instrumentation
+
+# 特征矩阵的列
+FEATURE_COLUMNS = ('workload', 'content_score', 'review_count',
+                   'slot_usage', 'is_general', 'interest_match', 'interest_relevance')
+
+# 时间槽网格：周一到周日 × 第1-12节
+SLOT_GRID_DAYS = 7
+SLOT_GRID_SLOTS = 12
+SLOT_GRID_SIZE = SLOT_GRID_DAYS * SLOT_GRID_SLOTS
+
+def slot_index(day: int, slot: int) -> int:
+    """(星期几, 第几节) 在时间槽网格中的下标"""
+    return (day - 1) * SLOT_GRID_SLOTS + (slot - 1)
+
+def build_slot_matrix(courses: List[Course]) -> np.ndarray:
+    """构建课程-时间槽占用矩阵，形状为 (课程数, SLOT_GRID_SIZE)"""
+    matrix = np.zeros((len(courses), SLOT_GRID_SIZE), dtype=bool)
+    for i, course in enumerate(courses):
+        for time_slot in course.time_slots:
+            if not 1 <= time_slot.day <= SLOT_GRID_DAYS:
+                continue
+            start = max(time_slot.start_slot, 1)
+            end = min(time_slot.end_slot, SLOT_GRID_SLOTS)
+            if start <= end:
+                matrix[i, slot_index(time_slot.day, start):slot_index(time_slot.day, end) + 1] = True
+    return matrix
+
+@dataclass
+class StudentProfile:
+    """学生画像"""
+    age: str  # 年级
+    major: str  # 专业
+    interests: List[str]  # 兴趣领域
+    preferred_workload: str  # 期望工作量：'low', 'medium', 'high'
+    preferred_assessment: str  # 期望考核方式：'exam', 'project', 'mixed'
+    preferred_teaching_style: str  # 期望教学风格：'theoretical', 'practical', 'balanced'
+
+# 打分分量：在特征矩阵基础上按学生偏好展开，打分 = 分量 @ 权重
+SCORE_COMPONENTS = ('workload_fit', 'content', 'reviews', 'slot_usage',
+                    'general', 'general_interest', 'non_general')
+
+# 手工设定的权重：工作量30分、内容20分、评价数量10分、时间20分、课程类型10/20/15分
+HEURISTIC_WEIGHTS = np.array([30.0, 20.0, 10.0, 20.0, 10.0, 20.0, 15.0])
+
+def score_components(features: np.ndarray, preferred_workload: str) -> np.ndarray:
+    """把特征矩阵展开为打分分量，每个分量取值在 0-1 之间"""
+    workload = features[:, 0]
+    is_general = features[:, 4].astype(bool)
+    interest_match = features[:, 5].astype(bool)
+    
+    # 工作量匹配度
+    if preferred_workload == 'low':
+        workload_fit = np.maximum(0, 1 - workload / 100)
+    elif preferred_workload == 'medium':
+        workload_fit = 1 - np.abs(50 - workload) / 100
+    else:  # high
+        workload_fit = np.minimum(1, workload / 100)
+    
+    return np.column_stack([
+        workload_fit,
+        features[:, 1] / 10,
+        np.minimum(1, features[:, 2] / 100),
+        features[:, 3],
+        is_general & ~interest_match,
+        is_general & interest_match,
+        ~is_general
+    ]).astype(float)
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """返回得分最高的 k 个下标（按得分降序，同分按下标升序）
+
+    用 np.partition 找出第 k 名的分数线，只对入选的 k 个元素排序。
+    """
+    n = len(scores)
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+    
+    neg = -scores
+    threshold = np.partition(neg, k - 1)[k - 1]
+    above = np.flatnonzero(neg < threshold)
+    ties = np.flatnonzero(neg == threshold)[:k - len(above)]
+    chosen = np.sort(np.concatenate([above, ties]))
+    return chosen[np.argsort(neg[chosen], kind='stable')]
+
+class AIRecommender:
+    """AI课程推荐器"""
+    
+    def __init__(self, scheduler: CourseScheduler, preference_model=None):
+        self.scheduler = scheduler
+        self.student_profile = None
+        # 离线训练的偏好模型（见 preference_model.py），为None时使用手工权重
+        self.preference_model = preference_model
+    
+    def set_student_profile(self, profile: StudentProfile):
+        """设置学生画像"""
+        self.student_profile = profile
+    
+    def get_course_features(self, course: Course) -> Dict:
+        """获取课程特征"""
+        table = course_rating_manager.get_course_feature_table()
+        rating_name = course_rating_manager.resolve_course_name(course.name)
+        if rating_name not in table.index:
+            return {
+                'workload_score': 0,
+                'content_score': 0,
+                'assessment_score': 0,
+                'teaching_score': 0,
+                'review_count': 0
+            }
+        
+        row = table.loc[rating_name]
+        return {
+            'workload_score': float(row['workload']),
+            'content_score': float(row['content_score']),
+            'assessment_score': float(row['assessment']),
+            'review_count': float(row['review_count'])
+        }
+    
+    def build_feature_matrix(self, courses: List[Course]) -> Tuple[np.ndarray, np.ndarray]:
+        """一次性构建全部候选课程的特征矩阵
+        
+        Returns:
+            (features, interest_index)
+            features: (n, len(FEATURE_COLUMNS)) 的矩阵，列含义见 FEATURE_COLUMNS
+            interest_index: 每门课最相关的兴趣在 student_profile.interests 中的下标，未达到匹配阈值为 -1
+        """
+        n = len(courses)
+        features = np.zeros((n, len(FEATURE_COLUMNS)))
+        interest_index = np.full(n, -1, dtype=int)
+        if n == 0:
+            return features, interest_index
+        
+        # 1. 评分特征：按课程名整体对齐评分汇总表
+        table = course_rating_manager.get_course_feature_table()
+        names = [course.name for course in courses]
+        rating_names = [course_rating_manager.resolve_course_name(name) for name in names]
+        rating_features = table.reindex(rating_names)[['workload', 'content_score', 'review_count']]
+        features[:, :3] = rating_features.fillna(0).to_numpy(dtype=float)
+        
+        # 2. 时间槽利用率：课程占用矩阵与当前空闲时间槽做一次矩阵运算
+        slot_matrix = build_slot_matrix(courses)
+        free = np.zeros(SLOT_GRID_SIZE, dtype=bool)
+        for day, slot in self.scheduler.get_available_slots():
+            free[slot_index(day, slot)] = True
+        slot_counts = slot_matrix.sum(axis=1)
+        free_counts = (slot_matrix & free).sum(axis=1)
+        features[:, 3] = np.divide(free_counts, slot_counts,
+                                   out=np.zeros(n), where=slot_counts > 0)
+        
+        # 3. 课程类型与兴趣相关度：字符n-gram TF-IDF索引上一次算出全部课程×全部兴趣
+        features[:, 4] = [course.course_type == '通识课' for course in courses]
+        interests = self.student_profile.interests
+        if interests:
+            relevance = get_interest_index().relevance(names, interests)
+            best = relevance.argmax(axis=1)
+            best_relevance = relevance[np.arange(n), best]
+            matched = (features[:, 4] == 1) & (best_relevance >= INTEREST_MATCH_THRESHOLD)
+            features[:, 5] = matched
+            features[:, 6] = best_relevance
+            interest_index[matched] = best[matched]
+        
+        return features, interest_index
+    
+    def score_feature_matrix(self, features: np.ndarray) -> np.ndarray:
+        """对特征矩阵整体打分
+        
+        设置了偏好模型时使用模型权重，否则使用手工设定的 HEURISTIC_WEIGHTS。
+        """
+        components = score_components(features, self.student_profile.preferred_workload)
+        if self.preference_model is not None:
+            return self.preference_model.score_components(components)
+        return components @ HEURISTIC_WEIGHTS
+    
+    @instrumentation.timed('recommender.score_courses')
+    def score_courses(self, courses: List[Course]) -> np.ndarray:
+        """批量计算课程与学生画像的匹配分数"""
+        if not self.student_profile:
+            return np.zeros(len(courses))
+        features, _ = self.build_feature_matrix(courses)
+        return self.score_feature_matrix(features)
+    
+    def calculate_course_score(self, course: Course) -> float:
+        """计算课程与学生画像的匹配分数"""
+        if not self.student_profile:
+            return 0
+        return float(self.score_courses([course])[0])
+    
+    def recommend_courses(self, 
+                        available_courses: List[Course],
+                        top_k: int = 5,
+                        min_credits: float = 0) -> List[Dict]:
+        """推荐课程
+        
+        Args:
+            available_courses: 可选课程列表
+            top_k: 推荐课程数量
+            min_credits: 最小学分要求
+        
+        Returns:
+            推荐课程列表，每个元素包含课程信息和推荐理由
+        """
+        return list(self.iter_recommendations(available_courses, top_k, min_credits))
+    
+    def iter_recommendations(self,
+                             available_courses: List[Course],
+                             top_k: int = None,
+                             min_credits: float = 0) -> Iterator[Dict]:
+        """按推荐顺序逐条产出推荐结果
+        
+        给出 top_k 时只对前 top_k 名做部分选择；否则建堆后按需弹出。
+        推荐理由在产出时才生成，界面可以先显示前几条再继续取。
+        同分课程按 available_courses 中的先后顺序排列。
+        """
+        if not self.student_profile:
+            return
+        
+        # 剔除与已选课程时间冲突的课程
+        candidates = [course for course in available_courses
+                      if not self.scheduler.check_conflicts(course)]
+        if not candidates:
+            return
+        
+        # 整体计算特征与得分，推荐理由直接复用同一份特征
+        features, interest_index = self.build_feature_matrix(candidates)
+        scores = self.score_feature_matrix(features)
+        
+        if top_k:
+            ranked = iter(top_k_indices(scores, top_k))
+        else:
+            heap = [(-score, index) for index, score in enumerate(scores.tolist())]
+            heapq.heapify(heap)
+            ranked = (heapq.heappop(heap)[1] for _ in range(len(heap)))
+        
+        count = 0
+        current_credits = 0
+        for idx in ranked:
+            if top_k and count >= top_k:
+                break
+            
+            if min_credits and current_credits >= min_credits:
+                break
+            
+            course = candidates[idx]
+            yield {
+                'course': course,
+                'score': float(scores[idx]),
+                'reasons': self._build_reasons(features[idx], interest_index[idx])
+            }
+            count += 1
+            current_credits += course.credit
+    
+    def _build_reasons(self, feature_row: np.ndarray, interest_idx: int) -> List[str]:
+        """根据已计算的特征生成推荐理由"""
+        reasons = []
+        
+        # 工作量匹配
+        workload = feature_row[0]
+        if workload < 30:
+            workload_desc = "较轻"
+        elif workload < 70:
+            workload_desc = "适中"
+        else:
+            workload_desc = "较重"
+        
+        if self.student_profile.preferred_workload == 'low' and workload < 30:
+            reasons.append(f"课程工作量{workload_desc}，符合你的学习节奏")
+        elif self.student_profile.preferred_workload == 'medium' and 30 <= workload <= 70:
+            reasons.append(f"课程工作量{workload_desc}，适合你的学习计划")
+        elif self.student_profile.preferred_workload == 'high' and workload > 70:
+            reasons.append(f"课程工作量{workload_desc}，能够充分投入学习")
+        
+        # 内容评分
+        if feature_row[1] >= 8:
+            reasons.append("课程内容评分优秀，教学质量有保障")
+        elif feature_row[1] >= 7:
+            reasons.append("课程内容评分良好，值得选择")
+        
+        # 时间安排
+        if feature_row[3] > 0.8:
+            reasons.append("课程时间安排合理，不会与其他课程冲突")
+        
+        # 兴趣匹配
+        if interest_idx >= 0:
+            interest = self.student_profile.interests[interest_idx]
+            reasons.append(f"课程内容与你的{interest}兴趣相关")
+        
+        return reasons
+    
+    def get_workload_analysis(self, courses: List[Course]) -> Dict:
+        """分析课程组合的工作量"""
+        if not courses:
+            return {
+                'total_workload': 'unknown',
+                'description': '暂无课程工作量信息',
+                'distribution': {}
+            }
+        
+        # 收集每门课的工作量信息
+        workloads = []
+        distribution = {'low': 0, 'medium': 0, 'high': 0, 'unknown': 0}
+        
+        for course in courses:
+            workload_info = course_rating_manager.get_course_workload_info(course.name)
+            level = workload_info['workload']
+            distribution[level] += 1
+            
+            if workload_info.get('score'):
+                workloads.append(workload_info['score'])
+        
+        # 计算总体工作量
+        if workloads:
+            avg_workload = sum(workloads) / len(workloads)
+            if avg_workload >= 80:
+                total_level = 'high'
+                description = '总体工作量较大，建议合理安排时间'
+            elif avg_workload >= 50:
+                total_level = 'medium'
+                description = '总体工作量适中，比较均衡'
+            else:
+                total_level = 'low'
+                description = '总体工作量较小，可以考虑增加课程'
+        else:
+            total_level = 'unknown'
+            description = '暂无足够的工作量信息进行评估'
+        
+        return {
+            'total_workload': total_level,
+            'description': description,
+            'distribution': distribution
+        } 
\ No newline at end of file
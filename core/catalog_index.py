@@ -0,0 +1,241 @@
+"""
+全部课程的检索索引（课程浏览界面 catalog_browser.py 使用）
+索引建立一次，之后每次按键只做倒排表求交和数组运算，不再逐门课程解析、比较字符串：
+
+    名称、教师   字符二元组倒排索引：取出查询串每个二元组的行号表求交，再核对子串
+    拼音         课程名称的全拼和首字母（pypinyin），同样建倒排索引，全拼只匹配从某个音节开头的位置；
+                 未安装 pypinyin 时不支持拼音检索
+    上课时间     每个教学班占用的时间槽预先转成位掩码，存成两个 uint64 数组（共 7 × 12 位），
+                 星期、节次、与我的课表是否冲突都是整列的按位与
+    学分         numpy 数组上的区间比较
+"""
+
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import instrumentation
+from .conflict_index import time_mask
+
+logger = logging.getLogger(__name__)
+
+DAYS = 7
+PERIODS = 12
+_LOW_BITS = (1 << 64) - 1
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+
+def _grams(text: str) -> set:
+    """文本中的单字和相邻二字"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class SubstringIndex:
+    """一列文本的字符二元组倒排索引（不区分大小写），search 返回包含查询串的行号（升序）"""
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts = [text.lower() for text in texts]
+        postings: Dict[str, List[int]] = {}
+        for row, text in enumerate(self.texts):
+            for gram in _grams(text):
+                postings.setdefault(gram, []).append(row)
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    def search(self, query: str) -> np.ndarray:
+        query = query.lower()
+        if len(query) <= 1:
+            return self.postings.get(query, _EMPTY)
+        lists = sorted((self.postings.get(query[i:i + 2], _EMPTY) for i in range(len(query) - 1)), key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        if len(query) > 2 and len(rows):
+            # 含有全部二元组不等于含有查询串，逐个核对（候选行已经很少）
+            texts = self.texts
+            rows = rows[np.fromiter((query in texts[row] for row in rows), dtype=bool, count=len(rows))]
+        return rows
+
+
+class SyllableIndex(SubstringIndex):
+    """全拼的倒排索引：查询串只匹配从某个音节开头的位置（"xue" 匹配 数学 shuxue，"uxu" 不匹配）
+
+    另建一张"音节开头的单字和二字"倒排表，查询的前两个字母必须出现在音节开头，候选行因此很少。
+    """
+
+    def __init__(self, texts: Sequence[str], starts: Sequence[frozenset]):
+        super().__init__(texts)
+        self.starts = starts
+        heads: Dict[str, List[int]] = {}
+        for row, (text, positions) in enumerate(zip(self.texts, starts)):
+            grams = {text[position:position + 2] for position in positions}
+            grams.update(text[position] for position in positions)
+            for gram in grams:
+                heads.setdefault(gram, []).append(row)
+        self.heads = {gram: np.array(rows, dtype=np.int32) for gram, rows in heads.items()}
+
+    def search(self, query: str) -> np.ndarray:
+        query = query.lower()
+        head = self.heads.get(query[:2], _EMPTY)
+        if len(query) <= 2:
+            return head
+        lists = sorted([head] + [self.postings.get(query[i:i + 2], _EMPTY) for i in range(1, len(query) - 1)],
+                       key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        if len(rows):
+            texts, starts = self.texts, self.starts
+            rows = rows[np.fromiter((_starts_at_syllable(texts[row], query, starts[row]) for row in rows),
+                                    dtype=bool, count=len(rows))]
+        return rows
+
+
+def pinyin_keys(names: Iterable[str]) -> Optional[Dict[str, Tuple[str, str, frozenset]]]:
+    """课程名称 -> (全拼, 首字母, 全拼中各音节的起始位置)，只保留小写字母和数字
+
+    未安装 pypinyin 时返回 None。名称中的非汉字部分（如 "AI"）整段算一个音节。
+    """
+    try:
+        from pypinyin import lazy_pinyin
+    except ImportError:
+        logger.warning("未安装 pypinyin，课程浏览不支持拼音检索")
+        return None
+    strip = re.compile(r'[^a-z0-9]')
+    keys = {}
+    for name in set(names):
+        syllables = [syllable for syllable in (strip.sub('', part.lower()) for part in lazy_pinyin(name))
+                     if syllable]
+        starts, offset = [], 0
+        for syllable in syllables:
+            starts.append(offset)
+            offset += len(syllable)
+        keys[name] = (''.join(syllables), ''.join(syllable[0] for syllable in syllables), frozenset(starts))
+    return keys
+
+
+def _starts_at_syllable(text: str, query: str, starts: frozenset) -> bool:
+    """query 是否在 text 中某个音节开头的位置出现"""
+    position = text.find(query)
+    while position >= 0:
+        if position in starts:
+            return True
+        position = text.find(query, position + 1)
+    return False
+
+
+def slots_mask(days: Iterable[int] = (), periods: Iterable[int] = ()) -> int:
+    """所选星期（1-7）与所选节次（1-12）组成的时间槽位掩码，某一项为空表示不限"""
+    days = list(days) or range(1, DAYS + 1)
+    periods = list(periods) or range(1, PERIODS + 1)
+    mask = 0
+    for day in days:
+        for period in periods:
+            mask |= 1 << ((day - 1) * PERIODS + period - 1)
+    return mask
+
+
+class CatalogIndex:
+    """全部教学班的检索索引
+
+    courses 是 extract_courses.get_catalog_courses 的记录（课程名称、教师、学分、上课时间等），
+    search 返回满足全部条件的行号（升序），用 courses[row] 取课程。
+    """
+
+    def __init__(self, courses: List[Dict]):
+        self.courses = courses
+        names = [str(course.get('课程名称') or '') for course in courses]
+        self.names = SubstringIndex(names)
+        self.teachers = SubstringIndex([str(course.get('教师') or '') for course in courses])
+
+        keys = pinyin_keys(names)
+        self.has_pinyin = keys is not None
+        if self.has_pinyin:
+            self.pinyin = SyllableIndex([keys[name][0] for name in names], [keys[name][2] for name in names])
+            self.initials = SubstringIndex([keys[name][1] for name in names])
+
+        masks = [time_mask(course.get('上课时间')) for course in courses]
+        self.mask_low = np.array([mask & _LOW_BITS for mask in masks], dtype=np.uint64)
+        self.mask_high = np.array([mask >> 64 for mask in masks], dtype=np.uint64)
+        self.credits = np.array([float(course.get('学分') or 0) for course in courses])
+
+    def __len__(self):
+        return len(self.courses)
+
+    def match_text(self, query: str) -> np.ndarray:
+        """名称包含 query 的行；query 全是字母时也按全拼（从音节开头匹配）和首字母匹配（如 "gailv"、"glt"）"""
+        query = query.strip()
+        rows = self.names.search(query)
+        if self.has_pinyin and query.isascii() and query.isalpha():
+            rows = np.union1d(rows, np.union1d(self.pinyin.search(query), self.initials.search(query)))
+        return rows
+
+    def overlaps(self, mask: int) -> np.ndarray:
+        """每个教学班是否占用 mask 中的时间槽（布尔数组）"""
+        low = np.uint64(mask & _LOW_BITS)
+        high = np.uint64(mask >> 64)
+        return ((self.mask_low & low) | (self.mask_high & high)) != 0
+
+    def search(self, text: str = '', teacher: str = '', days: Iterable[int] = (), periods: Iterable[int] = (),
+               min_credit: float = None, max_credit: float = None, avoid_mask: int = 0) -> np.ndarray:
+        """满足全部条件的行号
+
+        Args:
+            text: 课程名称的子串，或全拼/首字母
+            teacher: 教师姓名的子串
+            days, periods: 在所选星期（1-7）的所选节次（1-12）有课，都为空时不限
+            min_credit, max_credit: 学分区间（含端点）
+            avoid_mask: 我的课表占用的时间槽（core.conflict_index.occupancy_mask），
+                        非 0 时只保留与之不冲突的教学班
+        """
+        with instrumentation.timer('catalog.search'):
+            rows = None
+            if text.strip():
+                rows = self.match_text(text)
+            if teacher.strip():
+                matched = self.teachers.search(teacher.strip())
+                rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+
+            keep = None
+            days, periods = list(days), list(periods)
+            if days or periods:
+                keep = self.overlaps(slots_mask(days, periods))
+            if avoid_mask:
+                free = ~self.overlaps(avoid_mask)
+                keep = free if keep is None else keep & free
+            if min_credit is not None:
+                in_range = self.credits >= min_credit
+                keep = in_range if keep is None else keep & in_range
+            if max_credit is not None:
+                in_range = self.credits <= max_credit
+                keep = in_range if keep is None else keep & in_range
+
+            if rows is None:
+                return np.arange(len(self.courses), dtype=np.int32) if keep is None else np.flatnonzero(keep)
+            return rows if keep is None else rows[keep[rows]]
+
+
+_index_cache: Dict[Tuple, CatalogIndex] = {}
+
+
+def get_catalog_index(path: str = None) -> CatalogIndex:
+    """课表的检索索引，文件未变化时直接返回内存中的结果"""
+    # 在这里导入：读表用到 pandas，只在第一次打开课程浏览时加载
+    from .extract_courses import file_path, get_catalog_courses
+    path = path or file_path
+    cache_key = (path, os.path.getmtime(path), os.path.getsize(path))
+    index = _index_cache.get(cache_key)
+    if index is None:
+        with instrumentation.timer('catalog.build_index'):
+            index = CatalogIndex(get_catalog_courses(path))
+        _index_cache.clear()
+        _index_cache[cache_key] = index
+    return index
@@ -0,0 +1,142 @@
+"""
+选课界面的实时时间冲突
+每门课程的上课时间只解析一次，转成位掩码（course_scheduler.slot_mask，每个 (星期, 节次) 占一位）。
+上课时间相同的课程归为一组，打开列表时预先算好组与组之间的冲突邻接表；
+勾选或取消一门课时只更新与它冲突的组的计数，得到状态变化的行，不再两两比较已选课程。
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence
+
+from .course_scheduler import TimeSlot, slot_mask
+
+# 一周 7 天 × 每天 12 节
+SLOT_BITS = 7 * 12
+
+
+@lru_cache(maxsize=4096)
+def time_mask(time_str) -> int:
+    """上课时间字符串 -> 位掩码（没有时间信息的为 0，不与任何课程冲突）"""
+    return slot_mask(TimeSlot.parse_time_str(str(time_str or '')))
+
+
+def occupancy_mask(times: Iterable) -> int:
+    """一组上课时间占用的全部时间槽"""
+    mask = 0
+    for time_str in times:
+        mask |= time_mask(time_str)
+    return mask
+
+
+class ConflictIndex:
+    """一个课程列表的冲突关系与当前选择的占用情况
+
+    fixed_mask 是之前步骤已选课程（必修课等）占用的时间槽，与之重叠的课程始终标为冲突。
+    一门课"冲突"是指：与 fixed_mask 重叠，或与当前选择中的其他课程重叠。
+    """
+
+    def __init__(self, times: Sequence, fixed_mask: int = 0):
+        self.fixed_mask = fixed_mask
+        self.masks = [time_mask(time_str) for time_str in times]
+
+        # 上课时间相同的行归为一组
+        group_ids: Dict[int, int] = {}
+        self.group_of: List[int] = []
+        self.group_rows: List[List[int]] = []
+        self.group_masks: List[int] = []
+        group_masks = self.group_masks
+        for row, mask in enumerate(self.masks):
+            group = group_ids.get(mask)
+            if group is None:
+                group = group_ids[mask] = len(group_masks)
+                group_masks.append(mask)
+                self.group_rows.append([])
+            self.group_of.append(group)
+            self.group_rows[group].append(row)
+
+        # 组邻接表：占用同一时间槽的组互相冲突（非空的组与自身冲突）
+        groups_by_bit: List[List[int]] = [[] for _ in range(SLOT_BITS)]
+        for group, mask in enumerate(group_masks):
+            for bit in _bits(mask):
+                groups_by_bit[bit].append(group)
+        self.adjacency: List[List[int]] = []
+        for mask in group_masks:
+            neighbours = set()
+            for bit in _bits(mask):
+                neighbours.update(groups_by_bit[bit])
+            self.adjacency.append(sorted(neighbours))
+        self.group_fixed = [bool(mask & fixed_mask) for mask in group_masks]
+
+        self.selected = [False] * len(self.masks)
+        # 每组：与之冲突的组中已勾选的课程数
+        self._blocked = [0] * len(group_masks)
+        # 每个时间槽被已勾选课程占用的次数
+        self._bit_counts = [0] * SLOT_BITS
+        self._overlapping_bits = 0
+
+    @property
+    def occupancy(self) -> int:
+        """当前选择占用的时间槽（不含 fixed_mask）"""
+        mask = 0
+        for bit, count in enumerate(self._bit_counts):
+            if count:
+                mask |= 1 << bit
+        return mask
+
+    def has_conflicts(self) -> bool:
+        """当前选择中是否有两门课时间重叠"""
+        return self._overlapping_bits > 0
+
+    def is_conflicting(self, row: int) -> bool:
+        group = self.group_of[row]
+        return self.group_fixed[group] or self._blocked[group] - self.selected[row] > 0
+
+    def set_fixed_mask(self, fixed_mask: int) -> List[int]:
+        """之前步骤的选择变化后更新 fixed_mask，返回冲突状态可能改变的行"""
+        if fixed_mask == self.fixed_mask:
+            return []
+        self.fixed_mask = fixed_mask
+        changed = []
+        for group, mask in enumerate(self.group_masks):
+            fixed = bool(mask & fixed_mask)
+            if fixed != self.group_fixed[group]:
+                self.group_fixed[group] = fixed
+                changed.extend(self.group_rows[group])
+        return changed
+
+    def set_selected(self, row: int, selected: bool) -> List[int]:
+        """勾选/取消一门课，返回冲突状态发生变化的行"""
+        if self.selected[row] == selected:
+            return []
+        self.selected[row] = selected
+        step = 1 if selected else -1
+        for bit in _bits(self.masks[row]):
+            before = self._bit_counts[bit]
+            self._bit_counts[bit] = before + step
+            if selected and before == 1:
+                self._overlapping_bits += 1
+            elif not selected and before == 2:
+                self._overlapping_bits -= 1
+
+        changed = []
+        for group in self.adjacency[self.group_of[row]]:
+            before = self._blocked[group]
+            after = before + step
+            self._blocked[group] = after
+            if self.group_fixed[group]:
+                continue
+            # 未勾选的行：计数在 0/1 之间变化时状态改变；已勾选的行（自身占一个）：在 1/2 之间
+            low = min(before, after)
+            if low == 0:
+                changed.extend(r for r in self.group_rows[group] if not self.selected[r] and r != row)
+            elif low == 1:
+                changed.extend(r for r in self.group_rows[group] if self.selected[r] and r != row)
+        return changed
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """位掩码中为 1 的位"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
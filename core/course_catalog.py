@@ -0,0 +1,157 @@
+"""
+课程目录缓存
+课表中缺少时间、地点或教师的课程使用示例数据补全。示例数据由课程名称的稳定摘要
+（blake2b）决定，不受 Python 每次启动随机化字符串 hash 的影响，同一门课在任何进程中
+得到相同的时间，依赖它的占用矩阵、冲突矩阵和保存的课表也就可以缓存和比较。
+全部课程的示例数据在数据文件变化时计算一次，保存在缓存目录中。
+"""
+
+import os
+import json
+import tempfile
+import hashlib
+import logging
+from typing import List, Dict, Optional
+
+from config import CACHE_CONFIG, get_cache_path, get_resource_path
+
+logger = logging.getLogger(__name__)
+
+# 缓存格式版本，示例数据的生成规则变化时递增
+CATALOG_CACHE_VERSION = 1
+
+# 课表中找不到时间等信息时使用的示例数据
+PLACEHOLDER_DAYS = ['周一', '周二', '周三', '周四', '周五']
+PLACEHOLDER_PERIODS = ['1-2节', '3-4节', '5-6节', '7-8节']
+PLACEHOLDER_LOCATIONS = ['教学楼A101', '教学楼A102', '教学楼B201', '教学楼B202', '实验楼C301']
+PLACEHOLDER_TEACHERS = ['张教授', '李教授', '王教授', '赵教授', '陈教授', '刘教授']
+
+
+def stable_digest(text: str) -> int:
+    """字符串的稳定摘要（64位无符号整数），跨进程、跨平台一致"""
+    return int.from_bytes(hashlib.blake2b(str(text).encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def placeholder_fields(course_name: str) -> Dict[str, str]:
+    """按课程名称生成示例时间、地点和教师
+
+    time/location/teacher 用于课表中完全找不到的课程，
+    numbered_location/numbered_teacher 用于课表中有该课但缺少对应字段的情况。
+    """
+    digest = stable_digest(course_name)
+    course_hash = digest % 1000
+    return {
+        'time': (PLACEHOLDER_DAYS[course_hash % len(PLACEHOLDER_DAYS)]
+                 + PLACEHOLDER_PERIODS[course_hash % len(PLACEHOLDER_PERIODS)]),
+        'location': PLACEHOLDER_LOCATIONS[course_hash % len(PLACEHOLDER_LOCATIONS)],
+        'teacher': PLACEHOLDER_TEACHERS[course_hash % len(PLACEHOLDER_TEACHERS)],
+        'numbered_location': f'教学楼{digest % 5 + 1}01',
+        'numbered_teacher': f'教师{digest % 6 + 1}',
+    }
+
+
+def catalog_files() -> List[str]:
+    """课程目录的数据文件"""
+    return [get_resource_path("北京大学2025春季课表.xlsx"),
+            get_resource_path("通班&智能专业课 表格.xlsx")]
+
+
+def source_signature(paths: List[str]) -> str:
+    """数据文件的签名（文件名、大小、修改时间），用于判断缓存是否过期"""
+    parts = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            parts.append(f"{os.path.basename(path)}:{stat.st_size}:{int(stat.st_mtime)}")
+    return '|'.join(parts)
+
+
+def _read_course_names(paths: List[str]) -> List[str]:
+    """课表和通班表中的全部课程名称（经 load_catalog_frames 读取，与选课界面共用缓存）"""
+    # 在这里导入：extract_courses 导入了本模块
+    from .extract_courses import load_catalog_frames
+    if not all(os.path.exists(path) for path in paths):
+        logger.warning("课表文件不完整，课程目录缓存为空（示例数据在用到时现算）")
+        return []
+    frames = load_catalog_frames(*paths)
+    names = []
+    for df in (frames.course_df, frames.compulsory_df):
+        if '课程名称' in df.columns:
+            names.extend(str(name).strip() for name in df['课程名称'].dropna())
+    return list(dict.fromkeys(name for name in names if name and name != 'nan'))
+
+
+class CourseCatalog:
+    """课程目录缓存：课程名称 -> 示例数据"""
+
+    def __init__(self, placeholders: Dict[str, Dict[str, str]], signature: str = ''):
+        self.placeholders = placeholders
+        self.signature = signature
+
+    def placeholder(self, course_name: str) -> Dict[str, str]:
+        """课程的示例数据，不在缓存中的课程现算并补入"""
+        fields = self.placeholders.get(course_name)
+        if fields is None:
+            fields = self.placeholders[course_name] = placeholder_fields(course_name)
+        return fields
+
+    @classmethod
+    def build(cls, names: List[str], signature: str = '') -> 'CourseCatalog':
+        return cls({name: placeholder_fields(name) for name in names}, signature)
+
+    def save(self, path: str):
+        """原子写入：先写临时文件再替换"""
+        # 临时文件名唯一，多个进程同时写同一缓存也不会互相踩
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': CATALOG_CACHE_VERSION, 'signature': self.signature,
+                           'placeholders': self.placeholders}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['CourseCatalog']:
+        """加载缓存，版本不符时返回 None"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CATALOG_CACHE_VERSION:
+            return None
+        return cls(data.get('placeholders', {}), data.get('signature', ''))
+
+
+_catalog: Optional[CourseCatalog] = None
+
+
+def get_course_catalog() -> CourseCatalog:
+    """获取课程目录缓存：优先加载缓存文件，数据文件有变化时重新计算并保存"""
+    global _catalog
+    if _catalog is not None:
+        return _catalog
+
+    paths = catalog_files()
+    signature = source_signature(paths)
+    cache_path = get_cache_path(CACHE_CONFIG['catalog_cache_file'])
+    if os.path.exists(cache_path):
+        try:
+            catalog = CourseCatalog.load(cache_path)
+            if catalog is not None and catalog.signature == signature:
+                _catalog = catalog
+                return catalog
+        except Exception as e:
+            logger.warning(f"加载课程目录缓存失败，重新计算: {e}")
+
+    _catalog = CourseCatalog.build(_read_course_names(paths), signature)
+    try:
+        _catalog.save(cache_path)
+        logger.info(f"课程目录缓存已保存: {cache_path}（{len(_catalog.placeholders)}门课程）")
+    except Exception as e:
+        logger.warning(f"保存课程目录缓存失败: {e}")
+    return _catalog
+
+
+def get_placeholder(course_name: str) -> Dict[str, str]:
+    """课程的示例时间、地点和教师（见 placeholder_fields）"""
+    return get_course_catalog().placeholder(course_name)
@@ -0,0 +1,186 @@
+"""
+课程名称规范化与匹配
+三张表（学校课表、通班专业课表、课程评分表）中的课程名称写法不完全一致：
+零宽空格、全角/半角括号、罗马数字（"线性代数A I"、"人工智能系统实践 (II)"）、简称（"微电基"）等。
+这里在读表时为每个名称计算一次规范化的连接键，建立 键 -> 行号 的哈希索引；
+精确命中失败时再查别名表，最后退回到预先建立的字符二元组倒排索引做模糊匹配。
+"""
+
+import re
+import unicodedata
+from typing import List, Dict, Tuple, Optional, Iterable
+
+# 罗马数字字符（NFKC 会把 "Ⅱ" 变成 "II"，与前面的字母粘连后无法区分，需先行替换）
+ROMAN_CHARS = {'Ⅰ': '1', 'Ⅱ': '2', 'Ⅲ': '3', 'Ⅳ': '4', 'Ⅴ': '5', 'Ⅵ': '6',
+               'ⅰ': '1', 'ⅱ': '2', 'ⅲ': '3', 'ⅳ': '4', 'ⅴ': '5', 'ⅵ': '6'}
+
+# 独立出现的罗马数字、中文序号和上/下册标记
+ROMAN_TOKENS = {'i': '1', 'ii': '2', 'iii': '3', 'iv': '4', 'v': '5', 'vi': '6',
+                '一': '1', '二': '2', '三': '3', '四': '4', '上': '1', '下': '2'}
+
+# 简称与全称的对应（两侧都按 course_key 规范化后比较）
+COURSE_NAME_ALIASES = {
+    '微电基': '微电子与电路基础',
+    '人工智能中的数学': 'AI中的数学',
+    '计概': '计算概论A',
+    '数算': '数据结构与算法(A)',
+    '算分': '算法设计与分析',
+    '程设': '程序设计实习',
+    '高数': '高等数学A',
+    '线代': '线性代数A I',
+}
+
+# 模糊匹配的最低相似度（字符二元组的 Dice 系数）
+FUZZY_MATCH_THRESHOLD = 0.85
+
+_SPACE_OR_BRACKET = re.compile(r'[\s()\[\]【】<>《》·・\-—_:：,，.。/]+')
+_LEVEL_MARKS = re.compile(r'[0-9a-z]+')
+
+
+def course_key(name) -> str:
+    """课程名称的规范化连接键
+
+    "计算概论 A" / "计算概论A"、"数据结构与算法 (A)" / "数据结构与算法（A）"、
+    "线性代数A I" / "线性代数AⅠ"、"高等数学A 下" / "高等数学A II" 得到相同的键。
+    """
+    if name is None or (isinstance(name, float) and name != name):
+        return ''
+    text = ''.join(ROMAN_CHARS.get(ch, ch) for ch in str(name))
+    text = unicodedata.normalize('NFKC', text).replace('\u200b', '').lower()
+    tokens = [token for token in _SPACE_OR_BRACKET.split(text) if token]
+    # 除首个词外，单独成词的罗马数字或上/下换成阿拉伯数字
+    tokens = tokens[:1] + [ROMAN_TOKENS.get(token, token) for token in tokens[1:]]
+    return ''.join(tokens)
+
+
+def _bigrams(key: str) -> set:
+    if len(key) < 2:
+        return {key} if key else set()
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+_ALIAS_KEYS = {course_key(alias): course_key(full) for alias, full in COURSE_NAME_ALIASES.items()}
+
+
+class CourseNameIndex:
+    """一张表的课程名称索引：规范化键 -> 行号列表，并附带模糊匹配用的二元组倒排索引"""
+
+    def __init__(self, names: Iterable):
+        self.rows: Dict[str, List[int]] = {}
+        self.names: Dict[str, str] = {}
+        for position, name in enumerate(names):
+            key = course_key(name)
+            if not key or key == 'nan':
+                continue
+            self.rows.setdefault(key, []).append(position)
+            self.names.setdefault(key, str(name).strip())
+
+        self._grams = {key: _bigrams(key) for key in self.rows}
+        self._postings: Dict[str, List[str]] = {}
+        for key, grams in self._grams.items():
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(key)
+        self._resolved: Dict[str, Tuple[Optional[str], str]] = {}
+        self._by_name: Dict[str, Optional[str]] = {}
+
+    def resolve_key(self, name) -> Optional[str]:
+        """名称对应的索引键：精确 -> 别名 -> 模糊，找不到返回 None（结果按原名称缓存）"""
+        try:
+            return self._by_name[name]
+        except (KeyError, TypeError):
+            pass
+        resolved = self._resolve_cached(course_key(name))[0]
+        if isinstance(name, str):
+            self._by_name[name] = resolved
+        return resolved
+
+    def _resolve_cached(self, key: str) -> Tuple[Optional[str], str]:
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolved[key] = self._resolve(key)
+        return resolved
+
+    def _resolve(self, key: str):
+        if not key:
+            return None, 'missing'
+        if key in self.rows:
+            return key, 'exact'
+        alias = _ALIAS_KEYS.get(key)
+        if alias in self.rows:
+            return alias, 'alias'
+        # 反向：索引中的简称对应查询的全称
+        for short, full in _ALIAS_KEYS.items():
+            if full == key and short in self.rows:
+                return short, 'alias'
+        fuzzy = self._fuzzy(key)
+        return (fuzzy, 'fuzzy') if fuzzy else (None, 'missing')
+
+    def _fuzzy(self, key: str) -> Optional[str]:
+        """二元组倒排索引取候选，Dice 系数最高且达到阈值者为匹配
+
+        两个名称都带编号或级别且不同（"实践 I" 与 "实践 II"、"计算概论A" 与 "计算概论（C）"）时
+        不视为同一门课。
+        """
+        grams = _bigrams(key)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._postings.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        marks = set(_LEVEL_MARKS.findall(key))
+        best, best_score = None, 0.0
+        for candidate, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._grams[candidate]))
+            candidate_marks = set(_LEVEL_MARKS.findall(candidate))
+            if marks and candidate_marks and marks != candidate_marks:
+                continue
+            if score > best_score:
+                best, best_score = candidate, score
+        return best if best_score >= FUZZY_MATCH_THRESHOLD else None
+
+    def lookup(self, name) -> List[int]:
+        """名称对应的行号列表，找不到时为空"""
+        key = self.resolve_key(name)
+        return self.rows.get(key, []) if key else []
+
+    def resolve_name(self, name) -> Optional[str]:
+        """名称在本表中的写法（同键的第一行），找不到返回 None"""
+        key = self.resolve_key(name)
+        return self.names.get(key) if key else None
+
+    def match_rate(self, names: Iterable) -> Dict[str, float]:
+        """一组名称在本表中的匹配情况：各类命中数和总体匹配率"""
+        counts = {'exact': 0, 'alias': 0, 'fuzzy': 0, 'missing': 0}
+        for key in dict.fromkeys(course_key(name) for name in names):
+            if key:
+                counts[self._resolve_cached(key)[1]] += 1
+        total = sum(counts.values())
+        counts['total'] = total
+        counts['rate'] = (total - counts['missing']) / total if total else 1.0
+        return counts
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    from config import get_resource_path
+
+    def read_names(filename, column):
+        df = pd.read_excel(get_resource_path(filename))
+        df.columns = df.columns.str.replace('\u200b', '').str.strip()
+        return df[column].dropna().astype(str).tolist()
+
+    timetable = read_names("北京大学2025春季课表.xlsx", '课程名称')
+    compulsory = read_names("通班&智能专业课 表格.xlsx", '课程名称')
+    ratings = read_names("课程评分.xlsx", '课程')
+
+    for title, index, names in (("通班专业课 -> 课表", CourseNameIndex(timetable), compulsory),
+                                ("课程评分 -> 课表", CourseNameIndex(timetable), ratings),
+                                ("课程评分 -> 通班专业课", CourseNameIndex(compulsory), ratings)):
+        exact_names = set(index.names.values())
+        exact_rate = sum(n.strip() in exact_names for n in set(names)) / len(set(names))
+        report = index.match_rate(names)
+        print(f"{title}: 原精确匹配率 {exact_rate:.0%}，规范化后 {report['rate']:.0%} "
+              f"(精确{report['exact']} 别名{report['alias']} 模糊{report['fuzzy']} 未匹配{report['missing']})")
+        for name in dict.fromkeys(names):
+            key = course_key(name)
+            if key not in index.rows:
+                print(f"    {name} -> {index.resolve_name(name)}")
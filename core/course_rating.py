@@ -1,7 +1,11 @@
-import pandas as pd
+import numpy as np
 import os
 import logging
 
+from config import get_resource_path
+from .course_names import CourseNameIndex
+from . import instrumentation
+
 logger = logging.getLogger(__name__)
 
 class CourseRatingManager:
@@ -9,34 +13,59 @@ class CourseRatingManager:
     
     def __init__(self, rating_file_path=None):
         if rating_file_path is None:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            self.rating_file_path = os.path.join(base_dir, "res", "课程评分.xlsx")
+            self.rating_file_path = get_resource_path("课程评分.xlsx")
         else:
             self.rating_file_path = rating_file_path
         
-        self.ratings_data = None
-        self.load_ratings()
-    
+        # 评分表在第一次使用时才读取，导入本模块不读文件
+        self._ratings_data = None
+        self._name_index = CourseNameIndex([])
+        self._feature_table = None
+
+    @property
+    def ratings_data(self):
+        if self._ratings_data is None:
+            self.load_ratings()
+        return self._ratings_data
+
+    @property
+    def name_index(self):
+        if self._ratings_data is None:
+            self.load_ratings()
+        return self._name_index
+
     def load_ratings(self):
         """加载课程评分数据"""
+        import pandas as pd
+        self._feature_table = None
         try:
             if os.path.exists(self.rating_file_path):
-                self.ratings_data = pd.read_excel(self.rating_file_path)
-                logger.info(f"成功加载课程评分数据，共{len(self.ratings_data)}条记录")
+                with instrumentation.timer('excel.read_ratings'):
+                    self._ratings_data = pd.read_excel(self.rating_file_path)
+                logger.info(f"成功加载课程评分数据，共{len(self._ratings_data)}条记录")
                 
                 # 清理列名中的特殊字符
-                self.ratings_data.columns = [col.strip().replace('\u200b', '') for col in self.ratings_data.columns]
+                self._ratings_data.columns = [col.strip().replace('\u200b', '') for col in self._ratings_data.columns]
+                
+                logger.debug("课程评分数据列名: %s", self._ratings_data.columns.tolist())
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("数据预览:\n%s", self._ratings_data.head())
                 
-                print(f"课程评分数据列名: {self.ratings_data.columns.tolist()}")
-                print(f"数据预览:\n{self.ratings_data.head()}")
+                # 课程名称索引：按规范化的名称查找，兼容简称和写法差异
+                if '课程' in self._ratings_data.columns:
+                    self._name_index = CourseNameIndex(self._ratings_data['课程'])
                 
             else:
                 logger.warning(f"课程评分文件不存在: {self.rating_file_path}")
-                self.ratings_data = pd.DataFrame()
+                self._ratings_data = pd.DataFrame()
                 
         except Exception as e:
             logger.error(f"加载课程评分数据失败: {e}")
-            self.ratings_data = pd.DataFrame()
+            self._ratings_data = pd.DataFrame()
+    
+    def resolve_course_name(self, course_name):
+        """课程在评分表中的名称，找不到返回 None"""
+        return self.name_index.resolve_name(course_name)
     
     def get_course_ratings(self, course_name):
         """获取指定课程的所有评分信息"""
@@ -45,7 +74,7 @@ class CourseRatingManager:
         
         try:
             # 查找课程
-            course_ratings = self.ratings_data[self.ratings_data['课程'] == course_name]
+            course_ratings = self.ratings_data.iloc[self.name_index.lookup(course_name)]
             
             if course_ratings.empty:
                 return []
@@ -67,9 +96,44 @@ class CourseRatingManager:
         except Exception as e:
             logger.error(f"获取课程评分失败: {e}")
             return []
-    
+
+    def get_course_feature_table(self):
+        """按课程名汇总的评分特征表（首次调用时计算并缓存）
+
+        返回以课程名为索引的DataFrame，列为workload、content_score、
+        assessment、review_count，取值为该课程各条评分中非空非零项的平均值。
+        同一课程的不同写法合并到 resolve_course_name 给出的名称下。
+        """
+        import pandas as pd
+        if self._feature_table is not None:
+            return self._feature_table
+
+        columns = {
+            '课程工作量': 'workload',
+            '课程内容 满分10分': 'content_score',
+            '课程考核': 'assessment',
+            '有效评价条数': 'review_count'
+        }
+        if (self.ratings_data is None or self.ratings_data.empty
+                or '课程' not in self.ratings_data.columns):
+            self._feature_table = pd.DataFrame(columns=list(columns.values()), dtype=float)
+            return self._feature_table
+
+        table = pd.DataFrame({'课程': self.ratings_data['课程'].map(self.resolve_course_name)})
+        for source, target in columns.items():
+            if source in self.ratings_data.columns:
+                values = pd.to_numeric(self.ratings_data[source], errors='coerce')
+                table[target] = values.where(values != 0)
+            else:
+                table[target] = np.nan
+        table = table.dropna(subset=['课程'])
+        self._feature_table = table.groupby('课程').mean().fillna(0)
+        return self._feature_table
+
+    @instrumentation.timed('rating.teacher_recommendations')
     def get_teacher_recommendations(self, course_list):
         """根据课程列表获取教师推荐"""
+        import pandas as pd
         recommendations = {}
         
         for course_name in course_list:
@@ -135,6 +199,7 @@ class CourseRatingManager:
     
     def get_course_workload_info(self, course_name):
         """获取课程工作量信息"""
+        import pandas as pd
         ratings = self.get_course_ratings(course_name)
         
         if not ratings:
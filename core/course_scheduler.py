@@ -1,8 +1,17 @@
-import pandas as pd
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Iterator, Iterable
 from dataclasses import dataclass
 from datetime import datetime, time
 import re
+import heapq
+import logging
+
+from . import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# 课表中的上课时间格式，例如 "星期一(第1节-第2节)"
+TIMETABLE_TIME_PATTERN = re.compile(r'星期([一二三四五六日天])\(第(\d+)节-第(\d+)节\)')
+TIMETABLE_DAYS = {'一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '日': 7, '天': 7}
 
 @dataclass
 class TimeSlot:
@@ -20,12 +29,17 @@ class TimeSlot:
     @classmethod
     def parse_time_str(cls, time_str: str) -> List['TimeSlot']:
         """解析课程时间字符串
-        格式: "周一1-2节,周三3-4节"
+        格式: "周一1-2节,周三3-4节"，或课表中的 "星期一(第1节-第2节) 星期三(第3节-第4节)"
         返回: [TimeSlot(1, 1, 2), TimeSlot(3, 3, 4)]
         """
         if not time_str:
             return []
         
+        # 课表格式，单双周标记忽略
+        if '星期' in time_str:
+            return [cls(TIMETABLE_DAYS[day], int(start), int(end))
+                    for day, start, end in TIMETABLE_TIME_PATTERN.findall(time_str)]
+        
         day_map = {
             '周一': 1, '周二': 2, '周三': 3,
             '周四': 4, '周五': 5, '周六': 6, '周日': 7
@@ -54,9 +68,17 @@ class TimeSlot:
             
             return slots
         except Exception as e:
-            print(f"解析课程时间出错: {e}")
+            logger.warning("解析课程时间出错: %s", e)
             return []
 
+def slot_mask(time_slots: Iterable[TimeSlot]) -> int:
+    """时间槽集合 -> 位掩码（每个 (星期, 节次) 占一位），两门课冲突当且仅当掩码相与非零"""
+    mask = 0
+    for time_slot in time_slots:
+        for slot in range(max(time_slot.start_slot, 1), min(time_slot.end_slot, 12) + 1):
+            mask |= 1 << ((time_slot.day - 1) * 12 + slot - 1)
+    return mask
+
 @dataclass
 class Course:
     """课程信息"""
@@ -136,12 +158,51 @@ class CourseScheduler:
         Returns:
             推荐的课程列表
         """
+        return list(self.iter_recommended_courses(min_credits, max_courses, preferred_days))
+    
+    def iter_recommended_courses(self,
+                                 min_credits: float = 0,
+                                 max_courses: int = None,
+                                 preferred_days: List[int] = None) -> Iterator[Course]:
+        """按推荐顺序逐门产出不冲突的课程
+        
+        只给出 max_courses 时用 heapq.nsmallest 做部分选择；否则建堆后按需弹出，
+        调用方取到足够的课程即可停止迭代，不必对全部候选排序。
+        同分课程按加入可选列表的先后顺序排列。
+        """
+        # (-评分, 原始下标) 作为排序键，下标唯一，不会比较到 Course 对象
+        keyed = [(-score, index) for index, score in self._score_available_courses(preferred_days)]
+        
+        if max_courses:
+            ranked = iter(heapq.nsmallest(max_courses, keyed))
+        else:
+            heapq.heapify(keyed)
+            ranked = (heapq.heappop(keyed) for _ in range(len(keyed)))
+        
+        count = 0
+        current_credits = 0
+        for _, index in ranked:
+            # 检查是否达到最大课程数
+            if max_courses and count >= max_courses:
+                break
+            
+            # 检查是否达到最小学分
+            if min_credits and current_credits >= min_credits:
+                break
+            
+            course = self.available_courses[index]
+            yield course
+            count += 1
+            current_credits += course.credit
+    
+    @instrumentation.timed('scheduler.score_available')
+    def _score_available_courses(self, preferred_days: List[int] = None) -> List[Tuple[int, float]]:
+        """为所有不冲突的可选课程评分，返回 [(下标, 评分), ...]"""
         # 获取可用时间槽
         available_slots = self.get_available_slots()
         
-        # 对可选课程进行评分
-        scored_courses = []
-        for course in self.available_courses:
+        scored = []
+        for index, course in enumerate(self.available_courses):
             # 检查是否有时间冲突
             if self.check_conflicts(course):
                 continue
@@ -157,7 +218,8 @@ class CourseScheduler:
                           for slot in course.time_slots
                           for s in range(slot.start_slot, slot.end_slot + 1)}
             available_course_slots = course_slots & available_slots
-            slot_usage = len(available_course_slots) / len(course_slots)
+            # 没有解析出上课时间的课程利用率按 0 计（与 build_feature_matrix 一致）
+            slot_usage = len(available_course_slots) / len(course_slots) if course_slots else 0.0
             score += slot_usage * 20
             
             # 3. 优先日期加分
@@ -166,45 +228,32 @@ class CourseScheduler:
                                         if slot.day in preferred_days)
                 score += preferred_slot_count * 5
             
-            scored_courses.append((score, course))
-        
-        # 按评分排序
-        scored_courses.sort(reverse=True)
+            scored.append((index, score))
         
-        # 选择最佳课程组合
-        recommended = []
-        current_credits = 0
-        
-        for _, course in scored_courses:
-            # 检查是否达到最大课程数
-            if max_courses and len(recommended) >= max_courses:
-                break
-            
-            # 检查是否达到最小学分
-            if min_credits and current_credits >= min_credits:
-                break
-            
-            # 添加课程
-            recommended.append(course)
-            current_credits += course.credit
-        
-        return recommended
+        return scored
     
+    def get_schedule_grid(self, days: int = 5) -> List[List[List[int]]]:
+        """生成课程表网格
+        返回: 12×days 的网格，每格是占用该节的课程在 selected_courses 中的下标（按加入顺序），
+        有多个下标即这些课程时间重叠
+        """
+        grid = [[[] for _ in range(days)] for _ in range(12)]
+        for index, course in enumerate(self.selected_courses):
+            for time_slot in course.time_slots:
+                if 1 <= time_slot.day <= days:  # 默认只处理周一到周五
+                    for slot in range(max(time_slot.start_slot, 1) - 1, min(time_slot.end_slot, 12)):
+                        cell = grid[slot][time_slot.day - 1]
+                        # 同一门课的两个时间段重叠时只记一次
+                        if not cell or cell[-1] != index:
+                            cell.append(index)
+        return grid
+
     def get_schedule_matrix(self) -> List[List[str]]:
         """生成课程表矩阵
-        返回: 12x5的矩阵，表示周一到周五每节课的课程名称
+        返回: 12x5的矩阵，表示周一到周五每节课的课程名称（时间重叠的课程用"/"连接）
         """
-        # 初始化空课表
-        schedule = [['' for _ in range(5)] for _ in range(12)]
-        
-        # 填充课程
-        for course in self.selected_courses:
-            for time_slot in course.time_slots:
-                if 1 <= time_slot.day <= 5:  # 只处理周一到周五
-                    for slot in range(time_slot.start_slot - 1, time_slot.end_slot):
-                        schedule[slot][time_slot.day - 1] = course.name
-        
-        return schedule
+        return [['/'.join(self.selected_courses[index].name for index in cell) for cell in row]
+                for row in self.get_schedule_grid()]
     
     @staticmethod
     def format_schedule(schedule: List[List[str]]) -> str:
@@ -226,4 +275,10 @@ def create_course_from_dict(course_dict: Dict) -> Course:
         location=course_dict.get('location', '') or course_dict.get('上课地点', ''),
         teacher=course_dict.get('teacher', '') or course_dict.get('教师', ''),
         course_type=course_dict.get('type', '') or course_dict.get('课程类型', '') or course_dict.get('course_type', '')
-    ) 
\ No newline at end of file
+    ) 
+
+
+@instrumentation.timed('parse.courses')
+def create_courses_from_dicts(course_dicts: Iterable[Dict]) -> List[Course]:
+    """批量创建课程对象（解析上课时间），埋点按批次计时而不是逐门课程"""
+    return [create_course_from_dict(course_dict) for course_dict in course_dicts]
@@ -0,0 +1,205 @@
+"""
+选课界面的课程列表
+必修课选择界面和通识课选择界面显示的课程由这里加载和筛选，界面只负责显示与勾选。
+SelectionTotals 维护勾选课程的学分合计，界面勾选时按单门课程增减。
+"""
+
+import logging
+from typing import List, Dict, Tuple
+
+from config import get_resource_path
+from .conflict_index import occupancy_mask, time_mask
+from .course_catalog import get_placeholder
+from .extract_courses import OPTIONAL_COMPULSORY_NAMES, load_catalog_frames, file_path, get_general_courses
+
+logger = logging.getLogger(__name__)
+
+# 必修课选择界面只显示春季学期（下学期）开设的课程
+SPRING_SEMESTERS = ["一下", "二下", "三下", "四下"]
+YEAR_PREFIXES = ["一", "二", "三", "四"]
+
+# 通班专业课表格读取失败时显示的示例课程
+FALLBACK_COMPULSORY_COURSES = [
+    ('计算概论A', 3, '一上'),
+    ('线性代数A I', 4, '一上'),
+    ('高等数学A I', 5, '一上'),
+    ('数据结构与算法(A)', 3, '二上'),
+    ('计算机系统导论', 5, '二上'),
+]
+
+# 课表读取失败时显示的示例通识课程
+SAMPLE_GENERAL_COURSES = [
+    {"课程名称": "大学英语", "学分": 2, "上课时间": "周一3-4节", "教师": "李教授", "类型": "语言类"},
+    {"课程名称": "中国文学经典", "学分": 3, "上课时间": "周二1-2节", "教师": "王教授", "类型": "文学类"},
+    {"课程名称": "世界历史概论", "学分": 2, "上课时间": "周三5-6节", "教师": "张教授", "类型": "历史类"},
+    {"课程名称": "艺术欣赏", "学分": 2, "上课时间": "周四7-8节", "教师": "赵教授", "类型": "艺术类"},
+    {"课程名称": "心理学导论", "学分": 3, "上课时间": "周五3-4节", "教师": "陈教授", "类型": "心理类"},
+    {"课程名称": "环境科学概论", "学分": 2, "上课时间": "周一7-8节", "教师": "刘教授", "类型": "科学类"},
+    {"课程名称": "经济学原理", "学分": 3, "上课时间": "周二5-6节", "教师": "孙教授", "类型": "经济类"},
+    {"课程名称": "哲学思想史", "学分": 2, "上课时间": "周三1-2节", "教师": "周教授", "类型": "哲学类"},
+    {"课程名称": "体育健康", "学分": 1, "上课时间": "周四3-4节", "教师": "吴教授", "类型": "体育类"},
+    {"课程名称": "音乐欣赏", "学分": 2, "上课时间": "周五1-2节", "教师": "郑教授", "类型": "艺术类"},
+    {"课程名称": "数学思维", "学分": 3, "上课时间": "周一1-2节", "教师": "马教授", "类型": "数学类"},
+    {"课程名称": "社会学概论", "学分": 2, "上课时间": "周二7-8节", "教师": "冯教授", "类型": "社会类"},
+]
+
+
+def compulsory_grade(grade: str) -> str:
+    """必修课选择使用的学期：兼容"大一""大二"（取该学年下学期）或"二下"格式"""
+    if grade in ["大一", "大二", "大三", "大四"]:
+        return f"{grade[1]}下"
+    return grade or "二下"
+
+
+def is_current_grade_course(course_semester: str, grade: str) -> bool:
+    """课程的选课时间是否与当前学期匹配（完全相同、跨学期或简写的下学期）"""
+    if not course_semester:
+        return False
+    grade_prefix = grade[0]
+    semester = "下" if grade.endswith("下") else "上"
+    patterns = [
+        grade,                                # 完全匹配（如"二下"）
+        f"{grade_prefix}上/下",               # 跨学期匹配（如"二上/下"）
+        f"{grade_prefix}/下",                 # 简写下学期（如"二/下"）
+        f"{grade_prefix}{semester}/下"        # 扩展格式
+    ]
+    return any(pattern in course_semester for pattern in patterns)
+
+
+def is_spring_semester_course(course_semester: str) -> bool:
+    """课程是否在下学期开设（包括跨学期的课程）"""
+    return (any(semester in course_semester for semester in SPRING_SEMESTERS) or
+            any(f"{prefix}/下" in course_semester for prefix in YEAR_PREFIXES))
+
+
+def load_compulsory_course_list(grade: str) -> List[Dict]:
+    """通班专业课表格中的全部必修课（不含选择性必修），标记是否属于当前学期
+
+    时间、地点、教师使用课程目录中的示例数据（由课程名称的稳定摘要决定）。
+    """
+    frames = load_catalog_frames(file_path, get_resource_path("通班&智能专业课 表格.xlsx"))
+    courses = []
+    for row in frames.compulsory_df.to_dict('records'):
+        course_name = str(row.get('课程名称', '')).strip()
+        if course_name in OPTIONAL_COMPULSORY_NAMES or not course_name or course_name == 'nan':
+            continue
+        course_semester = str(row.get('选课时间', '')).strip()
+        placeholder = get_placeholder(course_name)
+        is_current = is_current_grade_course(course_semester, grade)
+        logger.debug("课程 %s，选课时间 %s，当前学期: %s", course_name, course_semester, is_current)
+        courses.append({
+            'name': course_name,
+            'credit': row.get('学分', 2),
+            'grade': course_semester,
+            'time': placeholder['time'],
+            'location': placeholder['location'],
+            'teacher': placeholder['teacher'],
+            'is_current_grade': is_current
+        })
+    logger.info(f"加载了 {len(courses)} 门课程，当前年级课程 "
+                f"{sum(1 for c in courses if c['is_current_grade'])} 门")
+    return courses
+
+
+def fallback_compulsory_courses(grade: str) -> List[Dict]:
+    """表格读取失败时的示例必修课"""
+    return [{'name': name, 'credit': credit, 'grade': semester,
+             'is_current_grade': grade in [f"{semester[0]}上", f"{semester[0]}下"]}
+            for name, credit, semester in FALLBACK_COMPULSORY_COURSES]
+
+
+def spring_semester_courses(courses: List[Dict]) -> List[Dict]:
+    """必修课选择界面显示的课程（下学期开设的）"""
+    return [course for course in courses if is_spring_semester_course(course['grade'])]
+
+
+def load_general_courses() -> List[Dict]:
+    """通识课选择界面的课程：课表中全部通识课的教学班（读表结果有缓存），课表读取失败时用示例课程"""
+    try:
+        courses = get_general_courses(file_path)
+    except Exception as e:
+        logger.error("读取通识课失败: %s", e)
+        courses = []
+    if not courses:
+        logger.warning("未读取到通识课，使用示例课程")
+        return [dict(course, 课程类型='通识课') for course in SAMPLE_GENERAL_COURSES]
+    return courses
+
+
+def rank_general_courses(courses: List[Dict], existing_courses: List[Dict]) -> List[Dict]:
+    """标记与已选课程时间不冲突的通识课为推荐，推荐的排在前面（同组按课程名称）
+
+    已选课程占用的时间槽先合成一个位掩码，每门课只与它比较一次。
+    """
+    occupied = occupancy_mask(existing['time'] for existing in existing_courses)
+    for course in courses:
+        course['recommended'] = not time_mask(course.get('上课时间', '')) & occupied
+    return sorted(courses, key=lambda x: (not x['recommended'], x['课程名称']))
+
+
+def course_credit(value) -> float:
+    """课程学分（表格中可能是字符串或空值，无法识别时按0计）"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def selection_record(course: Dict) -> Dict:
+    """课程列表中的一行（中文列名或英文键）-> user_data 中保存的课程记录"""
+    return {
+        'name': course.get('课程名称', course.get('name', '')),
+        'credit': course_credit(course.get('学分', course.get('credit'))),
+        'time': course.get('上课时间', course.get('time', '')),
+        'location': course.get('上课地点', course.get('location', '')),
+        'teacher': course.get('教师', course.get('teacher', '')),
+    }
+
+
+def selection_signature(selection: Dict, *keys) -> Tuple:
+    """选课结果中若干字段的快照（课程只取名称和时间），界面再次显示时比较，只刷新变化的部分"""
+    return tuple(
+        tuple((course.get('name'), course.get('time')) for course in value) if isinstance(value, list) else value
+        for value in (selection.get(key) for key in keys))
+
+
+class SelectionTotals:
+    """当前选择的门数与学分合计（总计和按类型），勾选、取消一门课时 O(1) 更新
+
+    base_credits 是之前步骤已选课程的学分（打开界面时取一次），total 包含这部分。
+    """
+
+    def __init__(self, base_credits: float = 0.0):
+        self.base_credits = base_credits
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.credits = 0.0
+        # 类型 -> [门数, 学分]
+        self.by_type: Dict[str, List] = {}
+
+    def add(self, credit: float, course_type: str = ''):
+        self.count += 1
+        self.credits += credit
+        entry = self.by_type.setdefault(course_type, [0, 0.0])
+        entry[0] += 1
+        entry[1] += credit
+
+    def remove(self, credit: float, course_type: str = ''):
+        self.count -= 1
+        self.credits -= credit
+        entry = self.by_type[course_type]
+        entry[0] -= 1
+        entry[1] -= credit
+        if not entry[0]:
+            del self.by_type[course_type]
+
+    @property
+    def total(self) -> float:
+        return self.base_credits + self.credits
+
+    def describe(self) -> str:
+        """按类型列出门数和学分，每类一行"""
+        return '\n'.join(f"{course_type or '其他'}：{count}门，{credits:g}学分"
+                         for course_type, (count, credits) in sorted(self.by_type.items()))
@@ -0,0 +1,324 @@
+"""
+多学期培养方案规划
+根据学生当前年级和已修课程，把专业课表中剩余的课程排入之后的各个学期：
+每门课只放在其"选课时间"对应的学期，每学期学分不超过 COURSE_CONFIG['max_total_credits']，
+同一学期内的课程上课时间互不冲突。
+搜索以"学期 + 剩余课程集合"为状态做记忆化，完整的 8 学期规划在 1 秒内完成。
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, Iterable
+
+import numpy as np
+import pandas as pd
+
+from config import COURSE_CONFIG, get_resource_path
+from .course_scheduler import Course, CourseScheduler, slot_mask
+from .course_names import CourseNameIndex
+from .extract_courses import load_catalog_frames
+
+logger = logging.getLogger(__name__)
+
+# 八个学期，下标 0-7
+SEMESTERS = ('一上', '一下', '二上', '二下', '三上', '三下', '四上', '四下')
+YEARS = '一二三四'
+SEMESTER_INDEX = {name: i for i, name in enumerate(SEMESTERS)}
+
+# 每学期最多参与枚举的课程数，超出时按紧迫程度截取（防止组合爆炸）
+MAX_TERM_CANDIDATES = 16
+
+# 每学期学分超限时最多保留的候选组合数，以及枚举时最多检查的组合数
+MAX_TERM_CHOICES = 6
+MAX_TERM_LEAVES = 2048
+
+
+def parse_semester_tokens(text) -> Tuple[int, ...]:
+    """解析"选课时间"为学期下标
+
+    支持 "一上"、"二上/三上"、"三上/下"（三上或三下）、"二/三上"（二上或三上）、
+    "二年级"（二上或二下）等写法，无法识别时返回空元组。
+    """
+    text = str(text or '').replace('\u200b', '').replace(' ', '').strip()
+    if not text or text == 'nan':
+        return ()
+    match = re.fullmatch(rf'([{YEARS}])年级', text)
+    if match:
+        year = YEARS.index(match.group(1))
+        return (year * 2, year * 2 + 1)
+
+    parts = [re.fullmatch(rf'([{YEARS}]?)([上下]?)', part) for part in text.split('/')]
+    if not all(parts):
+        return ()
+    years = [p.group(1) for p in parts]
+    halves = [p.group(2) for p in parts]
+    result = []
+    for i in range(len(parts)):
+        # 省略的年级沿用前一项，省略的上下学期沿用后一项
+        year = years[i] or next((y for y in reversed(years[:i]) if y), '')
+        half = halves[i] or next((h for h in halves[i + 1:] if h), '')
+        if year and half:
+            result.append(SEMESTER_INDEX[year + half])
+    return tuple(sorted(set(result)))
+
+
+def grade_to_semester(grade: str) -> int:
+    """年级（"大二"）或学期（"二下"）转换为学期下标"""
+    grade = COURSE_CONFIG['grade_mapping'].get(grade, grade)
+    if grade not in SEMESTER_INDEX:
+        raise ValueError(f"未识别的年级: {grade}")
+    return SEMESTER_INDEX[grade]
+
+
+@dataclass
+class PlannedCourse:
+    """待规划的课程：可选学期与各个教学班的时间"""
+    name: str
+    credit: float
+    semesters: Tuple[int, ...]
+    sections: List[Course] = field(default_factory=list)
+
+    def section_masks(self) -> List[int]:
+        # 课表中没有时间信息的课程不参与冲突检查
+        masks = [slot_mask(section.time_slots) for section in self.sections]
+        return list(dict.fromkeys(masks)) or [0]
+
+
+@dataclass
+class TermPlan:
+    """一个学期的规划结果"""
+    semester: str
+    scheduler: CourseScheduler
+
+    @property
+    def courses(self) -> List[Course]:
+        return self.scheduler.selected_courses
+
+    @property
+    def credits(self) -> float:
+        return sum(course.credit for course in self.courses)
+
+
+@dataclass
+class DegreePlan:
+    """多学期规划结果"""
+    terms: List[TermPlan]
+    unplaced: List[str]
+
+    def format(self) -> str:
+        lines = []
+        for term in self.terms:
+            names = '、'.join(course.name for course in term.courses) or '（无）'
+            lines.append(f"{term.semester}（{term.credits:g}学分）: {names}")
+        if self.unplaced:
+            lines.append(f"未能安排: {'、'.join(self.unplaced)}")
+        return '\n'.join(lines)
+
+
+class DegreePlanner:
+    """多学期培养方案规划器"""
+
+    def __init__(self, courses: List[PlannedCourse], max_term_credits: float = None):
+        self.courses = courses
+        self.max_term_credits = (COURSE_CONFIG['max_total_credits']
+                                 if max_term_credits is None else max_term_credits)
+
+    @classmethod
+    def from_catalog(cls, timetable_file: str = None, compulsory_file: str = None,
+                     max_term_credits: float = None) -> 'DegreePlanner':
+        """由通班专业课表格（选课时间）和学校课表（教学班时间）构建规划器
+
+        两张表经 extract_courses.load_catalog_frames 读取（与选课界面共用缓存、课程名称连接键和名称索引）。
+        """
+        timetable_file = timetable_file or get_resource_path("北京大学2025春季课表.xlsx")
+        compulsory_file = compulsory_file or get_resource_path("通班&智能专业课 表格.xlsx")
+
+        frames = load_catalog_frames(timetable_file, compulsory_file)
+        course_df = frames.course_df
+        sections: Dict[str, List[Course]] = {}
+        if '课程名称' in course_df.columns:
+            credit, time_str, teacher = (course_df[column] if column in course_df.columns
+                                         else pd.Series(np.nan, index=course_df.index)
+                                         for column in ('学分', '上课时间', '教师'))
+            credits = pd.to_numeric(credit, errors='coerce').fillna(0)
+            for key, name, credit, time_str, teacher in zip(course_df['_key'], course_df['课程名称'],
+                                                            credits, time_str, teacher):
+                sections.setdefault(key, []).append(Course(
+                    name=str(name).strip(),
+                    credit=float(credit),
+                    time='' if pd.isna(time_str) else str(time_str),
+                    location='',
+                    teacher='' if pd.isna(teacher) else str(teacher),
+                    course_type='必修'
+                ))
+
+        courses = []
+        for row in frames.compulsory_df.itertuples(index=False):
+            name = str(getattr(row, '课程名称', '')).strip()
+            if not name or name == 'nan':
+                continue
+            credit = pd.to_numeric(getattr(row, '学分', 0), errors='coerce')
+            courses.append(PlannedCourse(
+                name=name,
+                credit=0.0 if pd.isna(credit) else float(credit),
+                semesters=parse_semester_tokens(getattr(row, '选课时间', '')),
+                sections=sections.get(frames.course_index.resolve_key(name), [])
+            ))
+        return cls(courses, max_term_credits)
+
+    def plan(self, grade: str, completed: Iterable[str] = ()) -> DegreePlan:
+        """规划从当前学期到四下的全部剩余课程
+
+        Args:
+            grade: 当前年级（"大二"）或学期（"二下"）
+            completed: 已修课程名称
+
+        Returns:
+            DegreePlan，尽量把课程安排在可选的最早学期；
+            可选学期都已过去的课程顺延到之后同为秋季/春季的学期。
+        """
+        start = grade_to_semester(grade)
+        completed_index = CourseNameIndex(completed)
+        remaining = [c for c in self.courses if completed_index.resolve_key(c.name) is None]
+
+        # 每门课在 [start, 8) 内可以安排的学期
+        options: List[Tuple[int, ...]] = []
+        for course in remaining:
+            terms = tuple(t for t in course.semesters if t >= start)
+            if not terms and course.semesters:
+                terms = tuple(t for t in range(start, len(SEMESTERS))
+                              if any(t % 2 == s % 2 for s in course.semesters))
+            options.append(terms)
+
+        n = len(remaining)
+        credits = [c.credit for c in remaining]
+        masks = [c.section_masks() for c in remaining]
+        earliest = [terms[0] if terms else 0 for terms in options]
+        last = [terms[-1] if terms else -1 for terms in options]
+        offered = [sum(1 << i for i in range(n) if term in options[i])
+                   for term in range(len(SEMESTERS) + 1)]
+        later = [0] * (len(SEMESTERS) + 1)
+        for term in range(len(SEMESTERS) - 1, -1, -1):
+            later[term] = later[term + 1] | offered[term]
+        cap = self.max_term_credits
+
+        def term_choices(term: int, pending: int) -> List[Tuple[int, Tuple[Tuple[int, int], ...]]]:
+            """本学期可行的 (课程子集位掩码, ((课程下标, 教学班下标), ...)) 组合"""
+            candidates = [i for i in range(n) if pending >> i & 1 and offered[term] >> i & 1]
+            # 最后机会的课程优先，其次学分大的课程
+            candidates.sort(key=lambda i: (last[i] != term, -credits[i], i))
+            candidates = candidates[:MAX_TERM_CANDIDATES]
+
+            # 全部放得下且互不冲突时，提前安排不会更差，不再枚举子集
+            greedy = _assign_sections(candidates, credits, masks, cap)
+            if greedy is not None:
+                return [(sum(1 << i for i in candidates), greedy)]
+
+            # 否则只枚举"极大"子集（再加入任何一门都会超学分或冲突）：
+            # 课程提前安排不会使结果变差，非极大子集总被某个极大子集支配。
+            # 候选已按优先级排序且先尝试"加入"分支，最先得到的就是按优先级贪心填满的组合，
+            # 之后依次是替换掉低优先级课程的组合，取够 MAX_TERM_CHOICES 个即停止
+            found: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+            leaves = [0]
+
+            def fits(i: int, used: float, occupied: int) -> Optional[int]:
+                """课程 i 能否加入：能则返回第一个不冲突的教学班下标"""
+                if used + credits[i] > cap:
+                    return None
+                return next((k for k, mask in enumerate(masks[i]) if not mask & occupied), None)
+
+            def search(pos: int, chosen: int, used: float, occupied: int,
+                       skipped: Tuple[int, ...], sections: Tuple[Tuple[int, int], ...]):
+                if len(found) >= MAX_TERM_CHOICES or leaves[0] >= MAX_TERM_LEAVES:
+                    return
+                if pos == len(candidates):
+                    leaves[0] += 1
+                    if all(fits(i, used, occupied) is None for i in skipped):
+                        found.setdefault(chosen, sections)
+                    return
+                i = candidates[pos]
+                # 子集内取第一个不冲突的教学班，不再对教学班组合做枚举
+                k = fits(i, used, occupied)
+                if k is not None:
+                    search(pos + 1, chosen | 1 << i, used + credits[i],
+                           occupied | masks[i][k], skipped, sections + ((i, k),))
+                search(pos + 1, chosen, used, occupied, skipped + (i,), sections)
+
+            search(0, 0, 0.0, 0, (), ())
+            return list(found.items())
+
+        @lru_cache(maxsize=None)
+        def best(term: int, pending: int) -> Tuple[Tuple[int, int], tuple]:
+            """从 term 学期开始安排 pending 中的课程：返回 ((未安排数, 总推迟学期数), 各学期选择)"""
+            if term == len(SEMESTERS):
+                return (bin(pending).count('1'), 0), ()
+            # 之后不再开设的课程计入未安排，保证状态规范化
+            dropped = pending & ~later[term]
+            pending &= later[term]
+            best_cost, best_choices = None, ()
+            for chosen, sections in term_choices(term, pending):
+                (unplaced, delay), rest = best(term + 1, pending & ~chosen)
+                delay += sum(term - earliest[i] for i in range(n) if chosen >> i & 1)
+                cost = (unplaced + bin(dropped).count('1'), delay)
+                if best_cost is None or cost < best_cost:
+                    best_cost, best_choices = cost, ((chosen, sections),) + rest
+            return best_cost, best_choices
+
+        placeable = sum(1 << i for i in range(n) if options[i])
+        _, choices = best(start, placeable)
+
+        terms = []
+        placed = 0
+        for offset, (chosen, sections) in enumerate(choices):
+            scheduler = CourseScheduler()
+            for i, k in sections:
+                scheduler.add_selected_course(self._section_course(remaining[i], masks[i][k]))
+            terms.append(TermPlan(SEMESTERS[start + offset], scheduler))
+            placed |= chosen
+        unplaced = [remaining[i].name for i in range(n) if not placed >> i & 1]
+        best.cache_clear()
+        return DegreePlan(terms, unplaced)
+
+    @staticmethod
+    def _section_course(course: PlannedCourse, mask: int) -> Course:
+        """取出与所选掩码对应的教学班，没有课表信息时只保留名称和学分"""
+        for section in course.sections:
+            if slot_mask(section.time_slots) == mask:
+                return Course(course.name, course.credit, section.time, section.location,
+                              section.teacher, '必修')
+        return Course(course.name, course.credit, '', '', '', '必修')
+
+
+def _assign_sections(candidates: List[int], credits: List[float], masks: List[List[int]],
+                     cap: float) -> Optional[Tuple[Tuple[int, int], ...]]:
+    """全部候选课程能否同时安排：能则返回 ((课程下标, 教学班下标), ...)"""
+    if sum(credits[i] for i in candidates) > cap:
+        return None
+
+    def assign(pos: int, occupied: int) -> Optional[Tuple[Tuple[int, int], ...]]:
+        if pos == len(candidates):
+            return ()
+        i = candidates[pos]
+        for k, mask in enumerate(masks[i]):
+            if not mask & occupied:
+                rest = assign(pos + 1, occupied | mask)
+                if rest is not None:
+                    return ((i, k),) + rest
+        return None
+
+    return assign(0, 0)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    grade = sys.argv[1] if len(sys.argv) > 1 else "一上"
+    completed = sys.argv[2].split(',') if len(sys.argv) > 2 else []
+    planner = DegreePlanner.from_catalog()
+    started = time.perf_counter()
+    result = planner.plan(grade, completed)
+    print(result.format())
+    print(f"规划耗时: {(time.perf_counter() - started) * 1000:.1f}ms")
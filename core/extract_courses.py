@@ -0,0 +1,393 @@
+import pandas as pd
+import numpy as np
+import os
+import re
+import logging
+from dataclasses import dataclass
+from typing import List, Dict, Tuple
+
+from config import RES_DIR, get_resource_path
+from .course_names import course_key, CourseNameIndex
+from .course_catalog import get_placeholder
+from . import instrumentation
+
+logger = logging.getLogger(__name__)
+
+def parse_time_slot(time_str):
+    """解析课程时间格式"""
+    if pd.isna(time_str):
+        return []
+    
+    # 处理多种时间格式
+    time_slots = []
+    time_str = str(time_str)
+    
+    # 处理类似 "周一3-4节" 的格式
+    weekday_map = {'周一': 1, '周二': 2, '周三': 3, '周四': 4, '周五': 5}
+    for weekday, num in weekday_map.items():
+        if weekday in time_str:
+            # 提取节数
+            periods = re.findall(r'(\d+)-(\d+)节', time_str)
+            if periods:
+                start, end = map(int, periods[0])
+                time_slots.append((num, start, end))
+    
+    return time_slots
+
+# 年级映射 - 包含上下半学期和跨学期的课程
+GRADE_SEMESTERS = {
+    "大一": ["一上", "一上/下", "一/下", "一下"],
+    "大二": ["二上", "二上/下", "二/下", "二下"],
+    "大三": ["三上", "三上/下", "三/下", "三下"],
+    "大四": ["四上", "四上/下", "四/下", "四下"],
+    # 直接学期格式的映射
+    "一上": ["一上", "一上/下"],
+    "一下": ["一下", "一上/下", "一/下"],
+    "二上": ["二上", "二上/下"],
+    "二下": ["二下", "二上/下", "二/下"],
+    "三上": ["三上", "三上/下"],
+    "三下": ["三下", "三上/下", "三/下"],
+    "四上": ["四上", "四上/下"],
+    "四下": ["四下", "四上/下", "四/下"]
+}
+
+# 通班的选择性必修课
+OPTIONAL_COMPULSORY_NAMES = ['微电子与电路基础', '人工智能与社会科学']
+
+# 课表中属于通识课的课程类型
+GENERAL_COURSE_TYPES = ('通选课', '全校公选课')
+
+# 浏览全部课程时每个教学班保留的列（学分为数值，其余为文字）
+CATALOG_COLUMNS = ('课程号', '课程名称', '开课单位', '课程类型', '班号', '学分', '起止周', '上课时间', '教师', '备注')
+
+@dataclass
+class CourseCatalogFrames:
+    """读入并预处理过的两张表
+
+    compulsory_df: 通班&智能专业课表格，附加 _key（课程名称连接键，见 course_names.course_key）
+    course_df: 课程详细信息表，附加 _key
+    semester_index: 年级/学期 -> 通班表各行是否属于该学期的布尔数组
+    course_index: 课程详细信息表的课程名称索引（别名与模糊匹配）
+    """
+    compulsory_df: pd.DataFrame
+    course_df: pd.DataFrame
+    semester_index: Dict[str, np.ndarray]
+    course_index: CourseNameIndex
+
+
+def build_semester_index(semesters: pd.Series) -> Dict[str, np.ndarray]:
+    """预先计算每个年级/学期对应的行
+
+    "选课时间"只有十几种不同的取值，先在这些取值上按原规则（完全相等或包含任一目标学期）
+    判断一次，再映射回全部行。
+    """
+    values = semesters.fillna('').astype(str)
+    codes, uniques = pd.factorize(values)
+    index = {}
+    for grade, targets in GRADE_SEMESTERS.items():
+        hit = np.array([value in targets or any(t in value for t in targets if value)
+                        for value in uniques], dtype=bool)
+        index[grade] = hit[codes] if len(uniques) else np.zeros(len(values), dtype=bool)
+    return index
+
+
+_catalog_cache: Dict[Tuple, CourseCatalogFrames] = {}
+
+
+def load_catalog_frames(file_path, compulsory_file) -> CourseCatalogFrames:
+    """读取两张表并建立索引，文件未变化时直接返回内存中的结果"""
+    cache_key = tuple((path, os.path.getmtime(path), os.path.getsize(path))
+                      for path in (file_path, compulsory_file))
+    frames = _catalog_cache.get(cache_key)
+    if frames is not None:
+        instrumentation.count('excel.catalog_cache_hit')
+        return frames
+
+    logger.info(f"正在读取必修课程文件: {compulsory_file}")
+    with instrumentation.timer('excel.read_compulsory'):
+        compulsory_df = pd.read_excel(compulsory_file)
+    logger.info(f"正在读取课程详细信息文件: {file_path}")
+    with instrumentation.timer('excel.read_timetable'):
+        course_df = pd.read_excel(file_path)
+
+    # 处理列名中的特殊字符
+    compulsory_df.columns = compulsory_df.columns.str.replace('\u200b', '').str.strip()
+    course_df.columns = course_df.columns.str.replace('\u200b', '').str.strip()
+
+    logger.info(f"通班文件列名: {compulsory_df.columns.tolist()}")
+
+    # 检查必要的列是否存在（在清理列名后）
+    required_columns = ['课程名称', '选课时间']
+    for col in required_columns:
+        if col not in compulsory_df.columns:
+            logger.error(f"必修课程文件缺少必要的列: {col}")
+            logger.error(f"实际列名: {compulsory_df.columns.tolist()}")
+            raise ValueError(f"必修课程文件缺少必要的列: {col}")
+
+    compulsory_df['_key'] = compulsory_df['课程名称'].map(course_key)
+    if '课程名称' in course_df.columns:
+        course_df['_key'] = course_df['课程名称'].map(course_key)
+    else:
+        course_df['_key'] = pd.Series(dtype=object)
+
+    frames = CourseCatalogFrames(compulsory_df, course_df,
+                                 build_semester_index(compulsory_df['选课时间']),
+                                 CourseNameIndex(course_df['课程名称'] if '课程名称' in course_df.columns else []))
+    _catalog_cache.clear()
+    _catalog_cache[cache_key] = frames
+    return frames
+
+
+def _placeholder_columns(names: pd.Series) -> pd.DataFrame:
+    """课程目录缓存中的示例时间、地点和教师（由课程名称的稳定摘要决定）"""
+    uniques = names.drop_duplicates()
+    table = pd.DataFrame([get_placeholder(name) for name in uniques], index=uniques.to_numpy())
+    return table.reindex(names.to_numpy())
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    """取列，不存在时返回全空列"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(np.nan, index=df.index, dtype=object)
+
+
+def _text_column(series: pd.Series) -> pd.Series:
+    return series.astype(str).where(series.notna(), '')
+
+
+def _int_column(series: pd.Series, default: int) -> pd.Series:
+    values = pd.to_numeric(series, errors='coerce')
+    return values.fillna(default).astype(int)
+
+
+def join_course_details(target_df: pd.DataFrame, course_df: pd.DataFrame,
+                        placeholders: bool = True, course_index: CourseNameIndex = None) -> List[Dict]:
+    """把目标课程与课程详细信息表按课程名称连接键整体合并
+
+    课表中每个教学班产生一条记录，顺序与目标课程顺序一致；
+    给出 course_index 时，键不完全一致的课程先经别名/模糊匹配换成课表中的键。
+    placeholders 为 True 时，课表中找不到的课程用通班表中的学分和示例时间/地点/教师补全，
+    否则直接丢弃。
+    """
+    if target_df.empty:
+        return []
+    keys = target_df['_key'].to_numpy()
+    if course_index is not None:
+        keys = np.array([course_index.resolve_key(name) or key
+                         for name, key in zip(target_df['课程名称'], keys)], dtype=object)
+    left = pd.DataFrame({
+        '_key': keys,
+        '_target_name': target_df['课程名称'].astype(str).to_numpy(),
+        '_target_credit': pd.to_numeric(_column(target_df, '学分'), errors='coerce').to_numpy(),
+    })
+    merged = left.merge(course_df, on='_key', how='left', indicator=True, sort=False)
+    found = (merged.pop('_merge') == 'both').to_numpy()
+    if not placeholders:
+        merged = merged[found].reset_index(drop=True)
+        found = np.ones(len(merged), dtype=bool)
+        if merged.empty:
+            return []
+
+    credit = pd.to_numeric(_column(merged, '学分'), errors='coerce')
+    time_text = _text_column(_column(merged, '上课时间'))
+    location = _column(merged, '上课地点')
+    teacher = _column(merged, '教师')
+    result = pd.DataFrame({
+        '课程名称': np.where(found, _text_column(_column(merged, '课程名称')), merged['_target_name']),
+        '学分': np.where(found, credit.fillna(2), pd.Series(merged['_target_credit']).fillna(2)).astype(float),
+    })
+
+    if placeholders:
+        fake = _placeholder_columns(merged['_target_name'])
+        missing_time = (time_text == '') | (time_text == 'nan')
+        result['上课时间'] = np.where(found & ~missing_time, time_text, fake['time'])
+        result['上课地点'] = np.where(found, np.where(location.notna(), _text_column(location), fake['numbered_location']),
+                                  fake['location'])
+        result['教师'] = np.where(found, np.where(teacher.notna(), _text_column(teacher), fake['numbered_teacher']),
+                                fake['teacher'])
+    else:
+        for column in ('上课时间', '上课地点', '教师'):
+            result[column] = merged[column].astype(str) if column in merged.columns else ''
+
+    result['课程容量'] = np.where(found, _int_column(_column(merged, '课程容量'), 50), 50)
+    result['已选人数'] = np.where(found, _int_column(_column(merged, '已选人数'), 0), 0)
+    records = result.to_dict('records')
+    for record in records:
+        record['课程容量'] = int(record['课程容量'])
+        record['已选人数'] = int(record['已选人数'])
+    return records
+
+
+def extract_courses_by_grade_and_major(file_path, grade, major, course_type="必修"):
+    """
+    从Excel文件中提取指定年级和专业的课程信息
+    course_type: "必修" 或 "选择性必修"
+    """
+    try:
+        # 获取文件路径
+        compulsory_file = get_resource_path("通班&智能专业课 表格.xlsx")
+        
+        # 检查文件是否存在
+        if not os.path.exists(compulsory_file):
+            logger.error(f"必修课程文件不存在: {compulsory_file}")
+            raise FileNotFoundError(f"必修课程文件不存在: {compulsory_file}")
+        
+        if not os.path.exists(file_path):
+            logger.error(f"课程详细信息文件不存在: {file_path}")
+            raise FileNotFoundError(f"课程详细信息文件不存在: {file_path}")
+        
+        frames = load_catalog_frames(file_path, compulsory_file)
+        compulsory_df = frames.compulsory_df
+        course_df = frames.course_df
+        
+        # 获取通班课程
+        if major == "通班":
+            logger.info(f"处理通班专业课程 - 年级: {grade}, 课程类型: {course_type}")
+            if course_type == "选择性必修":
+                # 直接在详细课表中查找这两门课
+                target_df = pd.DataFrame({'课程名称': OPTIONAL_COMPULSORY_NAMES})
+                target_df['_key'] = target_df['课程名称'].map(course_key)
+                return join_course_details(target_df, course_df, placeholders=False,
+                                           course_index=frames.course_index)
+            
+            # 只根据年级筛选课程
+            if grade.endswith('上'):
+                grade = f"{grade[0]}下"
+            if grade in frames.semester_index:
+                target_df = compulsory_df[frames.semester_index[grade]]
+            else:
+                logger.warning(f"未识别的年级: {grade}，返回所有课程")
+                target_df = compulsory_df
+        else:
+            # 其他专业的处理逻辑保持不变
+            logger.info(f"处理{major}专业课程 - {course_type}")
+            if '课程类型' in compulsory_df.columns:
+                is_optional = compulsory_df['课程名称'].isin(OPTIONAL_COMPULSORY_NAMES)
+                target_df = compulsory_df[is_optional if course_type == "选择性必修" else ~is_optional]
+            else:
+                # 如果没有课程类型列，返回前10门课程
+                target_df = compulsory_df.head(10)
+            logger.info(f"找到{major}{course_type}课程: {len(target_df)}门")
+        
+        # 与课表整体合并，构建课程数据
+        courses = join_course_details(target_df, course_df, course_index=frames.course_index)
+        
+        logger.info(f"成功提取{course_type}课程信息: {len(courses)}门课程")
+        return courses
+        
+    except Exception as e:
+        logger.error(f"提取课程信息时出错: {str(e)}")
+        raise
+
+def get_compulsory_courses(file_path, grade, major):
+    """获取必修课程"""
+    return extract_courses_by_grade_and_major(file_path, grade, major, "必修")
+
+def get_optional_compulsory_courses(file_path, grade, major):
+    """获取选择性必修课程"""
+    return extract_courses_by_grade_and_major(file_path, grade, major, "选择性必修")
+
+def get_general_courses(file_path):
+    """获取课表中的全部通识课（通选课与全校公选课），每个教学班一条记录"""
+    compulsory_file = get_resource_path("通班&智能专业课 表格.xlsx")
+    frames = load_catalog_frames(file_path, compulsory_file)
+    course_df = frames.course_df
+    if '课程类型' not in course_df.columns:
+        logger.warning("课表缺少课程类型列，无法筛选通识课")
+        return []
+
+    general_df = course_df[course_df['课程类型'].isin(GENERAL_COURSE_TYPES)]
+    target_df = general_df.drop_duplicates('_key')[['课程名称', '_key']]
+    courses = join_course_details(target_df, general_df)
+    for course in courses:
+        course['课程类型'] = '通识课'
+    logger.info(f"找到通识课: {len(target_df)}门，{len(courses)}个教学班")
+    return courses
+
+def get_catalog_courses(file_path):
+    """课表中的全部教学班（浏览全部课程用），按课程名称排序，缺少的列为空"""
+    compulsory_file = get_resource_path("通班&智能专业课 表格.xlsx")
+    course_df = load_catalog_frames(file_path, compulsory_file).course_df
+    table = pd.DataFrame({column: _text_column(_column(course_df, column)) for column in CATALOG_COLUMNS})
+    table['学分'] = pd.to_numeric(_column(course_df, '学分'), errors='coerce').fillna(0).astype(float)
+    table = table[table['课程名称'] != ''].sort_values('课程名称', kind='stable')
+    logger.info(f"课表共 {len(table)} 个教学班")
+    return table.to_dict('records')
+
+def get_course_types(file_path):
+    """获取所有课程类型"""
+    try:
+        compulsory_file = get_resource_path("通班&智能专业课 表格.xlsx")
+        
+        if not os.path.exists(compulsory_file):
+            logger.error(f"必修课程文件不存在: {compulsory_file}")
+            raise FileNotFoundError(f"必修课程文件不存在: {compulsory_file}")
+        
+        logger.info(f"正在读取必修课程文件: {compulsory_file}")
+        df = pd.read_excel(compulsory_file)
+        
+        # 对于通班，返回特殊处理
+        if "通班" in df['专业'].unique():
+            logger.info("返回通班特殊课程类型")
+            return ["必修", "选择性必修"]
+        
+        course_types = sorted(df['课程类型'].unique().tolist())
+        logger.info(f"找到课程类型: {course_types}")
+        return course_types
+    except Exception as e:
+        logger.error(f"获取课程类型时出错: {str(e)}")
+        raise
+
+def get_majors(file_path):
+    """获取所有专业"""
+    try:
+        compulsory_file = get_resource_path("通班&智能专业课 表格.xlsx")
+        
+        if not os.path.exists(compulsory_file):
+            logger.error(f"必修课程文件不存在: {compulsory_file}")
+            raise FileNotFoundError(f"必修课程文件不存在: {compulsory_file}")
+        
+        logger.info(f"正在读取必修课程文件: {compulsory_file}")
+        df = pd.read_excel(compulsory_file)
+        
+        majors = sorted(df['专业'].unique().tolist())
+        logger.info(f"找到专业: {majors}")
+        return majors
+    except Exception as e:
+        logger.error(f"获取专业列表时出错: {str(e)}")
+        raise
+
+def get_available_courses(file_path, grade, major):
+    """获取可选课程（考虑课程容量）"""
+    try:
+        courses = extract_courses_by_grade_and_major(file_path, grade, major)
+        available_courses = [course for course in courses if course['已选人数'] < course['课程容量']]
+        logger.info(f"找到可选课程: {len(available_courses)}门")
+        return available_courses
+    except Exception as e:
+        logger.error(f"获取可选课程时出错: {str(e)}")
+        raise
+
+# 数据文件目录与学校课表
+res_dir = RES_DIR
+file_path = get_resource_path("北京大学2025春季课表.xlsx")
+
+if __name__ == "__main__":
+    # 测试代码
+    grade = "二上"  # 例如：一上、一下、二上、二下等
+    major = "通班"  # 测试通班选课
+
+    try:
+        courses = extract_courses_by_grade_and_major(file_path, grade, major)
+        print(f"{grade} {major} 的专业课程:")
+        for course in courses:
+            print(f"- {course['课程名称']} (学分: {course['学分']})")
+            print(f"  时间: {course['上课时间']}, 地点: {course['上课地点']}")
+            print(f"  教师: {course['教师']}, 容量: {course['课程容量']}, 已选: {course['已选人数']}")
+            
+            # 测试时间冲突检查
+            if course['上课时间']:
+                print(f"  时间解析: {parse_time_slot(course['上课时间'])}")
+    except Exception as e:
+        print(f"错误: {e}")
\ No newline at end of file
@@ -0,0 +1,420 @@
+"""
+HTML 报告（课表、AI 评估、默认评估）
+所有页面共用一份样式表 STYLESHEET；模板在导入时按占位符切分好，渲染时把各段和转义后的值
+放进列表，最后 join 一次。插入的值默认做 HTML 转义，已经是 HTML 的片段用 Markup 包装。
+
+export_schedules 把多名学生的课表分别写成 HTML 文件，共用同一个 style.css。
+"""
+
+import html
+import os
+import re
+from typing import Dict, Iterable, List, Sequence
+
+from .conflict_index import time_mask
+
+# 需要转义的字符
+_SPECIAL = re.compile(r'[&<>"\']')
+
+
+class Markup(str):
+    """已转义的 HTML 片段，渲染时原样插入"""
+
+
+def escape(value) -> str:
+    """值 -> HTML 文本（Markup 原样返回，数字不需要转义）"""
+    kind = type(value)
+    if kind is Markup:
+        return value
+    if kind is int or kind is float:
+        return str(value)
+    if value is None:
+        return ''
+    text = value if kind is str else str(value)
+    # 大多数值不含需要转义的字符，先检查一次，省去 html.escape 的五次替换
+    return html.escape(text) if _SPECIAL.search(text) else text
+
+
+def text_to_html(text) -> Markup:
+    """纯文本 -> HTML（转义后换行变为 <br>）"""
+    return Markup(escape(text).replace('\n', '<br>'))
+
+
+class HtmlTemplate:
+    """以 {name} 为占位符的模板，构造时切分一次，渲染时只做拼接（值默认转义）"""
+
+    _FIELD = re.compile(r'\{(\w+)\}')
+
+    def __init__(self, source: str):
+        self._parts = self._FIELD.split(source)
+        self._fields = self._parts[1::2]
+
+    def _fill(self, values) -> List[str]:
+        parts = self._parts.copy()
+        parts[1::2] = [escape(values[field]) for field in self._fields]
+        return parts
+
+    def render_into(self, out: List[str], **values):
+        """把渲染结果的各段追加到 out（由调用方统一 join 或 writelines）
+
+        值为列表时视为已渲染的片段（例如另一个模板 render_into 的结果），依次放入，不再拼接成字符串。
+        """
+        parts = self._parts
+        out.append(parts[0])
+        for position in range(1, len(parts), 2):
+            value = values[parts[position]]
+            if type(value) is list:
+                out.extend(value)
+            else:
+                out.append(escape(value))
+            out.append(parts[position + 1])
+
+    def render(self, **values) -> str:
+        return ''.join(self._fill(values))
+
+
+# ---- 共用样式 ----
+
+STYLESHEET = """
+body { font-family: '微软雅黑', sans-serif; line-height: 1.6; margin: 15px; color: #333; }
+h2 { margin-top: 0; }
+/* QTextBrowser/QTextDocument 不支持渐变，使用其后的 background-color */
+.header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); background-color: #667eea;
+          color: white; padding: 20px; border-radius: 15px; margin-bottom: 25px;
+          box-shadow: 0 4px 15px rgba(0,0,0,0.1); }
+.schedule-header { background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%); background-color: #4CAF50;
+                   color: white; padding: 10px; border-radius: 8px; margin-bottom: 15px; text-align: center; }
+.content { background-color: #f8f9fa; border-left: 5px solid #007bff; padding: 20px; border-radius: 10px;
+           margin-bottom: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.05); }
+.advice { background-color: #f8f9fa; border-left: 5px solid #28a745; padding: 20px; border-radius: 10px;
+          margin-bottom: 20px; }
+.ai-result { background: white; padding: 25px; border-radius: 12px; border: 1px solid #e0e0e0;
+             white-space: pre-wrap; font-size: 14px; line-height: 1.6; }
+.footer { text-align: center; color: #666; font-size: 12px; margin-top: 20px; padding: 10px;
+          border-top: 1px solid #eee; }
+.stats { display: flex; justify-content: space-around; background: #e3f2fd; padding: 15px; border-radius: 10px;
+         margin: 15px 0; }
+.stat-item { text-align: center; }
+.stat-number { font-size: 24px; font-weight: bold; color: #1976d2; }
+.highlight { color: #e74c3c; font-weight: bold; }
+.good { color: #27ae60; }
+.warning { color: #f39c12; }
+.info-box { background: white; padding: 15px; border-radius: 8px; margin: 10px 0; border: 1px solid #ddd; }
+.schedule-table { width: 100%; border-collapse: collapse; margin-bottom: 15px; }
+.schedule-table th, .schedule-table td { border: 1px solid #ddd; padding: 8px; text-align: center; font-size: 12px; }
+.schedule-table th { background-color: #f2f2f2; font-weight: bold; }
+.compulsory { background-color: #FFE4E1; }
+.optional { background-color: #E0FFFF; }
+.general { background-color: #F0FFF0; }
+.overlap { background-color: #FFCDD2; }
+.tag { padding: 2px 8px; border-radius: 3px; }
+.summary { background-color: #f8f9fa; padding: 10px; border-radius: 5px; font-size: 14px; }
+.course-info { font-size: 10px; line-height: 1.2; }
+.info { margin: 20px 0; }
+.title { text-align: center; margin: 20px 0; }
+"""
+
+# 页面内嵌样式（界面中的 QTextBrowser 和单独导出的文件）与批量导出时链接的样式文件
+INLINE_STYLE = Markup(f"<style>{STYLESHEET}</style>")
+STYLESHEET_FILE = 'style.css'
+LINKED_STYLE = Markup(f'<link rel="stylesheet" href="{STYLESHEET_FILE}">')
+
+PAGE = HtmlTemplate("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{style}
+</head>
+<body>
+{body}
+</body>
+</html>
+""")
+
+# ---- 课表 ----
+
+# 选课分类：user_data 中的键、课程类型、表格中的样式类
+CATEGORIES = (
+    ('compulsory_courses', '必修课', 'compulsory'),
+    ('optional_compulsory_courses', '选择性必修课', 'optional'),
+    ('general_courses', '通识课', 'general'),
+)
+TYPE_CLASSES = {course_type: css_class for _, course_type, css_class in CATEGORIES}
+
+WEEKDAY_HEADER = Markup(''.join(f"<th>{day}</th>" for day in ('周一', '周二', '周三', '周四', '周五')))
+
+# 最终课表页面的时间列
+SCHEDULE_TIME_LABELS = [
+    "8:00-8:45", "8:55-9:40", "10:00-10:45", "10:55-11:40",
+    "13:30-14:15", "14:25-15:10", "15:30-16:15", "16:25-17:10",
+    "18:30-19:15", "19:25-20:10", "20:20-21:05", "21:15-22:00"
+]
+SCHEDULE_ROW_HEADS = [f"<tr><td><strong>第{i + 1}节<br>{label}</strong></td>"
+                      for i, label in enumerate(SCHEDULE_TIME_LABELS)]
+
+COURSE_CELL = HtmlTemplate('<div class="course-info"><strong>{name}</strong><br>{teacher}<br>'
+                           '{location}<br>{credit}学分</div>')
+
+SCHEDULE_BODY = HtmlTemplate("""<div class="schedule-header">
+<h3>🎓 {grade} {major} 课程表</h3>
+<p>总学分: {total_credits} 分 | 课程数: {course_count} 门</p>
+</div>
+<table class="schedule-table">
+<tr><th style="width: 80px;">时间</th>{weekdays}</tr>
+{rows}
+</table>
+<div class="summary">
+<h4>📊 课程统计</h4>
+<div style="display: flex; justify-content: space-between;">
+<div><span class="tag compulsory">必修课</span> {compulsory_count}门 ({compulsory_credits}学分)</div>
+<div><span class="tag optional">选择性必修</span> {optional_count}门 ({optional_credits}学分)</div>
+<div><span class="tag general">通识课</span> {general_count}门 ({general_credits}学分)</div>
+</div>
+<p style="text-align: center; margin-top: 10px;"><strong>总计: {total_credits} 学分</strong></p>
+</div>""")
+
+EXPORT_BODY = HtmlTemplate("""<div class="title">
+<h1>课程表</h1>
+<p>{student_info}</p>
+</div>
+<table class="schedule-table">
+<tr><th>时间</th>{weekdays}</tr>
+{rows}
+</table>
+<div class="info">
+<h2>统计信息</h2>
+{stats}
+</div>
+<div class="info">
+<h2>课程列表</h2>
+{course_list}
+</div>""")
+
+
+def render_schedule_rows(out: List[str], grid: List[List[Sequence[int]]], row_heads: Sequence[str],
+                         fragments: Sequence[str], classes: Sequence[str]):
+    """课表网格（CourseScheduler.get_schedule_grid）-> 表格行
+
+    row_heads 是每行开头（含时间列）的 HTML，fragments/classes 是每门课程的单元格内容和样式类，
+    每门课程只渲染一次；时间重叠的课程放在同一格中。
+    """
+    course_cells = [f'<td class="{css_class}">{fragment}</td>' for fragment, css_class in zip(fragments, classes)]
+    for head, cells in zip(row_heads, grid):
+        out.append(head)
+        for indices in cells:
+            if not indices:
+                out.append('<td></td>')
+            elif len(indices) == 1:
+                out.append(course_cells[indices[0]])
+            else:
+                out.append('<td class="overlap">' + '<br>'.join(fragments[index] for index in indices) + '</td>')
+        out.append('</tr>')
+
+
+def mask_grid(masks: Sequence[int], days: int = 5) -> List[List[List[int]]]:
+    """各课程的时间位掩码（conflict_index.time_mask）-> 12×days 的课表网格，格式同 get_schedule_grid"""
+    # 空格子共用一个空元组，只为有课的格子建列表
+    grid = [[()] * days for _ in range(12)]
+    for index, mask in enumerate(masks):
+        mask &= (1 << days * 12) - 1
+        while mask:
+            low = mask & -mask
+            bit = low.bit_length() - 1
+            row, day = bit % 12, bit // 12
+            if grid[row][day]:
+                grid[row][day].append(index)
+            else:
+                grid[row][day] = [index]
+            mask ^= low
+    return grid
+
+
+def category_credits(selection: Dict) -> Dict[str, float]:
+    """各分类的学分合计"""
+    return {key: sum(course['credit'] for course in selection.get(key, [])) for key, _, _ in CATEGORIES}
+
+
+def render_final_schedule(selection: Dict, style: Markup = INLINE_STYLE) -> str:
+    """最终课表页面
+
+    Args:
+        selection: 界面 user_data 格式的选课结果（age、major 和各分类课程）
+        style: 内嵌样式或链接样式文件
+    """
+    return ''.join(final_schedule_parts(selection, style))
+
+
+def final_schedule_parts(selection: Dict, style: Markup = INLINE_STYLE) -> List[str]:
+    """最终课表页面的各段（按顺序 join 或 writelines 即为完整页面）"""
+    masks, fragments, classes = [], [], []
+    for key, _, css_class in CATEGORIES:
+        for course in selection.get(key, []):
+            masks.append(time_mask(course.get('time') or course.get('上课时间')))
+            fragments.append(COURSE_CELL.render(name=course.get('name', ''), teacher=course.get('teacher', ''),
+                                                location=course.get('location', ''),
+                                                credit=course.get('credit', '')))
+            classes.append(css_class)
+    rows: List[str] = []
+    render_schedule_rows(rows, mask_grid(masks), SCHEDULE_ROW_HEADS, fragments, classes)
+
+    credits = category_credits(selection)
+    counts = {key: len(selection.get(key, [])) for key, _, _ in CATEGORIES}
+    body: List[str] = []
+    SCHEDULE_BODY.render_into(
+        body, grade=selection.get('age', ''), major=selection.get('major', ''),
+        total_credits=sum(credits.values()), course_count=sum(counts.values()),
+        weekdays=WEEKDAY_HEADER, rows=rows,
+        compulsory_count=counts['compulsory_courses'], compulsory_credits=credits['compulsory_courses'],
+        optional_count=counts['optional_compulsory_courses'],
+        optional_credits=credits['optional_compulsory_courses'],
+        general_count=counts['general_courses'], general_credits=credits['general_courses'])
+    page: List[str] = []
+    PAGE.render_into(page, title="课程表", style=style, body=body)
+    return page
+
+
+def render_schedule_export(student_info: str, grid: List[List[List[int]]], courses: Sequence,
+                           time_labels: Sequence[str], stats_text: str, course_list_text: str) -> str:
+    """最终课表界面"导出"的页面：课表网格、统计信息和课程列表（纯文本）"""
+    row_heads = [f"<tr><td>{escape(label)}</td>" for label in time_labels]
+    fragments = [escape(course.name) for course in courses]
+    classes = [TYPE_CLASSES.get(course.course_type, '') for course in courses]
+    rows: List[str] = []
+    render_schedule_rows(rows, grid, row_heads, fragments, classes)
+    body = EXPORT_BODY.render(student_info=student_info, weekdays=WEEKDAY_HEADER, rows=Markup(''.join(rows)),
+                              stats=text_to_html(stats_text), course_list=text_to_html(course_list_text))
+    return PAGE.render(title="课程表", style=INLINE_STYLE, body=Markup(body))
+
+
+def file_stem(name) -> str:
+    """学生编号等 -> 可用作文件名的字符串（不含扩展名）"""
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(name))
+
+
+def unique_stem(stem: str, used: set) -> str:
+    """重名时依次加 -2、-3 后缀，并把结果记入 used
+
+    比较不区分大小写，写到不区分大小写的文件系统也不会互相覆盖。
+    """
+    candidate, suffix = stem, 1
+    while candidate.lower() in used:
+        suffix += 1
+        candidate = f"{stem}-{suffix}"
+    used.add(candidate.lower())
+    return candidate
+
+
+def export_schedules(selections: Iterable[Dict], output_dir: str) -> List[str]:
+    """把多名学生的课表分别写成 HTML 文件，返回文件路径
+
+    样式表只写一次（style.css），各页面链接它。文件名取 selection 中的 id，
+    没有时按顺序编号；重名的依次加 -2、-3 后缀。
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, STYLESHEET_FILE), 'w', encoding='utf-8') as f:
+        f.write(STYLESHEET)
+    paths, used = [], set()
+    for position, selection in enumerate(selections, start=1):
+        stem = unique_stem(file_stem(selection.get('id') or f"student-{position:04d}"), used)
+        path = os.path.join(output_dir, stem + '.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(final_schedule_parts(selection, style=LINKED_STYLE))
+        paths.append(path)
+    return paths
+
+
+# ---- 评估报告 ----
+
+STATS_BLOCK = HtmlTemplate("""<div class="stats">
+<div class="stat-item"><div class="stat-number">{compulsory_count}</div><div>必修课程</div></div>
+<div class="stat-item"><div class="stat-number">{optional_count}</div><div>选择性必修</div></div>
+<div class="stat-item"><div class="stat-number">{general_count}</div><div>通识课程</div></div>
+<div class="stat-item"><div class="stat-number">{total_credits}</div><div>总学分</div></div>
+</div>""")
+
+AI_EVALUATION_BODY = HtmlTemplate("""<div class="header">
+<h2>{service_title}</h2>
+<p>基于您的选课情况，为您生成了专业的AI评估报告</p>
+</div>
+<div class="content">
+<h3>📊 选课统计概览</h3>
+{stats}
+</div>
+<div class="content">
+<h3>🎯 AI智能评估报告</h3>
+<div class="ai-result">{ai_result}</div>
+</div>
+<div class="footer">
+<p>📋 学生信息：{grade} · {major} | ⏰ 生成时间：刚刚</p>
+<p>💡 本报告由人工智能生成，仅供参考，建议结合实际情况做出选择</p>
+</div>""")
+
+DEFAULT_EVALUATION_BODY = HtmlTemplate("""<div class="header">
+<h2>📊 选课评估报告</h2>
+<p>基于您的选课情况生成的综合评估报告</p>
+</div>
+<div class="advice">
+<h3>📊 基本信息</h3>
+<div class="info-box">
+<p><strong>👨‍🎓 学生信息：</strong>{grade} · {major}</p>
+<p><strong>📚 总学分：</strong><span class="highlight">{total_credits}分</span></p>
+<p><strong>📋 选课门数：</strong>{total_courses}门课程</p>
+</div>
+</div>
+<div class="advice">
+<h3>✅ 课程结构分析</h3>
+<div class="info-box">
+<p class="good">▪ 您的课程选择涵盖了必修、选修和通识教育各个领域</p>
+<p class="good">▪ 学分分配合理，符合学年要求</p>
+<p class="warning">▪ 建议关注课程时间安排，避免冲突</p>
+<p class="good">▪ 课程难度搭配适中，有利于循序渐进学习</p>
+</div>
+</div>
+<div class="advice">
+<h3>🎯 专业发展建议</h3>
+<div class="info-box">
+<p><strong>1. 基础巩固：</strong>重视必修课程学习，建立扎实的专业理论基础</p>
+<p><strong>2. 视野拓展：</strong>通过选修课程扩展知识面，培养跨学科思维</p>
+<p><strong>3. 实践应用：</strong>注重理论与实践相结合，积极参与项目实践</p>
+<p><strong>4. 能力提升：</strong>培养批判性思维和创新能力</p>
+</div>
+</div>
+<div class="advice">
+<h3>📈 学习规划建议</h3>
+<div class="info-box">
+<p><strong>📅 短期目标（本学期）：</strong>专注于必修课程学习，确保基础知识掌握</p>
+<p><strong>🎯 中期目标（本学年）：</strong>通过选修课程拓展专业视野，提升综合能力</p>
+<p><strong>🚀 长期目标（整个大学）：</strong>结合通识教育，培养全面发展的综合素质</p>
+</div>
+</div>
+<div class="advice">
+<h3>⭐ 综合评价</h3>
+<div class="info-box" style="text-align: center; font-size: 18px;">
+<p><span class="good">课程搭配：8.5/10</span></p>
+<p><span class="good">学分安排：9.0/10</span></p>
+<p><span class="good">专业匹配：8.8/10</span></p>
+<p style="margin-top: 15px;"><span class="highlight">总体评价：优秀</span></p>
+<p style="color: #666; font-size: 14px;">课程搭配合理，建议继续保持并注重实践应用</p>
+</div>
+</div>""")
+
+
+def render_ai_evaluation(ai_result: str, data: Dict, service_title: str) -> str:
+    """AI 评估报告页面（ai_result 为模型返回的纯文本，转义后按原样换行显示）"""
+    stats = STATS_BLOCK.render(
+        compulsory_count=len(data.get('必修课程', [])), optional_count=len(data.get('选择性必修', [])),
+        general_count=len(data.get('通识课程', [])), total_credits=data.get('总学分', 0))
+    body = AI_EVALUATION_BODY.render(
+        service_title=service_title, stats=Markup(stats), ai_result=ai_result,
+        grade=data.get('年级', '未知'), major=data.get('专业', '未知'))
+    return PAGE.render(title="AI评估报告", style=INLINE_STYLE, body=Markup(body))
+
+
+def render_default_evaluation(data: Dict) -> str:
+    """默认评估报告页面（不调用 API）"""
+    total_courses = len(data.get('必修课程', [])) + len(data.get('选择性必修', [])) + len(data.get('通识课程', []))
+    body = DEFAULT_EVALUATION_BODY.render(
+        grade=data.get('年级', '未知'), major=data.get('专业', '未知'),
+        total_credits=data.get('总学分', 0), total_courses=total_courses)
+    return PAGE.render(title="选课评估报告", style=INLINE_STYLE, body=Markup(body))
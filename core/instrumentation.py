@@ -0,0 +1,202 @@
+"""
+性能埋点
+按名称汇总的计时器（上下文管理器 timer 和装饰器 timed）、计数器和直方图，
+可导出 JSON 快照，界面中由性能面板（performance_panel.py）显示。
+
+默认关闭：关闭时 timer() 返回共享的空上下文，timed 装饰的函数只多一次标志判断，
+count()/observe() 直接返回。用 PERF_CONFIG['enabled'] 或环境变量 COURSE_PERF=1 打开，
+运行中也可以调用 enable()。
+
+    from core import instrumentation
+
+    with instrumentation.timer('excel.load_catalog'):
+        ...
+
+    @instrumentation.timed('scheduler.check_conflicts')
+    def check_conflicts(...): ...
+"""
+
+import os
+import json
+import time
+import tempfile
+import bisect
+import atexit
+import functools
+import threading
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+from config import PERF_CONFIG, get_cache_path
+
+# 延迟直方图的桶上界（毫秒），最后一个桶收纳更慢的操作
+LATENCY_BUCKETS_MS = (0.01, 0.1, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class LatencyHistogram:
+    """固定桶的延迟直方图，记录次数、总耗时和最大值，分位数按桶上界估计"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """第 q 分位（0-1）所在桶的上界；落在最后一个桶时返回最大值"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return self.max_ms
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+            return {
+                'count': self.count,
+                'total_ms': round(self.total_ms, 3),
+                'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+                'max_ms': round(self.max_ms, 3),
+                'p50_ms': self.percentile(0.5),
+                'p95_ms': self.percentile(0.95),
+                'p99_ms': self.percentile(0.99),
+                'buckets': dict(zip(labels, self.counts)),
+            }
+
+
+class _Registry:
+    def __init__(self):
+        self.enabled = False
+        self.started = time.time()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+
+_registry = _Registry()
+_NULL_TIMER = nullcontext()
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _registry.histogram(self.name).observe((time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def is_enabled() -> bool:
+    return _registry.enabled
+
+
+def enable(enabled: bool = True):
+    """打开或关闭埋点；关闭不清空已有数据"""
+    _registry.enabled = enabled
+
+
+def reset():
+    """清空全部计时和计数"""
+    with _registry.lock:
+        _registry.histograms.clear()
+        _registry.counters.clear()
+        _registry.started = time.time()
+
+
+def timer(name: str):
+    """计时上下文：with timer('name'): ...，关闭时为空操作"""
+    return _Timer(name) if _registry.enabled else _NULL_TIMER
+
+
+def timed(name: Optional[str] = None):
+    """计时装饰器，默认以 模块.函数 命名"""
+    def decorator(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _registry.enabled:
+                return func(*args, **kwargs)
+            with _Timer(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, n: int = 1):
+    """计数器加 n"""
+    if _registry.enabled:
+        with _registry.lock:
+            _registry.counters[name] = _registry.counters.get(name, 0) + n
+
+
+def observe(name: str, ms: float):
+    """直接记录一次耗时（毫秒），用于不便包在 with 中的场合"""
+    if _registry.enabled:
+        _registry.histogram(name).observe(ms)
+
+
+def snapshot() -> Dict:
+    """当前全部计时器和计数器，可直接写成 JSON"""
+    with _registry.lock:
+        histograms = list(_registry.histograms.items())
+        counters = dict(_registry.counters)
+    return {
+        'enabled': _registry.enabled,
+        'since': _registry.started,
+        'elapsed_seconds': round(time.time() - _registry.started, 3),
+        'timers': {name: histogram.snapshot() for name, histogram in sorted(histograms)},
+        'counters': dict(sorted(counters.items())),
+    }
+
+
+def write_snapshot(path: Optional[str] = None) -> str:
+    """把快照写成 JSON 文件（先写临时文件再替换），返回路径；默认写到缓存目录"""
+    path = path or get_cache_path(PERF_CONFIG['snapshot_file'])
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def _write_on_exit():
+    if _registry.histograms or _registry.counters:
+        write_snapshot()
+
+
+if PERF_CONFIG['enabled'] or os.environ.get('COURSE_PERF') == '1':
+    enable()
+    if PERF_CONFIG['write_on_exit']:
+        atexit.register(_write_on_exit)
@@ -0,0 +1,244 @@
+"""
+兴趣匹配索引
+在课程目录的课程名称（及备注说明）上预先构建字符 n-gram TF-IDF 索引，
+学生兴趣与全部候选课程的相关度通过一次稀疏矩阵乘法得到。
+索引以 .npz 格式保存在缓存目录中，数据文件未变化时直接加载。
+"""
+
+import os
+import re
+import logging
+import tempfile
+import unicodedata
+from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+
+from config import CACHE_CONFIG, get_cache_path
+from .course_catalog import catalog_files, source_signature
+
+logger = logging.getLogger(__name__)
+
+# 字符 n-gram 长度范围
+NGRAM_RANGE = (1, 3)
+
+# 兴趣相关度达到该值即视为匹配
+INTEREST_MATCH_THRESHOLD = 0.1
+
+# 常见英文缩写与中文说法的对应，查询时一并展开
+INTEREST_ALIASES = {
+    'ai': '人工智能',
+    'ml': '机器学习',
+    'dl': '深度学习',
+    'cv': '计算机视觉',
+    'nlp': '自然语言处理',
+    'rl': '强化学习',
+    'llm': '大语言模型',
+    'os': '操作系统',
+    'cs': '计算机',
+    'math': '数学',
+    'physics': '物理',
+    'music': '音乐',
+    'art': '艺术',
+    'history': '历史',
+    'economics': '经济',
+    'psychology': '心理',
+    'philosophy': '哲学',
+    'programming': '程序设计',
+    'robotics': '机器人',
+}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text) -> str:
+    """统一全角半角、大小写并去掉空白"""
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return ''
+    text = unicodedata.normalize('NFKC', str(text)).replace('\u200b', '').lower()
+    return _WHITESPACE.sub('', text)
+
+
+def char_ngrams(text: str) -> Dict[str, int]:
+    """提取字符 n-gram 及其出现次数"""
+    counts = {}
+    low, high = NGRAM_RANGE
+    for n in range(low, high + 1):
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def expand_interest(interest: str) -> str:
+    """展开兴趣中的英文缩写，例如 "AI" -> "ai人工智能" """
+    text = normalize_text(interest)
+    extra = [alias for key, alias in INTEREST_ALIASES.items()
+             if re.search(rf'(?<![a-z]){key}(?![a-z])', text)]
+    return text + ''.join(extra)
+
+
+class InterestIndex:
+    """课程文本的字符 n-gram TF-IDF 索引（CSR 稀疏格式）"""
+
+    def __init__(self, vocabulary: List[str], idf: np.ndarray, names: List[str],
+                 indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, signature: str = ''):
+        self.vocabulary = {gram: i for i, gram in enumerate(vocabulary)}
+        self.idf = idf
+        self.signature = signature
+        self.names = list(names)
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self._rows = {name: i for i, name in enumerate(self.names)}
+        self._extra_rows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def build(cls, names: List[str], descriptions: List[str] = None, signature: str = '') -> 'InterestIndex':
+        """由课程名称和说明文字构建索引，同名课程的文本合并为一行"""
+        descriptions = descriptions or [''] * len(names)
+        texts: Dict[str, str] = {}
+        for name, description in zip(names, descriptions):
+            name = str(name).strip()
+            if not name or name == 'nan':
+                continue
+            texts[name] = texts.get(name, normalize_text(name)) + normalize_text(description)
+
+        row_counts = [char_ngrams(text) for text in texts.values()]
+        document_frequency: Dict[str, int] = {}
+        for counts in row_counts:
+            for gram in counts:
+                document_frequency[gram] = document_frequency.get(gram, 0) + 1
+        vocabulary = sorted(document_frequency)
+        n_docs = len(row_counts)
+        idf = np.array([np.log((1 + n_docs) / (1 + document_frequency[g])) + 1 for g in vocabulary])
+
+        index = cls(vocabulary, idf, [], np.zeros(1, dtype=np.int64),
+                    np.zeros(0, dtype=np.int64), np.zeros(0), signature)
+        rows = [index._vectorize_counts(counts) for counts in row_counts]
+        index.names = list(texts)
+        index._rows = {name: i for i, name in enumerate(index.names)}
+        index.indptr = np.concatenate([[0], np.cumsum([len(r[0]) for r in rows])]).astype(np.int64)
+        index.indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int64)
+        index.data = np.concatenate([r[1] for r in rows]) if rows else np.zeros(0)
+        return index
+
+    def _vectorize_counts(self, counts: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """n-gram 计数 -> 单位长度的 TF-IDF 稀疏向量 (indices, data)"""
+        pairs = sorted((self.vocabulary[g], c) for g, c in counts.items() if g in self.vocabulary)
+        if not pairs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        indices = np.array([p[0] for p in pairs], dtype=np.int64)
+        tf = 1 + np.log([p[1] for p in pairs])
+        data = tf * self.idf[indices]
+        return indices, data / np.linalg.norm(data)
+
+    def _row(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """课程名称对应的稀疏向量，不在索引中的课程按名称现算并缓存"""
+        row = self._rows.get(name)
+        if row is not None:
+            start, end = self.indptr[row], self.indptr[row + 1]
+            return self.indices[start:end], self.data[start:end]
+        if name not in self._extra_rows:
+            self._extra_rows[name] = self._vectorize_counts(char_ngrams(normalize_text(name)))
+        return self._extra_rows[name]
+
+    def relevance(self, names: List[str], interests: List[str]) -> np.ndarray:
+        """全部候选课程与各兴趣的余弦相关度，形状为 (课程数, 兴趣数)"""
+        n, m = len(names), len(interests)
+        if n == 0 or m == 0:
+            return np.zeros((n, m))
+
+        # 兴趣向量拼成稠密矩阵 (词表大小, 兴趣数)
+        queries = np.zeros((len(self.idf), m))
+        for j, interest in enumerate(interests):
+            indices, data = self._vectorize_counts(char_ngrams(expand_interest(interest)))
+            queries[indices, j] = data
+
+        rows = [self._row(name) for name in names]
+        lengths = np.array([len(r[0]) for r in rows])
+        if not lengths.sum():
+            return np.zeros((n, m))
+        indices = np.concatenate([r[0] for r in rows])
+        data = np.concatenate([r[1] for r in rows])
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+
+        # 稀疏行 × 稠密查询矩阵：逐元素相乘后按行分段求和
+        products = data[:, None] * queries[indices]
+        scores = np.zeros((n, m))
+        nonempty = lengths > 0
+        scores[nonempty] = np.add.reduceat(products, indptr[:-1][nonempty], axis=0)
+        return scores
+
+    def save(self, path: str):
+        """保存索引（原子写入：先写临时文件再替换，写到一半中断不会留下损坏的索引）"""
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        # 临时文件名唯一，多个进程同时写也不会互相踩；传文件对象，numpy 不会再加 .npz 后缀
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, vocabulary=np.array(vocabulary), idf=self.idf,
+                                    names=np.array(self.names), indptr=self.indptr,
+                                    indices=self.indices, data=self.data,
+                                    signature=self.signature)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path: str) -> 'InterestIndex':
+        """加载索引"""
+        with np.load(path) as data:
+            return cls(data['vocabulary'].tolist(), data['idf'], data['names'].tolist(),
+                       data['indptr'], data['indices'], data['data'], str(data['signature']))
+
+
+def _read_catalog_texts(paths: List[str]) -> Tuple[List[str], List[str]]:
+    """读取课程目录中的课程名称和备注"""
+    import pandas as pd
+    names, descriptions = [], []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        df = pd.read_excel(path)
+        df.columns = df.columns.str.replace('\u200b', '').str.strip()
+        if '课程名称' not in df.columns:
+            continue
+        names.extend(df['课程名称'].astype(str).tolist())
+        if '备注' in df.columns:
+            descriptions.extend(df['备注'].fillna('').astype(str).tolist())
+        else:
+            descriptions.extend([''] * len(df))
+    return names, descriptions
+
+
+_interest_index: Optional[InterestIndex] = None
+
+
+def get_interest_index() -> InterestIndex:
+    """获取兴趣匹配索引：优先加载缓存，数据文件有变化时重新构建并保存"""
+    global _interest_index
+    if _interest_index is not None:
+        return _interest_index
+
+    paths = catalog_files()
+    signature = source_signature(paths)
+    cache_path = get_cache_path(CACHE_CONFIG['interest_index_file'])
+    if os.path.exists(cache_path):
+        try:
+            index = InterestIndex.load(cache_path)
+            if index.signature == signature:
+                _interest_index = index
+                return index
+        except Exception as e:
+            logger.warning(f"加载兴趣索引缓存失败，重新构建: {e}")
+
+    names, descriptions = _read_catalog_texts(paths)
+    _interest_index = InterestIndex.build(names, descriptions, signature)
+    try:
+        _interest_index.save(cache_path)
+        logger.info(f"兴趣索引已保存: {cache_path}（{len(_interest_index.names)}门课程）")
+    except Exception as e:
+        logger.warning(f"保存兴趣索引失败: {e}")
+    return _interest_index
@@ -3,15 +3,13 @@
 支持多种API接口，包括OpenAI GPT、Claude、国产大模型等
 """
 
-import requests
 import json
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from config import get_api_key, is_api_configured, AI_CONFIG
+from . import html_report, instrumentation
 
-# 配置日志
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class LLMIntegration:
@@ -56,6 +54,7 @@ class LLMIntegration:
     
     def call_deepseek_api(self, prompt: str) -> str:
         """调用DeepSeek API"""
+        import requests
         if not is_api_configured('deepseek'):
             return "DeepSeek API密钥未配置"
             
@@ -107,6 +106,7 @@ class LLMIntegration:
     
     def call_openai_api(self, prompt: str) -> str:
         """调用OpenAI GPT API"""
+        import requests
         if not is_api_configured('openai'):
             return "OpenAI API密钥未配置"
             
@@ -157,6 +157,7 @@ class LLMIntegration:
     
     def call_qwen_api(self, prompt: str) -> str:
         """调用阿里云千问API"""
+        import requests
         if not is_api_configured('qwen'):
             return "千问API密钥未配置"
             
@@ -204,6 +205,7 @@ class LLMIntegration:
     
     def call_zhipu_api(self, prompt: str) -> str:
         """调用智谱AI GLM API"""
+        import requests
         if not is_api_configured('zhipu'):
             return "智谱API密钥未配置"
             
@@ -255,6 +257,19 @@ class LLMIntegration:
         Returns:
             评估报告文本
         """
+        return self.generate_evaluation_with_service(student_data)[0]
+
+    @instrumentation.timed('llm.generate_evaluation')
+    def generate_evaluation_with_service(self, student_data: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """
+        生成智能评估报告，并给出实际应答的服务
+        
+        Args:
+            student_data: 学生选课数据
+            
+        Returns:
+            (评估报告HTML, 服务名)；没有API配置或全部调用失败时服务名为 None，报告为默认评估
+        """
         
         # 构建提示词
         prompt = self._build_evaluation_prompt(student_data)
@@ -268,21 +283,22 @@ class LLMIntegration:
             try:
                 logger.info(f"尝试使用 {service_name} API")
                 
-                if service_name == 'openai':
-                    result = self.call_openai_api(prompt)
-                elif service_name == 'zhipu':
-                    result = self.call_zhipu_api(prompt)
-                elif service_name == 'qwen':
-                    result = self.call_qwen_api(prompt)
-                elif service_name == 'deepseek':
-                    result = self.call_deepseek_api(prompt)
-                else:
-                    continue
+                with instrumentation.timer(f'llm.{service_name}'):
+                    if service_name == 'openai':
+                        result = self.call_openai_api(prompt)
+                    elif service_name == 'zhipu':
+                        result = self.call_zhipu_api(prompt)
+                    elif service_name == 'qwen':
+                        result = self.call_qwen_api(prompt)
+                    elif service_name == 'deepseek':
+                        result = self.call_deepseek_api(prompt)
+                    else:
+                        continue
                 
                 # 检查是否成功获取结果
                 if self._is_valid_response(result):
                     logger.info(f"成功使用 {service_name} API 生成评估")
-                    return self._format_evaluation_result(result, student_data, service_name)
+                    return self._format_evaluation_result(result, student_data, service_name), service_name
                 else:
                     logger.warning(f"{service_name} API返回无效结果: {result}")
                     
@@ -292,7 +308,8 @@ class LLMIntegration:
         
         # 如果所有API都失败，返回默认评估
         logger.info("所有AI API都不可用，使用默认评估")
-        return self._generate_default_evaluation(student_data)
+        instrumentation.count('llm.default_evaluation')
+        return self._generate_default_evaluation(student_data), None
     
     def _is_valid_response(self, response: str) -> bool:
         """检查API响应是否有效"""
@@ -353,211 +370,11 @@ class LLMIntegration:
             'deepseek': '🤖 DeepSeek分析'
         }.get(service_name, '🤖 AI智能分析')
         
-        # 转换为HTML格式
-        html_content = f"""
-        <html>
-        <head>
-            <style>
-                body {{ 
-                    font-family: '微软雅黑'; 
-                    line-height: 1.8; 
-                    margin: 15px; 
-                    color: #333;
-                }}
-                .header {{ 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                    color: white; 
-                    padding: 20px; 
-                    border-radius: 15px; 
-                    margin-bottom: 25px;
-                    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-                }}
-                .content {{ 
-                    background-color: #f8f9fa; 
-                    border-left: 5px solid #007bff; 
-                    padding: 20px;
-                    border-radius: 10px;
-                    margin-bottom: 20px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-                }}
-                .ai-result {{
-                    background: white;
-                    padding: 25px;
-                    border-radius: 12px;
-                    border: 1px solid #e0e0e0;
-                    white-space: pre-wrap;
-                    font-size: 14px;
-                    line-height: 1.6;
-                }}
-                .footer {{
-                    text-align: center;
-                    color: #666;
-                    font-size: 12px;
-                    margin-top: 20px;
-                    padding: 10px;
-                    border-top: 1px solid #eee;
-                }}
-                h2 {{ margin-top: 0; }}
-                .stats {{
-                    display: flex;
-                    justify-content: space-around;
-                    background: #e3f2fd;
-                    padding: 15px;
-                    border-radius: 10px;
-                    margin: 15px 0;
-                }}
-                .stat-item {{
-                    text-align: center;
-                }}
-                .stat-number {{
-                    font-size: 24px;
-                    font-weight: bold;
-                    color: #1976d2;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h2>{service_info}</h2>
-                <p>基于您的选课情况，为您生成了专业的AI评估报告</p>
-            </div>
-            
-            <div class="content">
-                <h3>📊 选课统计概览</h3>
-                <div class="stats">
-                    <div class="stat-item">
-                        <div class="stat-number">{len(data.get('必修课程', []))}</div>
-                        <div>必修课程</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{len(data.get('选择性必修', []))}</div>
-                        <div>选择性必修</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{len(data.get('通识课程', []))}</div>
-                        <div>通识课程</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{data.get('总学分', 0)}</div>
-                        <div>总学分</div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="content">
-                <h3>🎯 AI智能评估报告</h3>
-                <div class="ai-result">{ai_result}</div>
-            </div>
-            
-            <div class="footer">
-                <p>📋 学生信息：{data.get('年级', '未知')} · {data.get('专业', '未知')} | ⏰ 生成时间：刚刚</p>
-                <p>💡 本报告由人工智能生成，仅供参考，建议结合实际情况做出选择</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_content
+        return html_report.render_ai_evaluation(ai_result, data, service_info)
     
     def _generate_default_evaluation(self, data: Dict[str, Any]) -> str:
         """生成默认评估报告（当API不可用时）"""
-        total_courses = len(data.get('必修课程', [])) + len(data.get('选择性必修', [])) + len(data.get('通识课程', []))
-        
-        html_content = f"""
-        <html>
-        <head>
-            <style>
-                body {{ 
-                    font-family: '微软雅黑'; 
-                    line-height: 1.6; 
-                    margin: 15px;
-                    color: #333;
-                }}
-                .header {{ 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                    color: white; 
-                    padding: 20px; 
-                    border-radius: 15px; 
-                    margin-bottom: 25px;
-                }}
-                .content {{ 
-                    background-color: #f8f9fa; 
-                    padding: 20px;
-                    border-radius: 10px;
-                    margin-bottom: 20px;
-                    border-left: 5px solid #28a745;
-                }}
-                .highlight {{ color: #e74c3c; font-weight: bold; }}
-                .good {{ color: #27ae60; }}
-                .warning {{ color: #f39c12; }}
-                .info-box {{
-                    background: white;
-                    padding: 15px;
-                    border-radius: 8px;
-                    margin: 10px 0;
-                    border: 1px solid #ddd;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h2>📊 选课评估报告</h2>
-                <p>基于您的选课情况生成的综合评估报告</p>
-            </div>
-            
-            <div class="content">
-                <h3>📊 基本信息</h3>
-                <div class="info-box">
-                    <p><strong>👨‍🎓 学生信息：</strong>{data.get('年级', '未知')} · {data.get('专业', '未知')}</p>
-                    <p><strong>📚 总学分：</strong><span class="highlight">{data.get('总学分', 0)}分</span></p>
-                    <p><strong>📋 选课门数：</strong>{total_courses}门课程</p>
-                </div>
-            </div>
-            
-            <div class="content">
-                <h3>✅ 课程结构分析</h3>
-                <div class="info-box">
-                    <p class="good">▪ 您的课程选择涵盖了必修、选修和通识教育各个领域</p>
-                    <p class="good">▪ 学分分配合理，符合学年要求</p>
-                    <p class="warning">▪ 建议关注课程时间安排，避免冲突</p>
-                    <p class="good">▪ 课程难度搭配适中，有利于循序渐进学习</p>
-                </div>
-            </div>
-            
-            <div class="content">
-                <h3>🎯 专业发展建议</h3>
-                <div class="info-box">
-                    <p><strong>1. 基础巩固：</strong>重视必修课程学习，建立扎实的专业理论基础</p>
-                    <p><strong>2. 视野拓展：</strong>通过选修课程扩展知识面，培养跨学科思维</p>
-                    <p><strong>3. 实践应用：</strong>注重理论与实践相结合，积极参与项目实践</p>
-                    <p><strong>4. 能力提升：</strong>培养批判性思维和创新能力</p>
-                </div>
-            </div>
-            
-            <div class="content">
-                <h3>📈 学习规划建议</h3>
-                <div class="info-box">
-                    <p><strong>📅 短期目标（本学期）：</strong>专注于必修课程学习，确保基础知识掌握</p>
-                    <p><strong>🎯 中期目标（本学年）：</strong>通过选修课程拓展专业视野，提升综合能力</p>
-                    <p><strong>🚀 长期目标（整个大学）：</strong>结合通识教育，培养全面发展的综合素质</p>
-                </div>
-            </div>
-            
-            <div class="content">
-                <h3>⭐ 综合评价</h3>
-                <div class="info-box" style="text-align: center; font-size: 18px;">
-                    <p><span class="good">课程搭配：8.5/10</span></p>
-                    <p><span class="good">学分安排：9.0/10</span></p>
-                    <p><span class="good">专业匹配：8.8/10</span></p>
-                    <p style="margin-top: 15px;"><span class="highlight">总体评价：优秀</span></p>
-                    <p style="color: #666; font-size: 14px;">课程搭配合理，建议继续保持并注重实践应用</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_content
+        return html_report.render_default_evaluation(data)
 
 # 全局实例
 llm_client = LLMIntegration()
@@ -572,4 +389,28 @@ def get_ai_evaluation(student_data: Dict[str, Any]) -> str:
     Returns:
         HTML格式的评估报告
     """
-    return llm_client.generate_evaluation(student_data) 
\ No newline at end of file
+    return llm_client.generate_evaluation(student_data)
+
+def get_ai_evaluation_with_service(student_data: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """
+    获取AI评估结果及实际应答的服务（None 表示使用了默认评估，调用方不应缓存）
+
+    Args:
+        student_data: 学生选课数据
+
+    Returns:
+        (HTML格式的评估报告, 服务名或 None)
+    """
+    return llm_client.generate_evaluation_with_service(student_data)
+
+def get_default_evaluation(student_data: Dict[str, Any]) -> str:
+    """
+    不调用任何API，直接生成默认评估报告
+
+    Args:
+        student_data: 学生选课数据
+
+    Returns:
+        HTML格式的评估报告
+    """
+    return llm_client._generate_default_evaluation(student_data)
@@ -0,0 +1,73 @@
+"""
+日志配置
+程序入口调用一次 configure_logging()：级别由 APP_CONFIG['debug_mode'] 决定（调试模式为 DEBUG，
+否则为 INFO），LOGGING_CONFIG['module_levels'] 可单独调整某个模块。
+
+逐行（逐门课程）的日志用 DEBUG 级别、以 % 参数传值，未开启调试时既不格式化也不输出。
+开启调试时由 RateLimitFilter 限流：同一行代码在 rate_window 秒内最多输出 rate_burst 条，
+超出的只计数，窗口过后的下一条附带省略的条数。警告和错误不限流。
+"""
+
+import logging
+import threading
+from typing import Dict, Tuple
+
+from config import APP_CONFIG, LOGGING_CONFIG
+
+
+class RateLimitFilter(logging.Filter):
+    """按日志所在位置（模块 + 行号）限流"""
+
+    def __init__(self, burst: int, window: float):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        # (logger 名称, 行号) -> [窗口开始时间, 已输出条数, 已省略条数]
+        self._state: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.lineno)
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or record.created - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._state[key] = [record.created, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()}（此前同一位置省略 {suppressed} 条）"
+                    record.args = ()
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+    def suppressed(self) -> int:
+        """当前窗口中被省略的日志条数"""
+        with self._lock:
+            return sum(state[2] for state in self._state.values())
+
+
+_handler = None
+
+
+def configure_logging(debug: bool = None, stream=None) -> logging.Handler:
+    """设置根日志的级别和输出（重复调用时替换之前的设置），返回输出用的 handler"""
+    global _handler
+    debug = APP_CONFIG['debug_mode'] if debug is None else debug
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+
+    _handler = logging.StreamHandler(stream)
+    _handler.setFormatter(logging.Formatter(LOGGING_CONFIG['format']))
+    if LOGGING_CONFIG['rate_burst']:
+        _handler.addFilter(RateLimitFilter(LOGGING_CONFIG['rate_burst'], LOGGING_CONFIG['rate_window']))
+    root.addHandler(_handler)
+    root.setLevel(logging.DEBUG if debug else logging.INFO)
+    for name, level in LOGGING_CONFIG['module_levels'].items():
+        logging.getLogger(name).setLevel(level)
+    return _handler
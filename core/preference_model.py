@@ -0,0 +1,356 @@
+"""
+选课偏好模型
+在课程评分数据和选课记录上离线训练线性打分模型（带先验的逻辑回归），
+权重保存为一个很小的 .npz 文件，AIRecommender 批量打分时直接做一次矩阵乘法。
+
+用法:
+    python -m core.preference_model train      训练并保存模型
+    python -m core.preference_model evaluate   对比模型与手工权重的排序质量和打分耗时
+                                               （留出部分评分课程和选课记录，只在留出的数据上评估；
+                                               给出 --model 时评估已保存的模型）
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import CACHE_CONFIG, get_cache_path
+from .course_scheduler import CourseScheduler, create_course_from_dict
+from .course_rating import course_rating_manager
+from .ai_recommender import (AIRecommender, StudentProfile, FEATURE_COLUMNS,
+                            SCORE_COMPONENTS, HEURISTIC_WEIGHTS, score_components)
+
+logger = logging.getLogger(__name__)
+
+# 先验：把手工权重换算到逻辑回归的尺度，手工总分 0-100 对应 logit -2~2
+PRIOR_WEIGHTS = HEURISTIC_WEIGHTS / 100 * 4
+PRIOR_BIAS = -2.0
+
+
+class PreferenceModel:
+    """线性偏好模型：打分 = 100 * sigmoid(分量 @ weights + bias)，取值 0-100"""
+
+    def __init__(self, weights: np.ndarray, bias: float = PRIOR_BIAS,
+                 trained_at: str = '', sample_count: int = 0):
+        self.weights = np.asarray(weights, dtype=float)
+        self.bias = float(bias)
+        self.trained_at = trained_at
+        self.sample_count = sample_count
+
+    def score_components(self, components: np.ndarray) -> np.ndarray:
+        """对打分分量矩阵整体打分"""
+        return 100 * _sigmoid(components @ self.weights + self.bias)
+
+    def save(self, path: str = None) -> str:
+        """保存模型权重"""
+        path = path or get_cache_path(CACHE_CONFIG['preference_model_file'])
+        np.savez(path,
+                 weights=self.weights,
+                 bias=self.bias,
+                 components=np.array(SCORE_COMPONENTS),
+                 trained_at=self.trained_at,
+                 sample_count=self.sample_count)
+        logger.info(f"偏好模型已保存: {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional['PreferenceModel']:
+        """加载模型权重，文件不存在或分量定义不一致时返回None"""
+        path = path or get_cache_path(CACHE_CONFIG['preference_model_file'])
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                if tuple(data['components'].tolist()) != SCORE_COMPONENTS:
+                    logger.warning("偏好模型的打分分量与当前版本不一致，忽略该模型")
+                    return None
+                return cls(data['weights'], float(data['bias']),
+                           str(data['trained_at']), int(data['sample_count']))
+        except Exception as e:
+            logger.error(f"加载偏好模型失败: {e}")
+            return None
+
+
+def log_course_selection(offered: List[Dict], selected_names, course_type: str,
+                         grade: str = None, major: str = None, existing_times: List[str] = None,
+                         preferred_workload: str = 'medium', path: str = None):
+    """追加一条选课记录，作为偏好模型的训练数据
+
+    Args:
+        offered: 本次展示给学生的课程（字典格式同 create_course_from_dict）
+        selected_names: 学生最终选中的课程名称
+        course_type: 课程类型
+        grade, major: 年级和专业
+        existing_times: 此前已选课程的上课时间
+        preferred_workload: 学生期望的工作量
+    """
+    try:
+        selected_names = set(selected_names)
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'grade': grade,
+            'major': major,
+            'course_type': course_type,
+            'preferred_workload': preferred_workload,
+            'existing_times': [t for t in (existing_times or []) if t],
+            'offered': []
+        }
+        for course_dict in offered:
+            course = create_course_from_dict(course_dict)
+            entry['offered'].append({
+                'name': course.name,
+                'credit': course.credit,
+                'time': course.time,
+                'selected': course.name in selected_names
+            })
+        path = path or get_cache_path(CACHE_CONFIG['selection_log_file'])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    except Exception as e:
+        logger.warning(f"记录选课数据失败: {e}")
+
+
+def load_selection_log(path: str = None) -> List[Dict]:
+    """读取选课记录"""
+    path = path or get_cache_path(CACHE_CONFIG['selection_log_file'])
+    if not os.path.exists(path):
+        return []
+    events = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning("跳过无法解析的选课记录")
+    return events
+
+
+def rating_samples() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """由课程评分表构造训练样本
+
+    每门课一个样本，标签为该课程各位老师"平均分/有效评价条数"的均值（换算到0-1），
+    样本权重随评价条数增长。
+    """
+    data = course_rating_manager.ratings_data
+    empty = (np.zeros((0, len(SCORE_COMPONENTS))), np.zeros(0), np.zeros(0))
+    if data is None or data.empty or '课程' not in data.columns:
+        return empty
+
+    total = pd.to_numeric(data.get('平均分'), errors='coerce')
+    count = pd.to_numeric(data.get('有效评价条数'), errors='coerce')
+    per_review = (total / count).where(count > 0)
+    frame = pd.DataFrame({'课程': data['课程'].map(course_rating_manager.resolve_course_name),
+                          'label': per_review, 'count': count})
+    frame = frame.dropna(subset=['课程', 'label'])
+    if frame.empty:
+        return empty
+    grouped = frame.groupby('课程').agg(label=('label', 'mean'), count=('count', 'sum'))
+
+    table = course_rating_manager.get_course_feature_table().reindex(grouped.index).fillna(0)
+    features = np.zeros((len(grouped), len(FEATURE_COLUMNS)))
+    features[:, 0] = table['workload'].to_numpy(dtype=float)
+    features[:, 1] = table['content_score'].to_numpy(dtype=float)
+    features[:, 2] = table['review_count'].to_numpy(dtype=float)
+    features[:, 3] = 1  # 评分数据不含时间信息，按无冲突处理
+    components = score_components(features, 'medium')
+    labels = np.clip(grouped['label'].to_numpy(dtype=float) / 100, 0, 1)
+    weights = np.log1p(grouped['count'].to_numpy(dtype=float))
+    return components, labels, weights
+
+
+def split_rating_samples(samples: Tuple[np.ndarray, np.ndarray, np.ndarray], holdout: float,
+                         seed: int = 0) -> Tuple[Tuple, Tuple]:
+    """把评分样本随机分成 (训练, 留出) 两部分，seed 固定时划分可复现"""
+    components, labels, weights = samples
+    order = np.random.default_rng(seed).permutation(len(labels))
+    test = order[:int(round(len(labels) * holdout))]
+    train_rows = np.sort(order[len(test):])
+    test = np.sort(test)
+    return ((components[train_rows], labels[train_rows], weights[train_rows]),
+            (components[test], labels[test], weights[test]))
+
+
+def event_components(event: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """把一条选课记录转换为 (打分分量, 是否选中)"""
+    scheduler = CourseScheduler()
+    for i, time_str in enumerate(event.get('existing_times', [])):
+        scheduler.add_selected_course(create_course_from_dict({'name': f'已选{i}', 'time': time_str}))
+    recommender = AIRecommender(scheduler)
+    recommender.set_student_profile(StudentProfile(
+        age=event.get('grade') or '', major=event.get('major') or '', interests=[],
+        preferred_workload=event.get('preferred_workload') or 'medium',
+        preferred_assessment='mixed', preferred_teaching_style='balanced'
+    ))
+    courses = []
+    labels = []
+    for item in event.get('offered', []):
+        course = create_course_from_dict(dict(item, course_type=event.get('course_type', '')))
+        courses.append(course)
+        labels.append(1.0 if item.get('selected') else 0.0)
+    features, _ = recommender.build_feature_matrix(courses)
+    components = score_components(features, recommender.student_profile.preferred_workload)
+    return components, np.array(labels)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-np.clip(x, -50, 50)))
+
+
+def fit_logistic(components: np.ndarray, labels: np.ndarray, sample_weights: np.ndarray,
+                 l2: float = 1.0, iterations: int = 50) -> Tuple[np.ndarray, float]:
+    """带先验的加权逻辑回归（牛顿法+回溯线搜索），正则项把参数拉向手工权重换算出的先验"""
+    n, d = components.shape
+    X = np.hstack([components, np.ones((n, 1))])
+    prior = np.append(PRIOR_WEIGHTS, PRIOR_BIAS)
+
+    def loss(theta):
+        z = X @ theta
+        # log(1 + e^z) - y*z 的数值稳定写法
+        nll = np.logaddexp(0, z) - labels * z
+        return float(sample_weights @ nll + l2 / 2 * np.sum((theta - prior) ** 2))
+
+    theta = prior.copy()
+    current = loss(theta)
+    for _ in range(iterations):
+        p = _sigmoid(X @ theta)
+        gradient = X.T @ (sample_weights * (p - labels)) + l2 * (theta - prior)
+        hessian = (X.T * (sample_weights * p * (1 - p))) @ X + l2 * np.eye(d + 1)
+        step = np.linalg.solve(hessian, gradient)
+        rate = 1.0
+        while rate > 1e-4:
+            candidate = theta - rate * step
+            candidate_loss = loss(candidate)
+            if candidate_loss <= current:
+                break
+            rate /= 2
+        else:
+            break
+        theta, improvement = candidate, current - candidate_loss
+        current = candidate_loss
+        if improvement < 1e-10:
+            break
+    return theta[:d], float(theta[d])
+
+
+def train(events: List[Dict], l2: float = 1.0, ratings: Tuple = None) -> PreferenceModel:
+    """在评分数据和选课记录上训练偏好模型（ratings 为要用的评分样本，默认全部）"""
+    parts = [rating_samples() if ratings is None else ratings]
+    for event in events:
+        components, labels = event_components(event)
+        if len(labels):
+            parts.append((components, labels, np.ones(len(labels))))
+
+    components = np.vstack([p[0] for p in parts])
+    labels = np.concatenate([p[1] for p in parts])
+    sample_weights = np.concatenate([p[2] for p in parts])
+    if not len(labels):
+        logger.warning("没有可用的训练样本，使用先验权重")
+        return PreferenceModel(PRIOR_WEIGHTS, PRIOR_BIAS)
+
+    weights, bias = fit_logistic(components, labels, sample_weights, l2=l2)
+    return PreferenceModel(weights, bias,
+                           trained_at=datetime.now().isoformat(timespec='seconds'),
+                           sample_count=len(labels))
+
+
+def ndcg_at_k(scores: np.ndarray, relevance: np.ndarray, k: int = 5) -> float:
+    """按 scores 排序后的 NDCG@k"""
+    if not len(scores) or relevance.max() <= 0:
+        return float('nan')
+    k = min(k, len(scores))
+    discounts = 1 / np.log2(np.arange(2, k + 2))
+    order = np.argsort(-scores, kind='stable')[:k]
+    ideal = np.sort(relevance)[::-1][:k]
+    return float((relevance[order] * discounts).sum() / (ideal * discounts).sum())
+
+
+def evaluate(model: PreferenceModel, events: List[Dict], ratings: Tuple, k: int = 5, candidates: int = 10000):
+    """对比模型与手工权重：排序质量（NDCG@k）与批量打分耗时
+
+    events 和 ratings（评分样本）应是训练时没有用到的数据。
+    """
+    queries = []
+    components, labels, _ = ratings
+    if len(labels):
+        queries.append(('评分表', components, labels))
+    for event in events:
+        event_parts, event_labels = event_components(event)
+        if len(event_labels) and event_labels.max() > 0:
+            queries.append(('选课记录', event_parts, event_labels))
+
+    print(f"排序质量 (NDCG@{k})")
+    print(f"{'数据':<8} {'查询数':>6} {'手工权重':>10} {'偏好模型':>10}")
+    for source in ('评分表', '选课记录'):
+        subset = [q for q in queries if q[0] == source]
+        if not subset:
+            print(f"{source:<8} {0:>6} {'-':>10} {'-':>10}")
+            continue
+        heuristic = np.nanmean([ndcg_at_k(c @ HEURISTIC_WEIGHTS, y, k) for _, c, y in subset])
+        learned = np.nanmean([ndcg_at_k(model.score_components(c), y, k) for _, c, y in subset])
+        print(f"{source:<8} {len(subset):>6} {heuristic:>10.4f} {learned:>10.4f}")
+
+    # 与 build_feature_matrix 的输出同形状（FEATURE_COLUMNS 的每一列）
+    rng = np.random.default_rng(0)
+    ranges = {'workload': 100, 'content_score': 10, 'review_count': 50}
+    features = np.zeros((candidates, len(FEATURE_COLUMNS)))
+    for column, name in enumerate(FEATURE_COLUMNS):
+        if name in ('is_general', 'interest_match'):
+            features[:, column] = rng.integers(0, 2, candidates)
+        else:
+            features[:, column] = rng.uniform(0, ranges.get(name, 1), candidates)
+    repeat = 20
+    start = time.perf_counter()
+    for _ in range(repeat):
+        score_components(features, 'medium') @ HEURISTIC_WEIGHTS
+    heuristic_ms = (time.perf_counter() - start) / repeat * 1000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.score_components(score_components(features, 'medium'))
+    learned_ms = (time.perf_counter() - start) / repeat * 1000
+    print(f"\n批量打分耗时（{candidates}门候选）: 手工权重 {heuristic_ms:.2f}ms, 偏好模型 {learned_ms:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="选课偏好模型训练与评估")
+    parser.add_argument('command', choices=['train', 'evaluate'])
+    parser.add_argument('--log', help="选课记录文件路径")
+    parser.add_argument('--model', help="模型文件路径")
+    parser.add_argument('--l2', type=float, default=1.0, help="向先验权重收缩的正则强度")
+    parser.add_argument('--holdout', type=float, default=0.2, help="评估时留出的评分课程和选课记录比例")
+    args = parser.parse_args()
+
+    events = load_selection_log(args.log)
+    if args.command == 'train':
+        model = train(events, l2=args.l2)
+        path = model.save(args.model)
+        print(f"训练完成: {model.sample_count}个样本, 模型已保存到 {path}")
+        for name, weight in zip(SCORE_COMPONENTS, model.weights):
+            print(f"  {name:<18} {weight:8.3f}")
+        print(f"  {'bias':<18} {model.bias:8.3f}")
+    else:
+        split = int(len(events) * (1 - args.holdout))
+        train_ratings, test_ratings = split_rating_samples(rating_samples(), args.holdout)
+        if args.model:
+            # 已保存的模型：同样只看留出的部分（若模型是在全部数据上训练的，结果会偏乐观）
+            model = PreferenceModel.load(args.model)
+            if model is None:
+                parser.error(f"无法加载模型: {args.model}")
+            print(f"评估已保存的模型: {args.model}（训练于 {model.trained_at or '未知'}，"
+                  f"{model.sample_count}个样本）")
+        else:
+            model = train(events[:split], l2=args.l2, ratings=train_ratings)
+        evaluate(model, events[split:], test_ratings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+课表导出（iCalendar、XLSX）与批量打包
+输入是界面 user_data 格式的选课结果（age、major 和各分类课程，批量排课见 batch_scheduler.result_selection），
+与 core.html_report 相同。
+
+    write_ics        按周展开的日历事件（作息时间与起始日期见 config.EXPORT_CONFIG）
+    write_xlsx       openpyxl 只写模式：课表网格 + 课程列表
+    ScheduleArchive  把多名学生的课表逐个写进一个 zip，每个文件写完即落盘，不在内存中攒整个归档
+
+PDF 需要 Qt（schedule_pdf.py），导入该模块时通过 register_format 加入 FORMATS。
+"""
+
+import hashlib
+import re
+import zipfile
+from datetime import date, datetime, timedelta, timezone
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from config import EXPORT_CONFIG
+from .conflict_index import time_mask
+from .html_report import (CATEGORIES, LINKED_STYLE, STYLESHEET, STYLESHEET_FILE, file_stem,
+                          mask_grid, render_final_schedule, unique_stem)
+
+PERIODS = 12
+WEEKDAYS = ('周一', '周二', '周三', '周四', '周五', '周六', '周日')
+
+# 课表时间列，如 "第1节 (8:00-8:50)"
+PERIOD_LABELS = [f"第{period}节 ({start.lstrip('0')}-{end.lstrip('0')})"
+                 for period, (start, end) in enumerate(EXPORT_CONFIG['period_times'], start=1)]
+
+# 导出表格中各类课程的底色（与 html_report 的样式表相同）
+TYPE_COLORS = {'必修课': 'FFE4E1', '选择性必修课': 'E0FFFF', '通识课': 'F0FFF0'}
+OVERLAP_COLOR = 'FFCDD2'
+
+# 单双周标记，如 "星期三(第10节-第11节)(单)"
+_PARITY = {'单': 1, '双': 0}
+_PARITY_MARK = re.compile(r'\((单|双)\)')
+_SEGMENT_SPLIT = re.compile(r'\s+')
+
+
+def selection_courses(selection: Dict) -> Iterator[Tuple[Dict, str]]:
+    """选课结果中的全部课程：(课程字典, 课程类型)"""
+    for key, course_type, _ in CATEGORIES:
+        for course in selection.get(key, []):
+            yield course, course_type
+
+
+def course_time(course: Dict) -> str:
+    return str(course.get('time') or course.get('上课时间') or '')
+
+
+def parse_weeks(text, default_weeks: int = None) -> List[int]:
+    """起止周，如 "1-16"、"1-8,10-16"、"3"；没有时为 1..default_weeks"""
+    weeks = []
+    for part in re.split(r'[,，\s]+', str(text or '').strip()):
+        bounds = re.findall(r'\d+', part)
+        if len(bounds) == 1:
+            weeks.append(int(bounds[0]))
+        elif len(bounds) >= 2:
+            weeks.extend(range(int(bounds[0]), int(bounds[1]) + 1))
+    return weeks or list(range(1, (default_weeks or EXPORT_CONFIG['weeks']) + 1))
+
+
+def time_blocks(time_str: str) -> List[Tuple[int, int, int, Optional[int]]]:
+    """上课时间 -> [(星期0-6, 第一节, 最后一节, 单双周)]，连续的节次合为一段；单双周为 1/0，不限时为 None"""
+    blocks = []
+    for segment in _SEGMENT_SPLIT.split(time_str.strip()):
+        mark = _PARITY_MARK.search(segment)
+        parity = _PARITY[mark.group(1)] if mark else None
+        mask = time_mask(segment)
+        for day in range(len(WEEKDAYS)):
+            day_bits = (mask >> (day * PERIODS)) & ((1 << PERIODS) - 1)
+            period = 0
+            while day_bits:
+                if day_bits & 1:
+                    first = period
+                    while day_bits & 1:
+                        day_bits >>= 1
+                        period += 1
+                    blocks.append((day, first + 1, period, parity))
+                else:
+                    day_bits >>= 1
+                    period += 1
+    return blocks
+
+
+# ---- iCalendar ----
+
+# 北京时间没有夏令时，时区定义固定为 +0800
+_VTIMEZONE = ("BEGIN:VTIMEZONE", "TZID:Asia/Shanghai", "BEGIN:STANDARD", "DTSTART:19700101T000000",
+              "TZOFFSETFROM:+0800", "TZOFFSETTO:+0800", "TZNAME:CST", "END:STANDARD", "END:VTIMEZONE")
+
+
+def _ics_text(value) -> str:
+    """iCalendar 文本值的转义"""
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line: str) -> str:
+    """按 RFC 5545 每行不超过 75 个字节折行（不拆开 UTF-8 字符）"""
+    # 一个字符最多 3 个字节，不超过 25 个字符的行不必再编码检查
+    if len(line) <= 25 or len(line.encode('utf-8')) <= 75:
+        return line
+    parts, current, size = [], [], 0
+    for char in line:
+        width = len(char.encode('utf-8'))
+        if size + width > 75:
+            parts.append(''.join(current))
+            current, size = [' '], 1
+        current.append(char)
+        size += width
+    parts.append(''.join(current))
+    return '\r\n'.join(parts)
+
+
+def _period_time(period: int, end: bool) -> Tuple[int, int]:
+    hour, minute = EXPORT_CONFIG['period_times'][period - 1][1 if end else 0].split(':')
+    return int(hour), int(minute)
+
+
+def ics_lines(selection: Dict, stamp: datetime = None) -> Iterator[str]:
+    """日历的各行（未折行）：每门课每周每段一个事件"""
+    semester_start = date.fromisoformat(EXPORT_CONFIG['semester_start'])
+    stamp = (stamp or datetime.now(timezone.utc)).strftime('%Y%m%dT%H%M%SZ')
+    grade, major = selection.get('age', ''), selection.get('major', '')
+    student = str(selection.get('id') or f"{grade}{major}")
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield "PRODID:-//PKU Course Selection//Schedule Export//ZH"
+    yield "CALSCALE:GREGORIAN"
+    yield f"X-WR-CALNAME:{_ics_text(f'{grade} {major} 课表'.strip())}"
+    yield "X-WR-TIMEZONE:Asia/Shanghai"
+    yield from _VTIMEZONE
+    for course, course_type in selection_courses(selection):
+        name = course.get('name', '')
+        uid_base = hashlib.md5(f"{student}|{course_type}|{name}".encode('utf-8')).hexdigest()[:16]
+        summary = _ics_text(name)
+        location = _ics_text(course.get('location', '') or '')
+        description = _ics_text(f"教师：{course.get('teacher', '')}\n学分：{course.get('credit', '')}\n"
+                                f"类型：{course_type}\n时间：{course_time(course)}")
+        weeks = parse_weeks(course.get('weeks') or course.get('起止周'))
+        for day, first, last, parity in time_blocks(course_time(course)):
+            start_hour, start_minute = _period_time(first, end=False)
+            end_hour, end_minute = _period_time(last, end=True)
+            for week in weeks:
+                if parity is not None and week % 2 != parity:
+                    continue
+                day_date = semester_start + timedelta(weeks=week - 1, days=day)
+                yield "BEGIN:VEVENT"
+                yield f"UID:{uid_base}-{week}-{day}-{first}@course-selection"
+                yield f"DTSTAMP:{stamp}"
+                yield f"DTSTART;TZID=Asia/Shanghai:{day_date:%Y%m%d}T{start_hour:02d}{start_minute:02d}00"
+                yield f"DTEND;TZID=Asia/Shanghai:{day_date:%Y%m%d}T{end_hour:02d}{end_minute:02d}00"
+                yield f"SUMMARY:{summary}"
+                if location:
+                    yield f"LOCATION:{location}"
+                yield f"DESCRIPTION:{description}"
+                yield f"CATEGORIES:{_ics_text(course_type)}"
+                yield "END:VEVENT"
+    yield "END:VCALENDAR"
+
+
+def write_ics(selection: Dict, f: BinaryIO, stamp: datetime = None):
+    f.write(''.join(_fold(line) + '\r\n' for line in ics_lines(selection, stamp)).encode('utf-8'))
+
+
+# ---- XLSX ----
+
+def write_xlsx(selection: Dict, f: BinaryIO):
+    """openpyxl 只写模式：工作表“课表”（12节 × 周一至周五）和“课程列表”"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+
+    courses = list(selection_courses(selection))
+    grid = mask_grid([time_mask(course_time(course)) for course, _ in courses])
+
+    workbook = Workbook(write_only=True)
+    # 样式在工作簿中登记一次，单元格只引用样式名（逐个设置字体、底色时 openpyxl 每次都要查找样式表）
+    wrap = Alignment(wrap_text=True, vertical='center', horizontal='center')
+    workbook.add_named_style(NamedStyle('header', font=Font(bold=True), alignment=wrap))
+    workbook.add_named_style(NamedStyle('overlap', fill=PatternFill('solid', fgColor=OVERLAP_COLOR),
+                                        alignment=wrap))
+    for course_type, color in TYPE_COLORS.items():
+        workbook.add_named_style(NamedStyle(course_type, fill=PatternFill('solid', fgColor=color), alignment=wrap))
+
+    sheet = workbook.create_sheet('课表')
+    sheet.column_dimensions['A'].width = 18
+    for column in 'BCDEF':
+        sheet.column_dimensions[column].width = 24
+
+    def cell(value, style):
+        item = WriteOnlyCell(sheet, value=value)
+        item.style = style
+        return item
+
+    sheet.append([cell(text, 'header') for text in ("时间",) + WEEKDAYS[:5]])
+    texts = [f"{course.get('name', '')}\n{course.get('teacher', '')}\n{course.get('location', '')}"
+             for course, _ in courses]
+    for label, cells in zip(PERIOD_LABELS, grid):
+        row = [cell(label, 'header')]
+        for indices in cells:
+            if not indices:
+                # 空格子不设样式（openpyxl 每个带样式的单元格都要查一次样式表）
+                row.append(None)
+            elif len(indices) == 1:
+                row.append(cell(texts[indices[0]], courses[indices[0]][1]))
+            else:
+                row.append(cell('\n'.join(texts[index] for index in indices), 'overlap'))
+        sheet.append(row)
+
+    course_sheet = workbook.create_sheet('课程列表')
+    for column, width in zip('ABCDEF', (28, 14, 8, 30, 16, 16)):
+        course_sheet.column_dimensions[column].width = width
+    course_sheet.append(["课程名称", "类型", "学分", "上课时间", "教师", "地点"])
+    for course, course_type in courses:
+        course_sheet.append([course.get('name', ''), course_type, course.get('credit', ''), course_time(course),
+                             course.get('teacher', ''), course.get('location', '')])
+    workbook.save(f)
+
+
+# ---- 批量打包 ----
+
+def _write_html(selection: Dict, f: BinaryIO):
+    # 归档中的 HTML 共用根目录的 style.css
+    f.write(render_final_schedule(selection, style=LINKED_STYLE).encode('utf-8'))
+
+
+# 格式名 -> (扩展名, writer(selection, 二进制文件))
+FORMATS: Dict[str, Tuple[str, Callable[[Dict, BinaryIO], None]]] = {
+    'html': ('.html', _write_html),
+    'ics': ('.ics', write_ics),
+    'xlsx': ('.xlsx', write_xlsx),
+}
+
+
+def register_format(name: str, extension: str, writer: Callable[[Dict, BinaryIO], None]):
+    FORMATS[name] = (extension, writer)
+
+
+class ScheduleArchive:
+    """把多名学生的课表逐个写入一个 zip 文件
+
+    每名学生每种格式一个文件（<编号><扩展名>），add 时直接写入归档，
+    已写完的学生不再留在内存中，可以用来一次导出成千上万名学生。
+    编号重复（或清理后相同，如 "a/b" 与 "a_b"）时后来的学生加后缀 -2、-3……，不会覆盖前面的文件。
+    """
+
+    def __init__(self, path, formats: Sequence[str] = None):
+        self.formats = list(formats or EXPORT_CONFIG['default_formats'])
+        unknown = [name for name in self.formats if name not in FORMATS]
+        if unknown:
+            raise ValueError(f"不支持的导出格式: {', '.join(unknown)}（可用: {', '.join(FORMATS)}）")
+        self.count = 0
+        self._stems = set()  # 已用的文件名（小写）
+        self._zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        if 'html' in self.formats:
+            self._zip.writestr(STYLESHEET_FILE, STYLESHEET)
+
+    def add(self, selection: Dict):
+        stem = unique_stem(file_stem(selection.get('id') or f"student-{self.count + 1:04d}"), self._stems)
+        for name in self.formats:
+            extension, writer = FORMATS[name]
+            with self._zip.open(stem + extension, 'w') as f:
+                writer(selection, f)
+        self.count += 1
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def export_archive(selections: Iterable[Dict], path, formats: Sequence[str] = None) -> int:
+    """把一批学生的课表写入 zip 归档（selections 可以是生成器），返回学生数"""
+    with ScheduleArchive(path, formats) as archive:
+        for selection in selections:
+            archive.add(selection)
+    return archive.count
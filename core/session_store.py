@@ -0,0 +1,147 @@
+"""
+选课进度自动保存（APP_CONFIG['auto_save']）
+保存的内容：当前所在的步骤、年级、专业、各类已选课程，以及评估结果和评估输入的哈希——
+下次启动时可以直接回到上次的界面，评估输入没有变化时直接显示保存的结果，不再调用大语言模型。
+
+    SessionStore  会话文件的读写（先写临时文件再替换，写到一半退出也不会留下损坏的文件）
+    AutoSaver     合并短时间内的多次修改，停止修改 delay 秒后在后台线程写一次
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SESSION_VERSION = 1
+
+# 选课流程的步骤（按顺序）；恢复时回到保存的步骤
+STEPS = ('welcome', 'age', 'major', 'compulsory', 'optional_compulsory', 'general', 'evaluation', 'final')
+STEP_NAMES = {
+    'welcome': '欢迎', 'age': '年级选择', 'major': '专业选择', 'compulsory': '必修课选择',
+    'optional_compulsory': '选择性必修课选择', 'general': '通识课选择', 'evaluation': 'AI评估', 'final': '最终课表',
+}
+# 这些步骤之前的进度没有值得恢复的内容
+RESUMABLE_STEPS = STEPS[STEPS.index('compulsory'):]
+
+# 保存的选课字段（与界面 user_data 的键相同）
+SESSION_FIELDS = ('age', 'major', 'compulsory_courses', 'optional_compulsory_courses', 'general_courses',
+                  'total_credits', 'evaluation')
+
+
+def evaluation_hash(evaluation_data: Dict) -> str:
+    """评估输入（年级、专业、各类课程、总学分）的哈希，输入相同时可以直接使用保存的评估结果"""
+    text = json.dumps(evaluation_data, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class SessionStore:
+    """会话文件（JSON）"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict]:
+        """读取保存的会话；没有文件、文件损坏或版本不符时返回 None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("会话文件无法读取，忽略: %s", e)
+            return None
+        if data.get('version') != SESSION_VERSION or data.get('step') not in STEPS:
+            return None
+        return data
+
+    def save(self, state: Dict):
+        """原子写入：先写临时文件再替换"""
+        data = dict(state, version=SESSION_VERSION, saved_at=time.time())
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class AutoSaver:
+    """防抖的自动保存：update 合并修改并重新计时，delay 秒内没有新的修改才写文件
+
+    update 时复制传入的值，写文件在计时器线程中进行，不阻塞界面。
+    程序退出前调用 flush 立即写出尚未保存的修改。
+    """
+
+    def __init__(self, store: SessionStore, delay: float = 0.5):
+        self.store = store
+        self.delay = delay
+        self.writes = 0
+        self._state: Dict = {}
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # 计时器线程和 flush 可能同时写，写文件另用一把锁串行；
+        # 每份快照带序号，写文件时跳过比已写出的更旧的快照，旧状态不会覆盖新状态
+        self._write_lock = threading.Lock()
+        self._sequence = 0
+        self._written_sequence = 0
+
+    def update(self, **fields):
+        """记录修改（如 step='general', general_courses=[...]），稍后写入"""
+        snapshot = json.loads(json.dumps(fields, ensure_ascii=False, default=str))
+        with self._lock:
+            self._state.update(snapshot)
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """立即写出尚未保存的修改"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            state = dict(self._state)
+            self._dirty = False
+            self._sequence += 1
+            sequence = self._sequence
+        with self._write_lock:
+            if sequence <= self._written_sequence:
+                return  # 已经写出了更新的快照
+            try:
+                self.store.save(state)
+                self.writes += 1
+                self._written_sequence = sequence
+            except OSError as e:
+                logger.warning("自动保存失败: %s", e)
+
+    def discard(self):
+        """放弃尚未写出的修改并删除会话文件（重新开始选课）"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._state = {}
+            self._dirty = False
+            self._sequence += 1
+            sequence = self._sequence
+        with self._write_lock:
+            # 之前取出、尚未写出的快照不再写
+            self._written_sequence = sequence
+            self.store.clear()
@@ -0,0 +1,56 @@
+"""
+教师推荐：按课程列出评分表中各任课教师的得分（界面见 teacher_recommendation.py）
+"""
+
+from typing import List, Dict
+
+from config import get_resource_path
+from .course_names import CourseNameIndex
+
+
+class TeacherRecommender:
+    def __init__(self):
+        import pandas as pd
+        self.ratings_df = pd.read_excel(get_resource_path('课程评分.xlsx'))
+        self.ratings_df.columns = [col.strip().replace('\u200b', '') for col in self.ratings_df.columns]
+        self.name_index = CourseNameIndex(self.ratings_df['课程'])
+        # 预处理数据
+        self._preprocess_data()
+    
+    def _preprocess_data(self):
+        """预处理教师评分数据"""
+        import pandas as pd
+        # 确保数值列为浮点数类型
+        numeric_columns = ['课程内容 满分10分', '课程工作量', '课程考核', '平均分', '有效评价条数']
+        for col in numeric_columns:
+            self.ratings_df[col] = pd.to_numeric(self.ratings_df[col], errors='coerce').fillna(0)
+        
+        # 计算综合得分（将所有列的分数加权平均）
+        self.ratings_df['综合得分'] = (
+            self.ratings_df[['课程内容 满分10分', '课程工作量', '课程考核']].mean(axis=1) * 0.8 +  # 各项评分的平均值
+            (self.ratings_df['平均分'] / self.ratings_df['有效评价条数'].replace(0, 1)).fillna(0) * 0.2  # 总分/人数 作为参考
+        )
+    
+    def get_teacher_recommendations(self, course_name: str) -> List[Dict]:
+        """获取指定课程的所有教师推荐信息"""
+        import pandas as pd
+        course_teachers = self.ratings_df.iloc[self.name_index.lookup(course_name)]
+        if course_teachers.empty:
+            return []
+        
+        recommendations = []
+        for _, row in course_teachers.iterrows():
+            teacher_info = {
+                '教师姓名': str(row['老师']),
+                '综合得分': float(round(row['综合得分'], 2)),
+                '评分人数': int(row['有效评价条数']),
+                '教学': float(row['课程内容 满分10分']),
+                '给分': float(row['课程工作量']),
+                '推荐': float(row['课程考核']),
+                '总评分': float(row['平均分']),
+                '备注': str(row['数据来源于']) if pd.notna(row['数据来源于']) else ''
+            }
+            recommendations.append(teacher_info)
+        
+        # 按综合得分排序
+        return sorted(recommendations, key=lambda x: x['综合得分'], reverse=True)
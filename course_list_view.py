@@ -0,0 +1,251 @@
+"""
+课程列表（模型/视图）
+三个选课界面共用：CourseTableModel 保存课程和勾选状态（第0列为勾选列），并随勾选增减学分合计、
+更新与已选课程时间冲突的行（core.conflict_index），
+HighlightDelegate 按行的高亮类别绘制背景、已勾选的行加粗显示，
+CourseTableView 固定行高，只绘制可见的行，上万门课程也能立即打开。
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5.QtCore import Qt
+
+from config import UI_CONFIG
+from core.conflict_index import ConflictIndex
+from core.course_selection import SelectionTotals, course_credit
+
+# 行高亮类别（HighlightDelegate 按 UI_CONFIG['course_list']['highlight_colors'] 取背景色）
+HIGHLIGHT_ROLE = Qt.UserRole + 1
+
+# 列定义：(表头, 课程字典的键 或 course -> 显示值 的函数)
+Column = Tuple[str, Union[str, Callable[[Dict], object]]]
+
+
+class CourseTableModel(QtCore.QAbstractTableModel):
+    """课程列表：第0列为勾选列，其余列由 columns 定义，显示文字在绘制可见行时才生成
+
+    totals 是已勾选课程的学分合计（credit_key 取学分，type_key 取分类），
+    勾选一门课只增减这一门，不重新遍历列表。
+    给出 time_key 时，conflicts 记录课程之间的时间冲突，与已选课程冲突的行高亮为 'conflict'，
+    勾选一门课只重绘冲突状态改变的行。
+    """
+
+    CONFLICT_TOOLTIP = "与已选课程时间冲突"
+
+    # 勾选状态发生变化（单行或批量，批量勾选只发出一次）
+    checkedChanged = QtCore.pyqtSignal()
+
+    CHECK_HEADER = "选择"
+
+    def __init__(self, columns: Sequence[Column], credit_key: str = None, type_key: str = None,
+                 time_key: str = None, parent=None):
+        super().__init__(parent)
+        self._headers = [self.CHECK_HEADER] + [header for header, _ in columns]
+        self._getters = [self._make_getter(key) for _, key in columns]
+        self._credit_key = credit_key
+        self._type_key = type_key
+        self._time_key = time_key
+        self._courses: List[Dict] = []
+        self._checked: List[bool] = []
+        self._highlight: List[Optional[str]] = []
+        self._credits: List[float] = []
+        self._types: List[str] = []
+        self.totals = SelectionTotals()
+        self.conflicts: Optional[ConflictIndex] = None
+
+    @staticmethod
+    def _make_getter(key):
+        if callable(key):
+            return key
+        return lambda course: course.get(key, '')
+
+    def set_courses(self, courses: List[Dict], checked: Iterable[bool] = None,
+                    highlight: Iterable[Optional[str]] = None, fixed_mask: int = 0):
+        """整体替换课程列表（不发出 checkedChanged，调用方自行刷新学分）
+
+        fixed_mask 是之前步骤已选课程占用的时间槽（core.conflict_index.occupancy_mask）。
+        """
+        self.beginResetModel()
+        self._courses = list(courses)
+        count = len(self._courses)
+        self._checked = [bool(value) for value in checked] if checked is not None else [False] * count
+        self._highlight = list(highlight) if highlight is not None else [None] * count
+        self._credits = ([course_credit(course.get(self._credit_key)) for course in self._courses]
+                         if self._credit_key else [0.0] * count)
+        self._types = ([str(course.get(self._type_key) or '') for course in self._courses]
+                       if self._type_key else [''] * count)
+        self.totals.clear()
+        if self._time_key:
+            self.conflicts = ConflictIndex([course.get(self._time_key) for course in self._courses],
+                                           fixed_mask)
+        for row in self.checked_rows():
+            self.totals.add(self._credits[row], self._types[row])
+            if self.conflicts is not None:
+                self.conflicts.set_selected(row, True)
+        self.endResetModel()
+
+    # ---- QAbstractTableModel ----
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._courses)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return None
+            value = self._getters[column - 1](self._courses[row])
+            return '' if value is None else str(value)
+        if role == Qt.CheckStateRole and column == 0:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        if role == HIGHLIGHT_ROLE:
+            if self.conflicts is not None and self.conflicts.is_conflicting(row):
+                return 'conflict'
+            return self._highlight[row]
+        if role == Qt.ToolTipRole:
+            if self.conflicts is not None and self.conflicts.is_conflicting(row):
+                return self.CONFLICT_TOOLTIP
+            if column == 1:
+                return self.data(index, Qt.DisplayRole)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid() or index.column() != 0:
+            return False
+        self.set_checked(index.row(), value == Qt.Checked)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+        return Qt.ItemIsEnabled
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+    # ---- 课程与勾选状态 ----
+
+    def course(self, row: int) -> Dict:
+        return self._courses[row]
+
+    def courses(self) -> List[Dict]:
+        return self._courses
+
+    def is_checked(self, row: int) -> bool:
+        return self._checked[row]
+
+    def _apply_checked(self, row: int, checked: bool, repaint: List[int]) -> bool:
+        """更新一行的勾选状态和合计，需要重绘的行（该行及冲突状态改变的行）加入 repaint"""
+        if self._checked[row] == checked:
+            return False
+        self._checked[row] = checked
+        if checked:
+            self.totals.add(self._credits[row], self._types[row])
+        else:
+            self.totals.remove(self._credits[row], self._types[row])
+        repaint.append(row)
+        if self.conflicts is not None:
+            repaint.extend(self.conflicts.set_selected(row, checked))
+        return True
+
+    def set_checked(self, row: int, checked: bool):
+        self.set_rows_checked((row,), checked)
+
+    def set_rows_checked(self, rows: Iterable[int], checked: bool = True):
+        """勾选/取消若干行：合计逐行更新，重绘和 checkedChanged 都只发出一次"""
+        repaint: List[int] = []
+        for row in rows:
+            self._apply_checked(row, checked, repaint)
+        if not repaint:
+            return
+        # 已勾选的行加粗，冲突的行换背景：重绘涉及的行所在的范围
+        self.dataChanged.emit(self.index(min(repaint), 0),
+                              self.index(max(repaint), len(self._headers) - 1))
+        self.checkedChanged.emit()
+
+    def toggle(self, row: int):
+        self.set_checked(row, not self._checked[row])
+
+    def checked_rows(self) -> List[int]:
+        return [row for row, checked in enumerate(self._checked) if checked]
+
+    def checked_courses(self) -> List[Dict]:
+        return [course for course, checked in zip(self._courses, self._checked) if checked]
+
+    def set_fixed_mask(self, fixed_mask: int):
+        """之前步骤的选择变化后更新其占用的时间槽，只重绘冲突状态改变的行"""
+        if self.conflicts is None:
+            return
+        rows = self.conflicts.set_fixed_mask(fixed_mask)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), len(self._headers) - 1))
+
+    def set_highlight(self, row: int, key: Optional[str]):
+        if self._highlight[row] == key:
+            return
+        self._highlight[row] = key
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._headers) - 1),
+                              [HIGHLIGHT_ROLE])
+
+
+class HighlightDelegate(QtWidgets.QStyledItemDelegate):
+    """按行的高亮类别绘制背景，已勾选的行加粗、换色；画刷和字体在所有单元格间共用"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        settings = UI_CONFIG['course_list']
+        self._brushes = {key: QtGui.QBrush(QtGui.QColor(color))
+                         for key, color in settings['highlight_colors'].items()}
+        self._checked_color = QtGui.QColor(settings['checked_color'])
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        if index.model().is_checked(index.row()):
+            option.font.setBold(True)
+            option.palette.setColor(QtGui.QPalette.Text, self._checked_color)
+
+    def paint(self, painter, option, index):
+        brush = self._brushes.get(index.data(HIGHLIGHT_ROLE))
+        if brush is not None:
+            painter.fillRect(option.rect, brush)
+        super().paint(painter, option, index)
+
+
+class CourseTableView(QtWidgets.QTableView):
+    """课程列表视图：所有行等高（不逐行计算高度），点击行中任意位置切换勾选"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        settings = UI_CONFIG['course_list']
+        self.setItemDelegate(HighlightDelegate(self))
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.setWordWrap(False)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+
+        vertical = self.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(settings['row_height'])
+
+        horizontal = self.horizontalHeader()
+        horizontal.setStretchLastSection(True)
+        # 按内容调整列宽时只取样前若干行，不遍历整个列表
+        horizontal.setResizeContentsPrecision(settings['resize_sample_rows'])
+
+        self.clicked.connect(self._toggle_row)
+
+    def _toggle_row(self, index):
+        # 勾选列由委托处理，其余列点击也切换该行的勾选
+        if index.isValid() and index.column() != 0:
+            self.model().toggle(index.row())
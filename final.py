@@ -10,10 +10,37 @@
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 import os
+import logging
 from config import UI_CONFIG
 import pandas as pd
 from datetime import datetime
-from course_scheduler import CourseScheduler, create_course_from_dict
+from core.course_scheduler import CourseScheduler, create_course_from_dict
+from core.course_selection import selection_signature
+from core import html_report, instrumentation, schedule_export
+import schedule_pdf
+
+logger = logging.getLogger(__name__)
+
+# 课表的时间列（与导出的日历使用同一张作息时间表 config.EXPORT_CONFIG['period_times']）
+TIME_SLOT_LABELS = schedule_export.PERIOD_LABELS
+
+# 课程类型对应的颜色 - 使用更柔和的配色
+COURSE_TYPE_COLORS = {
+    '必修课': '#E3F2FD',  # 浅蓝色
+    '选择性必修课': '#F3E5F5',  # 浅紫色
+    '通识课': '#E8F5E9'  # 浅绿色
+}
+
+# 时间重叠的课程所在格子的颜色
+OVERLAP_COLOR = '#FFCDD2'
+
+# 导出对话框的文件类型：(过滤器, 扩展名)
+EXPORT_FILTERS = [
+    ("HTML Files (*.html)", '.html'),
+    ("iCalendar (*.ics)", '.ics'),
+    ("Excel (*.xlsx)", '.xlsx'),
+    ("PDF (*.pdf)", '.pdf'),
+]
 
 # 用户数据将在运行时动态获取，避免循环导入
 user_data = None
@@ -25,9 +52,9 @@ def get_user_data():
         try:
             import main_enhanced
             user_data = main_enhanced.user_data
-            print(f"Final.py - 成功导入用户数据: {dict(user_data)}")
+            logger.debug("成功导入用户数据: %s", user_data)
         except (ImportError, AttributeError) as e:
-            print(f"Final.py - 导入用户数据失败: {e}，使用默认数据")
+            logger.warning("导入用户数据失败: %s，使用默认数据", e)
             user_data = {
                 "compulsory_courses": [],
                 "optional_compulsory_courses": [],
@@ -218,6 +245,21 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
         self.export_button.clicked.connect(self.export_schedule)
         
         # 生成课表
+        self.schedule_key = self.selection_key()
+        self.generate_schedule()
+
+    @staticmethod
+    def selection_key():
+        return selection_signature(get_user_data(), 'age', 'major', 'total_credits', 'compulsory_courses',
+                                   'optional_compulsory_courses', 'general_courses')
+
+    def refresh(self):
+        """界面再次显示前调用：选课变化时才重新生成课表"""
+        key = self.selection_key()
+        if key == self.schedule_key:
+            return
+        self.schedule_key = key
+        self.scheduler = CourseScheduler()
         self.generate_schedule()
 
     def finish_and_exit(self):
@@ -233,11 +275,10 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
         try:
             # 获取用户数据
             user_data = get_user_data()
-            print("\n=== 课程数据加载情况 ===")
-            print(f"必修课数量: {len(user_data.get('compulsory_courses', []))}")
-            print(f"选择性必修课数量: {len(user_data.get('optional_compulsory_courses', []))}")
-            print(f"通识课数量: {len(user_data.get('general_courses', []))}")
-            print("======================\n")
+            logger.info("课程数据: 必修课 %d 门，选择性必修课 %d 门，通识课 %d 门",
+                        len(user_data.get('compulsory_courses', [])),
+                        len(user_data.get('optional_compulsory_courses', [])),
+                        len(user_data.get('general_courses', [])))
             
             # 更新学生信息
             age = user_data.get('age', '未知')
@@ -284,7 +325,6 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
 
             # 必修课
             compulsory_courses = user_data.get("compulsory_courses", [])
-            print("\n=== 必修课加载 ===")
             for course in compulsory_courses:
                 course_with_type = course.copy()
                 course_with_type['course_type'] = "必修课"
@@ -292,11 +332,10 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
                 course_obj = create_course_from_dict(course_with_type)
                 all_courses.append(course_obj)
                 self.scheduler.add_selected_course(course_obj)
-                print(f"添加必修课: {course_obj.name}")
+                logger.debug("添加必修课: %s", course_obj.name)
 
             # 选择性必修课
             optional_courses = user_data.get("optional_compulsory_courses", [])
-            print("\n=== 选择性必修课加载 ===")
             for course in optional_courses:
                 course_with_type = course.copy()
                 course_with_type['course_type'] = "选择性必修课"
@@ -304,11 +343,10 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
                 course_obj = create_course_from_dict(course_with_type)
                 all_courses.append(course_obj)
                 self.scheduler.add_selected_course(course_obj)
-                print(f"添加选择性必修课: {course_obj.name}")
+                logger.debug("添加选择性必修课: %s", course_obj.name)
 
             # 通识课
             general_courses = user_data.get("general_courses", [])
-            print("\n=== 通识课加载 ===")
             for course in general_courses:
                 course_with_type = course.copy()
                 course_with_type['course_type'] = "通识课"
@@ -316,10 +354,9 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
                 course_obj = create_course_from_dict(course_with_type)
                 all_courses.append(course_obj)
                 self.scheduler.add_selected_course(course_obj)
-                print(f"添加通识课: {course_obj.name}")
+                logger.debug("添加通识课: %s", course_obj.name)
             
-            print(f"\n总课程数: {len(all_courses)}")
-            print(f"调度器中课程数: {len(self.scheduler.selected_courses)}")
+            logger.debug("总课程数: %d，调度器中课程数: %d", len(all_courses), len(self.scheduler.selected_courses))
 
             # 创建课表
             self.create_schedule_table()
@@ -331,9 +368,7 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
             self.update_course_list(all_courses)
             
         except Exception as e:
-            print(f"生成课表时出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("生成课表时出错: %s", e)
             
             # 如果没有课程数据，显示提示信息
             if not any([
@@ -349,6 +384,7 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
                 self.schedule_table.setColumnCount(1)
                 self.schedule_table.setItem(0, 0, item)
 
+    @instrumentation.timed('ui.final.schedule_table')
     def create_schedule_table(self):
         """创建课程表格"""
         # 设置表格基本属性
@@ -373,76 +409,59 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
             }
         """)
         
-        # 设置时间段
-        time_slots = [
-            '第1节 (8:00-8:50)', '第2节 (9:00-9:50)',
-            '第3节 (10:10-11:00)', '第4节 (11:10-12:00)',
-            '第5节 (13:00-13:50)', '第6节 (14:00-14:50)',
-            '第7节 (15:10-16:00)', '第8节 (16:10-17:00)',
-            '第9节 (17:10-18:00)', '第10节 (18:40-19:30)',
-            '第11节 (19:40-20:30)', '第12节 (20:40-21:30)'
-        ]
-        
         # 设置时间列宽度和样式
         self.schedule_table.setColumnWidth(0, 150)  # 加宽时间列
+        self.schedule_table.verticalHeader().setDefaultSectionSize(40)  # 调整行高
+        
+        # 所有单元格共用的字体和画刷
+        time_font = QtGui.QFont('Microsoft YaHei', 9)  # 使用雅黑字体，更适合显示数字
+        time_font.setBold(True)
+        course_font = QtGui.QFont('楷体', 10)
+        time_background = QtGui.QBrush(QtGui.QColor('#E8EAF6'))  # 浅色背景
+        time_foreground = QtGui.QBrush(QtGui.QColor('#1A237E'))  # 深色文字
+        course_foreground = QtGui.QBrush(QtGui.QColor('#333333'))  # 深灰色文字
+        type_backgrounds = {course_type: QtGui.QBrush(QtGui.QColor(color))
+                            for course_type, color in COURSE_TYPE_COLORS.items()}
+        default_background = QtGui.QBrush(QtGui.QColor('#FFFFFF'))
+        overlap_background = QtGui.QBrush(QtGui.QColor(OVERLAP_COLOR))
+        
+        # 课程网格：每格是占用该节的课程下标，每门课程的提示文字只生成一次
+        courses = self.scheduler.selected_courses
+        self.schedule_grid = self.scheduler.get_schedule_grid()
+        tooltips = [
+            f"课程：{course.name}\n"
+            f"教师：{course.teacher}\n"
+            f"地点：{course.location}\n"
+            f"学分：{course.credit}\n"
+            f"类型：{course.course_type}"
+            for course in courses
+        ]
         
-        # 设置时间列
-        for i, time_slot in enumerate(time_slots):
-            item = QtWidgets.QTableWidgetItem(time_slot)
+        for row, (time_label, cells) in enumerate(zip(TIME_SLOT_LABELS, self.schedule_grid)):
+            # 时间列
+            item = QtWidgets.QTableWidgetItem(time_label)
             item.setTextAlignment(QtCore.Qt.AlignCenter)
-            # 为时间列设置特殊字体和样式
-            font = QtGui.QFont('Microsoft YaHei', 9)  # 使用雅黑字体，更适合显示数字
-            font.setBold(True)
-            item.setFont(font)
-            item.setBackground(QtGui.QColor('#E8EAF6'))  # 浅色背景
-            item.setForeground(QtGui.QColor('#1A237E'))  # 深色文字
-            self.schedule_table.setItem(i, 0, item)
-        
-        # 课程类型对应的颜色 - 使用更柔和的配色
-        course_colors = {
-            '必修课': '#E3F2FD',  # 浅蓝色
-            '选择性必修课': '#F3E5F5',  # 浅紫色
-            '通识课': '#E8F5E9'  # 浅绿色
-        }
-        
-        # 获取课程表矩阵
-        schedule_matrix = self.scheduler.get_schedule_matrix()
-        
-        # 填充课程
-        for row in range(12):
-            for col in range(1, 6):  # 跳过时间列
-                course_name = schedule_matrix[row][col-1]
-                if course_name:
-                    course = next(
-                        (c for c in self.scheduler.selected_courses if c.name == course_name),
-                        None
-                    )
-                    
-                    if course:
-                        item = QtWidgets.QTableWidgetItem(course.name)
-                        item.setTextAlignment(QtCore.Qt.AlignCenter)
-                        # 为课程设置字体
-                        font = QtGui.QFont('楷体', 10)
-                        item.setFont(font)
-                        
-                        # 设置背景色和文字颜色
-                        item.setBackground(QtGui.QColor(course_colors.get(course.course_type, '#FFFFFF')))
-                        item.setForeground(QtGui.QColor('#333333'))  # 深灰色文字
-                        
-                        tooltip = (
-                            f"课程：{course.name}\n"
-                            f"教师：{course.teacher}\n"
-                            f"地点：{course.location}\n"
-                            f"学分：{course.credit}\n"
-                            f"类型：{course.course_type}"
-                        )
-                        item.setToolTip(tooltip)
-                        
-                        self.schedule_table.setItem(row, col, item)
-        
-        # 调整行高
-        for i in range(self.schedule_table.rowCount()):
-            self.schedule_table.setRowHeight(i, 40)
+            item.setFont(time_font)
+            item.setBackground(time_background)
+            item.setForeground(time_foreground)
+            self.schedule_table.setItem(row, 0, item)
+            
+            # 课程（时间重叠的课程显示在同一格中）
+            for col, indices in enumerate(cells, start=1):
+                if not indices:
+                    continue
+                item = QtWidgets.QTableWidgetItem('\n'.join(courses[index].name for index in indices))
+                item.setTextAlignment(QtCore.Qt.AlignCenter)
+                item.setFont(course_font)
+                item.setForeground(course_foreground)
+                if len(indices) == 1:
+                    index = indices[0]
+                    item.setBackground(type_backgrounds.get(courses[index].course_type, default_background))
+                    item.setToolTip(tooltips[index])
+                else:
+                    item.setBackground(overlap_background)
+                    item.setToolTip("时间冲突\n\n" + '\n\n'.join(tooltips[index] for index in indices))
+                self.schedule_table.setItem(row, col, item)
         
         # 设置表格整体样式
         self.schedule_table.setStyleSheet("""
@@ -505,31 +524,27 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
         self.course_list.setText(course_list_text)
 
     def export_schedule(self):
-        """导出课表"""
+        """导出课表（HTML、iCalendar、Excel 或 PDF，按保存对话框中选择的类型）"""
         try:
-            # 生成HTML格式的课表
-            html_content = self.generate_html_schedule()
-            
             # 获取当前时间作为文件名
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"课表_{timestamp}.html"
             
             # 保存文件
-            file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            file_path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(
                 self,
                 "保存课表",
                 filename,
-                "HTML Files (*.html);;All Files (*)"
+                ";;".join(name for name, _ in EXPORT_FILTERS)
             )
             
             if file_path:
-                # 确保文件路径有.html后缀
-                if not file_path.lower().endswith('.html'):
-                    file_path += '.html'
-                
-                # 使用UTF-8编码保存文件
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
+                # 没有写扩展名或扩展名不支持时，按选择的文件类型补上
+                extension = os.path.splitext(file_path)[1].lower()
+                if extension not in dict(EXPORT_FILTERS).values():
+                    extension = dict(EXPORT_FILTERS).get(selected_filter, '.html')
+                    file_path += extension
+                self.write_export(file_path, extension)
                 QtWidgets.QMessageBox.information(
                     self,
                     "导出成功",
@@ -537,88 +552,39 @@ class FinalDialog(QtWidgets.QDialog, Ui_Dialog):
                 )
         
         except Exception as e:
-            import traceback
-            error_msg = f"导出课表时出错：\n{str(e)}\n\n详细错误信息：\n{traceback.format_exc()}"
-            print(error_msg)  # 打印详细错误信息到控制台
+            logger.exception("导出课表时出错: %s", e)
             QtWidgets.QMessageBox.warning(
                 self,
                 "导出失败",
                 f"导出课表时出错：\n{str(e)}"
             )
 
+    def write_export(self, file_path, extension):
+        """按扩展名写出课表文件"""
+        if extension == '.html':
+            # 使用UTF-8编码保存文件
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(self.generate_html_schedule())
+        elif extension == '.pdf':
+            schedule_pdf.print_html_pdf(self.generate_html_schedule(), file_path)
+        else:
+            writer = schedule_export.write_ics if extension == '.ics' else schedule_export.write_xlsx
+            with open(file_path, 'wb') as f:
+                writer(self.export_selection(), f)
+
+    def export_selection(self):
+        """界面上的课表（上课时间已补全）-> core.schedule_export 使用的选课结果"""
+        data = get_user_data()
+        selection = {'age': data.get('age', ''), 'major': data.get('major', '')}
+        keys = {course_type: key for key, course_type, _ in html_report.CATEGORIES}
+        for course in self.scheduler.selected_courses:
+            selection.setdefault(keys[course.course_type], []).append({
+                'name': course.name, 'credit': course.credit, 'time': course.time,
+                'teacher': course.teacher, 'location': course.location})
+        return selection
+
     def generate_html_schedule(self):
-        """生成HTML格式的课表"""
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>课程表</title>
-            <style>
-                body { font-family: '楷体', sans-serif; }
-                table { border-collapse: collapse; width: 100%; }
-                th, td { border: 1px solid black; padding: 8px; text-align: center; }
-                th { background-color: #f2f2f2; }
-                .course-必修课 { background-color: #FFE4E1; }
-                .course-选择性必修课 { background-color: #E0FFFF; }
-                .course-通识课 { background-color: #F0FFF0; }
-                .info { margin: 20px 0; }
-                .header { text-align: center; margin: 20px 0; }
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>课程表</h1>
-                <p>{student_info}</p>
-            </div>
-            <table>
-                <tr>
-                    <th>时间</th>
-                    <th>周一</th>
-                    <th>周二</th>
-                    <th>周三</th>
-                    <th>周四</th>
-                    <th>周五</th>
-                </tr>
-                {table_content}
-            </table>
-            <div class="info">
-                <h2>统计信息</h2>
-                {stats_info}
-            </div>
-            <div class="info">
-                <h2>课程列表</h2>
-                {course_list}
-            </div>
-        </body>
-        </html>
-        """
-        
-        # 获取表格内容
-        table_content = ""
-        for row in range(self.schedule_table.rowCount()):
-            table_content += "<tr>"
-            for col in range(self.schedule_table.columnCount()):
-                item = self.schedule_table.item(row, col)
-                if item:
-                    cell_content = item.text().replace('\n', '<br>')
-                    cell_class = ""
-                    if col > 0:  # 不是时间列
-                        tooltip = item.toolTip()
-                        if "类型：" in tooltip:
-                            course_type = tooltip.split("类型：")[1].split("\n")[0]
-                            cell_class = f' class="course-{course_type}"'
-                    table_content += f"<td{cell_class}>{cell_content}</td>"
-                else:
-                    table_content += "<td></td>"
-            table_content += "</tr>"
-        
-        # 生成完整的HTML
-        html_content = html_template.format(
-            student_info=self.student_info.text(),
-            table_content=table_content,
-            stats_info=self.stats_label.text().replace('\n', '<br>'),
-            course_list=self.course_list.toPlainText().replace('\n', '<br>')
-        )
-        
-        return html_content
+        """生成HTML格式的课表（课表网格与界面上的表格相同，由 create_schedule_table 保存）"""
+        return html_report.render_schedule_export(
+            self.student_info.text(), self.schedule_grid, self.scheduler.selected_courses, TIME_SLOT_LABELS,
+            self.stats_label.text(), self.course_list.toPlainText())
@@ -3,14 +3,14 @@ import os
 import requests
 import json
 import logging
+import time
 import pandas as pd
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import QTimer, QPropertyAnimation, QEasingCurve, QRect
 from PyQt5.QtWidgets import QMessageBox, QApplication
-from config import UI_CONFIG, APP_CONFIG, get_api_key, is_api_configured
+from config import UI_CONFIG, APP_CONFIG, CACHE_CONFIG, get_api_key, is_api_configured, get_cache_path
 
 # 配置日志
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 设置高DPI支持
@@ -23,14 +23,21 @@ if APP_CONFIG['high_dpi_enabled']:
 from welcome import Ui_Dialog as WelcomeUi
 from age import Ui_Dialog as AgeUi
 from major import Ui_Dialog as MajorUi
-from extract_courses import get_compulsory_courses, get_optional_compulsory_courses
+from core.extract_courses import get_compulsory_courses, get_optional_compulsory_courses
 from compulsory_choose import CompulsoryChooseUi
 from optimal_compulsory import OptimalCompulsoryUi
 from optimal import OptimalDialog
 from teacher import Ui_Dialog as TeacherUi
 from evaluation import Ui_Dialog as EvaluationUi
 from final import FinalDialog as FinalDialogClass
-from course_rating import course_rating_manager
+from core.course_rating import course_rating_manager
+from core import html_report
+from performance_panel import install_performance_shortcut
+from catalog_browser import install_catalog_shortcut
+from core.logging_setup import configure_logging
+from navigator import Navigator, Screen
+from core.session_store import (SessionStore, AutoSaver, SESSION_FIELDS, STEPS, STEP_NAMES, RESUMABLE_STEPS,
+                                evaluation_hash)
 
 # 全局用户数据
 user_data = {
@@ -40,9 +47,59 @@ user_data = {
     "optional_compulsory_courses": [],
     "general_courses": [],
     "total_credits": 0,
-    "all_selected_courses": []
+    "all_selected_courses": [],
+    # 上次的AI评估：{"hash": 评估输入的哈希, "html": 评估结果}
+    "evaluation": None
 }
 
+# 选课进度自动保存（APP_CONFIG['auto_save'] 开启时在 main() 中创建）
+autosaver = None
+
+# 各类课程在哪一步确认
+CATEGORY_STEPS = (('compulsory_courses', 'compulsory'), ('optional_compulsory_courses', 'optional_compulsory'),
+                  ('general_courses', 'general'))
+
+
+def save_session(step, **fields):
+    """记录当前进度：所在步骤、user_data 中的选课字段，以及 fields 中尚未确认的修改（如正在勾选的课程）
+
+    只合并修改并重新计时，停止修改一段时间后才在后台写文件。
+    """
+    if autosaver is None:
+        return
+    state = {key: user_data.get(key) for key in SESSION_FIELDS}
+    state.update(fields, step=step)
+    autosaver.update(**state)
+
+
+def restore_session(state):
+    """把保存的进度恢复到 user_data"""
+    user_data.update({key: state[key] for key in SESSION_FIELDS if key in state})
+    # 总学分只计之前步骤已确认的课程，当前步骤的课程在界面中确认后再累加
+    step_index = STEPS.index(state['step'])
+    user_data["total_credits"] = sum(course['credit'] for key, step in CATEGORY_STEPS
+                                     if STEPS.index(step) < step_index
+                                     for course in user_data.get(key) or [])
+
+
+def offer_resume(store):
+    """有保存的进度时询问是否直接回到上次的界面；返回恢复的步骤，不恢复时返回 None"""
+    state = store.load()
+    if not state or state['step'] not in RESUMABLE_STEPS:
+        return None
+    saved_at = time.strftime('%Y-%m-%d %H:%M', time.localtime(state.get('saved_at', 0)))
+    reply = QMessageBox.question(
+        None, "恢复选课进度",
+        f"检测到上次的选课进度：{state.get('age') or ''} {state.get('major') or ''}，"
+        f"停留在「{STEP_NAMES[state['step']]}」（保存于 {saved_at}）。\n\n是否直接回到上次的界面？",
+        QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+    if reply != QMessageBox.Yes:
+        autosaver.discard()
+        return None
+    restore_session(state)
+    logger.info("恢复选课进度: %s %s，步骤 %s", user_data["age"], user_data["major"], state['step'])
+    return state['step']
+
 class AnimatedDialog(QtWidgets.QDialog):
     """带有动画效果的对话框基类"""
     def __init__(self, parent=None):
@@ -108,7 +165,8 @@ class AgeDialog(AnimatedDialog):
         self.setStyleSheet(UI_CONFIG['component_styles']['dialog'])
         
         self.setup_buttons()
-        self.selected_age = None
+        # 恢复的进度或返回本界面时保留已选的年级
+        self.selected_age = user_data["age"]
         # 绑定返回按钮
         if hasattr(self.ui, 'pushButton'):
             self.ui.pushButton.clicked.connect(self.reject)
@@ -134,6 +192,7 @@ class AgeDialog(AnimatedDialog):
     def select_age(self, age):
         self.selected_age = age
         user_data["age"] = age
+        save_session('age')
         # 添加选择反馈
         QMessageBox.information(self, "选择确认", f"您选择了：{age}")
 
@@ -151,7 +210,7 @@ class MajorDialog(AnimatedDialog):
         # 应用统一样式
         self.setStyleSheet(UI_CONFIG['component_styles']['dialog'])
         self.setup_buttons()
-        self.selected_major = None
+        self.selected_major = user_data["major"]
         # 只绑定pushButton_9为返回按钮
         if hasattr(self.ui, 'pushButton_9'):
             self.ui.pushButton_9.clicked.connect(self.reject)
@@ -177,6 +236,7 @@ class MajorDialog(AnimatedDialog):
     def select_major(self, major):
         self.selected_major = major
         user_data["major"] = major
+        save_session('major')
         QMessageBox.information(self, "选择确认", f"您选择了：{major}")
 
     def confirm_major(self):
@@ -260,14 +320,14 @@ class TeacherDialog(AnimatedDialog):
                 self.ui.textBrowser.setHtml(content)
             
         except Exception as e:
-            print(f"生成教师推荐失败: {e}")
+            logger.error("生成教师推荐失败: %s", e)
             if hasattr(self.ui, 'textBrowser'):
                 self.ui.textBrowser.setHtml(f"<p style='font-family: 楷体;'>生成教师推荐时出现错误：{str(e)}</p>")
 
     def generate_ai_teacher_recommendation(self, course_names):
         """使用AI生成教师推荐建议"""
         try:
-            from llm_integration import LLMIntegration
+            from core.llm_integration import LLMIntegration
             
             llm = LLMIntegration()
             prompt = f"""
@@ -289,7 +349,7 @@ class TeacherDialog(AnimatedDialog):
                 return self.get_fallback_ai_recommendation()
                 
         except Exception as e:
-            print(f"AI推荐生成失败: {e}")
+            logger.error("AI推荐生成失败: %s", e)
             return self.get_fallback_ai_recommendation()
     
     def get_fallback_ai_recommendation(self):
@@ -316,7 +376,12 @@ class EvaluationDialog(AnimatedDialog):
         """设置评估界面"""
         self.ui.confirm.clicked.connect(self.goto_final_schedule)
         self.ui.back.clicked.connect(self.go_back_to_general_courses)
-        
+        self.evaluation_key = None
+        self.evaluation_failed = False
+        self.refresh()
+
+    def refresh(self):
+        """显示前调用：重新计算学分；选课变化（或上次生成失败）时才重新生成评估"""
         # 计算并显示正确的总学分
         compulsory_credits = sum(course['credit'] for course in user_data.get("compulsory_courses", []))
         optional_credits = sum(course['credit'] for course in user_data.get("optional_compulsory_courses", []))
@@ -325,63 +390,57 @@ class EvaluationDialog(AnimatedDialog):
         user_data["total_credits"] = total_credits
         
         self.ui.all_points.display(total_credits)
-        print(f"AI评估界面学分统计: 必修{compulsory_credits} + 选择性必修{optional_credits} + 通识{general_credits} = {total_credits}")
+        logger.info("AI评估界面学分统计: 必修%s + 选择性必修%s + 通识%s = %s",
+                    compulsory_credits, optional_credits, general_credits, total_credits)
         
-        # 自动生成评估
-        QTimer.singleShot(1000, self.generate_evaluation)
+        self.evaluation_data = {
+            "年级": user_data["age"],
+            "专业": user_data["major"],
+            "必修课程": [course['name'] for course in user_data["compulsory_courses"]],
+            "选择性必修": [course['name'] for course in user_data["optional_compulsory_courses"]],
+            "通识课程": [course['name'] for course in user_data["general_courses"]],
+            "总学分": user_data["total_credits"]
+        }
+        key = evaluation_hash(self.evaluation_data)
+        if key == self.evaluation_key and not self.evaluation_failed:
+            return  # 界面上已经是这次选课的评估
+        self.evaluation_key = key
+        self.evaluation_failed = False
+        saved = user_data.get("evaluation") or {}
+        if saved.get("hash") == self.evaluation_key:
+            # 选课与上次评估时相同，直接显示保存的结果，不再调用大语言模型
+            self.ui.textBrowser.setHtml(saved["html"])
+        else:
+            # 自动生成评估
+            QTimer.singleShot(1000, self.generate_evaluation)
     
     def goto_final_schedule(self):
-        """跳转到最终课表"""
-        try:
-            # 创建最终课表界面
-            final_dialog = FinalDialog()
-            
-            # 关闭当前界面并显示最终课表
-            self.accept()
-            final_dialog.exec_()
-            
-        except Exception as e:
-            print(f"跳转到最终课表失败: {e}")
-            QMessageBox.warning(self, "错误", f"无法跳转到最终课表：{str(e)}")
-            self.accept()
+        """跳转到最终课表（由导航切换界面）"""
+        self.accept()
 
     def go_back_to_general_courses(self):
-        """返回到通识课选择界面"""
-        try:
-            print("用户从AI评估界面返回，重新显示通识课选择界面")
-            # 重新创建通识课选择界面
-            from optimal import OptimalDialog
-            optimal_dialog = OptimalDialog(user_data.get("age", "大二"), user_data.get("major", "通班"))
-            self.reject()  # 关闭当前界面
-            optimal_dialog.exec_()
-        except Exception as e:
-            print(f"返回通识课选择界面失败: {e}")
-            self.reject()
+        """返回到通识课选择界面（由导航切换界面）"""
+        logger.info("用户从AI评估界面返回，重新显示通识课选择界面")
+        self.reject()
 
     def generate_evaluation(self):
-        print("[DEBUG] 生成AI评估时用户信息：", user_data)
-        sys.stdout.flush()
+        logger.debug("生成AI评估时用户信息：%s", user_data)
         try:
-            # 准备评估数据
-            evaluation_data = {
-                "年级": user_data["age"],
-                "专业": user_data["major"],
-                "必修课程": [course['name'] for course in user_data["compulsory_courses"]],
-                "选择性必修": [course['name'] for course in user_data["optional_compulsory_courses"]],
-                "通识课程": [course['name'] for course in user_data["general_courses"]],
-                "总学分": user_data["total_credits"]
-            }
-            
             # 显示加载动画
             self.ui.textBrowser.setHtml("<h2>🤖 正在生成智能评估...</h2><p>请稍候...</p>")
             QApplication.processEvents()
             
             # 调用大语言模型API
-            evaluation_result = self.call_llm_api(evaluation_data)
+            evaluation_result = self.call_llm_api(self.evaluation_data)
             
             # 显示评估结果
             self.ui.textBrowser.setHtml(evaluation_result)
             
+            # 保存评估结果，选课不变时下次直接显示（调用失败、使用默认评估的结果不保存）
+            if not self.evaluation_failed:
+                user_data["evaluation"] = {"hash": self.evaluation_key, "html": evaluation_result}
+                save_session('evaluation')
+            
         except Exception as e:
             error_msg = f"""
             <html>
@@ -406,16 +465,21 @@ class EvaluationDialog(AnimatedDialog):
         """调用大语言模型API进行评估"""
         try:
             # 导入LLM集成模块
-            from llm_integration import get_ai_evaluation
+            from core.llm_integration import get_ai_evaluation_with_service
             
-            # 调用AI评估
-            return get_ai_evaluation(data)
+            # 调用AI评估；没有服务应答时返回的是默认评估，不算成功（不缓存，下次进入重试）
+            evaluation, service = get_ai_evaluation_with_service(data)
+            if service is None:
+                self.evaluation_failed = True
+            return evaluation
             
         except ImportError:
             # 如果无法导入LLM模块，使用原有的模拟响应
+            self.evaluation_failed = True
             return self._generate_fallback_evaluation(data)
         except Exception as e:
             # 如果API调用失败，返回错误信息和默认评估
+            self.evaluation_failed = True
             error_msg = f"""
             <html>
             <body style="font-family: '微软雅黑';">
@@ -502,20 +566,30 @@ class EvaluationDialog(AnimatedDialog):
 
 class FinalDialog(FinalDialogClass):
     def __init__(self):
+        # 先算好总学分，课表按正确的学分生成
+        self.update_total_credits()
         super().__init__()
         self.setup_final_ui()
 
-    def setup_final_ui(self):
-        """设置最终课表界面"""
-        # 计算并显示正确的总学分
+    def refresh(self):
+        """再次显示前调用：选课变化时才重新生成课表"""
+        self.update_total_credits()
+        super().refresh()
+
+    @staticmethod
+    def update_total_credits():
+        """计算正确的总学分"""
         compulsory_credits = sum(course['credit'] for course in user_data.get("compulsory_courses", []))
         optional_credits = sum(course['credit'] for course in user_data.get("optional_compulsory_courses", []))
         general_credits = sum(course['credit'] for course in user_data.get("general_courses", []))
         total_credits = compulsory_credits + optional_credits + general_credits
         user_data["total_credits"] = total_credits
         
-        print(f"最终课表学分统计: 必修{compulsory_credits} + 选择性必修{optional_credits} + 通识{general_credits} = {total_credits}")
-        
+        logger.info("最终课表学分统计: 必修%s + 选择性必修%s + 通识%s = %s",
+                    compulsory_credits, optional_credits, general_credits, total_credits)
+
+    def setup_final_ui(self):
+        """设置最终课表界面"""
         # 重新连接完成按钮，确保程序正确退出
         self.finish_button.clicked.disconnect()  # 断开原有连接
         self.finish_button.clicked.connect(self.finish_and_exit)
@@ -528,205 +602,41 @@ class FinalDialog(FinalDialogClass):
         QApplication.quit()
 
     def generate_final_schedule(self):
-        print("[DEBUG] 生成最终课表时用户信息：", user_data)
-        sys.stdout.flush()
         """生成最终课表 - 课程表格式"""
-        # 计算正确的总学分
-        compulsory_credits = sum(course['credit'] for course in user_data.get("compulsory_courses", []))
-        optional_credits = sum(course['credit'] for course in user_data.get("optional_compulsory_courses", []))
-        general_credits = sum(course['credit'] for course in user_data.get("general_courses", []))
-        total_credits = compulsory_credits + optional_credits + general_credits
-        
+        logger.debug("生成最终课表时用户信息：%s", user_data)
         # 更新全局学分数据
-        user_data["total_credits"] = total_credits
-        
-        html_content = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: '微软雅黑'; margin: 10px; }}
-                .header {{ background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%); color: white; padding: 10px; border-radius: 8px; margin-bottom: 15px; text-align: center; }}
-                .schedule-table {{ width: 100%; border-collapse: collapse; margin-bottom: 15px; }}
-                .schedule-table th, .schedule-table td {{ border: 1px solid #ddd; padding: 8px; text-align: center; font-size: 12px; }}
-                .schedule-table th {{ background-color: #f2f2f2; font-weight: bold; }}
-                .compulsory {{ background-color: #FFE4E1; }}
-                .optional {{ background-color: #E0FFFF; }}
-                .general {{ background-color: #F0FFF0; }}
-                .summary {{ background-color: #f8f9fa; padding: 10px; border-radius: 5px; font-size: 14px; }}
-                .course-info {{ font-size: 10px; line-height: 1.2; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h3>🎓 {user_data.get('age', '')} {user_data.get('major', '')} 课程表</h3>
-                <p>总学分: {total_credits} 分 | 课程数: {len(user_data.get('compulsory_courses', [])) + len(user_data.get('optional_compulsory_courses', [])) + len(user_data.get('general_courses', []))} 门</p>
-            </div>
-            
-            <table class="schedule-table">
-                <tr>
-                    <th style="width: 80px;">时间</th>
-                    <th>周一</th>
-                    <th>周二</th>
-                    <th>周三</th>
-                    <th>周四</th>
-                    <th>周五</th>
-                </tr>
-        """
-        
-        # 时间段
-        time_slots = [
-            "8:00-8:45", "8:55-9:40", "10:00-10:45", "10:55-11:40",
-            "13:30-14:15", "14:25-15:10", "15:30-16:15", "16:25-17:10",
-            "18:30-19:15", "19:25-20:10", "20:20-21:05", "21:15-22:00"
-        ]
-        
-        # 创建课程表矩阵
-        schedule_matrix = [["" for _ in range(5)] for _ in range(12)]
-        
-        # 解析时间并填入课程
-        def parse_time_and_fill(courses, course_type, css_class):
-            for course in courses:
-                time_str = course.get('time', '')
-                if not time_str:
-                    continue
-                    
-                try:
-                    # 解析时间格式，如 "周一3-4节"
-                    if '周' in time_str and '节' in time_str:
-                        # 提取星期
-                        weekday = -1
-                        if '周一' in time_str: weekday = 0
-                        elif '周二' in time_str: weekday = 1
-                        elif '周三' in time_str: weekday = 2
-                        elif '周四' in time_str: weekday = 3
-                        elif '周五' in time_str: weekday = 4
-                        
-                        if weekday >= 0:
-                            # 提取节次
-                            import re
-                            periods = re.findall(r'(\d+)', time_str)
-                            for period in periods:
-                                period_num = int(period) - 1  # 转换为0-based索引
-                                if 0 <= period_num < 12:
-                                    course_info = f'<div class="{css_class}"><div class="course-info"><strong>{course["name"]}</strong><br>{course.get("teacher", "")}<br>{course.get("location", "")}<br>{course["credit"]}学分</div></div>'
-                                    schedule_matrix[period_num][weekday] = course_info
-                except Exception as e:
-                    print(f"解析时间失败: {time_str}, 错误: {e}")
-        
-        # 填入各类课程
-        parse_time_and_fill(user_data.get("compulsory_courses", []), "必修课", "compulsory")
-        parse_time_and_fill(user_data.get("optional_compulsory_courses", []), "选择性必修课", "optional")
-        parse_time_and_fill(user_data.get("general_courses", []), "通识课", "general")
-        
-        # 生成表格行
-        for i, time_slot in enumerate(time_slots):
-            html_content += f"<tr><td><strong>第{i+1}节<br>{time_slot}</strong></td>"
-            for j in range(5):
-                cell_content = schedule_matrix[i][j] if schedule_matrix[i][j] else ""
-                html_content += f"<td>{cell_content}</td>"
-            html_content += "</tr>"
-        
-        html_content += """
-            </table>
-            
-            <div class="summary">
-                <h4>📊 课程统计</h4>
-                <div style="display: flex; justify-content: space-between;">
-                    <div>
-                        <span style="background-color: #FFE4E1; padding: 2px 8px; border-radius: 3px;">必修课</span>
-                        {compulsory_count}门 ({compulsory_credits}学分)
-                    </div>
-                    <div>
-                        <span style="background-color: #E0FFFF; padding: 2px 8px; border-radius: 3px;">选择性必修</span>
-                        {optional_count}门 ({optional_credits}学分)
-                    </div>
-                    <div>
-                        <span style="background-color: #F0FFF0; padding: 2px 8px; border-radius: 3px;">通识课</span>
-                        {general_count}门 ({general_credits}学分)
-                    </div>
-                </div>
-                <p style="text-align: center; margin-top: 10px;"><strong>总计: {total_credits} 学分</strong></p>
-            </div>
-        </body>
-        </html>
-        """.format(
-            compulsory_count=len(user_data.get("compulsory_courses", [])),
-            compulsory_credits=compulsory_credits,
-            optional_count=len(user_data.get("optional_compulsory_courses", [])),
-            optional_credits=optional_credits,
-            general_count=len(user_data.get("general_courses", [])),
-            general_credits=general_credits,
-            total_credits=total_credits
-        )
-        
-        return html_content
+        user_data["total_credits"] = sum(html_report.category_credits(user_data).values())
+        return html_report.render_final_schedule(user_data)
 
     def finish_selection(self):
         """完成选课"""
         QMessageBox.information(self, "选课完成", "恭喜您完成选课！祝您学习愉快！")
         self.accept()
 
-def run_welcome_flow():
-    welcome = WelcomeDialog()
-    return welcome.exec_() == QtWidgets.QDialog.Accepted
-
-def run_age_flow():
-    age = AgeDialog()
-    result = age.exec_()
-    if result == QtWidgets.QDialog.Accepted:
-        return "ok"
-    else:
-        return "back_to_welcome"
-
-def run_major_flow():
-    major = MajorDialog()
-    result = major.exec_()
-    if result == QtWidgets.QDialog.Accepted:
-        return "ok"
-    else:
-        return "back_to_age"
-
-def run_full_selection_flow():
-    print("[DEBUG] 进入选课流程，当前用户信息：", user_data)
-    sys.stdout.flush()
-    # 必修课
-    while True:
-        compulsory = CompulsoryChooseUi(user_data["age"], user_data["major"])
-        result = compulsory.exec_()
-        if result == QtWidgets.QDialog.Accepted + 1:
-            break  # 进入选择性必修课
-        elif result == QtWidgets.QDialog.Rejected:
-            return "back_to_major"  # 回到专业选择
-    # 选择性必修课
-    while True:
-        optimal_compulsory = OptimalCompulsoryUi(user_data["age"], user_data["major"])
-        result = optimal_compulsory.exec_()
-        if result == QtWidgets.QDialog.Accepted:
-            break  # 进入通识课
-        elif result == QtWidgets.QDialog.Rejected:
-            return "back_to_compulsory"  # 回到必修课
-    # 通识课
-    while True:
-        optimal = OptimalDialog(user_data["age"], user_data["major"])
-        result = optimal.exec_()
-        if result == QtWidgets.QDialog.Accepted:
-            break  # 进入评估
-        elif result == QtWidgets.QDialog.Rejected:
-            return "back_to_optimal_compulsory"  # 回到选择性必修课
-    # 评估
-    while True:
-        evaluation = EvaluationDialog()
-        result = evaluation.exec_()
-        if result == QtWidgets.QDialog.Accepted:
-            break  # 进入最终课表
-        elif result == QtWidgets.QDialog.Rejected:
-            return "back_to_optimal"  # 回到通识课
-    # 最终课表
-    final = FinalDialog()
-    final.exec_()
-    return "done"
+# 选课流程的状态表（状态名与 core.session_store.STEPS 相同）：
+# 界面、界面返回值 -> 下一个状态（None 表示结束）、再次进入时的刷新
+Accepted, Rejected = QtWidgets.QDialog.Accepted, QtWidgets.QDialog.Rejected
+SCREENS = {
+    'welcome': Screen(WelcomeDialog, {Accepted: 'age', Rejected: None}),
+    'age': Screen(AgeDialog, {Accepted: 'major', Rejected: 'welcome'}),
+    'major': Screen(MajorDialog, {Accepted: 'compulsory', Rejected: 'age'}),
+    # 必修课界面以 Accepted + 1 表示进入下一步
+    'compulsory': Screen(lambda: CompulsoryChooseUi(user_data["age"], user_data["major"]),
+                         {Accepted + 1: 'optional_compulsory', Rejected: 'major'},
+                         lambda dialog: dialog.refresh(user_data["age"], user_data["major"])),
+    'optional_compulsory': Screen(lambda: OptimalCompulsoryUi(user_data["age"], user_data["major"]),
+                                  {Accepted: 'general', Rejected: 'compulsory'},
+                                  lambda dialog: dialog.refresh(user_data["age"], user_data["major"])),
+    'general': Screen(lambda: OptimalDialog(user_data["age"], user_data["major"]),
+                      {Accepted: 'evaluation', Rejected: 'optional_compulsory'},
+                      lambda dialog: dialog.refresh(user_data["age"], user_data["major"])),
+    'evaluation': Screen(EvaluationDialog, {Accepted: 'final', Rejected: 'general'}, EvaluationDialog.refresh),
+    'final': Screen(FinalDialog, {Accepted: None, Rejected: None}, FinalDialog.refresh),
+}
 
 def main():
+    global autosaver
+    configure_logging()
     app = QApplication(sys.argv)
     app.setStyleSheet("""
         QDialog {
@@ -736,67 +646,21 @@ def main():
             background-color: white;
         }
     """)
+    performance_shortcut = install_performance_shortcut(app)
+    catalog_shortcut = install_catalog_shortcut(app)
+    if APP_CONFIG['auto_save']:
+        autosaver = AutoSaver(SessionStore(get_cache_path(CACHE_CONFIG['session_file'])),
+                              APP_CONFIG['auto_save_delay'])
     try:
-        while True:  # 欢迎
-            if not run_welcome_flow():
-                break
-            while True:  # 年级
-                age_result = run_age_flow()
-                if age_result == "back_to_welcome":
-                    break  # 回到欢迎
-                while True:  # 专业
-                    major_result = run_major_flow()
-                    if major_result == "back_to_age":
-                        break  # 回到年级
-                    # 必修课
-                    while True:
-                        compulsory = CompulsoryChooseUi(user_data["age"], user_data["major"])
-                        result = compulsory.exec_()
-                        if result == QtWidgets.QDialog.Accepted + 1:
-                            # 进入选择性必修课
-                            while True:
-                                optimal_compulsory = OptimalCompulsoryUi(user_data["age"], user_data["major"])
-                                result2 = optimal_compulsory.exec_()
-                                if result2 == QtWidgets.QDialog.Accepted:
-                                    # 进入通识课
-                                    while True:
-                                        optimal = OptimalDialog(user_data["age"], user_data["major"])
-                                        result3 = optimal.exec_()
-                                        if result3 == QtWidgets.QDialog.Accepted:
-                                            # 进入评估
-                                            while True:
-                                                evaluation = EvaluationDialog()
-                                                result4 = evaluation.exec_()
-                                                if result4 == QtWidgets.QDialog.Accepted:
-                                                    final = FinalDialog()
-                                                    final.exec_()
-                                                    break  # 选课流程结束
-                                                elif result4 == QtWidgets.QDialog.Rejected:
-                                                    # 回到通识课
-                                                    break
-                                            if result4 == QtWidgets.QDialog.Rejected:
-                                                continue  # 回到通识课
-                                            break  # 评估完成，退出通识课
-                                        elif result3 == QtWidgets.QDialog.Rejected:
-                                            # 回到选择性必修课
-                                            break
-                                    if result3 == QtWidgets.QDialog.Rejected:
-                                        continue  # 回到选择性必修课
-                                    break  # 通识课完成，退出选择性必修课
-                                elif result2 == QtWidgets.QDialog.Rejected:
-                                    # 回到必修课
-                                    break
-                            if result2 == QtWidgets.QDialog.Rejected:
-                                continue  # 回到必修课
-                            break  # 选择性必修课完成，退出必修课
-                        elif result == QtWidgets.QDialog.Rejected:
-                            # 回到专业选择
-                            break
-                    if result == QtWidgets.QDialog.Rejected:
-                        continue  # 回到专业选择
-                    break  # 必修课完成，退出专业选择
+        # 有保存的进度时可直接回到上次的界面（不重新走前面的步骤，评估结果也不重新生成）
+        resume_step = offer_resume(autosaver.store) if autosaver else None
+        navigator = Navigator(SCREENS, on_enter=save_session)
+        navigator.run(resume_step or 'welcome')
     except Exception as e:
         QMessageBox.critical(None, "系统错误", f"系统遇到错误：{str(e)}")
+    finally:
+        if autosaver:
+            autosaver.flush()
     sys.exit()
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""
+界面导航
+选课流程是一个状态机：每个状态是一个界面，界面关闭时的返回值决定下一个状态。
+界面第一次进入时创建，之后一直保留；再次进入时只调用 refresh，由界面自己刷新变化的部分，
+返回上一步不再重新读表、重建控件。
+
+    navigator = Navigator({
+        'age': Screen(AgeDialog, {Accepted: 'major', Rejected: 'welcome'}),
+        'major': Screen(MajorDialog, {Accepted: 'compulsory', Rejected: 'age'},
+                        refresh=lambda dialog: ...),
+        ...
+    })
+    navigator.run('welcome')
+
+每次切换的耗时（上一个界面关闭到下一个界面创建或刷新完成）记在 last_transition_ms，
+并按目标状态记入性能埋点 ui.navigate.<状态>。
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from core import instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class Screen(NamedTuple):
+    """一个状态：创建界面的函数、返回值 -> 下一个状态（None 表示结束），以及再次进入时的刷新"""
+    create: Callable[[], Any]
+    transitions: Dict[int, Optional[str]]
+    refresh: Optional[Callable[[Any], None]] = None
+
+
+class Navigator:
+    """按状态表切换界面，已创建的界面留在缓存中重复使用
+
+    on_enter(state) 在进入每个状态时调用（如自动保存当前步骤）。
+    返回值不在状态的 transitions 中时（如界面以其他方式关闭）重新显示同一个界面。
+    """
+
+    def __init__(self, screens: Dict[str, Screen], on_enter: Callable[[str], None] = None):
+        self.screens = screens
+        self.on_enter = on_enter
+        self.state: Optional[str] = None
+        self.last_transition_ms = 0.0
+        self._dialogs: Dict[str, Any] = {}
+
+    def dialog(self, state: str):
+        """状态对应的界面：第一次进入时创建，之后刷新后重复使用"""
+        screen = self.screens[state]
+        dialog = self._dialogs.get(state)
+        if dialog is None:
+            dialog = self._dialogs[state] = screen.create()
+            instrumentation.count('ui.navigate.created')
+        else:
+            if screen.refresh is not None:
+                screen.refresh(dialog)
+            instrumentation.count('ui.navigate.reused')
+        return dialog
+
+    def discard(self, state: str):
+        """丢弃缓存的界面，下次进入时重新创建"""
+        dialog = self._dialogs.pop(state, None)
+        if dialog is not None and hasattr(dialog, 'deleteLater'):
+            dialog.deleteLater()
+
+    def run(self, start: str) -> Optional[str]:
+        """从 start 开始显示界面，直到转移到 None；返回最后显示的状态"""
+        state = start
+        last = None
+        started = time.perf_counter()
+        while state is not None:
+            self.state = last = state
+            if self.on_enter is not None:
+                self.on_enter(state)
+            dialog = self.dialog(state)
+            self.last_transition_ms = (time.perf_counter() - started) * 1000
+            instrumentation.observe(f'ui.navigate.{state}', self.last_transition_ms)
+            logger.debug("切换到 %s: %.1fms", state, self.last_transition_ms)
+
+            result = dialog.exec_()
+            started = time.perf_counter()
+            state = self.screens[state].transitions.get(result, state)
+        return last
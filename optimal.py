@@ -12,9 +12,15 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QMessageBox
 import os
-import random
+import logging
 from config import UI_CONFIG
-from extract_courses import extract_courses_by_grade_and_major, has_time_conflict
+from core.course_selection import load_general_courses, rank_general_courses, selection_record
+from core.conflict_index import occupancy_mask
+from core.preference_model import log_course_selection
+from core import instrumentation
+from course_list_view import CourseTableModel, CourseTableView
+
+logger = logging.getLogger(__name__)
 
 # 导入主程序的用户数据
 try:
@@ -139,44 +145,22 @@ class Ui_Dialog(object):
         self.credits_background.setObjectName("credits_background")
         self.credits_background.setStyleSheet(UI_CONFIG['component_styles']['credits_display']['background'])
         
-        # 课程列表表格
-        self.list = QtWidgets.QTableWidget(Dialog)
-        self.list.setGeometry(QtCore.QRect(350, 170, 300, 400))
+        # 课程列表（第0列勾选）
+        self.list = CourseTableView(Dialog)
+        self.list.setGeometry(QtCore.QRect(350, 170, 470, 400))
         self.list.setObjectName("list")
-        self.list.setColumnCount(4)
         self.list.setStyleSheet(UI_CONFIG['component_styles']['table'])
-        
-        # 设置表头
-        headers = ["课程名称", "学分", "时间", "推荐"]
-        for i, header in enumerate(headers):
-            item = QtWidgets.QTableWidgetItem()
-            item.setText(header)
-            self.list.setHorizontalHeaderItem(i, item)
-        
-        # 复选框区域 - 使用滚动区域
-        self.checkbox_widget = QtWidgets.QWidget(Dialog)
-        self.checkbox_widget.setGeometry(QtCore.QRect(670, 170, 150, 400))
-        
-        self.scroll_area = QtWidgets.QScrollArea(self.checkbox_widget)
-        self.scroll_area.setGeometry(QtCore.QRect(0, 0, 150, 400))
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: 2px solid #000000;
-                border-radius: 10px;
-                background-color: #ffffff;
-            }
-        """)
-        
-        self.scroll_content = QtWidgets.QWidget()
-        self.scroll_area.setWidget(self.scroll_content)
-        
-        self.checkbox_layout = QtWidgets.QVBoxLayout(self.scroll_content)
-        self.checkbox_layout.setContentsMargins(10, 10, 10, 10)
-        self.checkbox_layout.setSpacing(8)
-        
-        # 复选框列表将动态创建
-        self.checkboxes = []
+        self.course_model = CourseTableModel([
+            ("课程名称", '课程名称'),
+            ("学分", '学分'),
+            ("时间", '上课时间'),
+            ("推荐", lambda course: "推荐" if course.get('recommended', False) else "冲突")
+        ], credit_key='学分', type_key='课程类型', time_key='上课时间', parent=Dialog)
+        self.list.setModel(self.course_model)
+        self.list.setColumnWidth(0, 50)
+        self.list.setColumnWidth(1, 160)
+        self.list.setColumnWidth(2, 50)
+        self.list.setColumnWidth(3, 130)
         
         # 设置z-order
         self.background.raise_()
@@ -188,7 +172,6 @@ class Ui_Dialog(object):
         self.all_points.raise_()
         self.label.raise_()
         self.back.raise_()
-        self.checkbox_widget.raise_()
 
     def retranslateUi(self, Dialog):
         _translate = QtCore.QCoreApplication.translate
@@ -225,6 +208,8 @@ class OptimalDialog(QtWidgets.QDialog, Ui_Dialog):
         # 连接信号
         self.confirm.clicked.connect(self.confirm_selection)
         self.back.clicked.connect(self.reject)
+        self.course_model.checkedChanged.connect(self.update_selection)
+        self.course_model.checkedChanged.connect(self.save_draft)
         
         # 加载课程并进行智能推荐
         self.load_courses()
@@ -235,7 +220,8 @@ class OptimalDialog(QtWidgets.QDialog, Ui_Dialog):
     def load_existing_courses(self):
         """加载已选择的课程（用于时间冲突检查）"""
         try:
-            # 从user_data获取已选课程
+            # 从user_data获取已选课程（在这里导入：本模块被 main_enhanced 导入时 user_data 尚未定义）
+            from main_enhanced import user_data
             self.existing_courses = []
             
             # 添加必修课
@@ -256,180 +242,72 @@ class OptimalDialog(QtWidgets.QDialog, Ui_Dialog):
                         'type': '选择性必修课'
                     })
             
-            print(f"已选课程数量: {len(self.existing_courses)}")
+            logger.info("已选课程数量: %d", len(self.existing_courses))
+            
+            # 已有的必修课和选择性必修课学分（累积学分从这里加起）
+            self.course_model.totals.base_credits = sum(
+                course['credit'] for key in ("compulsory_courses", "optional_compulsory_courses")
+                for course in user_data.get(key, []))
             
         except Exception as e:
-            print(f"加载已选课程失败: {e}")
+            logger.error("加载已选课程失败: %s", e)
             self.existing_courses = []
 
+    @instrumentation.timed('ui.optimal.load_courses')
     def load_courses(self):
         """加载通识课程并进行智能推荐"""
         try:
-            # 生成示例通识课程数据（实际项目中应从数据库或文件读取）
-            sample_courses = [
-                {"课程名称": "大学英语", "学分": 2, "上课时间": "周一3-4节", "教师": "李教授", "类型": "语言类"},
-                {"课程名称": "中国文学经典", "学分": 3, "上课时间": "周二1-2节", "教师": "王教授", "类型": "文学类"},
-                {"课程名称": "世界历史概论", "学分": 2, "上课时间": "周三5-6节", "教师": "张教授", "类型": "历史类"},
-                {"课程名称": "艺术欣赏", "学分": 2, "上课时间": "周四7-8节", "教师": "赵教授", "类型": "艺术类"},
-                {"课程名称": "心理学导论", "学分": 3, "上课时间": "周五3-4节", "教师": "陈教授", "类型": "心理类"},
-                {"课程名称": "环境科学概论", "学分": 2, "上课时间": "周一7-8节", "教师": "刘教授", "类型": "科学类"},
-                {"课程名称": "经济学原理", "学分": 3, "上课时间": "周二5-6节", "教师": "孙教授", "类型": "经济类"},
-                {"课程名称": "哲学思想史", "学分": 2, "上课时间": "周三1-2节", "教师": "周教授", "类型": "哲学类"},
-                {"课程名称": "体育健康", "学分": 1, "上课时间": "周四3-4节", "教师": "吴教授", "类型": "体育类"},
-                {"课程名称": "音乐欣赏", "学分": 2, "上课时间": "周五1-2节", "教师": "郑教授", "类型": "艺术类"},
-                {"课程名称": "数学思维", "学分": 3, "上课时间": "周一1-2节", "教师": "马教授", "类型": "数学类"},
-                {"课程名称": "社会学概论", "学分": 2, "上课时间": "周二7-8节", "教师": "冯教授", "类型": "社会类"},
-            ]
+            # 课表中全部通识课的教学班（课表在前面的步骤已读过，这里取缓存）
+            general_courses = load_general_courses()
             
             # 进行智能筛选，推荐时间不冲突的课程
-            recommended_courses = self.smart_course_recommendation(sample_courses)
-            
-            self.courses = recommended_courses
+            self.courses = self.smart_course_recommendation(general_courses)
+            logger.info("通识课 %d 个教学班，其中推荐 %d 个", len(self.courses),
+                        sum(course['recommended'] for course in self.courses))
             self.update_course_display()
             self.show_recommendation_info()
             
         except Exception as e:
-            print(f"加载课程失败: {e}")
+            logger.error("加载课程失败: %s", e)
             self.courses = []
 
     def smart_course_recommendation(self, all_courses):
-        """智能推荐时间不冲突的课程"""
-        recommended = []
-        conflict_courses = []
-        
-        for course in all_courses:
-            course_time = course.get('上课时间', '')
-            has_conflict = False
-            
-            # 检查与已选课程的时间冲突
-            for existing in self.existing_courses:
-                if self.check_time_conflict(course_time, existing['time']):
-                    has_conflict = True
-                    conflict_courses.append({
-                        'course': course,
-                        'conflict_with': existing['name'],
-                        'conflict_type': existing['type']
-                    })
-                    break
-            
-            if not has_conflict:
-                course['recommended'] = True
-                recommended.append(course)
-            else:
-                course['recommended'] = False
-                recommended.append(course)
-        
-        # 按推荐优先级排序（推荐的在前面）
-        recommended.sort(key=lambda x: (not x['recommended'], x['课程名称']))
-        
-        return recommended
+        """智能推荐时间不冲突的课程（与已选课程的时间位掩码比较）"""
+        return rank_general_courses(all_courses, self.existing_courses)
 
-    def check_time_conflict(self, time1, time2):
-        """检查两个时间是否冲突"""
-        if not time1 or not time2:
-            return False
-        
-        try:
-            # 简单的时间冲突检查逻辑
-            # 提取星期几和节次信息
-            def parse_time(time_str):
-                time_str = str(time_str).strip()
-                if '周' in time_str and '节' in time_str:
-                    # 提取星期
-                    weekday = ''
-                    if '周一' in time_str: weekday = '周一'
-                    elif '周二' in time_str: weekday = '周二'
-                    elif '周三' in time_str: weekday = '周三'
-                    elif '周四' in time_str: weekday = '周四'
-                    elif '周五' in time_str: weekday = '周五'
-                    elif '周六' in time_str: weekday = '周六'
-                    elif '周日' in time_str: weekday = '周日'
-                    
-                    # 提取节次
-                    periods = []
-                    if '1' in time_str: periods.append(1)
-                    if '2' in time_str: periods.append(2)
-                    if '3' in time_str: periods.append(3)
-                    if '4' in time_str: periods.append(4)
-                    if '5' in time_str: periods.append(5)
-                    if '6' in time_str: periods.append(6)
-                    if '7' in time_str: periods.append(7)
-                    if '8' in time_str: periods.append(8)
-                    
-                    return weekday, set(periods)
-                return '', set()
-            
-            weekday1, periods1 = parse_time(time1)
-            weekday2, periods2 = parse_time(time2)
-            
-            # 如果是同一天且时间段有重叠，则冲突
-            if weekday1 == weekday2 and weekday1 and periods1 & periods2:
-                return True
-            
-            return False
-            
-        except Exception as e:
-            print(f"时间冲突检查失败: {e}")
-            return False
+    def refresh(self, grade, major):
+        """界面再次显示前调用：之前步骤的选课变了才重新计算推荐和冲突标记，保留本界面的勾选"""
+        self.grade, self.major = grade, major
+        previous = [(course['name'], course['time']) for course in self.existing_courses]
+        self.load_existing_courses()
+        if [(course['name'], course['time']) for course in self.existing_courses] != previous:
+            selected = {(course['课程名称'], course.get('上课时间', ''))
+                        for course in self.course_model.checked_courses()}
+            self.courses = self.smart_course_recommendation(self.courses)
+            self.update_course_display(selected)
+            self.show_recommendation_info()
+        self.update_selection()
 
-    def update_course_display(self):
-        """更新课程显示"""
+    @instrumentation.timed('ui.optimal.course_table')
+    def update_course_display(self, selected=None):
+        """更新课程显示（selected 为要勾选的教学班（课程名称, 上课时间），默认恢复上次保存的勾选）
+
+        同一门课的多个教学班按上课时间区分；列表只绘制可见的行，全部教学班一次放入模型。
+        """
         if not self.courses:
             return
         
-        # 清空现有复选框
-        for checkbox in self.checkboxes:
-            checkbox.deleteLater()
-        self.checkboxes.clear()
-        
-        # 更新表格
-        self.list.setRowCount(len(self.courses))
-        
-        for i, course in enumerate(self.courses):
-            # 表格显示
-            name_item = QtWidgets.QTableWidgetItem(course['课程名称'])
-            credit_item = QtWidgets.QTableWidgetItem(str(course['学分']))
-            time_item = QtWidgets.QTableWidgetItem(course.get('上课时间', ''))
-            
-            # 推荐状态
-            if course.get('recommended', False):
-                recommend_item = QtWidgets.QTableWidgetItem("推荐")
-                recommend_item.setBackground(QtGui.QColor(144, 238, 144))  # 浅绿色
-                name_item.setBackground(QtGui.QColor(144, 238, 144))
-                credit_item.setBackground(QtGui.QColor(144, 238, 144))
-                time_item.setBackground(QtGui.QColor(144, 238, 144))
-            else:
-                recommend_item = QtWidgets.QTableWidgetItem("冲突")
-                recommend_item.setBackground(QtGui.QColor(255, 182, 193))  # 浅红色
-                name_item.setBackground(QtGui.QColor(255, 182, 193))
-                credit_item.setBackground(QtGui.QColor(255, 182, 193))
-                time_item.setBackground(QtGui.QColor(255, 182, 193))
-            
-            self.list.setItem(i, 0, name_item)
-            self.list.setItem(i, 1, credit_item)
-            self.list.setItem(i, 2, time_item)
-            self.list.setItem(i, 3, recommend_item)
-            
-            # 创建复选框
-            checkbox = QtWidgets.QCheckBox(self.scroll_content)
-            checkbox.setText(f"{course['课程名称']} ({course['学分']}分)")
-            checkbox.setStyleSheet(UI_CONFIG['component_styles']['checkbox'])
-            
-            # 推荐课程用不同颜色显示，但不自动勾选
-            if course.get('recommended', False):
-                checkbox.setStyleSheet(UI_CONFIG['component_styles']['checkbox'] + """
-                    QCheckBox {
-                        font-weight: bold;
-                        color: #4CAF50;
-                    }
-                """)
-            
-            checkbox.stateChanged.connect(self.update_selection)
-            self.checkboxes.append(checkbox)
-            self.checkbox_layout.addWidget(checkbox)
-        
-        # 调整表格列宽
-        self.list.resizeColumnsToContents()
+        # 推荐课程（与已选课程不冲突）绿色显示、冲突课程红色显示，都不自动勾选；
+        # 勾选后与之时间冲突的课程随即变为红色
+        if selected is None:
+            from main_enhanced import user_data
+            selected = {(course['name'], course.get('time', '')) for course in user_data.get('general_courses', [])}
+        self.course_model.set_courses(
+            self.courses,
+            checked=[(course['课程名称'], course.get('上课时间', '')) in selected for course in self.courses],
+            highlight=['recommended' if course.get('recommended', False) else 'conflict'
+                       for course in self.courses],
+            fixed_mask=occupancy_mask(course['time'] for course in self.existing_courses))
         
         # 更新学分显示
         self.update_selection()
@@ -437,127 +315,104 @@ class OptimalDialog(QtWidgets.QDialog, Ui_Dialog):
     def show_recommendation_info(self):
         """显示推荐信息"""
         try:
-            recommended_count = len([c for c in self.courses if c.get('recommended', False)])
-            conflict_count = len(self.courses) - recommended_count
+            recommended = [c for c in self.courses if c.get('recommended', False)]
+            conflicting = [c for c in self.courses if not c.get('recommended', False)]
+            recommended_count = len(recommended)
+            conflict_count = len(conflicting)
+            # 课表中的通识课有几百个教学班，这里每类只列出前若干个，完整列表在右侧课程列表中
+            limit = UI_CONFIG['course_list']['summary_limit']
+            more_html = "<p style='font-family: 楷体;'>……另有 {} 个，见右侧课程列表</p>"
             
             info_html = f"""
             <h3 style='color: #2196F3; font-family: 楷体;'>📚 通识课推荐</h3>
             <p style='font-family: 楷体;'><strong>推荐策略：</strong>优先选择与已选课程时间不冲突的课程</p>
-            <p style='font-family: 楷体;'><strong>推荐课程：</strong>{recommended_count} 门</p>
-            <p style='font-family: 楷体;'><strong>时间冲突：</strong>{conflict_count} 门</p>
+            <p style='font-family: 楷体;'><strong>推荐课程：</strong>{recommended_count} 个教学班</p>
+            <p style='font-family: 楷体;'><strong>时间冲突：</strong>{conflict_count} 个教学班</p>
             
             <h4 style='color: #4CAF50; font-family: 楷体;'>✅ 推荐课程</h4>
             """
             
-            for course in self.courses:
-                if course.get('recommended', False):
+            for course in recommended[:limit]:
+                info_html += f"""
+                <div style='margin: 5px 0; padding: 5px; background-color: #f0f8f0; border-radius: 3px; font-family: 楷体;'>
+                    <strong>{course['课程名称']}</strong><br>
+                    时间: {course.get('上课时间', '')}<br>
+                    学分: {course['学分']:g}
+                </div>
+                """
+            if recommended_count > limit:
+                info_html += more_html.format(recommended_count - limit)
+            
+            if conflict_count > 0:
+                info_html += f"<h4 style='color: #f44336; font-family: 楷体;'>⚠️ 时间冲突课程</h4>"
+                for course in conflicting[:limit]:
                     info_html += f"""
-                    <div style='margin: 5px 0; padding: 5px; background-color: #f0f8f0; border-radius: 3px; font-family: 楷体;'>
+                    <div style='margin: 5px 0; padding: 5px; background-color: #fff0f0; border-radius: 3px; font-family: 楷体;'>
                         <strong>{course['课程名称']}</strong><br>
                         时间: {course.get('上课时间', '')}<br>
-                        学分: {course['学分']}
+                        <span style='color: #f44336;'>与已选课程时间冲突</span>
                     </div>
                     """
-            
-            if conflict_count > 0:
-                info_html += f"<h4 style='color: #f44336; font-family: 楷体;'>⚠️ 时间冲突课程</h4>"
-                for course in self.courses:
-                    if not course.get('recommended', False):
-                        info_html += f"""
-                        <div style='margin: 5px 0; padding: 5px; background-color: #fff0f0; border-radius: 3px; font-family: 楷体;'>
-                            <strong>{course['课程名称']}</strong><br>
-                            时间: {course.get('上课时间', '')}<br>
-                            <span style='color: #f44336;'>与已选课程时间冲突</span>
-                        </div>
-                        """
+                if conflict_count > limit:
+                    info_html += more_html.format(conflict_count - limit)
             
             self.textBrowser.setHtml(info_html)
             
         except Exception as e:
-            print(f"显示推荐信息失败: {e}")
+            logger.error("显示推荐信息失败: %s", e)
             self.textBrowser.setHtml("<p style='font-family: 楷体;'>推荐信息加载失败</p>")
 
     def update_selection(self):
-        """更新选择状态"""
-        current_selection_credits = 0
-        selected_count = 0
-        
-        for i, checkbox in enumerate(self.checkboxes):
-            if checkbox.isChecked():
-                current_selection_credits += self.courses[i]['学分']
-                selected_count += 1
-        
-        # 获取已有的必修课和选择性必修课学分
-        try:
-            from main_enhanced import user_data
-            existing_credits = user_data.get("total_credits", 0)
-            total_display_credits = existing_credits + current_selection_credits
-        except:
-            total_display_credits = current_selection_credits
-        
-        # 显示累积学分
-        self.all_points.display(total_display_credits)
+        """更新选择状态（合计随勾选增减，不重新遍历课程）"""
+        totals = self.course_model.totals
+        # 显示累积学分（已有学分 + 本界面勾选的学分）
+        self.all_points.display(totals.total)
+        self.all_points.setToolTip(totals.describe())
         self.label.setText("累积学分")  # 简化标签文字，为数字留出更多空间
 
+    def save_draft(self):
+        """勾选变化时自动保存当前的选择（防抖，稍后在后台写文件）"""
+        from main_enhanced import save_session
+        save_session('general', general_courses=[
+            selection_record(course) for course in self.course_model.checked_courses()])
+
     def confirm_selection(self):
         """确认选择"""
-        self.selected_courses = []
-        
-        for i, checkbox in enumerate(self.checkboxes):
-            if checkbox.isChecked():
-                course = self.courses[i].copy()
-                self.selected_courses.append(course)
+        self.selected_courses = [course.copy() for course in self.course_model.checked_courses()]
         
         if not self.selected_courses:
             QMessageBox.warning(self, "提示", "请至少选择一门通识课程！")
             return
         
-        print(f"确认选择了{len(self.selected_courses)}门通识课程")
+        logger.info("确认选择了%d门通识课程", len(self.selected_courses))
         for course in self.selected_courses:
-            print(f"- {course['课程名称']} ({course['学分']}分)")
+            logger.debug("- %s (%s分)", course['课程名称'], course['学分'])
         
         # 保存通识课结果到全局数据并累积学分
         try:
             from main_enhanced import user_data
             
-            formatted_general = []
-            for course in self.selected_courses:
-                formatted_general.append({
-                    'name': course.get('课程名称', ''),
-                    'credit': float(course.get('学分', 0)),
-                    'time': course.get('上课时间', ''),
-                    'location': course.get('上课地点', ''),
-                    'teacher': course.get('教师', '')
-                })
+            formatted_general = [selection_record(course) for course in self.selected_courses]
             
             # 保存到全局数据
             user_data["general_courses"] = formatted_general
             
-            # 累积学分（加到已有的必修课和选择性必修课学分上）
-            general_credits = sum(course['credit'] for course in formatted_general)
-            user_data["total_credits"] += general_credits
-            
-            print(f"通识课完成，新增学分: {general_credits}")
-            print(f"最终累积总学分: {user_data['total_credits']}")
-            
-            # 跳转到AI智能分析评估
-            from evaluation import Ui_Dialog as EvaluationUi
-            from PyQt5 import QtWidgets
+            # 记录本次选课，作为偏好模型的训练数据
+            log_course_selection(self.courses, [c['name'] for c in formatted_general], '通识课',
+                                 grade=self.grade, major=self.major,
+                                 existing_times=[c['time'] for c in self.existing_courses])
             
-            evaluation_dialog = QtWidgets.QDialog()
-            evaluation_ui = EvaluationUi()
-            evaluation_ui.setupUi(evaluation_dialog)
+            # 累积学分（已有的必修课和选择性必修课学分 + 本界面勾选的学分，返回后重新确认也不会重复累加）
+            general_credits = self.course_model.totals.credits
+            user_data["total_credits"] = self.course_model.totals.total
             
-            # 创建评估对话框实例
-            from main_enhanced import EvaluationDialog
-            evaluation_instance = EvaluationDialog()
+            logger.info("通识课完成，新增学分: %s，累积总学分: %s", general_credits, user_data['total_credits'])
             
-            # 关闭当前界面并显示AI分析界面
+            # 进入AI智能分析评估（由 main_enhanced 的导航切换界面）
             self.accept()
-            evaluation_instance.exec_()
             
         except Exception as e:
-            print(f"保存通识课结果或跳转失败: {e}")
+            logger.error("保存通识课结果或跳转失败: %s", e)
             self.accept()
 
     def get_selected_courses(self):
@@ -2,8 +2,16 @@
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 import os
-from extract_courses import get_optional_compulsory_courses, has_time_conflict
+import logging
+from core.extract_courses import get_optional_compulsory_courses
+from core.conflict_index import occupancy_mask
+from core.course_selection import selection_record
 from config import UI_CONFIG
+from core.preference_model import log_course_selection
+from core import instrumentation
+from course_list_view import CourseTableModel, CourseTableView
+
+logger = logging.getLogger(__name__)
 
 class Ui_Dialog(object):
     def setupUi(self, Dialog):
@@ -28,7 +36,7 @@ class Ui_Dialog(object):
             if os.path.exists(background_path):
                 self.background.setPixmap(QtGui.QPixmap(background_path))
         except Exception as e:
-            print(f"加载背景图片失败: {e}")
+            logger.warning("加载背景图片失败: %s", e)
 
         # 标题
         self.title_label = QtWidgets.QPushButton(self.frame)
@@ -52,41 +60,21 @@ class Ui_Dialog(object):
             }
         """)
 
-        # 课程表格
-        self.list = QtWidgets.QTableWidget(self.frame)
-        self.list.setGeometry(QtCore.QRect(30, 150, 350, 450))
+        # 课程列表（第0列勾选）
+        self.list = CourseTableView(self.frame)
+        self.list.setGeometry(QtCore.QRect(30, 150, 650, 450))
         self.list.setObjectName("list")
-        self.list.setColumnCount(3)
-        self.list.setHorizontalHeaderLabels(['课程名称', '课程时间', '学分数'])
         self.list.setStyleSheet(UI_CONFIG['component_styles']['table'])
-        self.list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
-        self.list.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
-        self.list.horizontalHeader().setStretchLastSection(True)
-        self.list.verticalHeader().setVisible(False)
-        self.list.setColumnWidth(0, 180)
-        self.list.setColumnWidth(1, 100)
-        self.list.setColumnWidth(2, 60)
-
-        # 右侧复选框区域（滚动）
-        self.layoutWidget = QtWidgets.QWidget(self.frame)
-        self.layoutWidget.setGeometry(QtCore.QRect(400, 150, 280, 450))
-        self.layoutWidget.setObjectName("layoutWidget")
-        self.scrollArea = QtWidgets.QScrollArea(self.layoutWidget)
-        self.scrollArea.setGeometry(QtCore.QRect(0, 0, 280, 450))
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setStyleSheet("""
-            QScrollArea {
-                border: 2px solid #000000;
-                border-radius: 10px;
-                background-color: #ffffff;
-            }
-        """)
-        self.scrollWidget = QtWidgets.QWidget()
-        self.scrollArea.setWidget(self.scrollWidget)
-        self.verticalLayout = QtWidgets.QVBoxLayout(self.scrollWidget)
-        self.verticalLayout.setContentsMargins(10, 10, 10, 10)
-        self.verticalLayout.setSpacing(12)
-        self.verticalLayout.setObjectName("verticalLayout")
+        self.course_model = CourseTableModel([
+            ('课程名称', '课程名称'),
+            ('课程时间', '上课时间'),
+            ('学分数', '学分')
+        ], credit_key='学分', time_key='上课时间', parent=Dialog)
+        self.list.setModel(self.course_model)
+        self.list.setColumnWidth(0, 50)
+        self.list.setColumnWidth(1, 320)
+        self.list.setColumnWidth(2, 180)
+        self.list.setColumnWidth(3, 60)
 
         # 累计学分显示区域
         self.pushButton_4 = QtWidgets.QPushButton(self.frame)
@@ -122,7 +110,6 @@ class Ui_Dialog(object):
 
         # 设置z-order
         self.background.raise_()
-        self.layoutWidget.raise_()
         self.pushButton_4.raise_()
         self.confirm.raise_()
         self.list.raise_()
@@ -141,97 +128,66 @@ class OptimalCompulsoryUi(QtWidgets.QDialog, Ui_Dialog):
         self.major = major
         self.compulsory_courses = compulsory_courses or []
         self.selected_courses = []
-        self.checkboxes = []
+        self.course_model.checkedChanged.connect(self.update_selection)
+        self.course_model.checkedChanged.connect(self.save_draft)
         self.load_courses()
         self.confirm.clicked.connect(self.confirm_selection)
         self.back.clicked.connect(self.reject)
 
+    @instrumentation.timed('ui.optional.course_table')
     def load_courses(self):
         try:
             base_dir = os.path.dirname(os.path.abspath(__file__))
             res_dir = os.path.join(base_dir, "res")
             file_path = os.path.join(res_dir, "通班&智能专业课 表格.xlsx")
             courses = get_optional_compulsory_courses(file_path, self.grade, self.major)
-            self.list.setRowCount(len(courses))
-            # 清空旧复选框
-            for cb in self.checkboxes:
-                cb.deleteLater()
-            self.checkboxes.clear()
-            # 填充表格和复选框
             from main_enhanced import user_data
+            # 只加必修课学分（不加已累计的选择性必修课学分）
+            self.course_model.totals.base_credits = sum(
+                course['credit'] for course in user_data.get('compulsory_courses', []))
             selected_names = set()
             for c in user_data.get("optional_compulsory_courses", []):
                 if "name" in c:
                     selected_names.add(c["name"])
                 elif "课程名称" in c:
                     selected_names.add(c["课程名称"])
-            # 填充表格和复选框
-            for i, course in enumerate(courses):
-                # 表格
-                name_item = QtWidgets.QTableWidgetItem(course['课程名称'])
-                time_item = QtWidgets.QTableWidgetItem(str(course['上课时间']))
-                credit_item = QtWidgets.QTableWidgetItem(str(course['学分']))
-                for item in (name_item, time_item, credit_item):
-                    item.setFlags(QtCore.Qt.ItemIsEnabled)
-                self.list.setItem(i, 0, name_item)
-                self.list.setItem(i, 1, time_item)
-                self.list.setItem(i, 2, credit_item)
-                # 复选框
-                checkbox = QtWidgets.QCheckBox(f"{course['课程名称']}（{course['学分']}分）", self.scrollWidget)
-                checkbox.setProperty('course_data', course)
-                checkbox.stateChanged.connect(self.update_selection)
-                checkbox.setStyleSheet("""
-                    QCheckBox {
-                        font-size: 16px;           /* 字体更大 */
-                        font-weight: bold;
-                        color: #222;
-                        padding: 8px 12px;
-                        background: #F5F5F5;
-                        border-radius: 8px;
-                        margin-bottom: 8px;
-                        transition: background 0.2s;
-                    }
-                    QCheckBox:hover {
-                        background: #E0E0E0;
-                    }
-                    QCheckBox:checked {
-                        font-weight: bold;
-                        color: #2196F3;
-                        background: #E3F2FD;
-                        border: 2px solid #2196F3;
-                        box-shadow: 0 2px 8px rgba(33,150,243,0.15);
-                    }
-                """)
-                # 优先根据user_data恢复勾选
-                if course['课程名称'] in selected_names:
-                    checkbox.setChecked(True)
-                self.verticalLayout.addWidget(checkbox)
-                self.checkboxes.append(checkbox)
+            # 优先根据user_data恢复勾选；与必修课或已勾选课程时间冲突的行实时标红
+            self.course_model.set_courses(
+                courses, checked=[course['课程名称'] in selected_names for course in courses],
+                fixed_mask=occupancy_mask(course.get('time') for course in user_data.get('compulsory_courses', [])))
             self.list.resizeColumnsToContents()
-            self.list.resizeRowsToContents()
             self.update_selection()
         except Exception as e:
+            logger.exception("加载课程数据失败: %s", e)
             QtWidgets.QMessageBox.critical(self, "错误", f"加载课程数据失败：{str(e)}")
-            import traceback
-            traceback.print_exc()
 
-    def update_selection(self):
-        self.selected_courses = []
-        current_selection_credits = 0
-        for checkbox in self.checkboxes:
-            if checkbox.isChecked():
-                course_data = checkbox.property('course_data')
-                if course_data:
-                    self.selected_courses.append(course_data)
-                    current_selection_credits += float(course_data['学分'])
-        # 只加必修课学分（不加已累计的选择性必修课学分）
+    def refresh(self, grade, major):
+        """界面再次显示前调用：年级或专业变了才重新加载课程；必修课变了只更新已有学分和冲突标记"""
+        if (grade, major) != (self.grade, self.major):
+            self.grade, self.major = grade, major
+            self.load_courses()
+            return
         from main_enhanced import user_data
-        compulsory_credits = sum(course['credit'] for course in user_data.get('compulsory_courses', []))
-        total_display_credits = compulsory_credits + current_selection_credits
-        self.all_points.display(total_display_credits)
-        self.label.setText(f"累积学分 (当前选择{len(self.selected_courses)}门)")
+        compulsory_courses = user_data.get('compulsory_courses', [])
+        self.course_model.totals.base_credits = sum(course['credit'] for course in compulsory_courses)
+        self.course_model.set_fixed_mask(occupancy_mask(course.get('time') for course in compulsory_courses))
+        self.update_selection()
+
+    def update_selection(self):
+        # 合计随勾选增减，不重新遍历课程
+        totals = self.course_model.totals
+        self.all_points.display(totals.total)
+        self.label.setText(f"累积学分 (当前选择{totals.count}门)")
+
+    def save_draft(self):
+        """勾选变化时自动保存当前的选择（防抖，稍后在后台写文件）"""
+        from main_enhanced import save_session
+        save_session('optional_compulsory', optional_compulsory_courses=[
+            dict(selection_record(course), course_type='选择性必修课')
+            for course in self.course_model.checked_courses()])
 
     def confirm_selection(self):
+        self.selected_courses = self.course_model.checked_courses()
         if not self.selected_courses:
             QtWidgets.QMessageBox.warning(self, "警告", "请至少选择一门课程")
             return
@@ -240,47 +196,28 @@ class OptimalCompulsoryUi(QtWidgets.QDialog, Ui_Dialog):
             return
         try:
             from main_enhanced import user_data
-            formatted_optional = []
-            for course in self.selected_courses:
-                formatted_optional.append({
-                    'name': course.get('课程名称', ''),
-                    'credit': float(course.get('学分', 0)),
-                    'time': course.get('上课时间', ''),
-                    'location': course.get('上课地点', ''),
-                    'teacher': course.get('教师', ''),
-                    'course_type': '选择性必修课'
-                })
+            formatted_optional = [dict(selection_record(course), course_type='选择性必修课')
+                                  for course in self.selected_courses]
             user_data["optional_compulsory_courses"] = formatted_optional
-            optional_credits = sum(course['credit'] for course in formatted_optional)
-            user_data["total_credits"] += optional_credits
+            # 记录本次选课，作为偏好模型的训练数据
+            log_course_selection(
+                self.course_model.courses(),
+                [c['name'] for c in formatted_optional], '选择性必修课',
+                grade=self.grade, major=self.major,
+                existing_times=[c.get('time') for c in user_data.get('compulsory_courses', [])])
+            # 累积学分 = 必修课 + 本界面勾选的课程（返回后重新确认也不会重复累加）
+            user_data["total_credits"] = self.course_model.totals.total
             
-            # 跳转到通识课选择
-            from optimal import OptimalDialog
-            optimal_dialog = OptimalDialog(self.grade, self.major)
+            # 进入通识课选择（由 main_enhanced 的导航切换界面）
             self.accept()
-            optimal_result = optimal_dialog.exec_()
-            
-            # 如果用户从通识课界面返回，重新显示选择性必修课界面
-            if optimal_result == QtWidgets.QDialog.Rejected:
-                print("用户从通识课界面返回，重新显示选择性必修课界面")
-                # 重新创建选择性必修课界面
-                new_optimal_compulsory = OptimalCompulsoryUi(self.grade, self.major)
-                new_optimal_compulsory.exec_()
                 
         except Exception as e:
-            print(f"保存选择性必修课数据时出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("保存选择性必修课数据时出错: %s", e)
 
     def check_time_conflicts(self):
-        for i in range(len(self.selected_courses)):
-            for j in range(i + 1, len(self.selected_courses)):
-                if has_time_conflict(
-                    self.selected_courses[i]['上课时间'],
-                    self.selected_courses[j]['上课时间']
-                ):
-                    return True
-        return False
+        # 已勾选课程的冲突随勾选实时维护，这里直接读取（课程加载失败时没有冲突索引，也没有勾选）
+        conflicts = self.course_model.conflicts
+        return conflicts is not None and conflicts.has_conflicts()
 
     def get_selected_courses(self):
-        return self.selected_courses
\ No newline at end of file
+        return self.course_model.checked_courses()
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+性能面板
+显示 core.instrumentation 汇总的各项操作耗时和计数，每秒刷新，可导出 JSON 快照。
+任意界面中按 Ctrl+Shift+P 打开（见 install_performance_shortcut）。
+"""
+
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+                             QPushButton, QCheckBox, QHeaderView, QFileDialog, QApplication)
+
+from core import instrumentation
+
+TIMER_COLUMNS = ['操作', '次数', '总耗时(ms)', '平均(ms)', 'p50(ms)', 'p95(ms)', '最大(ms)']
+TIMER_KEYS = ['count', 'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms']
+
+
+class PerformancePanel(QDialog):
+    """各项操作的耗时（按总耗时从高到低）和计数器"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("性能面板")
+        self.resize(760, 520)
+        self.init_ui()
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.enabled_box = QCheckBox("记录性能数据")
+        self.enabled_box.setChecked(instrumentation.is_enabled())
+        self.enabled_box.toggled.connect(instrumentation.enable)
+        controls.addWidget(self.enabled_box)
+        controls.addStretch()
+        for text, slot in (("重置", self.reset), ("导出JSON", self.export)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            controls.addWidget(button)
+        layout.addLayout(controls)
+
+        self.timer_table = QTableWidget(0, len(TIMER_COLUMNS))
+        self.timer_table.setHorizontalHeaderLabels(TIMER_COLUMNS)
+        self.timer_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.timer_table.verticalHeader().setVisible(False)
+        self.timer_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.timer_table, 3)
+
+        self.counter_table = QTableWidget(0, 2)
+        self.counter_table.setHorizontalHeaderLabels(['计数器', '值'])
+        self.counter_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.counter_table.verticalHeader().setVisible(False)
+        self.counter_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.counter_table, 1)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        snapshot = instrumentation.snapshot()
+        timers = sorted(snapshot['timers'].items(), key=lambda item: -item[1]['total_ms'])
+        self.timer_table.setRowCount(len(timers))
+        for row, (name, stats) in enumerate(timers):
+            self.timer_table.setItem(row, 0, QTableWidgetItem(name))
+            for col, key in enumerate(TIMER_KEYS, start=1):
+                value = stats[key]
+                item = QTableWidgetItem(str(value) if key == 'count' else f"{value:.2f}")
+                item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+                self.timer_table.setItem(row, col, item)
+
+        counters = list(snapshot['counters'].items())
+        self.counter_table.setRowCount(len(counters))
+        for row, (name, value) in enumerate(counters):
+            self.counter_table.setItem(row, 0, QTableWidgetItem(name))
+            self.counter_table.setItem(row, 1, QTableWidgetItem(str(value)))
+
+        state = "记录中" if snapshot['enabled'] else "未记录（勾选上方选项开始记录）"
+        self.status_label.setText(f"{state}，统计时长 {snapshot['elapsed_seconds']:.0f} 秒")
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "导出性能快照", "perf_snapshot.json", "JSON 文件 (*.json)")
+        if path:
+            instrumentation.write_snapshot(path)
+            self.status_label.setText(f"已导出: {path}")
+
+
+class _PanelShortcut(QtCore.QObject):
+    """应用级按键过滤：任意窗口中按 Ctrl+Shift+P 打开性能面板
+
+    选课对话框都是模态运行的，面板也设为应用模态才能接收点击；面板打开期间当前对话框暂不响应。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.panel = None
+
+    def eventFilter(self, obj, event):
+        if (event.type() == QtCore.QEvent.KeyPress and event.key() == QtCore.Qt.Key_P
+                and event.modifiers() == (QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier)):
+            if self.panel is None:
+                self.panel = PerformancePanel()
+                self.panel.setWindowModality(QtCore.Qt.ApplicationModal)
+            self.panel.show()
+            self.panel.raise_()
+            self.panel.refresh()
+            return True
+        return False
+
+
+def install_performance_shortcut(app: QApplication):
+    """在应用上安装 Ctrl+Shift+P 快捷键"""
+    shortcut = _PanelShortcut(app)
+    app.installEventFilter(shortcut)
+    return shortcut
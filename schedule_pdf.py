@@ -0,0 +1,55 @@
+"""
+课表 PDF 导出
+用 QTextDocument 排版 HTML 课表（core.html_report），QPrinter 输出为 PDF。
+没有界面时自动创建 offscreen 平台的 QGuiApplication，可在服务器上批量导出。
+导入本模块后，core.schedule_export 的批量打包支持 'pdf' 格式。
+"""
+
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Dict
+
+from PyQt5 import QtCore, QtGui
+from PyQt5.QtPrintSupport import QPrinter
+
+from core import schedule_export
+from core.html_report import render_final_schedule
+
+_app = None
+
+
+def _ensure_application():
+    """QTextDocument 和 QPrinter 需要 QGuiApplication；界面程序中已有实例时直接使用"""
+    global _app
+    if QtCore.QCoreApplication.instance() is None:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        _app = QtGui.QGuiApplication([])
+
+
+def print_html_pdf(html: str, path: str):
+    """把 HTML 排版为 A4 横向的 PDF 写到 path"""
+    _ensure_application()
+    printer = QPrinter(QPrinter.HighResolution)
+    printer.setOutputFormat(QPrinter.PdfFormat)
+    printer.setOutputFileName(path)
+    printer.setPageSize(QPrinter.A4)
+    printer.setOrientation(QPrinter.Landscape)
+    document = QtGui.QTextDocument()
+    document.setHtml(html)
+    document.print_(printer)
+
+
+def write_pdf(selection: Dict, f: BinaryIO):
+    """选课结果 -> PDF 写入 f（QPrinter 只能输出到文件，先写临时文件再复制）"""
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    try:
+        print_html_pdf(render_final_schedule(selection), path)
+        with open(path, 'rb') as pdf:
+            shutil.copyfileobj(pdf, f)
+    finally:
+        os.remove(path)
+
+
+schedule_export.register_format('pdf', '.pdf', write_pdf)
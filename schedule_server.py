@@ -0,0 +1,425 @@
+"""
+选课服务（HTTP/JSON）
+把课表查询、冲突检查、课程推荐、教师推荐和AI评估以 JSON 接口提供给网页端。
+课表、评分特征表、兴趣索引和通识课池在启动时加载一次，所有请求共享；
+请求由固定数量的工作线程处理，线程全忙时最多排队 queue_size 个连接，超出直接返回 503；
+读取请求和计算结果各有超时，计算超时返回 504；超时的计算仍占着计算线程直到完成，
+计算线程全被占用时新请求直接返回 503，不在队列中等待。每个接口记录延迟直方图，见 GET /metrics
+（打开性能埋点时还包括加载、解析、冲突检查、打分等各项操作的耗时）。
+
+接口:
+    GET  /health
+    GET  /metrics
+    GET  /catalog?q=&type=&limit=&offset=          课表查询（课程名称规范化后做子串匹配）
+    GET  /catalog/compulsory?grade=&major=&type=   专业必修/选择性必修课
+    POST /conflicts   {"selected": [课程], "candidates": [课程]}
+    POST /recommend   {"profile": {学生画像}, "selected": [课程], "candidates": [课程], "top_k": 5}
+    POST /teachers    {"courses": [课程名称]}
+    POST /evaluate    {"年级", "专业", "必修课程", "选择性必修", "通识课程", "总学分", "use_llm"}
+
+课程用 create_course_from_dict 能识别的字典表示（name/credit/time/... 或 课程名称/学分/上课时间/...）。
+不导入 PyQt5。
+
+用法: python start_system.py --serve [--host 127.0.0.1] [--port 8765] [--workers 8]
+"""
+
+import json
+import math
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from config import SERVER_CONFIG, get_resource_path
+from core.instrumentation import LatencyHistogram
+from core import instrumentation
+from core.course_scheduler import Course, CourseScheduler, create_courses_from_dicts
+from core.course_names import course_key
+from core.extract_courses import (file_path, load_catalog_frames, get_general_courses,
+                                  extract_courses_by_grade_and_major)
+from core.course_rating import course_rating_manager
+from core.interest_matcher import get_interest_index
+from core.ai_recommender import AIRecommender, StudentProfile
+from core.preference_model import PreferenceModel
+from core.llm_integration import get_ai_evaluation, get_default_evaluation
+from batch_scheduler import normalize_profile
+
+logger = logging.getLogger(__name__)
+
+# 课表查询返回的列
+CATALOG_COLUMNS = ['课程号', '课程名称', '开课单位', '课程类型', '班号', '学分', '起止周', '上课时间', '教师', '备注']
+
+
+class BadRequest(Exception):
+    """请求参数错误，返回 400"""
+
+
+class ServerMetrics:
+    """各接口的延迟直方图与状态码计数"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.status: Dict[str, Dict[int, int]] = {}
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, status: int, ms: float):
+        with self._lock:
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = LatencyHistogram()
+            codes = self.status.setdefault(endpoint, {})
+            codes[status] = codes.get(status, 0) + 1
+        histogram.observe(ms)
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            endpoints = list(self.latency.items())
+            status = {endpoint: dict(codes) for endpoint, codes in self.status.items()}
+        result = {
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'rejected': self.rejected,
+            'endpoints': {endpoint: dict(histogram.snapshot(), status=status.get(endpoint, {}))
+                          for endpoint, histogram in endpoints},
+        }
+        # 打开性能埋点时附带各项操作的耗时
+        if instrumentation.is_enabled():
+            result['operations'] = instrumentation.snapshot()
+        return result
+
+
+def to_jsonable(value):
+    """把 numpy 标量、NaN 等转换成可写入 JSON 的值"""
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+        return None
+    return value
+
+
+def course_record(course: Course) -> Dict:
+    return {'name': course.name, 'credit': course.credit, 'time': course.time,
+            'location': course.location, 'teacher': course.teacher, 'type': course.course_type}
+
+
+def _parse_courses(items, field: str) -> List[Course]:
+    if items is None:
+        return []
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise BadRequest(f"{field} 应为课程对象列表")
+    return create_courses_from_dicts(items)
+
+
+def _query_int(query: Dict, name: str, default: int, upper: int) -> int:
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise BadRequest(f"{name} 应为整数")
+    return max(0, min(value, upper))
+
+
+class ScheduleService:
+    """服务共享的内存数据与各接口的处理逻辑（线程安全：请求之间只读共享数据）"""
+
+    def __init__(self):
+        start = time.perf_counter()
+        self.frames = load_catalog_frames(file_path, get_resource_path("通班&智能专业课 表格.xlsx"))
+        course_df = self.frames.course_df
+        columns = [column for column in CATALOG_COLUMNS if column in course_df.columns]
+        self.catalog = course_df[columns].astype(object).where(course_df[columns].notna(), None)
+        self.catalog_keys = course_df['_key'].fillna('')
+        self.general_pool = create_courses_from_dicts(get_general_courses(file_path))
+        # 预先加载评分特征表、兴趣索引和偏好模型，请求中不再读文件
+        course_rating_manager.get_course_feature_table()
+        get_interest_index()
+        self.preference_model = PreferenceModel.load()
+        # 年级/专业/课程类型 -> 专业课列表（课表在服务运行期间不变）
+        self._compulsory_cache: Dict[tuple, List[Dict]] = {}
+        logger.info(f"服务数据加载完成: 课表{len(self.catalog)}行，通识课池{len(self.general_pool)}个教学班，"
+                    f"耗时{time.perf_counter() - start:.2f}s")
+
+    def catalog_query(self, query: Dict, body) -> Dict:
+        mask = np.ones(len(self.catalog), dtype=bool)
+        text = query.get('q', [''])[0]
+        if text:
+            mask &= self.catalog_keys.str.contains(course_key(text), regex=False).to_numpy()
+        course_type = query.get('type', [''])[0]
+        if course_type and '课程类型' in self.catalog.columns:
+            mask &= (self.catalog['课程类型'] == course_type).to_numpy()
+        limit = _query_int(query, 'limit', 50, 500)
+        offset = _query_int(query, 'offset', 0, len(self.catalog))
+        matched = self.catalog[mask]
+        return {'total': int(len(matched)),
+                'items': matched.iloc[offset:offset + limit].to_dict('records')}
+
+    def compulsory_query(self, query: Dict, body) -> Dict:
+        grade = query.get('grade', [''])[0]
+        major = query.get('major', ['通班'])[0]
+        course_type = query.get('type', ['必修'])[0]
+        if not grade:
+            raise BadRequest("缺少 grade 参数")
+        if course_type not in ("必修", "选择性必修"):
+            raise BadRequest("type 应为 必修 或 选择性必修")
+        cache_key = (grade, major, course_type)
+        items = self._compulsory_cache.get(cache_key)
+        if items is None:
+            items = self._compulsory_cache[cache_key] = extract_courses_by_grade_and_major(
+                file_path, grade, major, course_type)
+        return {'items': items}
+
+    def conflicts(self, query: Dict, body) -> Dict:
+        selected = _parse_courses(body.get('selected'), 'selected')
+        candidates = _parse_courses(body.get('candidates'), 'candidates')
+        scheduler = CourseScheduler()
+        selected_conflicts = []
+        for course in selected:
+            for other in scheduler.check_conflicts(course):
+                selected_conflicts.append([other.name, course.name])
+            scheduler.add_selected_course(course)
+        return {
+            'selected_conflicts': selected_conflicts,
+            'candidates': [{'name': course.name,
+                            'conflicts_with': [other.name for other in scheduler.check_conflicts(course)]}
+                           for course in candidates],
+        }
+
+    def recommend(self, query: Dict, body) -> Dict:
+        if not isinstance(body.get('profile'), dict):
+            raise BadRequest("缺少 profile")
+        profile = normalize_profile(body['profile'], 0)
+        scheduler = CourseScheduler()
+        for course in _parse_courses(body.get('selected'), 'selected'):
+            scheduler.add_selected_course(course)
+        candidates = (_parse_courses(body['candidates'], 'candidates')
+                      if body.get('candidates') is not None else self.general_pool)
+        try:
+            top_k = int(body.get('top_k', 5))
+        except (TypeError, ValueError):
+            raise BadRequest("top_k 应为整数")
+
+        recommender = AIRecommender(scheduler, self.preference_model)
+        recommender.set_student_profile(StudentProfile(
+            age=profile.get('grade', ''), major=profile.get('major', ''), interests=profile['interests'],
+            preferred_workload=profile['preferred_workload'],
+            preferred_assessment=profile['preferred_assessment'],
+            preferred_teaching_style=profile['preferred_teaching_style']))
+        return {'items': [{'course': course_record(item['course']), 'score': item['score'],
+                           'reasons': item['reasons']}
+                          for item in recommender.recommend_courses(candidates, top_k=max(1, top_k))]}
+
+    def teachers(self, query: Dict, body) -> Dict:
+        names = body.get('courses')
+        if not isinstance(names, list):
+            raise BadRequest("courses 应为课程名称列表")
+        return {'items': course_rating_manager.get_teacher_recommendations([str(name) for name in names])}
+
+    def evaluate(self, query: Dict, body) -> Dict:
+        data = {
+            '年级': body.get('年级', ''),
+            '专业': body.get('专业', ''),
+            '必修课程': list(body.get('必修课程', [])),
+            '选择性必修': list(body.get('选择性必修', [])),
+            '通识课程': list(body.get('通识课程', [])),
+            '总学分': body.get('总学分', 0),
+        }
+        use_llm = body.get('use_llm', True)
+        return {'html': get_ai_evaluation(data) if use_llm else get_default_evaluation(data)}
+
+    def routes(self) -> Dict:
+        return {
+            ('GET', '/catalog'): self.catalog_query,
+            ('GET', '/catalog/compulsory'): self.compulsory_query,
+            ('POST', '/conflicts'): self.conflicts,
+            ('POST', '/recommend'): self.recommend,
+            ('POST', '/teachers'): self.teachers,
+            ('POST', '/evaluate'): self.evaluate,
+        }
+
+
+class ScheduleRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'CourseScheduleServer/1.0'
+    # 响应头和响应体分两次写出，关闭 Nagle 以免与客户端的延迟确认叠加出约40ms的等待
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # 读取请求的超时（空闲的长连接到时关闭）
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str):
+        start = time.perf_counter()
+        path = urlsplit(self.path).path.rstrip('/') or '/'
+        status, payload = self._handle(method, path)
+        self._send_json(status, payload)
+        self.server.metrics.record(f"{method} {path}" if status != 404 else 'unknown', status,
+                                   (time.perf_counter() - start) * 1000)
+
+    def _handle(self, method: str, path: str):
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, self.server.metrics.snapshot()
+        handler = self.server.routes.get((method, path))
+        if handler is None:
+            return 404, {'error': f"未知接口: {method} {path}"}
+        try:
+            query = parse_qs(urlsplit(self.path).query)
+            body = self._read_body() if method == 'POST' else {}
+            future = self.server.submit_compute(handler, query, body)
+            if future is None:
+                return 503, {'error': '计算线程全忙，请稍后重试'}
+            return 200, future.result(timeout=self.server.request_timeout)
+        except BadRequest as e:
+            return 400, {'error': str(e)}
+        except FutureTimeout:
+            return 504, {'error': f"请求超时（{self.server.request_timeout}秒）"}
+        except Exception as e:
+            logger.exception(f"处理 {method} {path} 出错")
+            return 500, {'error': f"{type(e).__name__}: {e}"}
+
+    def _read_body(self) -> Dict:
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # 无法确定请求体的边界，响应后关闭连接
+            self.close_connection = True
+            raise BadRequest("Content-Length 无效")
+        if length > self.server.max_body_bytes:
+            # 未读取的请求体留在连接中，响应后关闭连接
+            self.close_connection = True
+            raise BadRequest("请求体过大")
+        raw = self.rfile.read(length) if length else b'{}'
+        try:
+            body = json.loads(raw.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise BadRequest("请求体不是合法的JSON")
+        if not isinstance(body, dict):
+            raise BadRequest("请求体应为JSON对象")
+        return body
+
+    def _send_json(self, status: int, payload):
+        data = json.dumps(to_jsonable(payload), ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ScheduleHTTPServer(HTTPServer):
+    """固定线程池处理连接的 HTTP 服务器
+
+    workers 个线程处理连接，另有同样数量的计算线程执行接口逻辑（便于按超时放弃等待）；
+    正在处理和排队的连接总数超过 workers + queue_size 时新连接直接得到 503。
+    超时后放弃等待的计算仍在执行，计算线程全被占用时 submit_compute 拒绝新的计算，
+    避免后续请求都排在卡住的计算后面、等到超时。
+    """
+
+    def __init__(self, address, service: ScheduleService, workers: int = None, queue_size: int = None,
+                 request_timeout: float = None, max_body_bytes: int = None):
+        super().__init__(address, ScheduleRequestHandler)
+        workers = workers or SERVER_CONFIG['workers']
+        queue_size = SERVER_CONFIG['queue_size'] if queue_size is None else queue_size
+        self.service = service
+        self.workers = workers
+        self.routes = service.routes()
+        self.metrics = ServerMetrics()
+        self.request_timeout = request_timeout or SERVER_CONFIG['request_timeout']
+        self.max_body_bytes = max_body_bytes or SERVER_CONFIG['max_body_bytes']
+        self.connection_pool = ThreadPoolExecutor(workers, thread_name_prefix='connection')
+        self.compute_pool = ThreadPoolExecutor(workers, thread_name_prefix='compute')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._compute_slots = threading.BoundedSemaphore(workers)
+
+    def submit_compute(self, handler, *args):
+        """在计算线程中执行 handler；计算线程全被占用（包括超时后仍在执行的计算）时返回 None"""
+        if not self._compute_slots.acquire(blocking=False):
+            return None
+        try:
+            return self.compute_pool.submit(self._run_compute, handler, *args)
+        except RuntimeError:
+            # 服务器已关闭
+            self._compute_slots.release()
+            raise
+
+    def _run_compute(self, handler, *args):
+        try:
+            return handler(*args)
+        finally:
+            self._compute_slots.release()
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self.metrics.reject()
+            try:
+                body = json.dumps({'error': '服务繁忙，请稍后重试'}, ensure_ascii=False).encode('utf-8')
+                request.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json; charset=utf-8\r\n"
+                                b"Connection: close\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self.connection_pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.connection_pool.shutdown(wait=False)
+        self.compute_pool.shutdown(wait=False)
+
+
+def create_server(host: str = None, port: int = None, workers: int = None,
+                  request_timeout: float = None) -> ScheduleHTTPServer:
+    """加载共享数据并创建服务器（port 为 0 时由系统分配端口）"""
+    service = ScheduleService()
+    host = host or SERVER_CONFIG['host']
+    port = SERVER_CONFIG['port'] if port is None else port
+    return ScheduleHTTPServer((host, port), service, workers=workers, request_timeout=request_timeout)
+
+
+def serve(host: str = None, port: int = None, workers: int = None, request_timeout: float = None):
+    """启动服务并阻塞运行，Ctrl+C 退出"""
+    server = create_server(host, port, workers, request_timeout)
+    host, port = server.server_address[:2]
+    print(f"选课服务已启动: http://{host}:{port}  (工作线程 {server.workers}，"
+          f"超时 {server.request_timeout}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n服务已停止")
+    finally:
+        server.server_close()
@@ -5,6 +5,7 @@
 
 import sys
 import os
+import argparse
 import subprocess
 import time
 
@@ -46,7 +47,7 @@ def check_configuration():
     
     try:
         from config import get_configured_services, APP_CONFIG
-        from llm_integration import llm_client
+        from core.llm_integration import llm_client
         
         configured_services = get_configured_services()
         
@@ -97,7 +98,7 @@ def test_ai_service():
     print("\n🤖 测试AI服务...")
     
     try:
-        from llm_integration import get_ai_evaluation
+        from core.llm_integration import get_ai_evaluation
         from config import get_configured_services
         
         configured_services = get_configured_services()
@@ -174,8 +175,30 @@ def show_system_info():
     print("特性: 智能选课推荐、AI评估、课程管理")
     print()
 
+def start_server(args):
+    """以服务模式运行（不启动图形界面，不检查PyQt5）"""
+    print("🌐 启动选课服务...")
+    from core.logging_setup import configure_logging
+    from schedule_server import serve
+    configure_logging()
+    serve(args.host, args.port, args.workers, args.timeout)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="北京大学智能选课系统")
+    parser.add_argument('--serve', action='store_true', help='以HTTP/JSON服务模式运行')
+    parser.add_argument('--host', default=None, help='服务监听地址（默认见 SERVER_CONFIG）')
+    parser.add_argument('--port', type=int, default=None, help='服务端口（默认见 SERVER_CONFIG）')
+    parser.add_argument('--workers', type=int, default=None, help='工作线程数')
+    parser.add_argument('--timeout', type=float, default=None, help='请求超时（秒）')
+    return parser.parse_args()
+
 def main():
     """主函数"""
+    args = parse_args()
+    if args.serve:
+        start_server(args)
+        return
+    
     show_system_info()
     
     # 系统检查流程
@@ -37,7 +37,7 @@ def check_files():
     required_files = [
         'main_enhanced.py',
         'compulsory_choose.py',
-        'extract_courses.py',
+        'core/extract_courses.py',
         'config.py',
         'welcome.py',
         'age.py',
@@ -47,7 +47,7 @@ def check_files():
         'teacher.py',
         'evaluation.py',
         'final.py',
-        'llm_integration.py'
+        'core/llm_integration.py'
     ]
     
     missing_files = []
@@ -87,9 +87,9 @@ def check_module_imports():
         'teacher',
         'evaluation',
         'final',
-        'extract_courses',
+        'core.extract_courses',
         'config',
-        'llm_integration'
+        'core.llm_integration'
     ]
     
     failed_imports = []
@@ -137,7 +137,7 @@ def check_data_loading():
     """检查数据加载"""
     print("\n=== 检查数据加载 ===")
     try:
-        from extract_courses import extract_courses_by_grade_and_major
+        from core.extract_courses import extract_courses_by_grade_and_major
         
         # 测试课程数据加载
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -0,0 +1,13 @@
+"""
+测试共用设置：把项目根目录加入 sys.path（与 benchmarks/ 中的脚本相同），
+测试可以直接 import core、config 等模块。
+
+用法: python -m pytest tests
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,46 @@
+"""core.ai_recommender.top_k_indices：部分排序取前 k 名"""
+
+import numpy as np
+import pytest
+
+from core.ai_recommender import top_k_indices
+
+
+def reference(scores, k):
+    """全排序的结果：得分降序，同分按下标升序"""
+    return np.argsort(-scores, kind='stable')[:k]
+
+
+def test_orders_by_score_descending():
+    scores = np.array([3.0, 9.0, 1.0, 7.0, 5.0])
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 4]
+
+
+def test_ties_keep_lower_index_first():
+    scores = np.array([5.0, 7.0, 5.0, 5.0, 1.0])
+    # 第 3 名的分数线上有三个同分，只取下标最小的两个
+    assert top_k_indices(scores, 3).tolist() == [1, 0, 2]
+
+
+@pytest.mark.parametrize('k', [5, 6, 100])
+def test_k_at_least_n_returns_everything_sorted(k):
+    scores = np.array([2.0, 8.0, 2.0, 4.0, 6.0])
+    assert top_k_indices(scores, k).tolist() == [1, 4, 3, 0, 2]
+
+
+def test_empty_scores():
+    assert len(top_k_indices(np.array([]), 3)) == 0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_full_sort(seed):
+    rng = np.random.default_rng(seed)
+    # 取值较少，保证有大量同分
+    scores = rng.integers(0, 20, 500).astype(float)
+    for k in (1, 10, 137, 499):
+        assert top_k_indices(scores, k).tolist() == reference(scores, k).tolist()
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_non_positive_k_returns_nothing(k):
+    assert len(top_k_indices(np.array([3.0, 1.0, 2.0]), k)) == 0
@@ -0,0 +1,98 @@
+"""core.conflict_index：时间位掩码与勾选时的增量冲突状态"""
+
+from core.conflict_index import ConflictIndex, occupancy_mask, time_mask
+
+MON_1_2 = '星期一(第1节-第2节)'
+MON_2_3 = '星期一(第2节-第3节)'
+MON_3_4 = '星期一(第3节-第4节)'
+WED_1_2 = '星期三(第1节-第2节)'
+
+
+def conflicting_rows(index):
+    return [row for row in range(len(index.masks)) if index.is_conflicting(row)]
+
+
+def test_time_mask_bits():
+    # 第 (星期-1)*12 + 节次-1 位
+    assert time_mask(MON_1_2) == 0b11
+    assert time_mask('周一3-4节') == 0b1100
+    assert time_mask(WED_1_2) == 0b11 << 24
+    assert time_mask('') == 0
+    assert time_mask(None) == 0
+
+
+def test_occupancy_mask_unions_times():
+    assert occupancy_mask([MON_1_2, MON_3_4, '']) == 0b1111
+    assert occupancy_mask([]) == 0
+
+
+def test_same_time_rows_share_a_group():
+    index = ConflictIndex([MON_1_2, WED_1_2, MON_1_2])
+    assert index.group_of[0] == index.group_of[2] != index.group_of[1]
+    assert index.group_rows[index.group_of[0]] == [0, 2]
+
+
+def test_selecting_marks_overlapping_rows():
+    index = ConflictIndex([MON_1_2, MON_2_3, MON_3_4, WED_1_2])
+    assert conflicting_rows(index) == []
+
+    changed = index.set_selected(0, True)
+    assert sorted(changed) == [1]
+    # 已勾选的课程本身不算冲突，只有与它重叠的未勾选课程变红
+    assert conflicting_rows(index) == [1]
+    assert not index.has_conflicts()
+
+    changed = index.set_selected(1, True)
+    assert sorted(changed) == [0, 2]
+    assert conflicting_rows(index) == [0, 1, 2]
+    assert index.has_conflicts()
+
+    index.set_selected(1, False)
+    assert conflicting_rows(index) == [1]
+    assert not index.has_conflicts()
+
+
+def test_selecting_twice_is_a_no_op():
+    index = ConflictIndex([MON_1_2, MON_2_3])
+    index.set_selected(0, True)
+    assert index.set_selected(0, True) == []
+    index.set_selected(0, False)
+    assert index.set_selected(0, False) == []
+    assert conflicting_rows(index) == []
+
+
+def test_identical_times_conflict_with_each_other():
+    index = ConflictIndex([MON_1_2, MON_1_2])
+    index.set_selected(0, True)
+    assert conflicting_rows(index) == [1]
+    index.set_selected(1, True)
+    assert index.has_conflicts()
+    assert conflicting_rows(index) == [0, 1]
+
+
+def test_rows_without_time_never_conflict():
+    index = ConflictIndex(['', MON_1_2, None], fixed_mask=time_mask(MON_1_2))
+    index.set_selected(1, True)
+    index.set_selected(0, True)
+    assert not index.is_conflicting(0)
+    assert not index.is_conflicting(2)
+
+
+def test_fixed_mask_and_its_updates():
+    index = ConflictIndex([MON_1_2, MON_3_4, WED_1_2], fixed_mask=time_mask(MON_1_2))
+    assert conflicting_rows(index) == [0]
+
+    assert index.set_fixed_mask(time_mask(MON_1_2)) == []
+    assert sorted(index.set_fixed_mask(time_mask(MON_3_4))) == [0, 1]
+    assert conflicting_rows(index) == [1]
+    # 之前步骤的课程不计入当前选择的占用
+    assert index.occupancy == 0
+
+
+def test_occupancy_tracks_selection():
+    index = ConflictIndex([MON_1_2, WED_1_2])
+    index.set_selected(0, True)
+    index.set_selected(1, True)
+    assert index.occupancy == time_mask(MON_1_2) | time_mask(WED_1_2)
+    index.set_selected(0, False)
+    assert index.occupancy == time_mask(WED_1_2)
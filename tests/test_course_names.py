@@ -0,0 +1,58 @@
+"""core.course_names：课程名称规范化键与 精确 -> 别名 -> 模糊 的名称匹配"""
+
+import pytest
+
+from core.course_names import CourseNameIndex, course_key
+
+
+@pytest.mark.parametrize('a, b', [
+    ('计算概论 A', '计算概论A'),
+    ('数据结构与算法 (A)', '数据结构与算法（A）'),
+    ('线性代数A I', '线性代数AⅠ'),
+    ('高等数学A 下', '高等数学A II'),
+    ('​人工智能引论', '人工智能引论'),
+])
+def test_course_key_equates_spellings(a, b):
+    assert course_key(a) == course_key(b)
+
+
+def test_course_key_keeps_levels_apart():
+    assert course_key('人工智能系统实践 I') != course_key('人工智能系统实践 (II)')
+    assert course_key('计算概论A') != course_key('计算概论C')
+
+
+@pytest.mark.parametrize('value', [None, float('nan'), ''])
+def test_course_key_of_missing_name_is_empty(value):
+    assert course_key(value) == ''
+
+
+def test_index_rows_and_first_spelling():
+    index = CourseNameIndex(['计算概论 A', '线性代数A I', '计算概论A', None])
+    assert index.lookup('计算概论（A）') == [0, 2]
+    assert index.resolve_name('计算概论A') == '计算概论 A'
+    assert index.lookup('不存在的课程') == []
+    assert index.resolve_key('不存在的课程') is None
+
+
+def test_index_resolves_aliases_both_ways():
+    full = CourseNameIndex(['微电子与电路基础'])
+    assert full.resolve_name('微电基') == '微电子与电路基础'
+    short = CourseNameIndex(['微电基'])
+    assert short.resolve_name('微电子与电路基础') == '微电基'
+
+
+def test_index_fuzzy_match_respects_threshold_and_levels():
+    index = CourseNameIndex(['人工智能系统实践 I', '计算机系统导论'])
+    # 少一个字，二元组相似度仍然足够高
+    assert index.resolve_name('计算机系统导论课') == '计算机系统导论'
+    # 编号不同的课程不视为同一门
+    assert index.resolve_key('人工智能系统实践 II') is None
+    assert index.resolve_key('操作系统') is None
+
+
+def test_match_rate_counts_each_kind():
+    index = CourseNameIndex(['计算概论A', '微电子与电路基础', '计算机系统导论'])
+    report = index.match_rate(['计算概论 A', '微电基', '计算机系统导论课', '编译原理', '计算概论A'])
+    assert (report['exact'], report['alias'], report['fuzzy'], report['missing']) == (1, 1, 1, 1)
+    assert report['total'] == 4
+    assert report['rate'] == pytest.approx(0.75)
@@ -0,0 +1,86 @@
+"""core.degree_planner："选课时间"解析与多学期规划"""
+
+import pytest
+
+from core.course_scheduler import Course
+from core.degree_planner import (DegreePlanner, PlannedCourse, SEMESTERS, grade_to_semester,
+                                 parse_semester_tokens)
+
+MON_1_2 = '星期一(第1节-第2节)'
+WED_1_2 = '星期三(第1节-第2节)'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('一上', (0,)),
+    ('二下', (3,)),
+    ('二上/三上', (2, 4)),
+    ('三上/下', (4, 5)),
+    ('二/三上', (2, 4)),
+    ('二年级', (2, 3)),
+    (' 一上​', (0,)),
+    ('五上', ()),
+    ('abc', ()),
+    ('', ()),
+    (None, ()),
+    (float('nan'), ()),
+])
+def test_parse_semester_tokens(text, expected):
+    assert parse_semester_tokens(text) == expected
+
+
+def test_grade_to_semester():
+    assert grade_to_semester('大二') == SEMESTERS.index('二上')
+    assert grade_to_semester('三下') == SEMESTERS.index('三下')
+    with pytest.raises(ValueError):
+        grade_to_semester('研一')
+
+
+def course(name, credit, semesters, *times):
+    sections = [Course(name, credit, time, '', '', '必修') for time in times]
+    return PlannedCourse(name, credit, tuple(semesters), sections)
+
+
+def placement(plan):
+    return {c.name: term.semester for term in plan.terms for c in term.courses}
+
+
+def test_courses_go_to_their_earliest_semester():
+    planner = DegreePlanner([course('甲', 3, [0, 2]), course('乙', 4, [1]), course('丙', 2, [3])],
+                            max_term_credits=30)
+    plan = planner.plan('一上')
+    assert placement(plan) == {'甲': '一上', '乙': '一下', '丙': '二下'}
+    assert plan.unplaced == []
+    assert [term.semester for term in plan.terms] == list(SEMESTERS)
+
+
+def test_time_conflicts_push_a_course_to_its_other_semester():
+    planner = DegreePlanner([course('甲', 3, [0, 2], MON_1_2), course('乙', 3, [0], MON_1_2)],
+                            max_term_credits=30)
+    plan = planner.plan('一上')
+    # 乙只在一上开设，甲让出一上，改到二上
+    assert placement(plan) == {'乙': '一上', '甲': '二上'}
+
+
+def test_a_free_section_is_chosen_when_one_conflicts():
+    planner = DegreePlanner([course('甲', 3, [0], MON_1_2, WED_1_2), course('乙', 3, [0], MON_1_2)],
+                            max_term_credits=30)
+    plan = planner.plan('一上')
+    times = {c.name: c.time for c in plan.terms[0].courses}
+    assert times == {'甲': WED_1_2, '乙': MON_1_2}
+
+
+def test_credit_cap_leaves_courses_unplaced():
+    planner = DegreePlanner([course('甲', 4, [0]), course('乙', 3, [0])], max_term_credits=5)
+    plan = planner.plan('一上')
+    assert placement(plan) == {'甲': '一上'}
+    assert plan.unplaced == ['乙']
+    assert all(term.credits <= 5 for term in plan.terms)
+
+
+def test_completed_and_past_courses():
+    planner = DegreePlanner([course('计算概论 A', 3, [0]), course('线性代数A I', 4, [0]),
+                             course('程序设计实习', 3, [1])], max_term_credits=30)
+    plan = planner.plan('大二', completed=['计算概论A'])
+    # 已修课程按规范化名称匹配后跳过；一上的课程顺延到之后的秋季学期，一下的课程顺延到春季学期
+    assert placement(plan) == {'线性代数A I': '二上', '程序设计实习': '二下'}
+    assert plan.terms[0].semester == '二上'
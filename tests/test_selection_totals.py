@@ -0,0 +1,63 @@
+"""core.course_selection.SelectionTotals：勾选时增量维护的门数与学分合计"""
+
+import pytest
+
+from core.course_selection import SelectionTotals, course_credit
+
+
+def test_add_and_remove_update_totals():
+    totals = SelectionTotals(base_credits=10)
+    totals.add(3, '必修课')
+    totals.add(2.5, '通识课')
+    totals.add(2, '必修课')
+    assert totals.count == 3
+    assert totals.credits == pytest.approx(7.5)
+    assert totals.total == pytest.approx(17.5)
+    assert totals.by_type == {'必修课': [2, 5.0], '通识课': [1, 2.5]}
+
+    totals.remove(2.5, '通识课')
+    assert totals.count == 2
+    assert totals.total == pytest.approx(15)
+    # 某类型的课程全部取消后不再列出
+    assert '通识课' not in totals.by_type
+
+
+def test_base_credits_can_change_after_selection():
+    totals = SelectionTotals()
+    totals.add(4)
+    totals.base_credits = 6
+    assert totals.total == pytest.approx(10)
+
+
+def test_clear_keeps_base_credits():
+    totals = SelectionTotals(base_credits=8)
+    totals.add(3, '必修课')
+    totals.clear()
+    assert (totals.count, totals.credits, totals.by_type) == (0, 0.0, {})
+    assert totals.total == 8
+
+
+def test_describe_lists_each_type():
+    totals = SelectionTotals()
+    assert totals.describe() == ''
+    totals.add(3, '通识课')
+    totals.add(2, '')
+    totals.add(1.5, '通识课')
+    assert totals.describe().splitlines() == ['其他：1门，2学分', '通识课：2门，4.5学分']
+
+
+def test_many_toggles_return_to_zero():
+    totals = SelectionTotals()
+    credits = [0.5, 1, 2, 3, 4.5] * 200
+    for credit in credits:
+        totals.add(credit, '选修')
+    for credit in credits:
+        totals.remove(credit, '选修')
+    assert totals.count == 0
+    assert totals.credits == pytest.approx(0)
+    assert totals.by_type == {}
+
+
+@pytest.mark.parametrize('value, expected', [(3, 3.0), ('2.5', 2.5), (None, 0.0), ('', 0.0), ('两', 0.0)])
+def test_course_credit(value, expected):
+    assert course_credit(value) == expected